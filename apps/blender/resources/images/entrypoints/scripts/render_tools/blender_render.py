@@ -1,18 +1,83 @@
+import json
 import os
+import re
 import stat
 import subprocess
 import sys
 from multiprocessing import cpu_count
-from typing import List
+from typing import Callable, List, Optional
 
 from . import scenefileeditor
 
 BLENDER_COMMAND = "blender"
+CROP_RENDERED_MARKER = "GOLEM_CROP_RENDERED "
+JOB_DONE_MARKER = "GOLEM_JOB_DONE"
+
+# Blender status lines end with "Path Tracing Tile 3/16" (Cycles)
+# or "Part 3-16" (Blender Internal)
+TILE_PROGRESS_RE = re.compile(r"(?:Tile|Part) (\d+)[/-](\d+)\s*$")
+# Printed after a frame is written
+FRAME_SAVED_PREFIX = "Saved:"
+
+
+def exec_cmd(cmd, on_output: Optional[Callable[[str], None]] = None):
+    if on_output is None:
+        pc = subprocess.Popen(cmd)
+        return pc.wait()
+
+    pc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                          universal_newlines=True)
+    for line in pc.stdout:
+        sys.stdout.write(line)
+        on_output(line)
+    return pc.wait()
 
 
-def exec_cmd(cmd):
-    pc = subprocess.Popen(cmd)
-    return pc.wait()
+def report_progress(mounted_paths: dict, progress: float) -> None:
+    """ Writes the progress to the file polled by Golem. The file is
+    replaced atomically, so a partially written value is never read. """
+    progress_file = mounted_paths.get("PROGRESS_FILE")
+    if not progress_file:
+        return
+    tmp_file = progress_file + ".tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            f.write("{:.4f}".format(progress))
+        os.replace(tmp_file, progress_file)
+    except OSError as exc:
+        print("Cannot report progress: {}".format(exc), file=sys.stderr)
+
+
+class RenderProgress:
+    """ Estimates the progress of rendering `total_frames` frames from the
+    output of consecutive Blender processes. """
+
+    def __init__(self, mounted_paths: dict, total_frames: int) -> None:
+        self.mounted_paths = mounted_paths
+        self.total_frames = max(1, total_frames)
+        self.frames_done = 0
+        self.last_reported = None
+
+    def on_output(self, line: str) -> None:
+        if line.startswith(FRAME_SAVED_PREFIX):
+            self.frames_done += 1
+            self._report(0.)
+            return
+        match = TILE_PROGRESS_RE.search(line)
+        if match:
+            done, total = int(match.group(1)), int(match.group(2))
+            if total:
+                self._report(min(1., done / total))
+
+    def _report(self, frame_fraction: float) -> None:
+        progress = min(1., (self.frames_done + frame_fraction)
+                       / self.total_frames)
+        # avoid rewriting the file for every status line
+        if self.last_reported is not None \
+                and progress - self.last_reported < 0.01:
+            return
+        self.last_reported = progress
+        report_progress(self.mounted_paths, progress)
 
 
 # pylint: disable=too-many-arguments
@@ -143,6 +208,18 @@ def gen_blender_command(parameters: dict,
     return cmd
 
 
+def gen_crop_results(parameters: dict, crop: dict) -> List[str]:
+    output_format = parameters["output_format"].lower()
+
+    results_list = list()
+    for frame in parameters["frames"]:
+        filename = crop["outfilebasename"] \
+                   + "{:04d}.".format(frame) \
+                   + output_format
+        results_list.append(filename)
+    return results_list
+
+
 def render(parameters: dict,
            mounted_paths: dict) -> List[dict]:
 
@@ -150,6 +227,9 @@ def render(parameters: dict,
 
     crop_counter = 0
     output_info = list()
+    progress = RenderProgress(mounted_paths,
+                              len(crops) * len(parameters["frames"]))
+    report_progress(mounted_paths, 0.)
 
     for crop in crops:
 
@@ -158,23 +238,14 @@ def render(parameters: dict,
                                               crop_counter)
         cmd = gen_blender_command(parameters, crop, mounted_paths, script_file)
 
-        output_format = parameters["output_format"].lower()
-
-        results_list = list()
-        for frame in parameters["frames"]:
-            filename = crop["outfilebasename"] \
-                       + "{:04d}.".format(frame) \
-                       + output_format
-            results_list.append(filename)
-
         crop_info = dict()
         crop_info["crop"] = crop
-        crop_info["results"] = results_list
+        crop_info["results"] = gen_crop_results(parameters, crop)
 
         output_info.append(crop_info)
 
         print(cmd, file=sys.stderr)
-        exit_code = exec_cmd(cmd)
+        exit_code = exec_cmd(cmd, progress.on_output)
         if exit_code is not 0:
             sys.exit(exit_code)
 
@@ -183,6 +254,159 @@ def render(parameters: dict,
     return output_info
 
 
+def render_crops(parameters: dict,
+                 mounted_paths: dict,
+                 on_crop_rendered: Optional[Callable[[dict], None]] = None,
+                 num_threads=cpu_count()) -> List[dict]:
+    """ Renders all the crops in a single Blender process, so the scene is
+    loaded once instead of once per crop. `on_crop_rendered` is called with
+    the crop info as soon as all frames of that crop are written.
+    """
+
+    output_info = list()
+    for crop in parameters["crops"]:
+        crop_info = dict()
+        crop_info["crop"] = crop
+        crop_info["results"] = gen_crop_results(parameters, crop)
+        output_info.append(crop_info)
+
+    script_file = scenefileeditor.generate_blender_multicrop_file(
+        "scriptfile-multicrop.py",
+        parameters,
+        [dict(info["crop"], results=info["results"]) for info in output_info],
+        mounted_paths,
+        num_threads,
+        CROP_RENDERED_MARKER)
+
+    cmd = [
+        "{}".format(BLENDER_COMMAND),
+        "-b", "{}".format(parameters["scene_file"]),
+        "-y",  # enable scripting by default
+        "-noaudio",
+        "-P", "{}".format(script_file),
+    ]
+
+    print(cmd, file=sys.stderr)
+    pc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                          universal_newlines=True)
+    for line in pc.stdout:
+        if not line.startswith(CROP_RENDERED_MARKER):
+            sys.stdout.write(line)
+            continue
+        crop_num = int(line[len(CROP_RENDERED_MARKER):])
+        if on_crop_rendered:
+            on_crop_rendered(output_info[crop_num])
+
+    exit_code = pc.wait()
+    if exit_code != 0:
+        sys.exit(exit_code)
+
+    return output_info
+
+
+class BlenderServer:
+    """ A Blender process which keeps the scene loaded and renders the crops
+    of consecutive jobs, written to its stdin one JSON object per line.
+    The process is started on the first job and restarted when it dies or
+    a job uses another scene file.
+    """
+
+    def __init__(self, mounted_paths: dict,
+                 num_threads=cpu_count()) -> None:
+        self.mounted_paths = mounted_paths
+        self.num_threads = num_threads
+        self.scene_file: Optional[str] = None
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def render_crops(self,
+                     parameters: dict,
+                     output_dir: str,
+                     on_crop_rendered: Optional[Callable[[dict], None]] = None
+                     ) -> List[dict]:
+        """ Same as `render_crops`, but without loading the scene again.
+        Raises RuntimeError when Blender exits before the job is done. """
+
+        output_info = list()
+        for crop in parameters["crops"]:
+            crop_info = dict()
+            crop_info["crop"] = crop
+            crop_info["results"] = gen_crop_results(parameters, crop)
+            output_info.append(crop_info)
+
+        if not self.running or self.scene_file != parameters["scene_file"]:
+            self.close()
+            self._start(parameters["scene_file"])
+
+        job = dict(
+            output_format=parameters["output_format"],
+            resolution=list(parameters["resolution"]),
+            use_compositing=parameters["use_compositing"],
+            samples=parameters["samples"],
+            frames=list(parameters["frames"]),
+            crops=[dict(info["crop"], results=info["results"])
+                   for info in output_info],
+            output_dir=output_dir,
+        )
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except OSError:
+            self.close()
+            raise RuntimeError("Blender server is not running")
+
+        for line in self.process.stdout:
+            if line.startswith(JOB_DONE_MARKER):
+                return output_info
+            if not line.startswith(CROP_RENDERED_MARKER):
+                sys.stdout.write(line)
+                continue
+            crop_num = int(line[len(CROP_RENDERED_MARKER):])
+            if on_crop_rendered:
+                on_crop_rendered(output_info[crop_num])
+
+        exit_code = self.process.wait()
+        self.process = None
+        raise RuntimeError("Blender server exited with code {}"
+                           .format(exit_code))
+
+    def close(self) -> None:
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def _start(self, scene_file: str) -> None:
+        script_file = scenefileeditor.generate_blender_server_file(
+            "scriptfile-server.py",
+            self.mounted_paths,
+            self.num_threads,
+            CROP_RENDERED_MARKER,
+            JOB_DONE_MARKER)
+
+        cmd = [
+            "{}".format(BLENDER_COMMAND),
+            "-b", "{}".format(scene_file),
+            "-y",  # enable scripting by default
+            "-noaudio",
+            "-P", "{}".format(script_file),
+        ]
+
+        print(cmd, file=sys.stderr)
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        universal_newlines=True)
+        self.scene_file = scene_file
+
+
 # pylint: disable-msg=too-many-locals
 def gen_render_shell_scripts(parameters: dict,
                              mounted_paths: dict,
@@ -4,6 +4,14 @@ BLENDER_CROP_TEMPLATE_PATH \
     = os.path.join(os.path.dirname(os.path.realpath(__file__)),
                    "templates",
                    "blendercrop.py.template")
+BLENDER_MULTICROP_TEMPLATE_PATH \
+    = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                   "templates",
+                   "blendermulticrop.py.template")
+BLENDER_SERVER_TEMPLATE_PATH \
+    = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                   "templates",
+                   "blenderserver.py.template")
 
 
 def get_generated_files_path(mounted_paths: dict):
@@ -28,6 +36,40 @@ def generate_blender_crop_file(script_file_out,
                                           samples,
                                           override_output)
 
+    return _write_script_file(script_file_out, content, mounted_paths)
+
+
+# pylint: disable-msg=too-many-arguments
+def generate_blender_multicrop_file(script_file_out,
+                                    parameters,
+                                    crops,
+                                    mounted_paths,
+                                    num_threads,
+                                    marker):
+    content = _generate_blender_multicrop_file(BLENDER_MULTICROP_TEMPLATE_PATH,
+                                               parameters,
+                                               crops,
+                                               mounted_paths["OUTPUT_DIR"],
+                                               num_threads,
+                                               marker)
+
+    return _write_script_file(script_file_out, content, mounted_paths)
+
+
+def generate_blender_server_file(script_file_out,
+                                 mounted_paths,
+                                 num_threads,
+                                 crop_marker,
+                                 done_marker):
+    content = _generate_blender_server_file(BLENDER_SERVER_TEMPLATE_PATH,
+                                            num_threads,
+                                            crop_marker,
+                                            done_marker)
+
+    return _write_script_file(script_file_out, content, mounted_paths)
+
+
+def _write_script_file(script_file_out, content, mounted_paths):
     scripts_dir = get_generated_files_path(mounted_paths)
     if not os.path.isdir(scripts_dir):
         os.mkdir(scripts_dir)
@@ -58,3 +100,39 @@ def _generate_blender_crop_file(template_path, resolution, borders_x, borders_y,
     }
 
     return contents
+
+
+# pylint: disable-msg=too-many-arguments
+def _generate_blender_multicrop_file(template_path, parameters, crops,
+                                     output_dir, num_threads, marker):
+    with open(template_path) as f:
+        contents = f.read()
+
+    contents %= {
+        'resolution_x': parameters['resolution'][0],
+        'resolution_y': parameters['resolution'][1],
+        'use_compositing': parameters['use_compositing'],
+        'samples': parameters['samples'],
+        'output_format': parameters['output_format'].upper(),
+        'frames': list(parameters['frames']),
+        'crops': list(crops),
+        'output_dir': output_dir,
+        'num_threads': num_threads,
+        'marker': marker,
+    }
+
+    return contents
+
+
+def _generate_blender_server_file(template_path, num_threads, crop_marker,
+                                  done_marker):
+    with open(template_path) as f:
+        contents = f.read()
+
+    contents %= {
+        'num_threads': num_threads,
+        'crop_marker': crop_marker,
+        'done_marker': done_marker,
+    }
+
+    return contents
@@ -1,11 +1,33 @@
-from PIL import Image, ImageFilter
+import cv2
 import numpy
+from .rgbimage import RGBImage
 from .skimage import compare_mse
 
 
 import sys
 
 
+# PIL's ImageFilter.FIND_EDGES kernel
+EDGES_KERNEL = numpy.array( [ [ -1, -1, -1 ],
+                              [ -1,  8, -1 ],
+                              [ -1, -1, -1 ] ], dtype=numpy.float32 )
+
+
+## ======================= ##
+##
+def find_edges( pixels ):
+    """ Same as filtering the image with PIL's ImageFilter.FIND_EDGES:
+    the border pixels are copied and images smaller than the kernel are
+    returned unchanged. """
+    edges = pixels.copy()
+    if pixels.shape[ 0 ] < 3 or pixels.shape[ 1 ] < 3:
+        return edges
+
+    filtered = cv2.filter2D( pixels, cv2.CV_16S, EDGES_KERNEL )
+    edges[ 1:-1, 1:-1 ] = numpy.clip( filtered[ 1:-1, 1:-1 ], 0, 255 )
+    return edges
+
+
 ## ======================= ##
 ##
 class MetricEdgeFactor:
@@ -16,14 +38,8 @@ class MetricEdgeFactor:
     @staticmethod
     def compute_metrics( image1, image2 ):
 
-        image1 = image1.convert("RGB")
-        image2 = image2.convert("RGB")
-
-        edged_image1 = image1.filter( ImageFilter.FIND_EDGES )
-        edged_image2 = image2.filter( ImageFilter.FIND_EDGES )
-
-        np_image1 = numpy.array( edged_image1 )
-        np_image2 = numpy.array( edged_image2 )
+        np_image1 = find_edges( numpy.asarray( image1 ) )
+        np_image2 = find_edges( numpy.asarray( image2 ) )
 
         ref_edge_factor = numpy.mean( np_image1 )
         comp_edge_factor = numpy.mean( np_image2 )
@@ -50,8 +66,8 @@ def run():
     first_img = sys.argv[ 1 ]
     second_img = sys.argv[ 2 ]
 
-    first_img = Image.open( first_img )
-    second_img = Image.open( second_img )
+    first_img = RGBImage.from_file( first_img )
+    second_img = RGBImage.from_file( second_img )
 
     ssim = MetricEdgeFactor()
 
@@ -1,18 +1,21 @@
-import cv2
 import numpy
-from PIL import Image
 import sys
 
+from .rgbimage import RGBImage
+
 
 class MetricHistogramsCorrelation:
 
+    # The decision tree was trained on the correlation of 256 bins per
+    # channel histograms, so the bins are kept. Crops occupy a tiny part of
+    # the 256^3 bins and only the occupied ones are stored.
+    NUMBER_OF_BINS = 256 ** 3
+
     @staticmethod
     def compute_metrics( image1, image2):
         if image1.size != image2.size:
             raise Exception("Image sizes differ")
-        opencv_image_1 = cv2.cvtColor(numpy.array(image1), cv2.COLOR_RGB2BGR)
-        opencv_image_2 = cv2.cvtColor(numpy.array(image2), cv2.COLOR_RGB2BGR)
-        return {"histograms_correlation": MetricHistogramsCorrelation.compare_histograms(opencv_image_1, opencv_image_2)}
+        return {"histograms_correlation": MetricHistogramsCorrelation.compare_histograms(numpy.asarray(image1), numpy.asarray(image2))}
 
     @staticmethod
     def get_labels():
@@ -25,27 +28,52 @@ class MetricHistogramsCorrelation:
 
     @staticmethod
     def calculate_normalized_histogram(image):
-        number_of_bins = 256
-        channels_number = 3 # because of conversion from PIL to opencv
-        histogram = cv2.calcHist([image],
-                                 range(channels_number),
-                                 None,
-                                 [number_of_bins] * channels_number,
-                                 [0, 256] * channels_number)
-        cv2.normalize(histogram, histogram, 0, 256, cv2.NORM_MINMAX)
-        return histogram
+        """ Returns the occupied bins of the RGB histogram of the image and
+        their values, normalized to [0, 256] as with cv2.NORM_MINMAX """
+        pixels = image.reshape(-1, 3).astype(numpy.uint32)
+        colors = (pixels[:, 0] << 16) | (pixels[:, 1] << 8) | pixels[:, 2]
+        bins, counts = numpy.unique(colors, return_counts=True)
+        if counts.size == 0:
+            return bins, numpy.zeros(0, dtype=numpy.float32)
+        # the empty bins are the minimum, unless there are none
+        lowest = counts.min() \
+            if bins.size == MetricHistogramsCorrelation.NUMBER_OF_BINS else 0
+        highest = counts.max()
+        scale = 256. / (highest - lowest) if highest > lowest else 0.
+        return bins, ((counts - lowest) * scale).astype(numpy.float32)
 
     @staticmethod
     def compare_histograms(image_a, image_b):
-        histogram_a = MetricHistogramsCorrelation.calculate_normalized_histogram(image_a)
-        histogram_b = MetricHistogramsCorrelation.calculate_normalized_histogram(image_b)
-        result = cv2.compareHist(histogram_a, histogram_b, cv2.HISTCMP_CORREL)
-        return result
+        """ Same as cv2.compareHist(..., cv2.HISTCMP_CORREL) for the dense
+        histograms, the empty bins only contribute to the bin count """
+        bins_a, histogram_a = MetricHistogramsCorrelation.calculate_normalized_histogram(image_a)
+        bins_b, histogram_b = MetricHistogramsCorrelation.calculate_normalized_histogram(image_b)
+        if bins_a.size == 0 or bins_b.size == 0:
+            return 1.
+        histogram_a = histogram_a.astype(numpy.float64)
+        histogram_b = histogram_b.astype(numpy.float64)
+        # the bins are sorted, the bins of a are looked up in the bins of b
+        positions = numpy.searchsorted(bins_b, bins_a)
+        positions[positions == bins_b.size] = 0
+        common = bins_b[positions] == bins_a
+
+        scale = 1. / MetricHistogramsCorrelation.NUMBER_OF_BINS
+        s1 = histogram_a.sum()
+        s2 = histogram_b.sum()
+        s11 = numpy.dot(histogram_a, histogram_a)
+        s22 = numpy.dot(histogram_b, histogram_b)
+        s12 = numpy.dot(histogram_a[common], histogram_b[positions[common]])
+
+        numerator = s12 - s1 * s2 * scale
+        denominator = (s11 - s1 * s1 * scale) * (s22 - s2 * s2 * scale)
+        if abs(denominator) <= numpy.finfo(numpy.float64).eps:
+            return 1.
+        return numerator / numpy.sqrt(denominator)
 
 
 def run():
-    first_img = Image.open(sys.argv[1])
-    second_img = Image.open(sys.argv[2])
+    first_img = RGBImage.from_file(sys.argv[1])
+    second_img = RGBImage.from_file(sys.argv[2])
 
     histograms_correlation_metric = MetricHistogramsCorrelation()
 
@@ -1,26 +1,39 @@
-
 import numpy as np
-from PIL import Image
 import OpenEXR
 
 import Imath
 
-# converting .exr file to .png if user gave .exr file as a rendered scene
-def ConvertEXRToPNG(exrfile, pngfile):
+
+# decoding .exr file straight into a float array if user gave .exr file as a
+# rendered scene
+def read_exr(exrfile) -> np.ndarray:
+    """ Returns the RGB channels of the EXR file as a (height, width, 3)
+    float32 array of linear values. """
     File = OpenEXR.InputFile(exrfile)
-    PixType = Imath.PixelType(Imath.PixelType.FLOAT)
-    DW = File.header()['dataWindow']
-    Size = (DW.max.x - DW.min.x + 1, DW.max.y - DW.min.y + 1)
-    rgb = [np.frombuffer(File.channel(c, PixType), dtype=np.float32) for c in
-           'RGB']
-    for i in range(3):
-        rgb[i] = np.where(rgb[i] <= 0.0031308,
-                          (rgb[i] * 12.92) * 255.0,
-                          (1.055 * (rgb[i] ** (1.0 / 2.4)) - 0.055) * 255.0)
-    rgb8 = [Image.frombytes("F", Size, c.tostring()).convert("L") for c in rgb]
-    Image.merge("RGB", rgb8).save(pngfile, "PNG")
+    try:
+        if 'RenderLayer.Combined.R' in File.header()['channels']:
+            raise ValueError("There is no support for OpenEXR multilayer")
+        PixType = Imath.PixelType(Imath.PixelType.FLOAT)
+        DW = File.header()['dataWindow']
+        width = DW.max.x - DW.min.x + 1
+        height = DW.max.y - DW.min.y + 1
+        return np.stack([
+            np.frombuffer(File.channel(c, PixType), dtype=np.float32)
+            .reshape(height, width)
+            for c in 'RGB'
+        ], axis=-1)
+    finally:
+        File.close()
+
 
-# converting .tga file to .png if user gave .tga file as a rendered scene
-def ConvertTGAToPNG(tgafile, pngfile):
-    img = Image.open(tgafile)
-    img.save(pngfile)
+def linear_to_srgb8(rgb: np.ndarray) -> np.ndarray:
+    """ Applies the sRGB curve to linear values and quantizes them to uint8
+    the way PIL converts "F" images to "L": clamped to [0, 255] and truncated.
+    """
+    # the power is evaluated also for the negative values, which take the
+    # linear branch anyway
+    with np.errstate(invalid='ignore'):
+        srgb = np.where(rgb <= 0.0031308,
+                        (rgb * 12.92) * 255.0,
+                        (1.055 * (rgb ** (1.0 / 2.4)) - 0.055) * 255.0)
+    return np.clip(srgb, 0, 255).astype(np.uint8)
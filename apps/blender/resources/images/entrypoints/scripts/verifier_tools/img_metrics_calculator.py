@@ -1,15 +1,13 @@
+import functools
 import itertools
 import os
 import sys
 from pathlib import Path
-from typing import Dict
-
-import OpenEXR
-from PIL import Image
+from typing import Dict, Union
 
 from . import decision_tree
-from .img_format_converter import ConvertTGAToPNG, ConvertEXRToPNG
 from .imgmetrics import ImgMetrics
+from .rgbimage import RGBImage
 
 CROP_NAME = "scene_crop.png"
 VERIFICATION_SUCCESS = "TRUE"
@@ -26,8 +24,8 @@ def calculate_metrics(reference_img_path,
     """
     This is the entry point for calculation of metrics between the
     rendered_scene and the sample(cropped_img) generated for comparison.
-    :param reference_img_path:
-    :param result_img_path:
+    :param reference_img_path: path or already decoded RGBImage
+    :param result_img_path: path or already decoded RGBImage
     :param xres: x position of crop (left, top)
     :param yres: y position of crop (left, top)
     :param metrics_output_filename:
@@ -89,6 +87,9 @@ def calculate_metrics(reference_img_path,
     return path_to_metrics
 
 
+# The classifier is read once per process, a verification worker reuses it
+# for every job
+@functools.lru_cache(maxsize=None)
 def load_classifier():
     data = decision_tree.DecisionTree.load(TREE_PATH)
     return data[0], data[1]
@@ -111,37 +112,23 @@ def _load_and_prepare_images_for_comparison(reference_img_path,
     This function prepares (i.e. crops) the rendered_scene so that it will
     fit the sample(cropped_img) generated for comparison.
 
-    :param reference_img_path:
-    :param result_img_path:
+    :param reference_img_path: path or already decoded RGBImage
+    :param result_img_path: path or already decoded RGBImage
     :param xres: x position of crop (left, top)
     :param yres: y position of crop (left, top)
     :return:
     """
-    rendered_scene = convert_to_png_if_needed(result_img_path)
-    reference_img = convert_to_png_if_needed(reference_img_path)
+    rendered_scene = load_image(result_img_path)
+    reference_img = load_image(reference_img_path)
     (crop_width, crop_height) = reference_img.size
     crops = get_crops(rendered_scene, xres, yres, crop_width, crop_height)
     return reference_img, crops, rendered_scene
 
 
-def get_file_extension_lowercase(file_path):
-    return os.path.splitext(file_path)[1][1:].lower()
-
-
-def convert_to_png_if_needed(img_path):
-    extension = get_file_extension_lowercase(img_path)
-    name = os.path.basename(img_path)
-    file_name = os.path.join("/tmp/", name)
-    if extension == "exr":
-        channels = OpenEXR.InputFile(img_path).header()['channels']
-        if 'RenderLayer.Combined.R' in channels:
-            sys.exit("There is no support for OpenEXR multilayer")
-        ConvertEXRToPNG(img_path, file_name)
-    elif extension == "tga":
-        ConvertTGAToPNG(img_path, file_name)
-    else:
-        file_name = img_path
-    return Image.open(file_name)
+def load_image(img: Union[str, RGBImage]) -> RGBImage:
+    if isinstance(img, RGBImage):
+        return img
+    return RGBImage.from_file(img)
 
 
 def get_crops(rendered_scene, x, y, width, height):
@@ -181,7 +168,7 @@ def compare_images(image_a, image_b, metrics) -> Dict:
     :return: ImgMetrics
     """
 
-    """imageA/B are images read by: PIL.Image.open(img.png)"""
+    """imageA/B are images read by: RGBImage.from_file(img.png)"""
     (crop_height, crop_width) = image_a.size
     crop_resolution = str(crop_height) + "x" + str(crop_width)
 
@@ -1,6 +1,9 @@
-from PIL import Image
 import sys
 
+import numpy
+
+from .rgbimage import RGBImage
+
 
 class MetricMassCenterDistance:
 
@@ -30,21 +33,20 @@ class MetricMassCenterDistance:
 
     @staticmethod
     def compute_mass_centers(image):
-        image = image.convert('RGB')
-        pixels = image.load()
+        pixels = numpy.asarray(image)
         width, height = image.size
+        # exact integer sums of the masses of every column and row
+        column_masses = pixels.sum(axis=0, dtype=numpy.int64)
+        row_masses = pixels.sum(axis=1, dtype=numpy.int64)
+        mass_centers_x = numpy.arange(width, dtype=numpy.int64) @ column_masses
+        mass_centers_y = numpy.arange(height, dtype=numpy.int64) @ row_masses
+        total_masses = column_masses.sum(axis=0)
         results = dict()
-        for channel_index in range(len(pixels[0, 0])):
-            mass_center_x = 0
-            mass_center_y = 0
-            total_mass = 0
-            for x in range(width):
-                for y in range(height):
-                    mass = pixels[x, y][channel_index]
-                    mass_center_x += mass * x
-                    mass_center_y += mass * y
-                    total_mass += mass
-                    
+        for channel_index in range(pixels.shape[2]):
+            mass_center_x = int(mass_centers_x[channel_index])
+            mass_center_y = int(mass_centers_y[channel_index])
+            total_mass = int(total_masses[channel_index])
+
             divisor_x = (float(total_mass) * width)
             divisor_y = (float(total_mass) * height)
                
@@ -63,8 +65,8 @@ class MetricMassCenterDistance:
 
 
 def run():
-    first_img = Image.open(sys.argv[1])
-    second_img = Image.open(sys.argv[2])
+    first_img = RGBImage.from_file(sys.argv[1])
+    second_img = RGBImage.from_file(sys.argv[2])
 
     mass_center_distance = MetricMassCenterDistance()
 
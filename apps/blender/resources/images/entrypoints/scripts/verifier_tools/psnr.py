@@ -1,5 +1,6 @@
 import numpy
 import math
+from .rgbimage import RGBImage
 from .skimage import compare_psnr
 
 import sys
@@ -14,11 +15,8 @@ class MetricPSNR:
     @staticmethod
     def compute_metrics( image1, image2 ):
 
-        image1 = image1.convert("RGB")
-        image2 = image2.convert("RGB")
-
-        np_image1 = numpy.array( image1 )
-        np_image2 = numpy.array( image2 )
+        np_image1 = numpy.asarray( image1 )
+        np_image2 = numpy.asarray( image2 )
 
         psnr = compare_psnr( np_image1, np_image2 )
 
@@ -40,8 +38,8 @@ class MetricPSNR:
 ##
 def run():
 
-    first_img = sys.argv[ 1 ]
-    second_img = sys.argv[ 2 ]
+    first_img = RGBImage.from_file( sys.argv[ 1 ] )
+    second_img = RGBImage.from_file( sys.argv[ 2 ] )
 
     psnr = MetricPSNR()
 
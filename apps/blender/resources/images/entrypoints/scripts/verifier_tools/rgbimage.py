@@ -0,0 +1,56 @@
+import os
+from typing import Tuple
+
+import numpy
+from PIL import Image
+
+from .img_format_converter import linear_to_srgb8, read_exr
+
+
+class RGBImage:
+    """ An 8-bit RGB image held in memory as a (height, width, 3) uint8 array.
+
+    Images are decoded once, EXR files are converted to sRGB in memory, and
+    the metrics read the pixels directly with numpy.asarray(image). """
+
+    def __init__(self, pixels: numpy.ndarray) -> None:
+        self.pixels = pixels
+
+    @classmethod
+    def from_file(cls, path: str) -> 'RGBImage':
+        extension = os.path.splitext(path)[1][1:].lower()
+        if extension == "exr":
+            return cls(linear_to_srgb8(read_exr(path)))
+        with Image.open(path) as image:
+            return cls(numpy.array(image.convert("RGB")))
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """ (width, height), as PIL.Image.size """
+        height, width = self.pixels.shape[:2]
+        return width, height
+
+    def crop(self, box) -> 'RGBImage':
+        """ Same as PIL.Image.crop, the area outside of the image is black """
+        left, upper, right, lower = (int(round(v)) for v in box)
+        width, height = self.size
+        pixels = numpy.zeros((max(lower - upper, 0), max(right - left, 0), 3),
+                             dtype=numpy.uint8)
+        src_left, src_upper = max(left, 0), max(upper, 0)
+        src_right, src_lower = min(right, width), min(lower, height)
+        if src_left < src_right and src_upper < src_lower:
+            pixels[src_upper - upper:src_lower - upper,
+                   src_left - left:src_right - left] = \
+                self.pixels[src_upper:src_lower, src_left:src_right]
+        return RGBImage(pixels)
+
+    def to_pil(self) -> Image.Image:
+        return Image.fromarray(self.pixels, "RGB")
+
+    def save(self, path: str) -> None:
+        self.to_pil().save(path)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.pixels
+        return self.pixels.astype(dtype)
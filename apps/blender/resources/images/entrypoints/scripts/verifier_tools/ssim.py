@@ -1,9 +1,58 @@
+import cv2
 import numpy
-from .skimage import compare_ssim
+from .rgbimage import RGBImage
+from .skimage import dtype_range
 
 import sys
 
 
+## ======================= ##
+##
+def compare_ssim_rgb( X, Y, win_size=7, K1=0.01, K2=0.03 ):
+    """ Same as skimage.compare_ssim( X, Y, multichannel=True ) with the
+    uniform window and sample covariance. The windows of every channel are
+    averaged with OpenCV box filters and only the windows which are not
+    cropped before the mean are used. """
+
+    if not X.shape == Y.shape:
+        raise ValueError( "Input images must have the same dimensions." )
+
+    height, width, channels = X.shape
+    if height < win_size or width < win_size:
+        raise ValueError( "win_size exceeds image extent." )
+
+    dmin, dmax = dtype_range[ X.dtype.type ]
+    data_range = dmax - dmin
+    C1 = ( K1 * data_range ) ** 2
+    C2 = ( K2 * data_range ) ** 2
+
+    NP = win_size ** 2
+    cov_norm = NP / ( NP - 1 )
+    pad = ( win_size - 1 ) // 2
+
+    def window_mean( image ):
+        mean = cv2.boxFilter( image, -1, ( win_size, win_size ),
+                              borderType=cv2.BORDER_REFLECT )
+        return mean[ pad:height - pad, pad:width - pad ]
+
+    mssim = numpy.empty( channels )
+    for ch in range( channels ):
+        x = X[ ..., ch ].astype( numpy.float64 )
+        y = Y[ ..., ch ].astype( numpy.float64 )
+
+        ux = window_mean( x )
+        uy = window_mean( y )
+        vx = cov_norm * ( window_mean( x * x ) - ux * ux )
+        vy = cov_norm * ( window_mean( y * y ) - uy * uy )
+        vxy = cov_norm * ( window_mean( x * y ) - ux * uy )
+
+        S = ( ( 2 * ux * uy + C1 ) * ( 2 * vxy + C2 ) ) / \
+            ( ( ux ** 2 + uy ** 2 + C1 ) * ( vx + vy + C2 ) )
+        mssim[ ch ] = S.mean()
+
+    return mssim.mean()
+
+
 ## ======================= ##
 ##
 class MetricSSIM:
@@ -14,13 +63,10 @@ class MetricSSIM:
     @staticmethod
     def compute_metrics( image1, image2 ):
 
-        image1 = image1.convert("RGB")
-        image2 = image2.convert("RGB")
-
-        np_image1 = numpy.array( image1 )
-        np_image2 = numpy.array( image2 )
+        np_image1 = numpy.asarray( image1 )
+        np_image2 = numpy.asarray( image2 )
 
-        structualSim = compare_ssim( np_image1, np_image2, multichannel=True )
+        structualSim = compare_ssim_rgb( np_image1, np_image2 )
 
         result = dict()
         result[ "ssim" ] = structualSim
@@ -37,8 +83,8 @@ class MetricSSIM:
 ##
 def run():
 
-    first_img = sys.argv[ 1 ]
-    second_img = sys.argv[ 2 ]
+    first_img = RGBImage.from_file( sys.argv[ 1 ] )
+    second_img = RGBImage.from_file( sys.argv[ 2 ] )
 
     ssim = MetricSSIM()
 
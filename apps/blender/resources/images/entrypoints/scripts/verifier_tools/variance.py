@@ -1,6 +1,30 @@
+import cv2
 import numpy
 
 
+## ======================= ##
+## Variances of the channels of an uint8 image from exact integer sums of
+## the channel histograms
+def channel_variances( pixels ):
+
+    values = numpy.arange( 256, dtype=numpy.int64 )
+    num = pixels.shape[ 0 ] * pixels.shape[ 1 ]
+
+    variances = list()
+    for ch in range( pixels.shape[ 2 ] ):
+        # OpenCV counts in float32, which is exact up to 2^24 pixels
+        if num <= 2 ** 24:
+            histogram = cv2.calcHist( [ pixels ], [ ch ], None, [ 256 ], [ 0, 256 ] )
+            counts = histogram.ravel().astype( numpy.int64 )
+        else:
+            counts = numpy.bincount( pixels[ ..., ch ].ravel(), minlength=256 )
+        suma = int( counts.dot( values ) )
+        suma_sq = int( counts.dot( values * values ) )
+        variances.append( ( num * suma_sq - suma * suma ) / ( num * num ) )
+
+    return variances
+
+
 ## ======================= ##
 ##
 class ImageVariance:
@@ -11,14 +35,11 @@ class ImageVariance:
     @staticmethod
     def compute_metrics( image1, image2 ):
 
-        image1 = image1.convert("RGB")
-        image2 = image2.convert("RGB")
-        
-        np_image1 = numpy.array( image1 )
-        np_image2 = numpy.array( image2 )
+        np_image1 = numpy.asarray( image1 )
+        np_image2 = numpy.asarray( image2 )
         
-        reference_variance = numpy.var( np_image1, axis=( 0, 1 ) )
-        image_variance = numpy.var( np_image2, axis=( 0, 1 ) )
+        reference_variance = channel_variances( np_image1 )
+        image_variance = channel_variances( np_image2 )
         
         reference_variance = reference_variance[ 0 ] + reference_variance[ 1 ] + reference_variance[ 2 ]
         image_variance = image_variance[ 0 ] + image_variance[ 1 ] + image_variance[ 2 ]
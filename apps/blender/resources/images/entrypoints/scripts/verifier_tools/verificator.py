@@ -5,6 +5,7 @@ from ..render_tools import blender_render as blender
 from .crop_generator import WORK_DIR, OUTPUT_DIR, SubImage, Region, PixelRegion, \
     generate_single_random_crop_data, Crop
 from .img_metrics_calculator import calculate_metrics
+from .rgbimage import RGBImage
 
 def get_crop_with_id(id: int, crops: [List[Crop]]) -> Optional[Crop]:
     for crop in crops:
@@ -65,36 +66,48 @@ def prepare_params(mounted_paths, subtask_border, scene_file_path, resolution, s
     return crops, params
 
 
-def make_verdict( subtask_file_paths, crops, results ):
-    verdict = True
+def verify_crop(subtasks, crops, crop_data,
+                output_dir=OUTPUT_DIR) -> bool:
+    # subtasks - paths or decoded RGBImages of the subtask results
+    crop = get_crop_with_id(crop_data['crop']['id'], crops)
 
-    for crop_data in results:
-        crop = get_crop_with_id(crop_data['crop']['id'], crops)
+    left, top = crop.get_relative_top_left()
 
-        left, top = crop.get_relative_top_left()
+    print("left " + str(left))
+    print("top " + str(top))
 
-        print("left " + str(left))
-        print("top " + str(top))
+    verdict = True
+    for crop, subtask in zip(crop_data['results'], subtasks):
+        crop_path = os.path.join(output_dir, crop)
+        results_path = calculate_metrics(crop_path,
+                            subtask,
+                            left, top,
+                            metrics_output_filename=os.path.join(output_dir, crop_data['crop']['outfilebasename'] + "metrics.txt"))
+
+        with open(results_path, 'r') as f:
+            data = json.load(f)
+        if data['Label'] != "TRUE":
+            verdict = False
+    return verdict
+
+
+def save_verdict(verdict, output_dir=OUTPUT_DIR):
+    with open(os.path.join(output_dir, 'verdict.json'), 'w') as f:
+        json.dump({'verdict': verdict}, f)
 
-        for crop, subtask in zip(crop_data['results'], subtask_file_paths):
-            crop_path = os.path.join(OUTPUT_DIR, crop)
-            results_path = calculate_metrics(crop_path,
-                                subtask,
-                                left, top,
-                                metrics_output_filename=os.path.join(OUTPUT_DIR, crop_data['crop']['outfilebasename'] + "metrics.txt"))
 
-            with open(results_path, 'r') as f:
-                data = json.load(f)
-            if data['Label'] != "TRUE":
-                verdict = False
+def make_verdict( subtask_file_paths, crops, results ):
+    verdict = True
 
-    with open(os.path.join(OUTPUT_DIR, 'verdict.json'), 'w') as f:
-        json.dump({'verdict': verdict}, f)
+    for crop_data in results:
+        if not verify_crop(subtask_file_paths, crops, crop_data):
+            verdict = False
 
+    save_verdict(verdict)
 
 
 def verify(subtask_file_paths, subtask_border, scene_file_path, resolution, samples, frames, output_format, basefilename,
-           crops_count=3, crops_borders=None):
+           crops_count=3, crops_borders=None, output_dir=OUTPUT_DIR, blender_server=None) -> bool:
 
     """ Function will verifiy image with crops rendered from given blender scene file.
 
@@ -111,18 +124,41 @@ def verify(subtask_file_paths, subtask_border, scene_file_path, resolution, samp
     work_dir - work
     crops_borders - list of [left, top, right, bottom] float decimal values list, representing crops borders
                     those will be used instead of random crops, if present.
+    output_dir - directory for the rendered crops, metrics and the verdict
+    blender_server - render_tools.blender_render.BlenderServer with the scene already loaded,
+                    a new Blender process is started for the crops if not given
+
+    Returns the verdict, which is also saved to verdict.json in output_dir.
 
     """
     mounted_paths = dict()
     mounted_paths["WORK_DIR"] = WORK_DIR
-    mounted_paths["OUTPUT_DIR"] = OUTPUT_DIR
+    mounted_paths["OUTPUT_DIR"] = output_dir
 
     crops, params = prepare_params(mounted_paths, subtask_border, scene_file_path,
                                     resolution, samples, frames, output_format,
                                     basefilename, crops_count, crops_borders)
 
-    results = blender.render(params, mounted_paths)
+    # Results are decoded once and compared in memory with every crop.
+    subtask_images = [RGBImage.from_file(path) for path in subtask_file_paths]
+
+    # All crops are rendered by a single Blender process, metrics for each
+    # crop are calculated as soon as it is ready.
+    verdicts = []
+
+    def on_crop_rendered(crop_data):
+        verdicts.append(
+            verify_crop(subtask_images, crops, crop_data, output_dir))
+
+    if blender_server is not None:
+        results = blender_server.render_crops(params, output_dir,
+                                              on_crop_rendered)
+    else:
+        results = blender.render_crops(params, mounted_paths,
+                                       on_crop_rendered)
 
     print(results)
 
-    make_verdict( subtask_file_paths, crops, results )
+    verdict = all(verdicts) and len(verdicts) == len(results)
+    save_verdict(verdict, output_dir)
+    return verdict
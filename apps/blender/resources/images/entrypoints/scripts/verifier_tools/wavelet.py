@@ -1,17 +1,23 @@
 import pywt
 import numpy
-from PIL import Image
+
+from .rgbimage import RGBImage
 
 import sys
 
 def calculate_sum( coeff ):
-    return sum( sum( coeff ** 2 ) )
+    return numpy.vdot( coeff, coeff )
 
 def calculate_size( coeff ):
     shape = coeff.shape
     return shape[ 0 ] * shape[ 1 ]
 
-def calculate_mse( coeff1, coeff2, low, high ):
+## ======================= ##
+## The transform is linear, so the MSE of the coefficients of two images is
+## calculated from the coefficients of their difference. Coefficients of
+## every channel can be stacked on the first axis, see decompose(), the
+## results of the channels are summed.
+def calculate_mse( coeff_diff, low, high, channels=1 ):
     if low == high:
         if low == 0:
             high = low + 1
@@ -20,14 +26,14 @@ def calculate_mse( coeff1, coeff2, low, high ):
     suma = 0
     num = 0
     for i in range( low, high ):
-        if type( coeff1[ i ] ) is tuple:
-            suma += calculate_sum( coeff1[ i ][ 0 ] - coeff2[ i ][ 0 ] )
-            suma += calculate_sum( coeff1[ i ][ 1 ] - coeff2[ i ][ 1 ] )
-            suma += calculate_sum( coeff1[ i ][ 2 ] - coeff2[ i ][ 2 ] )
-            num += 3 * coeff1[ i ][ 0 ].size
+        if type( coeff_diff[ i ] ) is tuple:
+            suma += calculate_sum( coeff_diff[ i ][ 0 ] )
+            suma += calculate_sum( coeff_diff[ i ][ 1 ] )
+            suma += calculate_sum( coeff_diff[ i ][ 2 ] )
+            num += 3 * coeff_diff[ i ][ 0 ].size // channels
         else:
-            suma += calculate_sum(coeff1[i] - coeff2[i] )
-            num += coeff1[ i ].size
+            suma += calculate_sum( coeff_diff[ i ] )
+            num += coeff_diff[ i ].size // channels
     if( num == 0 ):
         return 0
     else:
@@ -35,7 +41,14 @@ def calculate_mse( coeff1, coeff2, low, high ):
 
 ## ======================= ##
 ##
-def calculate_frequencies( coeff1, coeff2 ):
+def subtract_coeffs( coeff1, coeff2 ):
+    return [ tuple( c1 - c2 for c1, c2 in zip( level1, level2 ) )
+             if type( level1 ) is tuple else level1 - level2
+             for level1, level2 in zip( coeff1, coeff2 ) ]
+
+## ======================= ##
+##
+def calculate_frequencies( coeff1, coeff2, channels=1 ):
 
     num_levels = len( coeff1 )
     start_level = num_levels - 3
@@ -43,19 +56,39 @@ def calculate_frequencies( coeff1, coeff2 ):
     freq_list = list()
     
     for i in range( start_level, num_levels ):
-        
-        abs_coeff1 = numpy.absolute( coeff1[ i ] )
-        abs_coeff2 = numpy.absolute( coeff2[ i ] )
-        
-        sum_coeffs1 = sum( sum( sum( abs_coeff1 ) ) )
-        sum_coeffs2 = sum( sum( sum( abs_coeff2 ) ) )
-        
-        diff = numpy.absolute( sum_coeffs2 - sum_coeffs1 ) / ( 3 * coeff1[ i ][ 0 ].size )
+
+        # sums of the three detail coefficients of every channel
+        sum_coeffs1 = sum( numpy.absolute( c ).sum( axis=( -2, -1 ) ) for c in coeff1[ i ] )
+        sum_coeffs2 = sum( numpy.absolute( c ).sum( axis=( -2, -1 ) ) for c in coeff2[ i ] )
+
+        size = coeff1[ i ][ 0 ].size // channels
+        diff = numpy.sum( numpy.absolute( sum_coeffs2 - sum_coeffs1 ) ) / ( 3 * size )
         
         freq_list = [ diff ] + freq_list
     
 
     return freq_list
+
+## ======================= ##
+## Decomposes all channels of the (height, width, channels) image at once,
+## the coefficients of the channels are stacked on the first axis
+def decompose( np_image, wavelet ):
+    planes = numpy.moveaxis( np_image, -1, 0 )
+    planes = numpy.ascontiguousarray( planes, dtype=numpy.float64 )
+    return pywt.wavedec2( planes, wavelet )
+
+## ======================= ##
+##
+def add_band_mse( result, name, coeff_diff, channels ):
+
+    len_total = len( coeff_diff ) - 1
+    len_div_3 = int( len_total / 3 )
+    len_two_thirds = int( len_total * 2 / 3 )
+
+    result[ name + "_base" ] = calculate_mse( coeff_diff, 0, 1, channels )
+    result[ name + "_low" ] = calculate_mse( coeff_diff, 1, 1 + len_div_3, channels )
+    result[ name + "_mid" ] = calculate_mse( coeff_diff, 1 + len_div_3, 1 + len_two_thirds, channels )
+    result[ name + "_high" ] = calculate_mse( coeff_diff, 1 + len_two_thirds, 1 + len_total, channels )
         
         
 ## ======================= ##
@@ -67,79 +100,28 @@ class MetricWavelet:
     @staticmethod
     def compute_metrics( image1, image2):
 
-        image1 = image1.convert("RGB")
-        image2 = image2.convert("RGB")
-
-        np_image1 = numpy.array(image1)
-        np_image2 = numpy.array(image2)
+        np_image1 = numpy.asarray(image1)
+        np_image2 = numpy.asarray(image2)
+        np_diff = np_image1.astype( numpy.float64 ) - np_image2
+        channels = np_image1.shape[ 2 ]
 
         result = dict()
-        result["wavelet_db4_base"] = 0
-        result["wavelet_db4_low"] = 0
-        result["wavelet_db4_mid"] = 0
-        result["wavelet_db4_high"] = 0
-
-        for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "db4" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "db4" )
-
-            len_total = len( coeff1 ) - 1
-            len_div_3 = int( len_total / 3 )
-            len_two_thirds = int( len_total * 2 / 3 )
-
-            result[ "wavelet_db4_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
-            result[ "wavelet_db4_low" ] = result[ "wavelet_db4_low" ] + calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
-            result[ "wavelet_db4_mid" ] = result[ "wavelet_db4_mid" ] + calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
-            result[ "wavelet_db4_high" ] = result[ "wavelet_db4_high" ] + calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
-
-        #
-        result["wavelet_sym2_base"] = 0
-        result["wavelet_sym2_low"] = 0
-        result["wavelet_sym2_mid"] = 0
-        result["wavelet_sym2_high"] = 0
-
-        for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "sym2" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "sym2" )
-
-            len_total = len( coeff1 ) - 1
-            len_div_3 = int( len_total / 3 )
-            len_two_thirds = int( len_total * 2 / 3 )
-
-            result[ "wavelet_sym2_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
-            result[ "wavelet_sym2_low" ] = result[ "wavelet_sym2_low" ] + calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
-            result[ "wavelet_sym2_mid" ] = result[ "wavelet_sym2_mid" ] + calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
-            result[ "wavelet_sym2_high" ] = result[ "wavelet_sym2_high" ] + calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
-            
-            
+
+        for wavelet in [ "db4", "sym2" ]:
+            coeff_diff = decompose( np_diff, wavelet )
+            add_band_mse( result, "wavelet_" + wavelet, coeff_diff, channels )
+
         # Frequency metrics based on haar wavlets
-        result[ "wavelet_haar_freq_x1" ] = 0
-        result[ "wavelet_haar_freq_x2" ] = 0
-        result[ "wavelet_haar_freq_x3" ] = 0
-
-        result["wavelet_haar_base"] = 0
-        result["wavelet_haar_low"] = 0
-        result["wavelet_haar_mid"] = 0
-        result["wavelet_haar_high"] = 0
-
-        for i in range(0,3):
-            coeff1 = pywt.wavedec2( np_image1[...,i], "haar" )
-            coeff2 = pywt.wavedec2( np_image2[...,i], "haar" )  
-            
-            freqs = calculate_frequencies( coeff1, coeff2 )
-            
-            result[ "wavelet_haar_freq_x1" ] = result[ "wavelet_haar_freq_x1" ] + freqs[ 0 ]
-            result[ "wavelet_haar_freq_x2" ] = result[ "wavelet_haar_freq_x2" ] + freqs[ 1 ]
-            result[ "wavelet_haar_freq_x3" ] = result[ "wavelet_haar_freq_x3" ] + freqs[ 2 ]
-
-            len_total = len( coeff1 ) - 1
-            len_div_3 = int( len_total / 3 )
-            len_two_thirds = int( len_total * 2 / 3 )
-
-            result[ "wavelet_haar_base" ] += calculate_mse( coeff1, coeff2, 0, 1 )
-            result[ "wavelet_haar_low" ] += calculate_mse( coeff1, coeff2, 1, 1 + len_div_3 )
-            result[ "wavelet_haar_mid" ] += calculate_mse( coeff1, coeff2, 1 + len_div_3, 1 + len_two_thirds )
-            result[ "wavelet_haar_high" ] += calculate_mse( coeff1, coeff2, 1 + len_two_thirds, 1 + len_total )
+        coeff1 = decompose( np_image1, "haar" )
+        coeff2 = decompose( np_image2, "haar" )
+
+        freqs = calculate_frequencies( coeff1, coeff2, channels )
+
+        result[ "wavelet_haar_freq_x1" ] = freqs[ 0 ]
+        result[ "wavelet_haar_freq_x2" ] = freqs[ 1 ]
+        result[ "wavelet_haar_freq_x3" ] = freqs[ 2 ]
+
+        add_band_mse( result, "wavelet_haar", subtract_coeffs( coeff1, coeff2 ), channels )
 
         return result
 
@@ -153,8 +135,8 @@ class MetricWavelet:
 ## ======================= ##
 ##
 def run():
-    first_img = Image.open( sys.argv[1] )
-    second_img = Image.open( sys.argv[2] )
+    first_img = RGBImage.from_file( sys.argv[1] )
+    second_img = RGBImage.from_file( sys.argv[2] )
 
     ssim = MetricWavelet()
 
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Optional, Tuple
+
+from ..render_tools.blender_render import BlenderServer
+from .crop_generator import WORK_DIR
+from .verificator import verify
+
+# Spool directory layout, shared with golem.verificator.blender_worker:
+#   jobs/<job_id>.json      job parameters, written by Golem
+#   running/<job_id>.json   the job claimed by a worker
+#   results/<job_id>.json   {"verdict": bool, "error": str or null}
+#   <job_id>/               results of the subtask, the crops are rendered
+#                           to <job_id>/output
+#   stop                    asks the workers to exit
+JOBS_DIR = 'jobs'
+RUNNING_DIR = 'running'
+RESULTS_DIR = 'results'
+STOP_FILE = 'stop'
+
+POLL_INTERVAL = 0.2
+
+
+def claim_job(spool_dir: str) -> Optional[Tuple[str, dict]]:
+    """ Takes the oldest job from the spool. Jobs are claimed by moving them
+    to the running dir, so a job is run by one worker only, even if there
+    are more workers using the same spool. """
+    jobs_dir = os.path.join(spool_dir, JOBS_DIR)
+    try:
+        names = [name for name in os.listdir(jobs_dir)
+                 if name.endswith('.json')]
+    except FileNotFoundError:
+        return None
+
+    paths = [os.path.join(jobs_dir, name) for name in names]
+    for path in sorted(paths, key=_get_mtime):
+        job_id = os.path.splitext(os.path.basename(path))[0]
+        running_path = os.path.join(spool_dir, RUNNING_DIR,
+                                    os.path.basename(path))
+        try:
+            os.rename(path, running_path)
+        except FileNotFoundError:
+            continue  # claimed by another worker
+        with open(running_path, 'r') as f:
+            return job_id, json.load(f)
+    return None
+
+
+def finish_job(spool_dir: str, job_id: str, verdict: bool,
+               error: Optional[str] = None) -> None:
+    """ Writes the result of the job. The file is replaced atomically, so
+    Golem never reads a partially written result. """
+    result_path = os.path.join(spool_dir, RESULTS_DIR, job_id + '.json')
+    with open(result_path + '.tmp', 'w') as f:
+        json.dump({'verdict': verdict, 'error': error}, f)
+    os.replace(result_path + '.tmp', result_path)
+    try:
+        os.remove(os.path.join(spool_dir, RUNNING_DIR, job_id + '.json'))
+    except FileNotFoundError:
+        pass
+
+
+def run_job(spool_dir: str, job_id: str, params: dict,
+            blender_server: BlenderServer) -> bool:
+    output_dir = os.path.join(spool_dir, job_id, 'output')
+    os.makedirs(output_dir, exist_ok=True)
+    return verify(
+        params['subtask_paths'],
+        params['subtask_borders'],
+        params['scene_path'],
+        params['resolution'],
+        params['samples'],
+        params['frames'],
+        params['output_format'],
+        params['basefilename'],
+        output_dir=output_dir,
+        blender_server=blender_server,
+    )
+
+
+def serve(idle_timeout: float, spool_dir: str = WORK_DIR) -> None:
+    """ Runs the jobs from the spool until there are none for
+    `idle_timeout` seconds or Golem asks to stop. The scene stays loaded in
+    the Blender server and the verifier modules and the classifier stay in
+    memory between the jobs. """
+    for name in (JOBS_DIR, RUNNING_DIR, RESULTS_DIR):
+        os.makedirs(os.path.join(spool_dir, name), exist_ok=True)
+
+    blender_server = BlenderServer({
+        'WORK_DIR': spool_dir,
+        'OUTPUT_DIR': spool_dir,
+    })
+    last_job = time.time()
+    try:
+        while not os.path.exists(os.path.join(spool_dir, STOP_FILE)):
+            job = claim_job(spool_dir)
+            if job is None:
+                if time.time() - last_job > idle_timeout:
+                    print("Idle for {}s, exiting".format(idle_timeout))
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            job_id, params = job
+            print("Verifying job {}".format(job_id))
+            try:
+                verdict = run_job(spool_dir, job_id, params, blender_server)
+            except Exception:  # pylint: disable=broad-except
+                traceback.print_exc()
+                finish_job(spool_dir, job_id, False,
+                           traceback.format_exc(limit=1))
+            else:
+                finish_job(spool_dir, job_id, verdict)
+            sys.stdout.flush()
+            last_job = time.time()
+    finally:
+        blender_server.close()
+
+
+def _get_mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.
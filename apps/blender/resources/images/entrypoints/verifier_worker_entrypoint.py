@@ -0,0 +1,8 @@
+import json
+
+from scripts.verifier_tools.worker import serve
+
+with open('params.json', 'r') as params_file:
+    params = json.load(params_file)
+
+serve(params['idle_timeout'])
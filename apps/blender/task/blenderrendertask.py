@@ -6,7 +6,7 @@ import random
 import time
 from collections import OrderedDict
 from copy import copy
-from typing import Optional, Type
+from typing import Dict, Optional, Tuple, Type
 
 import apps.blender.resources.blenderloganalyser as log_analyser
 from apps.blender.blenderenvironment import BlenderEnvironment, \
@@ -18,6 +18,7 @@ from apps.rendering.resources.renderingtaskcollector import \
 from apps.rendering.resources.utils import handle_opencv_image_error
 from apps.rendering.task.framerenderingtask import FrameRenderingTask, \
     FrameRenderingTaskBuilder, FrameRendererOptions
+from apps.rendering.task.partitioning import AdaptivePartitioner
 from apps.rendering.task.renderingtask import PREVIEW_EXT, PREVIEW_X, \
     PREVIEW_Y
 from apps.rendering.task.renderingtaskstate import RenderingTaskDefinition, \
@@ -29,6 +30,7 @@ from golem.resource.dirmanager import DirManager
 from golem.task.taskbase import TaskPurpose, TaskTypeInfo
 from golem.task.taskstate import SubtaskStatus, TaskStatus
 from golem.verificator.blender_verifier import BlenderVerifier
+from golem.verificator.blender_worker import BlenderWorkerRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,8 @@ class PreviewUpdater(object):
         # pairs of (subtask_number, its_image_filepath)
         # careful: chunks' numbers start from 1
         self.chunks = {}
+        # number of the last chunk covered by a (merged) chunk
+        self.chunk_ends = {}
         self.preview_res_x = preview_res_x
         self.preview_res_y = preview_res_y
         self.preview_file_path = preview_file_path
@@ -64,12 +68,21 @@ class PreviewUpdater(object):
         self.perfect_match_area_y = 0
         self.perfectly_placed_subtasks = 0
 
+    def __setstate__(self, state):
+        self.__dict__ = state
+        # Pickled before merged chunks were added, each covers a single part
+        if 'chunk_ends' not in state:
+            self.chunk_ends = {number: number for number in self.chunks}
+
     def get_offset(self, subtask_number):
         return self.expected_offsets.get(subtask_number, self.preview_res_y)
 
-    def update_preview(self, subtask_path, subtask_number):
+    def update_preview(self, subtask_path, subtask_number, last_number=None):
+        if last_number is None:
+            last_number = subtask_number
         if subtask_number not in self.chunks:
             self.chunks[subtask_number] = subtask_path
+            self.chunk_ends[subtask_number] = last_number
 
         with handle_opencv_image_error(logger) as handler_result:
 
@@ -78,9 +91,9 @@ class PreviewUpdater(object):
             offset = self.get_offset(subtask_number)
             if subtask_number == self.perfectly_placed_subtasks + 1:
                 self.perfect_match_area_y += subtask_img.get_height()
-                self.perfectly_placed_subtasks += 1
+                self.perfectly_placed_subtasks = last_number
 
-            chunk_height = self._get_height(subtask_number)
+            chunk_height = self._get_height(subtask_number, last_number)
 
             subtask_img_resized = subtask_img.resize(self.preview_res_x,
                                                      chunk_height)
@@ -104,13 +117,15 @@ class PreviewUpdater(object):
         if not handler_result.success:
             return
 
-        if subtask_number == self.perfectly_placed_subtasks and \
-                (subtask_number + 1) in self.chunks:
-            self.update_preview(self.chunks[subtask_number + 1],
-                                subtask_number + 1)
+        if last_number == self.perfectly_placed_subtasks and \
+                (last_number + 1) in self.chunks:
+            self.update_preview(self.chunks[last_number + 1],
+                                last_number + 1,
+                                self.chunk_ends[last_number + 1])
 
     def restart(self):
         self.chunks = {}
+        self.chunk_ends = {}
         self.perfect_match_area_y = 0
         self.perfectly_placed_subtasks = 0
         if os.path.exists(self.preview_file_path):
@@ -118,9 +133,11 @@ class PreviewUpdater(object):
                 OpenCVImgRepr.empty(self.preview_res_x, self.preview_res_y)\
                     .save_with_extension(self.preview_file_path, PREVIEW_EXT)
 
-    def _get_height(self, subtask_number):
+    def _get_height(self, subtask_number, last_number=None):
+        if last_number is None:
+            last_number = subtask_number
         next_offset = \
-            self.expected_offsets.get(subtask_number + 1, self.preview_res_y)
+            self.expected_offsets.get(last_number + 1, self.preview_res_y)
         return next_offset - self.expected_offsets.get(subtask_number)
 
 
@@ -174,6 +191,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         :return list: list of pixels that belong to a subtask border
         """
         start_task = subtask.extra_data['start_task']
+        end_task = subtask.extra_data.get('end_task', start_task)
         frames = len(definition.options.frames)
         res_x, res_y = definition.resolution
 
@@ -183,7 +201,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
             method = cls.__get_border
 
         if not definition.options.use_frames:
-            return method(start_task, subtasks_count, res_x, res_y)
+            return method(start_task, subtasks_count, res_x, res_y, end_task)
         elif subtasks_count <= frames:
             if not as_path:
                 return []
@@ -199,7 +217,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
                       parts, res_x, res_y)
 
     @classmethod
-    def __get_border(cls, start, parts, res_x, res_y):
+    def __get_border(cls, start, parts, res_x, res_y, end=None):
         """
         Return list of pixels that should be marked as a border of subtasks
         with numbers between start and end.
@@ -207,8 +225,11 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         :param int parts: number of parts for single frame
         :param int res_x: image resolution width
         :param int res_y: image resolution height
+        :param int end: number of last subtask, defaults to start
         :return list: list of pixels that belong to a subtask border
         """
+        if end is None:
+            end = start
         border = []
         if res_x == 0 or res_y == 0:
             return border
@@ -217,7 +238,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         x = int(math.floor(res_x * scale_factor))
 
         upper = offsets[start]
-        lower = offsets[start + 1]
+        lower = offsets[end + 1]
         for i in range(upper, lower):
             border.append((0, i))
             border.append((x, i))
@@ -227,7 +248,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         return border
 
     @classmethod
-    def __get_border_path(cls, start, parts, res_x, res_y):
+    def __get_border_path(cls, start, parts, res_x, res_y, end=None):
         """
         Return list of points that make a border of subtasks with numbers
         between start and end.
@@ -235,8 +256,11 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
         :param int parts: number of parts for single frame
         :param int res_x: image resolution width
         :param int res_y: image resolution height
+        :param int end: number of last subtask, defaults to start
         :return list: list of pixels that belong to a subtask border
         """
+        if end is None:
+            end = start
         if res_x == 0 or res_y == 0:
             return []
 
@@ -245,7 +269,7 @@ class RenderingTaskTypeInfo(CoreTaskTypeInfo):
 
         x = int(math.floor(res_x * scale_factor))
         upper = offsets[start]
-        lower = max(0, offsets[start + 1] - 1)
+        lower = max(0, offsets[end + 1] - 1)
 
         return [(0, upper), (x, upper),
                 (x, lower), (0, lower)]
@@ -291,6 +315,9 @@ class BlenderRendererOptions(FrameRendererOptions):
         self.environment = BlenderEnvironment()
         self.compositing = False
         self.samples = 0
+        # Size subtasks according to providers' performance. Only used when
+        # not rendering separate frames.
+        self.adaptive_partitioning = False
 
 
 class BlenderNVGPURendererOptions(BlenderRendererOptions):
@@ -302,8 +329,10 @@ class BlenderNVGPURendererOptions(BlenderRendererOptions):
 
 class BlenderRenderTask(FrameRenderingTask):
     ENVIRONMENT_CLASS: Type[BlenderEnvironment] = BlenderEnvironment
-    VERIFIER_CLASS = functools.partial(BlenderVerifier,
-                                       docker_task_cls=DockerTaskThread)
+    VERIFIER_CLASS = functools.partial(
+        BlenderVerifier,
+        docker_task_cls=DockerTaskThread,
+        worker_registry=BlenderWorkerRegistry(DockerTaskThread))
 
     BLENDER_MIN_BOX = [8, 8]
     BLENDER_MIN_SAMPLE = 5
@@ -321,6 +350,22 @@ class BlenderRenderTask(FrameRenderingTask):
         self.compositing = False
         self.samples = task_definition.options.samples
 
+        self.partitioner: Optional[AdaptivePartitioner] = None
+        # start part number -> end part number of merged subtasks
+        self.parts_ranges: Dict[int, int] = {}
+        if getattr(task_definition.options, 'adaptive_partitioning', False) \
+                and not self.use_frames:
+            self.partitioner = AdaptivePartitioner(
+                total_parts=self.total_tasks,
+                subtask_timeout=self.header.subtask_timeout,
+                deadline=self.header.deadline)
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Tasks pickled before adaptive partitioning was added
+        self.__dict__.setdefault('partitioner', None)
+        self.__dict__.setdefault('parts_ranges', {})
+
     def initialize(self, dir_manager):
         super(BlenderRenderTask, self).initialize(dir_manager)
 
@@ -362,7 +407,7 @@ class BlenderRenderTask(FrameRenderingTask):
                          node_name: Optional[str] = None) \
             -> FrameRenderingTask.ExtraData:
 
-        start_task = self._get_next_task()
+        start_task, end_task = self._get_next_parts(perf_index)
         scene_file = self._get_scene_file_rel_path()
 
         if self.use_frames:
@@ -373,7 +418,8 @@ class BlenderRenderTask(FrameRenderingTask):
             parts = 1
 
         if not self.use_frames:
-            min_y, max_y = self._get_min_max_y(start_task)
+            min_y, _ = self._get_min_max_y(end_task)
+            _, max_y = self._get_min_max_y(start_task)
         elif parts > 1:
             min_y = (parts - self._count_part(start_task, parts)) \
                     * (1.0 / parts)
@@ -397,6 +443,7 @@ class BlenderRenderTask(FrameRenderingTask):
                       "output_format": self.output_format,
                       "path_root": self.main_scene_dir,
                       "start_task": start_task,
+                      "end_task": end_task,
                       "total_tasks": self.total_tasks,
                       "crops": crops,
                       "entrypoint":
@@ -428,6 +475,10 @@ class BlenderRenderTask(FrameRenderingTask):
         self.subtasks_given[subtask_id]['tmp_dir'] = self.tmp_dir
         # FIXME issue #1955
 
+        if self.partitioner:
+            self.partitioner.subtask_given(subtask_id, perf_index,
+                                           end_task - start_task + 1)
+
         part = self._count_part(start_task, parts)
 
         for frame in frames:
@@ -449,6 +500,16 @@ class BlenderRenderTask(FrameRenderingTask):
         self.subtasks_given[subtask_id]['ctd'] = ctd
         return self.ExtraData(ctd=ctd)
 
+    def accept_results(self, subtask_id, result_files):
+        super().accept_results(subtask_id, result_files)
+        if self.partitioner:
+            self.partitioner.subtask_finished(subtask_id)
+
+    def computation_failed(self, subtask_id: str, ban_node: bool = True):
+        super().computation_failed(subtask_id, ban_node)
+        if self.partitioner:
+            self.partitioner.subtask_failed(subtask_id)
+
     def restart(self):
         super(BlenderRenderTask, self).restart()
         if self.use_frames:
@@ -498,6 +559,22 @@ class BlenderRenderTask(FrameRenderingTask):
 
         return self._new_compute_task_def(hash, extra_data, 0)
 
+    def _get_next_parts(self, perf_index: float) -> Tuple[int, int]:
+        """ Returns numbers of the first and the last part for a new
+        subtask. Unless adaptive partitioning is enabled a subtask always
+        covers a single part. """
+        if self.partitioner is None or self.last_task == self.total_tasks:
+            start_task = self._get_next_task()
+            return start_task, self.parts_ranges.get(start_task, start_task)
+
+        parts_count = self.partitioner.get_parts_count(
+            perf_index, self.total_tasks - self.last_task)
+        start_task = self.last_task + 1
+        self.last_task += parts_count
+        if parts_count > 1:
+            self.parts_ranges[start_task] = self.last_task
+        return start_task, self.last_task
+
     def _get_min_max_y(self, start_task):
         if self.use_frames:
             parts = int(self.total_tasks / len(self.frames))
@@ -522,7 +599,9 @@ class BlenderRenderTask(FrameRenderingTask):
         return return_data
 
     def _update_preview(self, new_chunk_file_path, num_start):
-        self.preview_updater.update_preview(new_chunk_file_path, num_start)
+        self.preview_updater.update_preview(
+            new_chunk_file_path, num_start,
+            self.parts_ranges.get(num_start, num_start))
 
     def _update_frame_preview(self, new_chunk_file_path, frame_num, part=1,
                               final=False):
@@ -564,9 +643,12 @@ class BlenderRenderTask(FrameRenderingTask):
                 list(self.collected_file_names.values()), "paste")
 
     @staticmethod
-    def mark_part_on_preview(part, img_task, color, preview_updater):
+    def mark_part_on_preview(part, img_task, color, preview_updater,
+                             last_part=None):
+        if last_part is None:
+            last_part = part
         lower = preview_updater.get_offset(part)
-        upper = preview_updater.get_offset(part + 1)
+        upper = preview_updater.get_offset(last_part + 1)
         res_x = preview_updater.preview_res_x
         for i in range(0, res_x):
             for j in range(lower, upper):
@@ -575,7 +657,8 @@ class BlenderRenderTask(FrameRenderingTask):
     def _mark_task_area(self, subtask, img_task, color, frame_index=0):
         if not self.use_frames:
             self.mark_part_on_preview(subtask['start_task'], img_task, color,
-                                      self.preview_updater)
+                                      self.preview_updater,
+                                      subtask.get('end_task'))
         elif self.total_tasks <= len(self.frames):
             for i in range(0, int(math.floor(self.res_x * self.scale_factor))):
                 for j in range(0,
@@ -625,6 +708,8 @@ class BlenderRenderTaskBuilder(FrameRenderingTaskBuilder):
     def build_dictionary(cls, definition):
         dictionary = super().build_dictionary(definition)
         dictionary['options']['compositing'] = definition.options.compositing
+        dictionary['options']['adaptive_partitioning'] = \
+            definition.options.adaptive_partitioning
         return dictionary
 
     @classmethod
@@ -644,6 +729,8 @@ class BlenderRenderTaskBuilder(FrameRenderingTaskBuilder):
         definition = super().build_full_definition(task_type, dictionary)
         definition.options.compositing = options.get('compositing', False)
         definition.options.samples = options.get('samples', 0)
+        definition.options.adaptive_partitioning = \
+            options.get('adaptive_partitioning', False)
 
         return definition
 
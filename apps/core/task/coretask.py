@@ -1,3 +1,4 @@
+from copy import copy
 from datetime import datetime
 import decimal
 import logging
@@ -7,6 +8,7 @@ from typing import (
     Any,
     Dict,
     List,
+    Optional,
     Type,
     TYPE_CHECKING,
 )
@@ -16,6 +18,7 @@ from golem_messages import idgenerator
 from golem_messages.datastructures import tasks as dt_tasks
 import golem_messages.message
 
+from apps.core.task.stragglers import StragglerPolicy
 from apps.core.verification_queue import VerificationQueue
 from golem import constants as gconst
 from golem.core.common import HandleKeyError, timeout_to_deadline, to_unicode, \
@@ -26,6 +29,7 @@ from golem.resource.dirmanager import DirManager
 from golem.task.taskbase import Task, TaskBuilder, \
     TaskTypeInfo, AcceptClientVerdict
 from golem.task.taskclient import TaskClient
+from golem.task.taskkeeper import compute_subtask_value
 from golem.task.taskstate import SubtaskStatus
 from golem.verificator.core_verifier import CoreVerifier
 from golem.verificator.verifier import SubtaskVerificationState
@@ -174,6 +178,18 @@ class CoreTask(Task):
         self.tmp_dir = None
         self.max_pending_client_results = max_pending_client_results
 
+        self.straggler_policy: Optional[StragglerPolicy] = None
+        if getattr(task_definition, 'duplicate_stragglers', False):
+            self.straggler_policy = StragglerPolicy(total_parts=total_tasks)
+        # duplicate subtask id -> id of the first subtask computing the part
+        self.duplicate_of: Dict[str, str] = {}
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Tasks pickled before straggler duplication was added
+        self.__dict__.setdefault('straggler_policy', None)
+        self.__dict__.setdefault('duplicate_of', {})
+
     @staticmethod
     def create_task_id(public_key: bytes) -> str:
         return idgenerator.generate_id(public_key)
@@ -217,14 +233,28 @@ class CoreTask(Task):
             subtask_id,
             self._deadline,
             verification_finished_,
+            subtask_deadline=self._get_subtask_deadline(subtask_id),
+            value=compute_subtask_value(self.header.max_price,
+                                        self.header.subtask_timeout),
             subtask_info={**self.subtasks_given[subtask_id],
                           **{'owner': self.header.task_owner.key}},
             results=result_files,
             resources=self.task_resources,
         )
 
+    def _get_subtask_deadline(self, subtask_id: str) -> int:
+        ctd = self.subtasks_given[subtask_id].get('ctd')
+        if ctd and ctd.get('deadline'):
+            return ctd['deadline']
+        return self._deadline
+
     def verification_finished(self, subtask_id,
                               verdict: SubtaskVerificationState, result):
+        if self.subtasks_given[subtask_id]['status'] == \
+                SubtaskStatus.cancelled:
+            logger.info("Subtask %s already computed by another provider",
+                        subtask_id)
+            return
         try:
             if verdict == SubtaskVerificationState.VERIFIED:
                 self.accept_results(subtask_id, result['extra_data']['results'])
@@ -287,10 +317,15 @@ class CoreTask(Task):
         was_failure_before = subtask_info['status'] in [SubtaskStatus.failure,
                                                         SubtaskStatus.resent]
 
+        if subtask_info['status'] == SubtaskStatus.cancelled:
+            return
+
         if subtask_info['status'].is_active():
             # TODO Restarted tasks that were waiting for verification should
             # cancel it. Issue #2423
             self._mark_subtask_failed(subtask_id)
+            if subtask_info['status'] == SubtaskStatus.cancelled:
+                return
         elif subtask_info['status'] == SubtaskStatus.finished:
             self._mark_subtask_failed(subtask_id)
             self.num_tasks_received -= 1
@@ -447,8 +482,106 @@ class CoreTask(Task):
                 self.counting_nodes[node_id].reject()
             else:
                 self.counting_nodes[node_id].cancel()
+
+        if self._get_active_copies(subtask_id):
+            # The part is still computed by another provider
+            self.subtasks_given[subtask_id]['status'] = SubtaskStatus.cancelled
+            return
         self.num_failed_subtasks += 1
 
+    def get_subtask_copies(self, subtask_id: str) -> List[str]:
+        """ Ids of all the subtasks computing the same part as the given
+        one, including itself """
+        original_id = self.duplicate_of.get(subtask_id, subtask_id)
+        return [original_id] + [
+            duplicate_id
+            for duplicate_id, duplicated_id in self.duplicate_of.items()
+            if duplicated_id == original_id
+        ]
+
+    def _get_active_copies(self, subtask_id: str) -> List[str]:
+        return [
+            copy_id for copy_id in self.get_subtask_copies(subtask_id)
+            if copy_id != subtask_id
+            and self.subtasks_given[copy_id]['status'].is_active()
+        ]
+
+    def get_straggler_candidates(self, node_id: Optional[str] = None) \
+            -> Dict[str, int]:
+        """ Running subtasks whose parts may also be given to `node_id`,
+        mapped to the number of providers computing the part. Returns
+        nothing while there are parts left to be given out in the regular
+        way. Parts already computed by `node_id` or with results being
+        verified are skipped. """
+        if self.straggler_policy is None or self.needs_computation():
+            return {}
+
+        candidates: Dict[str, int] = {}
+        checked = set()
+        for subtask_id, subtask in self.subtasks_given.items():
+            original_id = self.duplicate_of.get(subtask_id, subtask_id)
+            if original_id in checked or 'ctd' not in subtask:
+                continue
+            checked.add(original_id)
+
+            copies = self.get_subtask_copies(subtask_id)
+            statuses = [self.subtasks_given[c]['status'] for c in copies]
+            computing = [c for c, status in zip(copies, statuses)
+                         if status.is_computed()]
+            if not computing \
+                    or SubtaskStatus.verifying in statuses \
+                    or any(self.subtasks_given[c]['node_id'] == node_id
+                           for c in copies):
+                continue
+            candidates[computing[0]] = len(computing)
+        return candidates
+
+    def get_parts_left(self) -> int:
+        return self.total_tasks - self.num_tasks_received
+
+    def query_duplicate_extra_data(self, subtask_id: str, perf_index: float,
+                                   node_id: Optional[str] = None,
+                                   node_name: Optional[str] = None) \
+            -> Task.ExtraData:
+        """ Creates a new subtask computing the same part as the running
+        subtask `subtask_id` """
+        original = self.subtasks_given[subtask_id]
+        new_subtask_id = self.create_subtask_id()
+        logger.info(
+            'Duplicating straggling subtask. task_id=%s, subtask_id=%s, '
+            'new_subtask_id=%s, node_id=%s',
+            self.header.task_id, subtask_id, new_subtask_id, node_id)
+
+        ctd = self._new_compute_task_def(
+            new_subtask_id,
+            copy(original['ctd']['extra_data']),
+            perf_index=perf_index)
+
+        duplicate = copy(original)
+        duplicate['subtask_id'] = new_subtask_id
+        duplicate['status'] = SubtaskStatus.starting
+        duplicate['node_id'] = node_id
+        duplicate['ctd'] = ctd
+        self.subtasks_given[new_subtask_id] = duplicate
+        self.duplicate_of[new_subtask_id] = \
+            self.duplicate_of.get(subtask_id, subtask_id)
+
+        if self.straggler_policy:
+            self.straggler_policy.subtask_duplicated()
+        return self.ExtraData(ctd=ctd)
+
+    def cancel_subtask_copies(self, subtask_id: str) -> List[str]:
+        """ Cancels the other subtasks computing the same part as the
+        accepted subtask `subtask_id`. Returns ids of the cancelled
+        subtasks. """
+        cancelled = self._get_active_copies(subtask_id)
+        for copy_id in cancelled:
+            subtask = self.subtasks_given[copy_id]
+            subtask['status'] = SubtaskStatus.cancelled
+            if subtask['node_id'] in self.counting_nodes:
+                self.counting_nodes[subtask['node_id']].cancel()
+        return cancelled
+
     def get_finishing_subtasks(self, node_id: str) -> List[dict]:
         return [
             subtask for subtask in self.subtasks_given.values()
@@ -56,6 +56,8 @@ class TaskDefinition(object):
         self.compute_on = "cpu"
 
         self.concent_enabled: bool = False
+        # Give straggling subtasks to additional providers
+        self.duplicate_stragglers: bool = False
 
     def __getstate__(self):
         return PICKLED_VERSION, self.__dict__
@@ -88,6 +90,9 @@ class TaskDefinition(object):
             if 'timeout' not in attributes:
                 attributes['timeout'] = attributes.pop('full_task_timeout')
 
+        if pickled_version < 3:
+            attributes.setdefault('duplicate_stragglers', False)
+
         for key in attributes:
             setattr(self, key, attributes[key])
 
@@ -135,6 +140,7 @@ class TaskDefinition(object):
                 'output_path': output_path
             },
             'concent_enabled': self.concent_enabled,
+            'duplicate_stragglers': self.duplicate_stragglers,
         }
 
     def build_output_path(self) -> str:
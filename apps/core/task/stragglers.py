@@ -0,0 +1,90 @@
+import logging
+import math
+import statistics
+import time
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("apps.core")
+
+
+class StragglerPolicy:
+    """ Decides which running subtask should also be given to another
+    provider, so that a single slow or vanished provider does not delay the
+    whole task until the subtask timeout.
+
+    A running subtask is a straggler when no more than `tail_share` of the
+    task's parts are left to be computed, or when it has been running
+    `slowdown` times longer than the median computation time of the subtasks
+    accepted so far. The oldest straggler is duplicated first and no part is
+    computed by more than `max_copies` providers at once.
+
+    The first verified copy is accepted and the others are cancelled, but
+    every copy may have to be paid for. The number of duplicates is
+    therefore limited to `budget` times the number of parts, which bounds
+    the extra cost to `budget` times the price of the whole task.
+    """
+
+    TAIL_SHARE = 0.1
+    SLOWDOWN = 2.
+    MAX_COPIES = 2
+    BUDGET = 0.1
+
+    def __init__(self, total_parts: int,
+                 tail_share: float = TAIL_SHARE,
+                 slowdown: float = SLOWDOWN,
+                 max_copies: int = MAX_COPIES,
+                 budget: float = BUDGET) -> None:
+        self.total_parts = total_parts
+        self.tail_parts = max(1, int(math.ceil(total_parts * tail_share)))
+        self.slowdown = slowdown
+        self.max_copies = max_copies
+        self.max_duplicates = max(1, int(total_parts * budget))
+        self.duplicates = 0
+        self._durations: List[float] = []
+
+    @property
+    def duplicates_left(self) -> int:
+        return max(0, self.max_duplicates - self.duplicates)
+
+    @property
+    def median_duration(self) -> Optional[float]:
+        if not self._durations:
+            return None
+        return statistics.median(self._durations)
+
+    def is_straggler(self, running_time: float, parts_left: int) -> bool:
+        if parts_left <= self.tail_parts:
+            return True
+        median = self.median_duration
+        return median is not None and running_time > self.slowdown * median
+
+    def select(self, running: Iterable[Tuple[str, float, int]],
+               parts_left: int, now: Optional[float] = None) \
+            -> Optional[str]:
+        """ Returns the id of the subtask to duplicate, if any.
+        :param running: (subtask id, time started, number of copies
+            computed) of the subtasks that may be duplicated
+        :param parts_left: number of parts not computed yet
+        """
+        if not self.duplicates_left:
+            return None
+        if now is None:
+            now = time.time()
+
+        stragglers = [
+            (started, subtask_id)
+            for subtask_id, started, copies in running
+            if copies < self.max_copies
+            and self.is_straggler(now - started, parts_left)
+        ]
+        if not stragglers:
+            return None
+        return min(stragglers)[1]
+
+    def subtask_duplicated(self) -> None:
+        self.duplicates += 1
+        logger.debug("Straggler duplicated. duplicates=%r/%r",
+                     self.duplicates, self.max_duplicates)
+
+    def subtask_finished(self, duration: float) -> None:
+        self._durations.append(duration)
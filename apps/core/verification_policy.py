@@ -0,0 +1,144 @@
+import enum
+import logging
+import random
+from typing import Callable, Dict, NamedTuple, Optional, Set
+
+from golem.verificator.verifier import SubtaskVerificationState
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationMode(enum.Enum):
+    # Result sanity checks followed by the verifier's full check
+    FULL = 'full'
+    # Full check of a sampled result, run after the regular verifications
+    SPOT = 'spot'
+    # Result sanity checks only: files, their number and image sizes
+    LIGHT = 'light'
+
+
+class ProviderRecord(NamedTuple):
+    """ What the requestor knows about a provider """
+    trust: float = 0.
+    verified: float = 0.  # results accepted so far
+    rejected: float = 0.  # results rejected so far
+
+    @property
+    def rejection_rate(self) -> float:
+        total = self.verified + self.rejected
+        return self.rejected / total if total else 0.
+
+
+RecordSource = Callable[[str], ProviderRecord]
+
+
+class VerificationPolicy:
+    """ Chooses how thoroughly a subtask result is verified.
+
+    Results of providers with no record, a trust below `MIN_TRUST`, fewer
+    than `MIN_VERIFIED` accepted results or a rejection rate above
+    `MAX_REJECTION_RATE` are fully verified, as well as results worth more
+    than `FULL_VALUE`. Other results pass a light check and are sampled for
+    a spot check with a probability falling linearly from `MAX_SPOT_RATE`
+    at `MIN_TRUST` to `MIN_SPOT_RATE` at full trust.
+
+    A rejected result escalates its provider: all of its results, including
+    the ones already waiting in the queue, are fully verified from then on.
+    """
+
+    MIN_TRUST = 0.5
+    MIN_VERIFIED = 50
+    MAX_REJECTION_RATE = 0.02
+    FULL_VALUE = 10 ** 18  # wei
+    MIN_SPOT_RATE = 0.05
+    MAX_SPOT_RATE = 0.5
+
+    def __init__(self,
+                 record_source: Optional[RecordSource] = None,
+                 rnd: Optional[random.Random] = None) -> None:
+        self._record_source = record_source
+        self._random = rnd or random.Random()
+        self.escalated: Set[str] = set()
+
+        self._counts: Dict[VerificationMode, int] = \
+            {mode: 0 for mode in VerificationMode}
+        self._failed_spot_checks = 0
+        self._full_time = 0.
+        self._full_count = 0
+
+    def set_record_source(self,
+                          record_source: Optional[RecordSource]) -> None:
+        """ Without a source of provider records every result is fully
+            verified """
+        self._record_source = record_source
+
+    def get_record(self, node_id: Optional[str]) -> Optional[ProviderRecord]:
+        if not node_id or self._record_source is None:
+            return None
+        try:
+            return self._record_source(node_id)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Can't get record of provider %r: %r", node_id, e)
+            return None
+
+    def get_spot_rate(self, record: ProviderRecord) -> float:
+        share = (record.trust - self.MIN_TRUST) / (1. - self.MIN_TRUST)
+        share = min(1., max(0., share))
+        return self.MAX_SPOT_RATE \
+            - (self.MAX_SPOT_RATE - self.MIN_SPOT_RATE) * share
+
+    def choose(self, node_id: Optional[str], value: int = 0) \
+            -> VerificationMode:
+        mode = self._choose(node_id, value)
+        logger.debug("Verification mode chosen. node_id=%r, value=%r, "
+                     "mode=%s", node_id, value, mode.value)
+        return mode
+
+    def _choose(self, node_id: Optional[str], value: int) \
+            -> VerificationMode:
+        if node_id in self.escalated or value > self.FULL_VALUE:
+            return VerificationMode.FULL
+        record = self.get_record(node_id)
+        if record is None \
+                or record.trust < self.MIN_TRUST \
+                or record.verified < self.MIN_VERIFIED \
+                or record.rejection_rate > self.MAX_REJECTION_RATE:
+            return VerificationMode.FULL
+        if self._random.random() < self.get_spot_rate(record):
+            return VerificationMode.SPOT
+        return VerificationMode.LIGHT
+
+    def is_escalated(self, node_id: Optional[str]) -> bool:
+        return node_id in self.escalated
+
+    def verification_finished(self, node_id: Optional[str],
+                              mode: VerificationMode,
+                              verdict: SubtaskVerificationState,
+                              duration: float) -> None:
+        self._counts[mode] += 1
+        if mode != VerificationMode.LIGHT:
+            self._full_time += duration
+            self._full_count += 1
+        if verdict != SubtaskVerificationState.WRONG_ANSWER or not node_id:
+            return
+        if mode == VerificationMode.SPOT:
+            self._failed_spot_checks += 1
+        if node_id not in self.escalated:
+            logger.warning("Result of provider %r rejected, verifying all "
+                           "of its results", node_id)
+            self.escalated.add(node_id)
+
+    def get_stats(self) -> Dict:
+        mean_full_time = \
+            self._full_time / self._full_count if self._full_count else 0.
+        light = self._counts[VerificationMode.LIGHT]
+        return {
+            'full': self._counts[VerificationMode.FULL],
+            'spot': self._counts[VerificationMode.SPOT],
+            'light': light,
+            'failed_spot_checks': self._failed_spot_checks,
+            'escalated_providers': len(self.escalated),
+            'full_verification_time': self._full_time,
+            # Light checks take a fraction of a second
+            'estimated_time_saved': light * mean_full_time,
+        }
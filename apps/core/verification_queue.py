@@ -1,18 +1,33 @@
+import heapq
+import itertools
 import logging
-import queue
+import time
 from functools import partial
 from types import FunctionType
-from typing import Optional, Type, Dict, Tuple
+from typing import Optional, Type, Dict, List, Tuple
 
+import psutil
 from golem.verificator.verifier import Verifier
 from twisted.internet.defer import Deferred, gatherResults
 
+from apps.core.verification_policy import VerificationMode, \
+    VerificationPolicy
 from apps.core.verification_task import VerificationTask
 
 logger = logging.getLogger(__name__)
 
 
 class VerificationQueue:
+    """ Runs subtask verifications, earliest subtask deadline first.
+
+    The number of concurrent verifications is capped by the number of cores
+    from the hardware preset (see `set_max_concurrency`) and further reduced
+    when the host is already busy.
+
+    How thoroughly each result is verified is decided by the `policy`.
+    Spot checks are run after the regular verifications due up to
+    `SPOT_CHECK_DELAY` seconds later, but not after their deadline.
+    """
 
     #  We assume that after 30 minutes verification tasks is stalled (possibly
     #  to bugs in third party docker api). After this period we finish
@@ -20,20 +35,45 @@ class VerificationQueue:
     #  configurable from config, and will be relative to nodes benchmark
     #  results.
     VERIFICATION_TIMEOUT = 1800
-
-    def __init__(self, concurrency: int = 1) -> None:
-        self._concurrency = concurrency
-        self._queue: queue.Queue = queue.Queue()
+    #  Lower bound for the timeout of a single verification job, used when
+    #  the subtask deadline is closer than VERIFICATION_TIMEOUT.
+    MIN_VERIFICATION_TIMEOUT = 300
+    #  Number of the most recent queue wait times kept for statistics.
+    WAIT_TIMES_WINDOW = 100
+    SPOT_CHECK_DELAY = 600
+
+    def __init__(self, concurrency: int = 1,
+                 policy: Optional[VerificationPolicy] = None) -> None:
+        self._concurrency = max(1, concurrency)
+        self.policy = policy or VerificationPolicy()
+        self._queue: List[Tuple[int, int, float, VerificationTask,
+                                Type[Verifier]]] = []
+        self._counter = itertools.count()
         self._jobs: Dict[str, Deferred] = dict()
         self.callbacks: Dict[VerificationTask, FunctionType] = dict()
         self._paused = False
+        self._wait_times: List[float] = []
+
+    def set_max_concurrency(self, concurrency: int) -> None:
+        """ Sets the upper limit of concurrent verifications, usually to the
+            number of cores in the current hardware preset """
+        self._concurrency = max(1, concurrency)
+        logger.info("Verification queue concurrency set to %d",
+                    self._concurrency)
+        self._process_queue()
 
     def submit(self,
                verifier_class: Type[Verifier],
                subtask_id: str,
                deadline: int,
                cb: FunctionType,
+               value: int = 0,
+               subtask_deadline: Optional[int] = None,
                **kwargs) -> None:
+        """ :param deadline: verifications started later time out
+            :param value: value of the subtask, used by the policy
+            :param subtask_deadline: orders the queue, defaults to deadline
+        """
 
         logger.debug(
             "Verification Queue submit: "
@@ -41,9 +81,16 @@ class VerificationQueue:
             verifier_class, subtask_id, deadline, kwargs
         )
 
-        entry = VerificationTask(subtask_id, deadline, kwargs)
+        mode = self.policy.choose(self._get_node_id(kwargs), value)
+        entry = VerificationTask(subtask_id, deadline, kwargs, mode)
         self.callbacks[entry] = cb
-        self._queue.put((entry, verifier_class))
+        priority = subtask_deadline or deadline
+        if mode == VerificationMode.SPOT:
+            # started after the deadline, the result would be rejected
+            priority = max(priority,
+                           min(priority + self.SPOT_CHECK_DELAY, deadline))
+        heapq.heappush(self._queue, (priority, next(self._counter),
+                                     time.time(), entry, verifier_class))
         self._process_queue()
 
     def pause(self) -> Deferred:
@@ -55,30 +102,79 @@ class VerificationQueue:
         self._paused = False
         self._process_queue()
 
+    @property
+    def concurrency(self) -> int:
+        """ Number of verifications allowed to run at the moment, based on the
+            configured maximum and the current CPU load of the host """
+        try:
+            load = psutil.cpu_percent(interval=None) / 100.
+            idle_cores = int(psutil.cpu_count() * (1. - load))
+        except Exception:  # pylint: disable=broad-except
+            return self._concurrency
+        # running verifications contribute to the load themselves
+        return max(1, min(self._concurrency, len(self._jobs) + idle_cores))
+
     @property
     def can_run(self) -> bool:
-        return not self._paused and len(self._jobs) < self._concurrency
+        return not self._paused and len(self._jobs) < self.concurrency
+
+    def get_stats(self) -> Dict:
+        wait_times = self._wait_times
+        return {
+            'queue_depth': len(self._queue),
+            'running': len(self._jobs),
+            'max_concurrency': self._concurrency,
+            'paused': self._paused,
+            'avg_wait_time':
+                sum(wait_times) / len(wait_times) if wait_times else 0.,
+            'max_wait_time': max(wait_times) if wait_times else 0.,
+            'policy': self.policy.get_stats(),
+        }
+
+    @staticmethod
+    def _get_node_id(kwargs: Dict) -> Optional[str]:
+        return (kwargs.get('subtask_info') or {}).get('node_id')
 
     def _process_queue(self) -> None:
-        if self.can_run:
+        while self.can_run:
             entry, verifier_cls = self._next()
-            if entry and verifier_cls:
-                self._run(entry, verifier_cls)
+            if not (entry and verifier_cls):
+                return
+            self._run(entry, verifier_cls)
 
     def _next(self) -> Tuple[Optional[VerificationTask], Optional[Verifier]]:
         try:
-            return self._queue.get(block=False)
-        except queue.Empty:
+            _, _, submitted, entry, verifier_cls = heapq.heappop(self._queue)
+        except IndexError:
             return None, None
 
+        self._wait_times.append(time.time() - submitted)
+        del self._wait_times[:-self.WAIT_TIMES_WINDOW]
+        logger.debug("Verification queue stats: %r", self.get_stats())
+        return entry, verifier_cls
+
+    @classmethod
+    def _get_timeout(cls, entry: VerificationTask) -> int:
+        time_left = int(entry.deadline - time.time())
+        return min(cls.VERIFICATION_TIMEOUT,
+                   max(cls.MIN_VERIFICATION_TIMEOUT, time_left))
+
     def _run(self, entry: VerificationTask,
              verifier_cls: Type[Verifier]) -> None:
         subtask_id = entry.subtask_id
+        node_id = self._get_node_id(entry.kwargs)
+        if entry.mode != VerificationMode.FULL \
+                and self.policy.is_escalated(node_id):
+            entry.mode = VerificationMode.FULL
 
-        logger.info("Running verification of subtask %r", subtask_id)
+        logger.info("Running verification of subtask %r. mode=%s",
+                    subtask_id, entry.mode.value)
+        started = time.time()
 
         def callback(*args):
             logger.info("Finished verification of subtask %r", subtask_id)
+            self.policy.verification_finished(
+                node_id, entry.mode, args[0][1], time.time() - started)
             try:
                 self.callbacks[entry](subtask_id=args[0][0], verdict=args[0][1],
                                       result=args[0][2])
@@ -100,7 +196,7 @@ class VerificationQueue:
             fn_timeout = partial(self._verification_timed_out, task=entry,
                                  event=result, subtask_id=subtask_id)
 
-            result.addTimeout(VerificationQueue.VERIFICATION_TIMEOUT, reactor,
+            result.addTimeout(self._get_timeout(entry), reactor,
                               onTimeoutCancel=fn_timeout)
             self._jobs[subtask_id] = result
 
@@ -111,6 +207,7 @@ class VerificationQueue:
         task.stop(event)
 
     def _reset(self) -> None:
-        self._queue = queue.Queue()
+        self._queue = []
         self._jobs = dict()
         self.callbacks = dict()
+        self._wait_times = []
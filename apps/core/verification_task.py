@@ -1,20 +1,24 @@
 import typing
 from twisted.internet.defer import Deferred, succeed
+from apps.core.verification_policy import VerificationMode
 from golem.core.common import deadline_to_timeout
 
 
 class VerificationTask:
 
-    def __init__(self, subtask_id, deadline, kwargs) -> None:
+    def __init__(self, subtask_id, deadline, kwargs,
+                 mode: VerificationMode = VerificationMode.FULL) -> None:
         self.deadline = deadline
         self.kwargs = kwargs
         self.subtask_id = subtask_id
+        self.mode = mode
         self.verifier: typing.Any = None
 
     def start(self, verifier_class) -> Deferred:
         self.verifier = verifier_class(self.kwargs)
         if deadline_to_timeout(self.deadline) > 0:
-            if self.verifier.simple_verification(self.kwargs):
+            if self.verifier.simple_verification(self.kwargs) \
+                    and self.mode != VerificationMode.LIGHT:
                 return self.verifier.start_verification(self.kwargs)
             return succeed(self.verifier.verification_completed())
         else:
@@ -9,6 +9,15 @@ with open('params.json', 'r') as params_file:
     params = json.load(params_file)
 
 
+def report_progress(progress):
+    progress_file = params.get('PROGRESS_FILE')
+    if not progress_file:
+        return
+    with open(progress_file + '.tmp', 'w') as f:
+        f.write("{:.4f}".format(progress))
+    os.replace(progress_file + '.tmp', progress_file)
+
+
 def run(data_files, subtask_data, difficulty, result_size, result_file):
     code_file = os.path.join(params['RESOURCES_DIR'], "code", "computing.py")
     computing = imp.load_source("code", code_file)
@@ -24,6 +33,8 @@ def run(data_files, subtask_data, difficulty, result_size, result_file):
     # TODO try catch and log errors. Issue #2425
     with open(result_path, "w") as f:
         f.write("{}".format(solution))
+    # the proof of work search gives no intermediate progress
+    report_progress(1.0)
 
 
 run(params['data_files'],
@@ -183,23 +183,14 @@ class EXRImgRepr(ImgRepr):
 
     def _convert_openexr_to_opencv_bgr(self):
         width, height = self.get_size()
-        bytes_r, bytes_g, bytes_b = self.img.channels("RGB")
-        r = numpy.fromstring(bytes_r, dtype=numpy.float32)
-        g = numpy.fromstring(bytes_g, dtype=numpy.float32)
-        b = numpy.fromstring(bytes_b, dtype=numpy.float32)
-
-        for channel in r, g, b:
-            for pixel_value in numpy.nditer(channel, op_flags=['readwrite']):
-                pixel_value[...] = round(pixel_value * 255)
-
-        opencv_img = numpy.zeros((height, width, 3), dtype=numpy.uint8)
-        r = numpy.reshape(r, (-1, width))
-        g = numpy.reshape(g, (-1, width))
-        b = numpy.reshape(b, (-1, width))
-        opencv_img[:, :, 0] = b
-        opencv_img[:, :, 1] = g
-        opencv_img[:, :, 2] = r
-        return opencv_img
+        # decoded straight from the channel buffers, in BGR order
+        bgr = numpy.stack([
+            numpy.frombuffer(channel, dtype=numpy.float32)
+            .reshape(height, width)
+            for channel in reversed(self.img.channels("RGB"))
+        ], axis=-1)
+        # numpy rounds halves to even, as round() did for every pixel
+        return numpy.round(bgr * 255).astype(numpy.uint8)
 
     def load_from_file(self, file_):
         self.img = OpenEXR.InputFile(file_)
@@ -221,12 +212,14 @@ class EXRImgRepr(ImgRepr):
         self.bgr[y, x] = color[::-1]
 
     def copy(self):
+        # the pixels are already decoded, the file is not read again
         e = EXRImgRepr()
-        e.load_from_file(self.file_path)
         e.dw = deepcopy(self.dw)
-        e.bgr = deepcopy(self.bgr)
+        e.bgr = self.bgr.copy()
         e.min = self.min
         e.max = self.max
+        e.file_path = self.file_path
+        e.name = self.name
         return e
 
     def close(self):
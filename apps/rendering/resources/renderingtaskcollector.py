@@ -37,8 +37,10 @@ class RenderingTaskCollector(object):
 
         res_x, res_y = 0, 0
 
-        for name in self.accepted_img_files:
-            image = OpenCVImgRepr.from_image_file(name)
+        # every part is decoded once and kept in memory until it is pasted
+        images = [OpenCVImgRepr.from_image_file(name)
+                  for name in self.accepted_img_files]
+        for image in images:
             img_y, res_x = image.img.shape[:2]
             res_y += img_y
             self.dtype = image.img.dtype
@@ -50,8 +52,7 @@ class RenderingTaskCollector(object):
         final_img = OpenCVImgRepr.empty(self.width, self.height, self.channels,
                                         self.dtype)
         offset = 0
-        for img_path in self.accepted_img_files:
-            image = OpenCVImgRepr.from_image_file(img_path)
+        for image in images:
             final_img.paste_image(image, 0, offset)
             offset += image.get_height()
         return final_img
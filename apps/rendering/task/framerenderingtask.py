@@ -147,7 +147,12 @@ class FrameRenderingTask(RenderingTask):
             self._update_subtask_frame_status(subtask_id)
 
     def restart_subtask(self, subtask_id):
+        subtask = self.subtasks_given[subtask_id]
+        was_finished = subtask['status'] == SubtaskStatus.finished
         super(FrameRenderingTask, self).restart_subtask(subtask_id)
+        if was_finished:
+            # CoreTask accounts for a single part only
+            self.num_tasks_received -= self._count_subtask_parts(subtask) - 1
         self._update_subtask_frame_status(subtask_id)
 
     def get_output_names(self):
@@ -196,7 +201,8 @@ class FrameRenderingTask(RenderingTask):
             else:
                 self._collect_frame_part(num_start, result_file, parts)
 
-        self.num_tasks_received += 1
+        self.num_tasks_received += \
+            self._count_subtask_parts(self.subtasks_given[subtask_id])
 
         if self.num_tasks_received == self.total_tasks and not self.use_frames:
             self._put_image_together()
@@ -432,6 +438,13 @@ class FrameRenderingTask(RenderingTask):
         if len(self.frames_given[frame_key]) == parts:
             self._put_frame_together(frame_num, num_start)
 
+    @staticmethod
+    def _count_subtask_parts(subtask):
+        """ Number of parts covered by a subtask, more than one if adjacent
+        parts were merged into a single subtask """
+        return subtask.get('end_task', subtask['start_task']) \
+            - subtask['start_task'] + 1
+
     def _count_part(self, start_num, parts):
         return ((start_num - 1) % parts) + 1
 
@@ -0,0 +1,95 @@
+import logging
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger("apps.rendering")
+
+
+class AdaptivePartitioner:
+    """ Decides how many consecutive parts of a rendering task should be
+    handed out to a provider in a single subtask.
+
+    The task is split into `total_parts` fine-grained parts. A provider
+    reporting a performance equal to the average one gets a single part,
+    faster providers get proportionally more (merged into one region), as
+    long as the estimated computation time fits both the subtask timeout and
+    the time left until the task deadline. Close to the deadline or near the
+    end of the task the regions shrink back to single parts.
+    """
+
+    # Fraction of the subtask timeout / time left that a subtask should take
+    TIME_SAFETY_MARGIN = 0.5
+    # Never hand out more than this fraction of the remaining parts at once
+    MAX_REMAINING_SHARE = 0.5
+
+    def __init__(self, total_parts: int, subtask_timeout: float,
+                 deadline: float) -> None:
+        self.total_parts = total_parts
+        self.subtask_timeout = subtask_timeout
+        self.deadline = deadline
+        # subtask_id -> (performance, parts count, time started)
+        self._running: Dict[str, Tuple[float, int, float]] = {}
+        self._perf_sum = 0.
+        self._perf_count = 0
+        # Estimated time of computing a single part for a provider with
+        # average performance. Unknown until the first subtask finishes.
+        self.part_time: Optional[float] = None
+
+    @property
+    def average_performance(self) -> float:
+        if not self._perf_count:
+            return 0.
+        return self._perf_sum / self._perf_count
+
+    def get_parts_count(self, perf_index: float, parts_left: int,
+                        now: Optional[float] = None) -> int:
+        if now is None:
+            now = time.time()
+        if parts_left <= 1 or perf_index <= 0:
+            return 1
+
+        average = self.average_performance or perf_index
+        speedup = perf_index / average
+        parts = max(1, int(math.floor(speedup)))
+
+        parts = min(parts, max(1, int(parts_left * self.MAX_REMAINING_SHARE)))
+
+        if self.part_time:
+            time_left = min(self.subtask_timeout, self.deadline - now)
+            budget = time_left * self.TIME_SAFETY_MARGIN * speedup
+            parts = min(parts, max(1, int(budget / self.part_time)))
+
+        return parts
+
+    def subtask_given(self, subtask_id: str, perf_index: float, parts: int,
+                      now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.time()
+        if perf_index > 0:
+            self._perf_sum += perf_index
+            self._perf_count += 1
+        self._running[subtask_id] = (perf_index, parts, now)
+
+    def subtask_finished(self, subtask_id: str,
+                         now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.time()
+        try:
+            perf_index, parts, started = self._running.pop(subtask_id)
+        except KeyError:
+            return
+        if perf_index <= 0 or not self.average_performance:
+            return
+
+        # normalize to a provider with average performance
+        speedup = perf_index / self.average_performance
+        part_time = (now - started) * speedup / parts
+        if self.part_time is None:
+            self.part_time = part_time
+        else:
+            self.part_time = 0.8 * self.part_time + 0.2 * part_time
+        logger.debug("Estimated part computation time: %r", self.part_time)
+
+    def subtask_failed(self, subtask_id: str) -> None:
+        self._running.pop(subtask_id, None)
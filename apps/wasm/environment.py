@@ -3,6 +3,6 @@ from golem.docker.environment import DockerEnvironment
 
 class WasmTaskEnvironment(DockerEnvironment):
     DOCKER_IMAGE = "golemfactory/wasm"
-    DOCKER_TAG = "0.2.1"
+    DOCKER_TAG = "0.2.2"
     ENV_ID = "WASM"
     SHORT_DESCRIPTION = "WASM Sandbox"
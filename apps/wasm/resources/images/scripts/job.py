@@ -4,6 +4,36 @@ import subprocess
 
 
 WASM_SANDBOX_EXECUTABLE_NAME = '/wasm-sandbox'
+# Interval of checking which output files have already been written
+PROGRESS_INTERVAL = 1.0
+
+
+def report_progress(params, progress):
+    progress_file = params.get('PROGRESS_FILE')
+    if not progress_file:
+        return
+    with open(progress_file + '.tmp', 'w') as f:
+        f.write("{:.4f}".format(progress))
+    os.replace(progress_file + '.tmp', progress_file)
+
+
+def wait_reporting_progress(process, params):
+    """ Waits for the sandbox to exit, reporting the fraction of the
+    expected output files that have already been written """
+    output_files = [
+        os.path.join(os.environ['OUTPUT_DIR'], path)
+        for path in params['output_file_paths']
+    ]
+    written = -1
+    while True:
+        try:
+            return process.wait(timeout=PROGRESS_INTERVAL)
+        except subprocess.TimeoutExpired:
+            pass
+        now_written = sum(1 for path in output_files if os.path.exists(path))
+        if output_files and now_written != written:
+            written = now_written
+            report_progress(params, written / len(output_files))
 
 
 def run_job():
@@ -14,7 +44,7 @@ def run_job():
         os.environ['RESOURCES_DIR'], params['input_dir_name']
     )
 
-    subprocess.call(
+    process = subprocess.Popen(
         [
             WASM_SANDBOX_EXECUTABLE_NAME,
             '-O',
@@ -32,6 +62,7 @@ def run_job():
         ] + params['exec_args'],
         cwd=os.environ['RESOURCES_DIR']
     )
+    wait_reporting_progress(process, params)
 
 
 if __name__ == '__main__':
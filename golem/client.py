@@ -64,6 +64,7 @@ from golem.resource.base.resourceserver import BaseResourceServer
 from golem.resource.dirmanager import DirManager, DirectoryType
 from golem.resource.hyperdrive.resourcesmanager import HyperdriveResourceManager
 from golem.rpc import utils as rpc_utils
+from golem.rpc.aggregator import TaskEventAggregator
 from golem.rpc.mapping.rpceventnames import Task, Network, Environment, UI
 from golem.task import taskpreset
 from golem.task.taskarchiver import TaskArchiver
@@ -204,6 +205,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         self.use_monitor = use_monitor
         self.monitor = None
         self.session_id = str(uuid.uuid4())
+        # Task status updates are merged and published in batches
+        self.task_events = TaskEventAggregator(self._publish)
 
         # TODO: Move to message queue #3160
         self._task_finished_cb = task_finished_cb
@@ -292,14 +295,16 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         op = kwargs['op'] if 'op' in kwargs else None
 
         if op is not None and op.subtask_related():
-            self._publish(Task.evt_subtask_status, kwargs['task_id'],
-                          kwargs['subtask_id'], op.value)
+            self.task_events.subtask_updated(kwargs['task_id'],
+                                             kwargs['subtask_id'], op.value,
+                                             completed=op.is_completed())
         else:
             op_class_name: str = op.__class__.__name__ \
                 if op is not None else None
             op_value: int = op.value if op is not None else None
-            self._publish(Task.evt_task_status, kwargs['task_id'],
-                          op_class_name, op_value)
+            self.task_events.task_updated(
+                kwargs['task_id'], op_class_name, op_value,
+                completed=op is not None and bool(op.is_completed()))
 
     def taskserver_listener(
             self,
@@ -325,6 +330,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         logger.debug('Starting client services ...')
         self.environments_manager.load_config(self.datadir)
         self.concent_service.start()
+        if not self.task_events.running:
+            self.task_events.start()
         self.concent_filetransfers.start()
 
         if self.use_monitor and not self.monitor:
@@ -348,6 +355,8 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         for service in self._services:
             if service.running:
                 service.stop()
+        if self.task_events.running:
+            self.task_events.stop()
         self.concent_service.stop()
         if self.concent_filetransfers.running:
             self.concent_filetransfers.stop()
@@ -398,6 +407,9 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         monitoring_publisher_service.start()
         self._services.append(monitoring_publisher_service)
 
+        self.task_server.reactor_lag.start()
+        self._services.append(self.task_server.reactor_lag)
+
         if self.config_desc.net_masking_enabled:
             mask_udpate_service = MaskUpdateService(
                 task_manager=self.task_server.task_manager,
@@ -566,6 +578,7 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         if self.p2pservice:
             self.p2pservice.stop_accepting()
             self.p2pservice.disconnect()
+            self.p2pservice.flush_known_hosts()
         if self.task_server:
             self.task_server.stop_accepting()
             self.task_server.disconnect()
@@ -622,6 +635,12 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         self.monitor.shut_down()
         self.diag_service.stop()
 
+    @rpc_utils.expose('golem.monitor.stats')
+    def get_monitor_stats(self) -> Dict:
+        if not self.monitor:
+            return {}
+        return self.monitor.get_sender_stats()
+
     @rpc_utils.expose('net.peer.connect')
     def connect(self, socket_address):
         if isinstance(socket_address, collections.Iterable):
@@ -1134,11 +1153,13 @@ class Client:  # noqa pylint: disable=too-many-instance-attributes,too-many-publ
         if state:
             return DictSerializer.dump(state)
 
-    def pull_resources(self, task_id, resources, client_options=None):
+    def pull_resources(self, task_id, resources, client_options=None,
+                       deadline=None):
         self.resource_server.download_resources(
             resources,
             task_id,
-            client_options=client_options
+            client_options=client_options,
+            deadline=deadline
         )
 
     @rpc_utils.expose('res.dirs')
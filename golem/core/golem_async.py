@@ -14,6 +14,10 @@ class AsyncHTTPRequest:
 
     agent = None
     timeout = 5
+    # Connections kept open for reuse, per host
+    max_persistent_per_host = 8
+    # Seconds after which an idle persistent connection is closed
+    cached_connection_timeout = 60
 
     @implementer(IBodyProducer)
     class BytesBodyProducer:
@@ -45,8 +49,12 @@ class AsyncHTTPRequest:
     @classmethod
     def create_agent(cls):
         from twisted.internet import reactor
-        from twisted.web.client import Agent  # imports reactor
-        return Agent(reactor, connectTimeout=cls.timeout)
+        # imports reactor
+        from twisted.web.client import Agent, HTTPConnectionPool
+        pool = HTTPConnectionPool(reactor, persistent=True)
+        pool.maxPersistentPerHost = cls.max_persistent_per_host
+        pool.cachedConnectionTimeout = cls.cached_connection_timeout
+        return Agent(reactor, connectTimeout=cls.timeout, pool=pool)
 
 
 class AsyncRequest(object):
@@ -0,0 +1,192 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from golem.core.service import IService
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1., 5.)
+
+
+class Histogram:
+    """ Counts observed values in fixed buckets """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # the last counter is for values above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.
+        self.max = 0.
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> Dict:
+        bounds = [str(bound) for bound in self.buckets] + ['inf']
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.,
+            'max': self.max,
+            'buckets': dict(zip(bounds, self.counts)),
+        }
+
+
+class Job:
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, name: str, interval: float, priority: int,
+                 budget: float) -> None:
+        self.name = name
+        self.interval = interval
+        self.priority = priority
+        self.budget = budget
+
+        self.next_run = 0.
+        self.last_run: Optional[float] = None
+        self.deferrals = 0
+        self.durations = Histogram()
+        self.overruns = 0
+        self.failures = 0
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_run
+
+    def to_dict(self) -> Dict:
+        return {
+            'interval': self.interval,
+            'priority': self.priority,
+            'budget': self.budget,
+            'last_run': self.last_run,
+            'overruns': self.overruns,
+            'failures': self.failures,
+            'deferrals': self.deferrals,
+            'duration': self.durations.to_dict(),
+        }
+
+
+class JobScheduler:
+    """ Runs periodic jobs of a service loop, each on its own interval.
+
+    Due jobs run in order of priority (lower value first). When a tick
+    exceeds `tick_budget`, the remaining due jobs are deferred to the next
+    tick, with their priority raised so that they are not starved. A job can
+    be woken up to run on the next tick, regardless of its interval.
+    """
+
+    def __init__(self, tick_budget: float = 0.5) -> None:
+        self.tick_budget = tick_budget
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, interval: float = 1., priority: int = 0,
+            budget: float = 0.1) -> None:
+        self._jobs[name] = Job(name, interval, priority, budget)
+
+    def wake(self, name: str) -> None:
+        with self._lock:
+            self._jobs[name].next_run = 0.
+
+    def run(self, jobs: Dict[str, Callable[[], None]]) -> List[str]:
+        """ Runs the due jobs from `jobs`, a mapping of names of added jobs
+            to their callables. Returns names of the jobs that were run. """
+        started = time.monotonic()
+        with self._lock:
+            due = sorted(
+                (job for name, job in self._jobs.items()
+                 if name in jobs and job.due(started)),
+                key=lambda job: (job.priority - job.deferrals, -job.deferrals),
+            )
+            for job in due:
+                # set before running, a wake-up during the run is not lost
+                job.next_run = started + job.interval
+
+        done = []
+        for job in due:
+            if done and time.monotonic() - started > self.tick_budget:
+                job.deferrals += 1
+                with self._lock:
+                    job.next_run = 0.
+                continue
+
+            self._run_job(job, jobs[job.name])
+            done.append(job.name)
+
+        if len(done) < len(due):
+            logger.debug("Deferred sync jobs: %r",
+                         [job.name for job in due if job.name not in done])
+        return done
+
+    @staticmethod
+    def _run_job(job: Job, func: Callable[[], None]) -> None:
+        job_started = time.monotonic()
+        try:
+            func()
+        except Exception:  # pylint: disable=broad-except
+            job.failures += 1
+            logger.exception("Sync job %r failed", job.name)
+
+        duration = time.monotonic() - job_started
+        job.durations.observe(duration)
+        job.last_run = time.time()
+        job.deferrals = 0
+        if duration > job.budget:
+            job.overruns += 1
+            logger.info("Sync job %r took %.3f s, over its %.3f s budget",
+                        job.name, duration, job.budget)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        return {name: job.to_dict() for name, job in self._jobs.items()}
+
+
+class ReactorLagMonitor(IService):
+    """ Measures how late the reactor runs delayed calls, which shows how
+        long it is blocked by the code it runs """
+
+    def __init__(self, interval: float = 1., clock=None) -> None:
+        self.interval = interval
+        # resolved on start, the reactor is not installed yet on import
+        self._clock = clock
+        self.lags = Histogram()
+        self.last_lag = 0.
+        self._call = None
+        self._expected = 0.
+
+    @property
+    def running(self) -> bool:
+        return self._call is not None
+
+    def start(self) -> None:
+        if self.running:
+            raise RuntimeError("service already started")
+        if self._clock is None:
+            from twisted.internet import reactor
+            self._clock = reactor
+        self._schedule()
+
+    def stop(self) -> None:
+        if not self.running:
+            raise RuntimeError("service not started")
+        if self._call.active():
+            self._call.cancel()
+        self._call = None
+
+    def _schedule(self) -> None:
+        self._expected = self._clock.seconds() + self.interval
+        self._call = self._clock.callLater(self.interval, self._tick)
+
+    def _tick(self) -> None:
+        self.last_lag = max(0., self._clock.seconds() - self._expected)
+        self.lags.observe(self.last_lag)
+        self._schedule()
+
+    def get_stats(self) -> Dict:
+        stats = self.lags.to_dict()
+        stats['last'] = self.last_lag
+        return stats
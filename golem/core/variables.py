@@ -63,6 +63,8 @@ CONCENT_PULL_INTERVAL = (MAX_CONCENT_PING_INTERVAL / 2).total_seconds()
 
 # Number of task headers transmitted per message
 TASK_HEADERS_LIMIT = 20
+# Task headers already known by a peer are sent again after (seconds)
+TASK_HEADERS_RESEND_INTERVAL = 10 * 60
 KEY_DIFFICULTY = 14
 
 # Maximum acceptable difference between node time and monitor time (seconds)
@@ -127,9 +129,15 @@ PAYMENT_DEADLINE = 24 * 60 * 60
 # CONCENT CONST #
 #################
 NUM_OF_RES_TRANSFERS_NEEDED_FOR_VER = 3
+# Number of requests sent to Concent concurrently
+CONCENT_MAX_IN_FLIGHT = 4
+# Number of files transferred to and from Concent storage concurrently
+CONCENT_FILETRANSFERS_MAX_IN_FLIGHT = 2
+# Size of a chunk of a file streamed to or from Concent storage (bytes)
+CONCENT_FILETRANSFERS_CHUNK_SIZE = 64 * 1024
 
 #################
 # TASK DEFINITION PICKLED VERSION #
 #################
 
-PICKLED_VERSION = 2
+PICKLED_VERSION = 3
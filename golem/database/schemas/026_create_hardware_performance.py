@@ -0,0 +1,29 @@
+# pylint: disable=no-member
+# pylint: disable=unused-argument
+import datetime
+
+import peewee as pw
+
+SCHEMA_VERSION = 26
+
+
+def migrate(migrator, database, fake=False, **kwargs):
+    @migrator.create_model  # pylint: disable=unused-variable
+    class HardwarePerformance(pw.Model):
+        environment_id = pw.CharField(index=True)
+        fingerprint = pw.CharField()
+        cpu_model = pw.CharField()
+        cpu_cores = pw.SmallIntegerField()
+        memory = pw.IntegerField()
+        vm = pw.CharField(default='')
+        value = pw.FloatField()
+        created_date = pw.DateTimeField(default=datetime.datetime.now)
+        modified_date = pw.DateTimeField(default=datetime.datetime.now)
+
+        class Meta:
+            db_table = "hardwareperformance"
+            primary_key = pw.CompositeKey('environment_id', 'fingerprint')
+
+
+def rollback(migrator, database, fake=False, **kwargs):
+    migrator.remove_model("hardwareperformance")
@@ -22,12 +22,8 @@ class DockerCommandHandler:
     TIMEOUT = 180
 
     commands: CommandDict = dict(
-        build=['docker', 'build'],
-        tag=['docker', 'tag'],
-        pull=['docker', 'pull'],
         version=['docker', '-v'],
         help=['docker', '--help'],
-        images=['docker', 'images', '-q'],
         info=['docker', 'info'],
     )
 
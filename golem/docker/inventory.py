@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set
+
+import docker.errors
+import requests
+
+from .client import local_client
+
+__all__ = ['ImageInventory']
+
+logger = logging.getLogger(__name__)
+
+ID_PREFIX = 'sha256:'
+
+
+def _normalize_name(name: str) -> str:
+    """ Docker reports Docker Hub images without the registry and the
+        "library/" namespace """
+    for prefix in ('docker.io/', 'library/'):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name
+
+
+def _normalize_id(image_id: str) -> str:
+    if image_id.startswith(ID_PREFIX):
+        return image_id
+    return ID_PREFIX + image_id
+
+
+class ImageInventory:
+    """ In-process copy of the list of local Docker images.
+
+        The list is loaded once and reloaded whenever the daemon reports an
+        image event (pull, tag, untag, delete, ...). Events are read in
+        `EVENTS_WINDOW` second windows, so that the watcher can be stopped
+        and reconnects after the daemon (or its VM) is restarted. The list is
+        also reloaded every `REFRESH_INTERVAL` seconds in case an event has
+        been missed, e.g. while the daemon was not reachable.
+
+        Lookups by name and by id do not talk to the daemon. """
+
+    EVENTS_WINDOW = 5  # s
+    REFRESH_INTERVAL = 60  # s
+
+    _instance: Optional['ImageInventory'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self,
+                 client_factory: Callable = local_client,
+                 events_window: int = EVENTS_WINDOW,
+                 refresh_interval: float = REFRESH_INTERVAL) -> None:
+        self._client_factory = client_factory
+        self._events_window = events_window
+        self._refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._tags: Dict[str, str] = {}  # repository:tag -> image id
+        self._ids: Dict[str, Set[str]] = {}  # image id -> repository:tag
+        self._loaded = False
+        self._loaded_at = 0.
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def instance(cls) -> 'ImageInventory':
+        """ Shared inventory of the local daemon, watched in background """
+        with cls._instance_lock:
+            if not cls._instance:
+                cls._instance = cls()
+                cls._instance.start()
+            return cls._instance
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name='ImageInventory', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(self._events_window + 5)
+
+    def reload(self) -> bool:
+        """ Lists the images of the daemon. Returns False when the daemon
+            can't be reached; the previous list is kept in that case. """
+        try:
+            images = self._client_factory().images()
+        except (docker.errors.DockerException,
+                requests.exceptions.RequestException) as e:
+            logger.debug("Can't list Docker images: %r", e)
+            return False
+        self._update(images)
+        return True
+
+    def invalidate(self) -> None:
+        """ Forces a reload on the next lookup """
+        with self._lock:
+            self._loaded = False
+
+    def has_name(self, name: str) -> bool:
+        """ Whether there is an image tagged `name` ('repository:tag') """
+        return self.get_id(name) is not None
+
+    def get_id(self, name: str) -> Optional[str]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._tags.get(_normalize_name(name))
+
+    def get_names(self, image_id: str) -> Set[str]:
+        """ Tags of the image with the given (full or short) id """
+        self._ensure_loaded()
+        image_id = _normalize_id(image_id)
+        with self._lock:
+            names = self._ids.get(image_id)
+            if names is None:
+                # Short ids are rare, fall back to a prefix match
+                names = next((
+                    tags for full_id, tags in self._ids.items()
+                    if full_id.startswith(image_id)
+                ), set())
+            return set(names)
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            loaded = self._loaded
+        if not loaded:
+            self.reload()
+
+    def _update(self, images: Iterable[dict]) -> None:
+        tags: Dict[str, str] = {}
+        ids: Dict[str, Set[str]] = {}
+        for image in images:
+            image_id = image['Id']
+            names = {_normalize_name(name)
+                     for name in image.get('RepoTags') or []
+                     if name != '<none>:<none>'}
+            ids[image_id] = names
+            tags.update((name, image_id) for name in names)
+
+        with self._lock:
+            self._tags, self._ids = tags, ids
+            self._loaded = True
+            self._loaded_at = time.monotonic()
+
+    def _watch(self) -> None:
+        since = int(time.time())
+        while not self._stop_event.is_set():
+            until = since + self._events_window
+            try:
+                changed = self._read_events(since, until)
+            except (docker.errors.DockerException,
+                    requests.exceptions.RequestException) as e:
+                logger.debug("Can't read Docker image events: %r", e)
+                # The daemon may have been restarted with a different list
+                self.invalidate()
+                if self._stop_event.wait(self._events_window):
+                    return
+                since = int(time.time())
+                continue
+
+            stale = time.monotonic() - self._loaded_at \
+                >= self._refresh_interval
+            if changed or stale:
+                self.reload()
+            since = until
+
+    def _read_events(self, since: int, until: int) -> bool:
+        """ Blocks until `until` and returns whether any image has changed """
+        changed = False
+        events = self._client_factory().events(
+            since=since, until=until, decode=True,
+            filters={'type': 'image'})
+        for event in events:
+            logger.debug('Docker image event: %r', event)
+            changed = True
+        return changed
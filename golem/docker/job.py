@@ -43,13 +43,18 @@ class DockerJob:
     # Mounted read-write in the container.
     OUTPUT_DIR = "/golem/output"
 
+    # The task script reports its progress by writing a number between 0 and 1
+    # to this file. Placed in WORK_DIR.
+    PROGRESS_FILE = "progress"
+
     # these keys/values pairs will be saved in "params" module - it is
     # dynamically created during docker setup and available for import
     # inside docker
     PATH_PARAMS = {
         "RESOURCES_DIR": RESOURCES_DIR,
         "WORK_DIR": WORK_DIR,
-        "OUTPUT_DIR": OUTPUT_DIR
+        "OUTPUT_DIR": OUTPUT_DIR,
+        "PROGRESS_FILE": posixpath.join(WORK_DIR, PROGRESS_FILE),
     }
 
     # Name of the parameters file, relative to WORK_DIR
@@ -182,6 +187,20 @@ class DockerJob:
     def _get_host_params_path(self):
         return os.path.join(self.work_dir, self.PARAMS_FILE)
 
+    def _get_host_progress_path(self):
+        return os.path.join(self.work_dir, self.PROGRESS_FILE)
+
+    def get_progress(self) -> Optional[float]:
+        """ Returns the progress last reported by the task script,
+        or None if it has not reported anything yet.
+        """
+        try:
+            with open(self._get_host_progress_path()) as progress_file:
+                progress = float(progress_file.read().strip())
+        except (OSError, ValueError):
+            return None
+        return min(1.0, max(0.0, progress))
+
     @staticmethod
     def _host_dir_chmod(dst_dir, mod):
         if isinstance(mod, str):
@@ -6,16 +6,21 @@ from pathlib import Path
 from threading import Thread
 from typing import Optional, Callable, Any, Iterable
 
+import docker.errors
+
 from golem import hardware
 from golem.core.common import is_linux, is_windows, is_osx
 from golem.core.threads import ThreadQueueExecutor
 from golem.docker.commands.docker import DockerCommandHandler
+from golem.docker.client import local_client
 from golem.docker.config import DockerConfigManager, APPS_DIR, IMAGES_INI, \
     CONSTRAINT_KEYS, MIN_CONSTRAINTS, DEFAULTS
 from golem.docker.hypervisor.docker_for_mac import DockerForMac
 from golem.docker.hypervisor.hyperv import HyperVHypervisor
 from golem.docker.hypervisor.virtualbox import VirtualBoxHypervisor
 from golem.docker.hypervisor.xhyve import XhyveHypervisor
+from golem.docker.inventory import ImageInventory
+from golem.docker.pool import DockerContainerPool
 from golem.docker.task_thread import DockerBind
 from golem.report import report_calls, Component
 
@@ -31,6 +36,7 @@ class DockerManager(DockerConfigManager):
         self._config_locked = False
         self._env_checked = False
         self._threads = ThreadQueueExecutor(queue_name='docker-machine')
+        self.container_pool: Optional[DockerContainerPool] = None
 
         if config_desc:
             self.build_config(config_desc)
@@ -132,6 +138,24 @@ class DockerManager(DockerConfigManager):
             memory_size=memory,
             cpu_count=config_desc.num_cores,
         )
+        self._update_container_pool(config_desc.num_cores)
+
+    def _update_container_pool(self, num_cores: int) -> None:
+        # Jobs are executed in warm containers only when the host directories
+        # can be bind-mounted directly, i.e. without a VM
+        if not is_linux():
+            return
+        if self.container_pool:
+            self.container_pool.reconfigure(self._container_host_config,
+                                            num_cores)
+        else:
+            self.container_pool = DockerContainerPool(
+                self._container_host_config, num_cores)
+
+    def quit(self) -> None:
+        if self.container_pool:
+            self.container_pool.drain()
+        super().quit()
 
     @contextmanager
     def locked_config(self):
@@ -211,6 +235,10 @@ class DockerManager(DockerConfigManager):
         else:
             done_callback()
 
+    @property
+    def image_inventory(self) -> ImageInventory:
+        return ImageInventory.instance()
+
     @staticmethod
     def command(*args, **kwargs) -> Optional[str]:
         kwargs.pop('machine_name', None)
@@ -218,6 +246,7 @@ class DockerManager(DockerConfigManager):
 
     def build_images(self):
         entries = []
+        self.image_inventory.reload()
 
         for entry in self._collect_images():
             version = self._image_version(entry)
@@ -226,7 +255,7 @@ class DockerManager(DockerConfigManager):
                 logger.warning('Image %s is not supported', version)
                 continue
 
-            if not self.command('images', args=[version]):
+            if not self.image_inventory.has_name(version):
                 entries.append(entry)
 
         if entries:
@@ -234,25 +263,30 @@ class DockerManager(DockerConfigManager):
 
     @report_calls(Component.docker, 'images.build')
     def _build_images(self, entries):
-        cwd = os.getcwd()
-
-        for entry in entries:
-            image, docker_file, _, build_dir = entry[:4]
-            version = self._image_version(entry)
+        client = local_client()
 
-            try:
-                os.chdir(APPS_DIR)
+        try:
+            for entry in entries:
+                image, docker_file, tag, build_dir = entry[:4]
+                version = self._image_version(entry)
+                path = os.path.join(APPS_DIR, build_dir)
                 logger.warning('Docker: building image %s', version)
 
-                self.command('build', args=['-t', image,
-                                            '-f', docker_file,
-                                            build_dir])
-                self.command('tag', args=[image, version])
-            finally:
-                os.chdir(cwd)
+                self._check_output(client.build(
+                    path=path,
+                    dockerfile=os.path.relpath(
+                        os.path.join(APPS_DIR, docker_file), path),
+                    tag=image,
+                    rm=True,
+                    decode=True,
+                ))
+                client.tag(image, image, tag=tag)
+        finally:
+            self.image_inventory.reload()
 
     def pull_images(self):
         entries = []
+        self.image_inventory.reload()
 
         for entry in self._collect_images():
             version = self._image_version(entry)
@@ -261,21 +295,35 @@ class DockerManager(DockerConfigManager):
                 logger.warning('Image %s is not supported', version)
                 continue
 
-            if not self.command('images', args=[version]):
+            if not self.image_inventory.has_name(version):
                 entries.append(entry)
 
         if entries:
             self._pull_images(entries)
 
     def _pull_images(self, entries):
-        for entry in entries:
-            version = self._image_version(entry)
-            self._pull_image(version)
+        try:
+            for entry in entries:
+                image, _, tag = entry[:3]
+                self._pull_image(image, tag)
+        finally:
+            self.image_inventory.reload()
 
     @report_calls(Component.docker, 'images.pull')
-    def _pull_image(self, version):
-        logger.warning('Docker: pulling image %r', version)
-        self.command('pull', args=[version])
+    def _pull_image(self, image, tag):
+        logger.warning('Docker: pulling image %s:%s', image, tag)
+        self._check_output(local_client().pull(
+            image, tag=tag, stream=True, decode=True))
+
+    @staticmethod
+    def _check_output(output: Iterable[dict]) -> None:
+        """ Consumes the progress stream of a build or a pull. Errors are
+            reported in the stream and not with the HTTP status. """
+        for chunk in output:
+            if 'error' in chunk:
+                raise docker.errors.DockerException(chunk['error'])
+            message = chunk.get('stream') or chunk.get('status') or ''
+            logger.debug('Docker: %s', message.rstrip())
 
     @classmethod
     def _image_version(cls, entry):
@@ -0,0 +1,434 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import docker.errors
+import requests
+
+from golem.docker.client import local_client
+from golem.docker.job import DockerJob
+
+__all__ = ['DockerContainerPool', 'PooledDockerJob', 'WarmContainer']
+
+logger = logging.getLogger(__name__)
+
+
+class WarmContainer:
+    """ A long-running container reused by consecutive jobs of the same image,
+    together with the host directories mounted in it """
+
+    def __init__(self, image_name: str, container_id: str, slot_dir: str,
+                 generation: int) -> None:
+        self.image_name = image_name
+        self.container_id = container_id
+        self.slot_dir = slot_dir
+        self.generation = generation
+        self.jobs_run = 0
+
+    @property
+    def resources_dir(self) -> str:
+        return os.path.join(self.slot_dir, 'resources')
+
+    @property
+    def work_dir(self) -> str:
+        return os.path.join(self.slot_dir, 'work')
+
+    @property
+    def output_dir(self) -> str:
+        return os.path.join(self.slot_dir, 'output')
+
+    @property
+    def logs_dir(self) -> str:
+        return os.path.join(self.slot_dir, 'logs')
+
+    @property
+    def binds(self) -> Dict[str, str]:
+        """ Host directory -> path in the container """
+        return {
+            self.resources_dir: DockerJob.RESOURCES_DIR,
+            self.work_dir: DockerJob.WORK_DIR,
+            self.output_dir: DockerJob.OUTPUT_DIR,
+            self.logs_dir: DockerContainerPool.LOGS_DIR,
+        }
+
+    def __repr__(self):
+        return '<WarmContainer {} ({}), jobs run: {}>'.format(
+            self.container_id, self.image_name, self.jobs_run)
+
+
+class DockerContainerPool:
+    """ Keeps pre-created, resource-limited containers for the images used
+    by the computed tasks, so that a job does not pay for creating and
+    starting a new container.
+
+    Every container idles (see `IDLE_COMMAND`) and jobs are run in it with
+    `docker exec`. Each job gets clean work, resources and output
+    directories. A container is removed after `MAX_JOBS_PER_CONTAINER` jobs,
+    after a failed or killed job and when the hardware preset changes.
+    The total number of containers is bounded by the number of cores.
+    """
+
+    LABEL = 'golem.container_pool'
+    # Keeps the container alive between the jobs
+    IDLE_COMMAND = 'tail -f /dev/null'
+    # Directory with stdout and stderr of the job. Mounted read-write.
+    LOGS_DIR = '/golem/logs'
+    STDOUT_FILE = 'stdout.log'
+    STDERR_FILE = 'stderr.log'
+
+    MAX_JOBS_PER_CONTAINER = 20
+
+    def __init__(self, host_config: Dict, max_containers: int) -> None:
+        self._host_config = dict(host_config)
+        self._max_containers = max(1, max_containers)
+        self._idle: Dict[str, List[WarmContainer]] = defaultdict(list)
+        self._in_use: Dict[str, WarmContainer] = dict()
+        self._generation = 0
+        self._root_dir: Optional[str] = None
+        self._lock = threading.Lock()
+        self.stats = dict(created=0, reused=0, recycled=0)
+
+    @property
+    def size(self) -> int:
+        return len(self._in_use) + sum(map(len, self._idle.values()))
+
+    def reconfigure(self, host_config: Dict, max_containers: int) -> None:
+        """ Applies the resource limits of a new hardware preset. Containers
+            created with the old limits are removed once they are idle. """
+        with self._lock:
+            self._max_containers = max(1, max_containers)
+            if host_config == self._host_config:
+                return
+            self._host_config = dict(host_config)
+            self._generation += 1
+        logger.info("Docker container pool: resource limits changed")
+        self.drain()
+
+    def acquire(self, image_name: str) -> WarmContainer:
+        with self._lock:
+            idle = self._idle[image_name]
+            if idle:
+                container = idle.pop()
+                self._in_use[container.container_id] = container
+                self.stats['reused'] += 1
+                return container
+            generation = self._generation
+            evicted = self._evict()
+
+        for container in evicted:
+            self._remove(container)
+
+        container = self._create(image_name, generation)
+        with self._lock:
+            self._in_use[container.container_id] = container
+            self.stats['created'] += 1
+        return container
+
+    def release(self, container: WarmContainer, failed: bool = False) -> None:
+        with self._lock:
+            if self._in_use.pop(container.container_id, None) is None:
+                return  # already discarded
+
+        container.jobs_run += 1
+        recycle = failed \
+            or container.jobs_run >= self.MAX_JOBS_PER_CONTAINER \
+            or container.generation != self._generation
+
+        if not recycle:
+            try:
+                self._reset_dirs(container)
+            except OSError as exc:
+                logger.warning("Cannot clean up %r: %r", container, exc)
+                recycle = True
+
+        with self._lock:
+            if not recycle and self.size < self._max_containers:
+                self._idle[container.image_name].append(container)
+                return
+            self.stats['recycled'] += 1
+
+        self._remove(container)
+        # prepare a replacement for the next job while this one is uploaded
+        threading.Thread(target=self.warm_up, args=(container.image_name,),
+                         name="ContainerPoolWarmUp", daemon=True).start()
+
+    def warm_up(self, image_name: str) -> None:
+        """ Pre-creates an idle container for the image, if there is room
+            in the pool """
+        with self._lock:
+            if self._idle[image_name] or self.size >= self._max_containers:
+                return
+            generation = self._generation
+
+        try:
+            container = self._create(image_name, generation)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Cannot create a pooled container for %s: %r",
+                           image_name, exc)
+            return
+
+        with self._lock:
+            self._idle[image_name].append(container)
+            self.stats['created'] += 1
+
+    def discard(self, container: WarmContainer) -> None:
+        """ Removes the container immediately, killing the running job """
+        with self._lock:
+            self._in_use.pop(container.container_id, None)
+            for idle in self._idle.values():
+                if container in idle:
+                    idle.remove(container)
+        self._remove(container)
+
+    def drain(self) -> None:
+        """ Removes all idle containers """
+        with self._lock:
+            idle = [c for containers in self._idle.values() for c in containers]
+            self._idle.clear()
+        for container in idle:
+            self._remove(container)
+
+    def _evict(self) -> List[WarmContainer]:
+        """ Makes room for a new container by taking idle containers of
+            other images out of the pool. Must be called with the lock held.
+        """
+        evicted: List[WarmContainer] = []
+        for idle in self._idle.values():
+            while idle and self.size >= self._max_containers:
+                evicted.append(idle.pop(0))
+        return evicted
+
+    def _get_root_dir(self) -> str:
+        if self._root_dir is None:
+            self._remove_stale_containers()
+            self._root_dir = tempfile.mkdtemp(prefix='golem-container-pool-')
+        return self._root_dir
+
+    def _create(self, image_name: str, generation: int) -> WarmContainer:
+        slot_dir = tempfile.mkdtemp(dir=self._get_root_dir())
+        container = WarmContainer(image_name, '', slot_dir, generation)
+        self._reset_dirs(container)
+
+        client = local_client()
+        host_config = client.create_host_config(
+            binds={
+                src: {'bind': dst, 'mode': 'rw'}
+                for src, dst in container.binds.items()
+            },
+            **self._host_config
+        )
+        try:
+            created = client.create_container(
+                image=image_name,
+                volumes=list(container.binds.values()),
+                host_config=host_config,
+                command=[self.IDLE_COMMAND],
+                working_dir=DockerJob.WORK_DIR,
+                environment=DockerJob.get_environment(),
+                labels={self.LABEL: ''},
+            )
+            container.container_id = created['Id']
+            client.start(container.container_id)
+        except Exception:
+            self._remove(container)
+            raise
+
+        logger.debug("Docker container pool: created %r", container)
+        return container
+
+    def _remove(self, container: WarmContainer) -> None:
+        if container.container_id:
+            try:
+                local_client().remove_container(container.container_id,
+                                                force=True)
+            except (docker.errors.APIError,
+                    requests.exceptions.RequestException) as exc:
+                logger.debug("Cannot remove container %s: %r",
+                             container.container_id, exc)
+        shutil.rmtree(container.slot_dir, ignore_errors=True)
+        logger.debug("Docker container pool: removed %r", container)
+
+    def _remove_stale_containers(self) -> None:
+        """ Removes pooled containers left behind by a previous run """
+        try:
+            client = local_client()
+            for stale in client.containers(all=True,
+                                           filters={'label': self.LABEL}):
+                client.remove_container(stale['Id'], force=True)
+        except (docker.errors.APIError,
+                requests.exceptions.RequestException) as exc:
+            logger.debug("Cannot remove stale pooled containers: %r", exc)
+
+    @staticmethod
+    def _reset_dirs(container: WarmContainer) -> None:
+        for path in container.binds:
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path)
+            os.chmod(path, 0o770)
+
+
+class PooledDockerJob(DockerJob):
+    """ DockerJob executed in a warm container taken from
+    DockerContainerPool. The job directories are copied to the directories
+    mounted in the container before the job starts and back after it ends.
+    """
+
+    # Interval of polling the exec instance for its exit code
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, pool: DockerContainerPool, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool = pool
+        self.warm_container: Optional[WarmContainer] = None
+        self.exec_id = None
+        self.failed = False
+
+    def _prepare(self):
+        with open(self._get_host_params_path(), "w") as params_file:
+            json.dump(self.parameters, params_file)
+
+        self.warm_container = self.pool.acquire(self.image.name)
+        self.container_id = self.warm_container.container_id
+        self.container = {'Id': self.container_id}
+
+        try:
+            _copy_tree(self.resources_dir, self.warm_container.resources_dir,
+                       link=True)
+            _copy_tree(self.work_dir, self.warm_container.work_dir)
+        except OSError:
+            self.failed = True
+            self._cleanup()
+            raise
+
+        self.state = self.STATE_CREATED
+        logger.debug("Job prepared in pooled container %s, image: %s",
+                     self.container_id, self.image.name)
+
+    def _cleanup(self):
+        warm_container = self.warm_container
+        if not warm_container:
+            return
+
+        self.warm_container = None
+        self.container = None
+        self.container_id = None
+        self.state = self.STATE_REMOVED
+
+        if not self.failed:
+            try:
+                _copy_tree(warm_container.work_dir, self.work_dir)
+                _copy_tree(warm_container.output_dir, self.output_dir)
+            except OSError as exc:
+                logger.warning("Cannot copy the job output: %r", exc)
+                self.failed = True
+        self.pool.release(warm_container, failed=self.failed)
+
+    def start(self):
+        if self.state != self.STATE_CREATED:
+            logger.debug("Job in container %s not started, status = %s",
+                         self.container_id, self.state)
+            return None
+
+        command = '{} > {} 2> {}'.format(
+            self.entrypoint,
+            os.path.join(self.pool.LOGS_DIR, self.pool.STDOUT_FILE),
+            os.path.join(self.pool.LOGS_DIR, self.pool.STDERR_FILE))
+        environment = dict(self.environment)
+        environment.setdefault('HOME', '/home/task')
+
+        client = local_client()
+        self.exec_id = client.exec_create(
+            self.container_id,
+            ['/bin/sh', '-c', command],
+            user=str(os.getuid()),
+            environment=environment,
+            workdir=self.WORK_DIR,
+        )['Id']
+        client.exec_start(self.exec_id, detach=True)
+        self.state = self.STATE_RUNNING
+        logger.debug("Job started in pooled container %s", self.container_id)
+        return client.exec_inspect(self.exec_id)
+
+    def wait(self, timeout=None):
+        if self.state not in [self.STATE_RUNNING, self.STATE_EXITED]:
+            logger.debug("Cannot wait for job in container %s, status = %s",
+                         self.container_id, self.state)
+            return -1
+
+        deadline = time.time() + timeout if timeout else None
+        client = local_client()
+        while True:
+            try:
+                inspect = client.exec_inspect(self.exec_id)
+            except docker.errors.APIError:
+                # container was removed by kill()
+                self.failed = True
+                return -1
+            if not inspect['Running']:
+                self.state = self.STATE_EXITED
+                exit_code = inspect['ExitCode']
+                self.failed = self.failed or exit_code != 0
+                return exit_code
+            if deadline and time.time() > deadline:
+                self.failed = True
+                raise requests.exceptions.ReadTimeout()
+            time.sleep(self.POLL_INTERVAL)
+
+    def kill(self):
+        warm_container = self.warm_container
+        if self.state != self.STATE_RUNNING or not warm_container:
+            return
+        self.failed = True
+        self.state = self.STATE_KILLED
+        self.pool.discard(warm_container)
+
+    def dump_logs(self, stdout_file=None, stderr_file=None):
+        if not self.warm_container:
+            return
+        logs_dir = self.warm_container.logs_dir
+        for name, path in ((self.pool.STDOUT_FILE, stdout_file),
+                           (self.pool.STDERR_FILE, stderr_file)):
+            if not path:
+                continue
+            src = os.path.join(logs_dir, name)
+            if os.path.exists(src):
+                shutil.copyfile(src, path)
+            else:
+                open(path, 'wb').close()
+
+    def get_status(self):
+        return self.state
+
+    def _get_host_progress_path(self):
+        warm_container = self.warm_container
+        if not warm_container:
+            return super()._get_host_progress_path()
+        return os.path.join(warm_container.work_dir, self.PROGRESS_FILE)
+
+
+def _copy_tree(src: str, dst: str, link: bool = False) -> None:
+    """ Copies the contents of `src` into the existing directory `dst`.
+        Files are hard-linked when `link` is set and it is possible. """
+    for root, dirs, files in os.walk(src):
+        rel = os.path.relpath(root, src)
+        target = os.path.join(dst, rel) if rel != os.curdir else dst
+        for name in dirs:
+            os.makedirs(os.path.join(target, name), exist_ok=True)
+        for name in files:
+            src_file = os.path.join(root, name)
+            dst_file = os.path.join(target, name)
+            if os.path.lexists(dst_file):
+                os.remove(dst_file)
+            if link:
+                try:
+                    os.link(src_file, dst_file)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(src_file, dst_file)
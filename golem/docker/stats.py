@@ -0,0 +1,254 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+import docker.errors
+import requests
+
+from .client import local_client
+
+__all__ = ['ResourceUsage', 'ContainerStatsCollector']
+
+logger = logging.getLogger(__name__)
+
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+
+class ResourceUsage(NamedTuple):
+    """ Resources used by a single container """
+    peak_memory: int = 0  # bytes
+    cpu_time: float = 0.  # s
+    block_read: int = 0  # bytes
+    block_write: int = 0  # bytes
+    wall_time: float = 0.  # s
+
+    @property
+    def cpu_utilization(self) -> float:
+        """ CPU time per second of wall time. Well below the number of
+            cores used for I/O bound computations. """
+        if self.wall_time <= 0:
+            return 0.
+        return self.cpu_time / self.wall_time
+
+    def to_dict(self) -> dict:
+        usage = self._asdict()
+        usage['cpu_utilization'] = self.cpu_utilization
+        return usage
+
+
+def _read_int(path: Path) -> int:
+    return int(path.read_text().strip())
+
+
+def _read_keys(path: Path) -> Dict[str, int]:
+    """ Parses 'key value' lines, e.g. of the cgroup v2 cpu.stat file """
+    values = {}
+    for line in path.read_text().splitlines():
+        key, _, value = line.partition(' ')
+        values[key] = int(value)
+    return values
+
+
+def _container_groups(container_id: str):
+    # cgroupfs and systemd cgroup drivers respectively
+    return (
+        Path('docker') / container_id,
+        Path('system.slice') / 'docker-{}.scope'.format(container_id),
+    )
+
+
+def read_cgroup_v1(container_id: str, root: Path = CGROUP_ROOT) \
+        -> Optional[Dict[str, int]]:
+    group = next((
+        path for path in _container_groups(container_id)
+        if (root / 'memory' / path).is_dir()
+    ), None)
+    if group is None:
+        return None
+
+    stats = {
+        'memory': _read_int(root / 'memory' / group / 'memory.usage_in_bytes'),
+        'memory_peak': _read_int(
+            root / 'memory' / group / 'memory.max_usage_in_bytes'),
+        'cpu_ns': _read_int(root / 'cpuacct' / group / 'cpuacct.usage'),
+        'block_read': 0,
+        'block_write': 0,
+    }
+    blkio = root / 'blkio' / group / 'blkio.throttle.io_service_bytes'
+    if blkio.exists():
+        for line in blkio.read_text().splitlines():
+            fields = line.split()
+            if len(fields) != 3:
+                continue  # the "Total" line
+            if fields[1] == 'Read':
+                stats['block_read'] += int(fields[2])
+            elif fields[1] == 'Write':
+                stats['block_write'] += int(fields[2])
+    return stats
+
+
+def read_cgroup_v2(container_id: str, root: Path = CGROUP_ROOT) \
+        -> Optional[Dict[str, int]]:
+    group = next((
+        root / path for path in _container_groups(container_id)
+        if (root / path).is_dir()
+    ), None)
+    if group is None:
+        return None
+
+    stats = {
+        'memory': _read_int(group / 'memory.current'),
+        'cpu_ns': _read_keys(group / 'cpu.stat')['usage_usec'] * 1000,
+        'block_read': 0,
+        'block_write': 0,
+    }
+    # memory.peak is available since Linux 5.19
+    peak = group / 'memory.peak'
+    if peak.exists():
+        stats['memory_peak'] = _read_int(peak)
+    io_stat = group / 'io.stat'
+    if io_stat.exists():
+        for line in io_stat.read_text().splitlines():
+            for field in line.split()[1:]:
+                key, _, value = field.partition('=')
+                if key == 'rbytes':
+                    stats['block_read'] += int(value)
+                elif key == 'wbytes':
+                    stats['block_write'] += int(value)
+    return stats
+
+
+def parse_api_stats(stats: dict) -> Optional[Dict[str, int]]:
+    """ Converts a Docker stats API response """
+    memory_stats = stats.get('memory_stats') or {}
+    cpu_usage = (stats.get('cpu_stats') or {}).get('cpu_usage') or {}
+    if not memory_stats or 'total_usage' not in cpu_usage:
+        return None  # the container is not running
+
+    result = {
+        'memory': memory_stats.get('usage', 0),
+        'cpu_ns': cpu_usage['total_usage'],
+        'block_read': 0,
+        'block_write': 0,
+    }
+    # not reported on cgroup v2
+    if 'max_usage' in memory_stats:
+        result['memory_peak'] = memory_stats['max_usage']
+    io_bytes = (stats.get('blkio_stats') or {}) \
+        .get('io_service_bytes_recursive') or []
+    for entry in io_bytes:
+        op = entry.get('op', '').lower()
+        if op == 'read':
+            result['block_read'] += entry['value']
+        elif op == 'write':
+            result['block_write'] += entry['value']
+    return result
+
+
+class ContainerStatsCollector(threading.Thread):
+    """ Samples the resource usage of a running container every `interval`
+        seconds. The container's cgroup is read directly when the Docker
+        daemon runs on this host, otherwise the Docker stats API is used.
+
+        A warm container runs many jobs, so CPU time and block I/O are the
+        difference between the last sample and the one taken by
+        `take_baseline` before the job starts. The peak memory counters can't
+        be reset between jobs: peak memory is the maximum of the samples, or
+        the container's peak counter if the job has raised it. Wall time is
+        measured from `start` to `stop`. """
+
+    INTERVAL = 0.5
+
+    def __init__(self,
+                 container_id: str,
+                 interval: float = INTERVAL,
+                 cgroup_root: Path = CGROUP_ROOT) -> None:
+        super().__init__(name='ContainerStatsCollector', daemon=True)
+        self.container_id = container_id
+        self.interval = interval
+        self.cgroup_root = cgroup_root
+        self.samples = 0
+
+        self._stop_event = threading.Event()
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+        self._peak_memory = 0
+        self._baseline: Dict[str, int] = {}
+        self._last: Dict[str, int] = {}
+
+    def __enter__(self) -> 'ContainerStatsCollector':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.stop()
+        return False
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        super().start()
+
+    def stop(self) -> None:
+        self._stopped_at = time.monotonic()
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(self.interval + 5)
+        # the usage since the last sample
+        self.sample()
+
+    def take_baseline(self) -> None:
+        self._baseline = self._try_read() or {}
+
+    def run(self) -> None:
+        while True:
+            self.sample()
+            if self._stop_event.wait(self.interval):
+                return
+
+    def sample(self) -> None:
+        stats = self._try_read()
+        if stats is None:
+            return
+        self.samples += 1
+        memory = stats['memory']
+        if stats.get('memory_peak', 0) > self._baseline.get('memory_peak', 0):
+            memory = max(memory, stats['memory_peak'])
+        self._peak_memory = max(self._peak_memory, memory)
+        self._last = stats
+
+    def _try_read(self) -> Optional[Dict[str, int]]:
+        try:
+            return self._read()
+        except (OSError, ValueError, KeyError,
+                docker.errors.APIError,
+                requests.exceptions.RequestException) as e:
+            logger.debug("Can't read stats of container %s: %r",
+                         self.container_id, e)
+            return None
+
+    def _read(self) -> Optional[Dict[str, int]]:
+        for read_cgroup in (read_cgroup_v1, read_cgroup_v2):
+            stats = read_cgroup(self.container_id, self.cgroup_root)
+            if stats is not None:
+                return stats
+        return parse_api_stats(
+            local_client().stats(self.container_id, stream=False))
+
+    @property
+    def usage(self) -> ResourceUsage:
+        started = self._started_at or time.monotonic()
+        stopped = self._stopped_at or time.monotonic()
+        return ResourceUsage(
+            peak_memory=self._peak_memory,
+            cpu_time=self._delta('cpu_ns') / 1e9,
+            block_read=self._delta('block_read'),
+            block_write=self._delta('block_write'),
+            wall_time=stopped - started,
+        )
+
+    def _delta(self, key: str) -> int:
+        if not self._last:
+            return 0
+        return max(self._last[key] - self._baseline.get(key, 0), 0)
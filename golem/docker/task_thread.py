@@ -8,9 +8,10 @@ import requests
 from golem.core.common import posix_path
 from golem.docker.image import DockerImage
 from golem.docker.job import DockerJob
+from golem.docker.pool import DockerContainerPool, PooledDockerJob
+from golem.docker.stats import ContainerStatsCollector, ResourceUsage
 from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.task.taskthread import TaskThread, JobException, TimeoutException
-from golem.vm.memorychecker import MemoryChecker
 
 if TYPE_CHECKING:
     from .manager import DockerManager  # noqa pylint:disable=unused-import
@@ -81,7 +82,8 @@ class DockerTaskThread(TaskThread):
                  extra_data: Dict,
                  dir_mapping: DockerDirMapping,
                  timeout: int,
-                 check_mem: bool = False) -> None:
+                 check_mem: bool = False,
+                 use_container_pool: bool = True) -> None:
 
         if not docker_images:
             raise AttributeError("docker images is None")
@@ -102,8 +104,14 @@ class DockerTaskThread(TaskThread):
                 break
 
         self.job: Optional[DockerJob] = None
+        self.progress = 0.0
         self.check_mem = check_mem
         self.dir_mapping = dir_mapping
+        # Pooled jobs work on copies of the job directories, so a job which
+        # exchanges files with Golem while it runs must not be pooled
+        self.use_container_pool = use_container_pool
+        # Resources used by the container, set when the job is done
+        self.resource_usage: Optional[ResourceUsage] = None
 
     @staticmethod
     def specify_dir_mapping(resources: str, temporary: str, work: str,
@@ -124,7 +132,7 @@ class DockerTaskThread(TaskThread):
             if self.use_timeout and self.task_timeout < 0:
                 raise TimeoutException()
 
-            estm_mem = self._run_docker_job()
+            self.resource_usage = self._run_docker_job()
 
         except (requests.exceptions.ReadTimeout, TimeoutException) as exc:
             if not self.use_timeout:
@@ -140,7 +148,7 @@ class DockerTaskThread(TaskThread):
             self._fail(exc)
 
         else:
-            self._task_computed(estm_mem)
+            self._task_computed(self.resource_usage)
 
         finally:
             self.job = None
@@ -152,7 +160,7 @@ class DockerTaskThread(TaskThread):
             DockerBind(self.dir_mapping.output, DockerJob.OUTPUT_DIR)
         ]
 
-    def _run_docker_job(self) -> Optional[int]:
+    def _run_docker_job(self) -> ResourceUsage:
         self.dir_mapping.mkdirs()
 
         binds = self._get_default_binds()
@@ -201,12 +209,27 @@ class DockerTaskThread(TaskThread):
             host_config=host_config
         )
 
-        with DockerJob(**params) as job, MemoryChecker(self.check_mem) as mc:
+        # Warm containers are created with the default binds only
+        pool = getattr(self.docker_manager, 'container_pool', None)
+        if self.use_container_pool and isinstance(pool, DockerContainerPool) \
+                and not (devices or runtime) \
+                and len(binds) == len(self._get_default_binds()):
+            job: DockerJob = PooledDockerJob(pool, **params)
+        else:
+            job = DockerJob(**params)
+
+        with job:
             self.job = job
+            stats = ContainerStatsCollector(job.container_id)
+            # a warm container has run other jobs before
+            stats.take_baseline()
             job.start()
 
-            exit_code = job.wait()
-            estm_mem = mc.estm_mem
+            with stats:
+                exit_code = job.wait()
+            usage = stats.usage
+            logger.debug("Container %s resource usage: %r",
+                         job.container_id, usage)
 
             job.dump_logs(str(self.dir_mapping.logs / self.STDOUT_FILE),
                           str(self.dir_mapping.logs / self.STDERR_FILE))
@@ -221,22 +244,29 @@ class DockerTaskThread(TaskThread):
                                f'tail of stdout:\n{std_out}\n')
                 raise JobException(self._exit_code_message(exit_code))
 
-        return estm_mem
+        return usage
 
-    def _task_computed(self, estm_mem: Optional[int]) -> None:
+    def _task_computed(self, usage: ResourceUsage) -> None:
+        self.progress = 1.0
         out_files = [
             str(path) for path in self.dir_mapping.output.glob("*")
         ]
         self.result = {
             "data": out_files,
+            "resource_usage": usage.to_dict(),
         }
-        if estm_mem is not None:
-            self.result = (self.result, estm_mem)
+        if self.check_mem:
+            self.result = (self.result, usage.peak_memory)
         self._deferred.callback(self)
 
-    def get_progress(self):
-        # TODO: make the container update some status file? Issue #56
-        return 0.0
+    def get_progress(self) -> float:
+        job = self.job
+        if job:
+            progress = job.get_progress()
+            # never go back, e.g. when the job restarts reporting
+            if progress is not None and progress > self.progress:
+                self.progress = progress
+        return self.progress
 
     def end_comp(self):
         try:
@@ -4,6 +4,7 @@ import logging
 import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -89,6 +90,8 @@ class TransactionSystem(LoopingCallService):
     BLOCK_NUMBER_DB_KEY: ClassVar[str] = 'ets_subscriptions_block_number'
 
     LOOP_INTERVAL: ClassVar[int] = 13
+    # Number of chain queries run at the same time
+    CHAIN_QUERY_WORKERS: ClassVar[int] = 4
 
     def __init__(self, datadir: Path, config) -> None:
         super().__init__(self.LOOP_INTERVAL)
@@ -118,6 +121,12 @@ class TransactionSystem(LoopingCallService):
         self._gntb_balance: int = 0
         self._last_eth_update: Optional[float] = None
         self._last_gnt_update: Optional[float] = None
+        self._block_number: Optional[int] = None
+        self._last_block_update: Optional[float] = None
+        self._chain_query_executor = ThreadPoolExecutor(
+            max_workers=self.CHAIN_QUERY_WORKERS,
+            thread_name_prefix='chain-query',
+        )
         self._payments_locked: int = 0
         self._gntb_locked: int = 0
         self._gntb_withdrawn: int = 0
@@ -314,6 +323,7 @@ class TransactionSystem(LoopingCallService):
         self._payment_processor.sendout(0)
         self._save_subscription_block_number()
         self._sci.stop()
+        self._chain_query_executor.shutdown(wait=False)
         super().stop()
 
     def add_payment_info(
@@ -393,11 +403,21 @@ class TransactionSystem(LoopingCallService):
             'gnt_nonconverted': self._gnt_balance,
             'eth_available': self.get_available_eth(),
             'eth_locked': self.get_locked_eth(),
-            'block_number': self._sci.get_block_number(),
+            'block_number': self.get_block_number(),
             'gnt_update_time': self._last_gnt_update,
             'eth_update_time': self._last_eth_update,
+            'block_update_time': self._last_block_update,
         }
 
+    @sci_required()
+    def get_block_number(self) -> int:
+        """ Returns the block number from the last balance refresh, so that
+            it can be read without a round trip to the node """
+        self._sci: SmartContractsInterface
+        if self._block_number is None:
+            return self._sci.get_block_number()
+        return self._block_number
+
     def lock_funds_for_payments(self, price: int, num: int) -> None:
         if not self._payment_processor:
             raise Exception('Start was not called')
@@ -770,18 +790,33 @@ class TransactionSystem(LoopingCallService):
         now = time.mktime(datetime.today().timetuple())
         addr = self._sci.get_eth_address()
 
+        # The queries are independent, run them at the same time instead of
+        # waiting for the node's response to each one in turn
+        submit = self._chain_query_executor.submit
+        eth_balance = submit(self._sci.get_eth_balance, addr)
+        gnt_balance = submit(self._sci.get_gnt_balance, addr)
+        gntb_balance = submit(self._sci.get_gntb_balance, addr)
+        block_number = submit(self._sci.get_block_number)
+
         # Sometimes web3 may throw but it's fine here, we'll just update the
         # balances next time
         try:
-            self._eth_balance = self._sci.get_eth_balance(addr)
+            self._eth_balance = eth_balance.result()
             self._last_eth_update = now
 
-            self._gnt_balance = self._sci.get_gnt_balance(addr)
-            self._gntb_balance = self._sci.get_gntb_balance(addr)
+            # GNT and GNTB are updated together, conversion depends on both
+            gnt, gntb = gnt_balance.result(), gntb_balance.result()
+            self._gnt_balance, self._gntb_balance = gnt, gntb
             self._last_gnt_update = now
         except Exception as e:  # pylint: disable=broad-except
             log.warning('Failed to update balances: %r', e)
 
+        try:
+            self._block_number = block_number.result()
+            self._last_block_update = now
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning('Failed to update block number: %r', e)
+
     @sci_required()
     def _try_convert_gnt(self) -> None:  # pylint: disable=too-many-branches
         self._sci: SmartContractsInterface
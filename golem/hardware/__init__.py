@@ -1,3 +1,4 @@
+import functools
 import logging
 import sys
 from enum import Enum
@@ -5,6 +6,7 @@ from multiprocessing import cpu_count
 from typing import List, Optional, Dict
 
 import psutil
+from cpuinfo import get_cpu_info
 from psutil import virtual_memory
 
 from golem.appconfig import MIN_MEMORY_SIZE, TOTAL_MEMORY_CAP, MIN_CPU_CORES, \
@@ -115,6 +117,19 @@ def cpus() -> List[int]:
     return cpu_list
 
 
+@functools.lru_cache()
+def cpu_model() -> str:
+    """
+    :return str: The CPU brand string, e.g. 'Intel(R) Core(TM) i7-7700 CPU'.
+    Reading it takes a while, so the result is cached.
+    """
+    try:
+        return get_cpu_info().get('brand', '')
+    except Exception as e:
+        logger.debug("Couldn't read CPU model: %r", e)
+        return ''
+
+
 def memory() -> int:
     """
     :return int: 3/4 of total memory in KiB
@@ -18,6 +18,7 @@ class ComputingSubtaskStateSnapshot:
             frames: List[int],
             start_task: int,
             total_tasks: int,
+            seconds_since_progress: float = 0.0,
             # if there's something more in extra_data, just ignore it
             **_kwargs
     ) -> None:
@@ -31,6 +32,7 @@ class ComputingSubtaskStateSnapshot:
         self.frames = copy(frames)
         self.start_task = start_task
         self.total_tasks = total_tasks
+        self.seconds_since_progress = seconds_since_progress
 
 
 class LocalTaskStateSnapshot:
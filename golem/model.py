@@ -507,6 +507,39 @@ class Performance(BaseModel):
             perf.save()
 
 
+class HardwarePerformance(BaseModel):
+    """ Keeps benchmark performance measured on a hardware configuration """
+    environment_id = CharField(null=False, index=True)
+    fingerprint = CharField(null=False)
+    cpu_model = CharField(null=False)
+    cpu_cores = SmallIntegerField(null=False)
+    memory = IntegerField(null=False)
+    vm = CharField(null=False, default='')
+    value = FloatField(null=False)
+
+    class Meta:
+        database = db
+        primary_key = CompositeKey('environment_id', 'fingerprint')
+
+    @classmethod
+    def update_or_create(cls, env_id, hardware, performance):
+        try:
+            perf = HardwarePerformance.get(
+                HardwarePerformance.environment_id == env_id,
+                HardwarePerformance.fingerprint == hardware.fingerprint)
+            perf.value = performance
+            perf.save()
+        except HardwarePerformance.DoesNotExist:
+            HardwarePerformance.create(
+                environment_id=env_id,
+                fingerprint=hardware.fingerprint,
+                cpu_model=hardware.cpu_model,
+                cpu_cores=hardware.cpu_cores,
+                memory=hardware.memory,
+                vm=hardware.vm,
+                value=performance)
+
+
 ##################
 # MESSAGE MODELS #
 ##################
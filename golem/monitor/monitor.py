@@ -1,8 +1,9 @@
+import itertools
 import logging
-import queue
 import threading
 import time
-from typing import Optional, Dict
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
@@ -22,33 +23,136 @@ from .transport.sender import DefaultJSONSender as Sender
 log = logging.getLogger('golem.monitor')
 
 
+# Models describing the current state; only the newest one of each type is
+# worth sending
+SNAPSHOT_TYPES = (
+    NodeInfoModel,
+    statssnapshotmodel.StatsSnapshotModel,
+    statssnapshotmodel.VMSnapshotModel,
+    statssnapshotmodel.P2PSnapshotModel,
+    statssnapshotmodel.RequestorStatsModel,
+    statssnapshotmodel.RequestorAggregateStatsModel,
+    statssnapshotmodel.ProviderStatsModel,
+    TaskComputerSnapshotModel,
+)
+
+
+class MessageBuffer(object):
+    """ Bounded, thread-safe buffer of messages waiting to be sent. A new
+    snapshot replaces the queued one of the same type; when the buffer is
+    full, the oldest message is dropped. """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max(1, max_size)
+        self._messages: 'OrderedDict[object, object]' = OrderedDict()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._messages)
+
+    def put(self, msg) -> None:
+        if isinstance(msg, SNAPSHOT_TYPES):
+            key = type(msg)
+        else:
+            key = next(self._counter)
+
+        with self._lock:
+            if key in self._messages:
+                # keep the position in the queue, send the newest data
+                self._messages[key] = msg
+                self.coalesced += 1
+                return
+            if len(self._messages) >= self.max_size:
+                self._messages.popitem(last=False)
+                self.dropped += 1
+            self._messages[key] = msg
+
+    def take(self, count: int) -> List:
+        with self._lock:
+            return [self._messages.popitem(last=False)[1]
+                    for _ in range(min(count, len(self._messages)))]
+
+
 class SenderThread(threading.Thread):
-    def __init__(self, node_info, monitor_host, monitor_request_timeout,
-                 monitor_sender_thread_timeout, proto_ver):
+    # max. number of messages waiting to be sent
+    MAX_QUEUE_SIZE = 500
+    # seconds between sending the buffered messages
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 node_info, monitor_host, monitor_request_timeout,
+                 monitor_sender_thread_timeout, proto_ver,
+                 max_batch_size=1, flush_interval=FLUSH_INTERVAL,
+                 max_queue_size=MAX_QUEUE_SIZE):
         super(SenderThread, self).__init__()
-        self.queue = queue.Queue()
+        self.queue = MessageBuffer(max_queue_size)
         self.stop_request = threading.Event()
         self.node_info = node_info
         self.sender = Sender(monitor_host, monitor_request_timeout, proto_ver)
         self.monitor_sender_thread_timeout = monitor_sender_thread_timeout
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = min(flush_interval,
+                                  monitor_sender_thread_timeout)
+        self._last_sent = 0.
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self._latencies: Deque[float] = deque(maxlen=100)
 
     def send(self, o):
         self.queue.put(o)
 
     def run(self):
+        self._last_sent = time.time()
         while not self.stop_request.isSet():
-            try:
-                msg = self.queue.get(True, self.monitor_sender_thread_timeout)
-                if msg is None:
-                    continue
-                self.sender.send(msg)
-            except queue.Empty:
+            self.stop_request.wait(self.flush_interval)
+            sent = self.flush()
+            idle_time = time.time() - self._last_sent
+            if not sent and idle_time >= self.monitor_sender_thread_timeout:
                 # send ping message
-                self.sender.send(self.node_info)
+                self._send_batch([self.node_info])
+        # deliver what is left, e.g. the logout message
+        self.flush()
+
+    def flush(self) -> int:
+        """ Sends all the buffered messages; returns their number """
+        count = 0
+        while True:
+            batch = self.queue.take(self.max_batch_size)
+            if not batch:
+                return count
+            self._send_batch(batch)
+            count += len(batch)
+
+    def _send_batch(self, batch: List) -> None:
+        started = time.time()
+        if self.sender.send_batch(batch):
+            self.sent += len(batch)
+            self._latencies.append(time.time() - started)
+        else:
+            self.failed += len(batch)
+        self.batches += 1
+        self._last_sent = time.time()
+
+    def get_stats(self) -> Dict:
+        latencies = self._latencies
+        return {
+            'queued': len(self.queue),
+            'sent': self.sent,
+            'failed': self.failed,
+            'batches': self.batches,
+            'dropped': self.queue.dropped,
+            'coalesced': self.queue.coalesced,
+            'avg_latency':
+                sum(latencies) / len(latencies) if latencies else None,
+            'max_latency': max(latencies) if latencies else None,
+        }
 
     def join(self, timeout=None):
         self.stop_request.set()
-        self.queue.put(None)
         super(SenderThread, self).join(timeout)
 
 
@@ -74,7 +178,10 @@ class SystemMonitor(object):
                 host,
                 request_timeout,
                 sender_thread_timeout,
-                proto_ver
+                proto_ver,
+                max_batch_size=self.config.get('MAX_BATCH_SIZE', 1),
+                flush_interval=self.config.get('FLUSH_INTERVAL',
+                                               SenderThread.FLUSH_INTERVAL)
             )
         return self._sender_thread
 
@@ -136,6 +243,9 @@ class SystemMonitor(object):
     def start(self):
         self.sender_thread.start()
 
+    def get_sender_stats(self) -> Dict:
+        return self.sender_thread.get_stats()
+
     def shut_down(self):
         dispatcher.disconnect(self.dispatch_listener, signal='golem.monitor')
         dispatcher.disconnect(self.p2p_listener, signal='golem.p2p')
@@ -2,6 +2,8 @@ import logging
 import requests
 import time
 
+from requests.adapters import HTTPAdapter
+
 log = logging.getLogger('golem.monitor.transport')
 
 
@@ -11,13 +13,26 @@ class DefaultHttpSender(object):
         self.timeout = request_timeout
         self.json_headers = {'content-type': 'application/json'}
         self.last_exception_time = 0
+        # duration of the last successful request, in seconds
+        self.last_latency = None
+        # status code of the last response, None if there was none
+        self.last_status_code = None
+        # keep the connection to the monitor alive between requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def _post(self, headers, payload):
+        self.last_status_code = None
         try:
             log.debug(f'sending msg {payload}')
-            r = requests.post(self.url, data=payload, headers=headers,
-                              timeout=self.timeout)
+            started = time.time()
+            r = self.session.post(self.url, data=payload, headers=headers,
+                                  timeout=self.timeout)
             log.debug(f'result {r}')
+            self.last_latency = time.time() - started
+            self.last_status_code = r.status_code
             return r.status_code == 200
         except requests.exceptions.RequestException as e:
             delta = time.time() - self.last_exception_time
@@ -8,3 +8,7 @@ class DefaultProto(object):
     def prepare_json_message(self, d):
         json_dict = {'proto_ver': self.proto_version, 'data': d}
         return dict2json(json_dict)
+
+    def prepare_json_batch(self, dicts):
+        json_dict = {'proto_ver': self.proto_version, 'batch': dicts}
+        return dict2json(json_dict)
@@ -1,12 +1,35 @@
+import logging
+
 from .httptransport import DefaultHttpSender
 from .proto import DefaultProto
 
+log = logging.getLogger('golem.monitor.transport')
+
 
 class DefaultJSONSender(object):
     def __init__(self, host, timeout, proto_ver):
         self.transport = DefaultHttpSender(host, timeout)
         self.proto = DefaultProto(proto_ver)
+        # cleared when the monitor rejects a batch request
+        self.batches_accepted = True
 
     def send(self, o):
         msg = self.proto.prepare_json_message(o.dict_repr())
         return self.transport.post_json(msg)
+
+    def send_batch(self, objects):
+        if len(objects) == 1 or not self.batches_accepted:
+            return all([self.send(o) for o in objects])
+        msg = self.proto.prepare_json_batch([o.dict_repr() for o in objects])
+        if self.transport.post_json(msg):
+            return True
+
+        status_code = self.transport.last_status_code
+        if status_code is None:
+            # the monitor is unreachable, single messages would fail too
+            return False
+        # the monitor may not accept batches, send single messages instead
+        log.info('Monitor rejected a batch (%s), sending single messages',
+                 status_code)
+        self.batches_accepted = False
+        return all([self.send(o) for o in objects])
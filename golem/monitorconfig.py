@@ -10,7 +10,14 @@ MONITOR_CONFIG = {
 
     # Increase this number every time any change is made to the protocol
     # (e.g. message object representation changes)
-    'PROTO_VERSION': 1,
+    'PROTO_VERSION': 2,
+
+    # Seconds between sending the buffered messages
+    'FLUSH_INTERVAL': 5,
+    # Max. number of messages sent in a single request
+    # ({'proto_ver': ..., 'batch': [...]}). Single messages are sent if the
+    # monitor server rejects batches
+    'MAX_BATCH_SIZE': 50,
 }
 
 # so that the queue will not get filled up
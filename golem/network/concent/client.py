@@ -1,10 +1,12 @@
 import calendar
 import datetime
+import itertools
 import logging
 import queue
 import threading
 import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 from pydispatch import dispatcher
@@ -23,7 +25,7 @@ from golem.network.concent.handlers_library import library
 from golem.terms import ConcentTermsOfUse
 
 from . import soft_switch
-from .helpers import ssl_kwargs
+from .helpers import create_session, get_message_deadline, ssl_kwargs
 
 logger = logging.getLogger(__name__)
 
@@ -74,9 +76,14 @@ def verify_response(response: requests.Response) -> None:
 def send_to_concent(
         msg: message.base.Message,
         signing_key: bytes,
-        concent_variant: dict) -> typing.Optional[bytes]:
+        concent_variant: dict,
+        session: typing.Optional[requests.Session] = None) \
+        -> typing.Optional[bytes]:
     """Sends a message to the concent server
 
+    :param session: Session to send the request with, so that connections
+                    are reused
+
     :return: Raw reply message, None or exception
     :rtype: Bytes|None
     """
@@ -115,7 +122,7 @@ def send_to_concent(
             concent_post_url,
             headers,
         )
-        response = requests.post(
+        response = (session or requests).post(
             concent_post_url,
             data=data,
             headers=headers,
@@ -133,7 +140,9 @@ def receive_from_concent(
         signing_key,
         public_key,
         concent_variant: dict,
-        path: str = '/api/v1/receive/') -> typing.Optional[bytes]:
+        path: str = '/api/v1/receive/',
+        session: typing.Optional[requests.Session] = None) \
+        -> typing.Optional[bytes]:
     concent_receive_url = urljoin(concent_variant['url'], path)
     headers = {
         'Content-Type': 'application/octet-stream',
@@ -150,7 +159,7 @@ def receive_from_concent(
             concent_receive_url,
             headers,
         )
-        response = requests.post(
+        response = (session or requests).post(
             concent_receive_url,
             data=data,
             headers=headers,
@@ -181,16 +190,29 @@ class ConcentClientService(threading.Thread):
     MAX_GRACE_TIME = 5 * 60  # s
     GRACE_FACTOR = 2  # n times on each failure
 
-    def __init__(self, keys_auth: keysauth.KeysAuth, variant: dict) -> None:
+    def __init__(self, keys_auth: keysauth.KeysAuth, variant: dict,
+                 max_in_flight: int = variables.CONCENT_MAX_IN_FLIGHT) \
+            -> None:
         super().__init__(daemon=True)
 
         self.keys_auth = keys_auth
         # SEE golem.core.variables.CONCENT_CHOICES
         self.variant: dict = variant
+        self.max_in_flight = max_in_flight
         self._stop_event = threading.Event()
-
-        self._queue: queue.Queue = queue.Queue()
+        self._wakeup = threading.Event()
+
+        # (subtask deadline, sequence number, message)
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight,
+            thread_name_prefix='concent-client',
+        )
+        self._session = create_session(max_in_flight)
         self._grace_time: int = self.MIN_GRACE_TIME
+        self._grace_until: float = 0.0
 
         self._delayed: dict = dict()
         self.received_messages: queue.Queue = queue.Queue(maxsize=100)
@@ -217,15 +239,20 @@ class ConcentClientService(threading.Thread):
         last_receive = 0.0
         while not self._stop_event.isSet():
             self._loop()
-            if time.time() - last_receive > variables.CONCENT_PULL_INTERVAL:
+            if time.time() - last_receive > variables.CONCENT_PULL_INTERVAL \
+                    and not self._in_grace_period():
                 last_receive = time.time()
                 self.receive()
-            time.sleep(1)
+            self._wakeup.wait(1)
+            self._wakeup.clear()
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wakeup.set()
         logger.info('Waiting for received messages queue to empty')
         self.received_messages.join()
+        self._executor.shutdown(wait=True)
+        self._session.close()
         logger.info('%s stopped', self)
 
     def submit_task_message(
@@ -311,14 +338,28 @@ class ConcentClientService(threading.Thread):
 
     def _loop(self) -> None:
         """
-        Main service loop. Requests from the queue are sent one by one (FIFO).
-        In case of failure, service enters a grace period.
+        Main service loop. Requests from the queue are sent concurrently,
+        up to `max_in_flight` at a time, the ones with the nearest subtask
+        deadline first. In case of failure, service enters a grace period.
         """
+        while not self._in_grace_period():
+            if not self._in_flight.acquire(blocking=False):
+                return
+            try:
+                _, _, msg = self._queue.get_nowait()
+            except queue.Empty:
+                self._in_flight.release()
+                return
+            self._executor.submit(self._send, msg)
+
+    def _send(self, msg: message.base.Message) -> None:
         try:
-            msg = self._queue.get_nowait()
-        except queue.Empty:
-            return
+            self._process(msg)
+        finally:
+            self._in_flight.release()
+            self._wakeup.set()
 
+    def _process(self, msg: message.base.Message) -> None:
         if not self.available:
             logger.debug('Concent disabled. Dropping %r', msg)
             return
@@ -328,13 +369,14 @@ class ConcentClientService(threading.Thread):
                 msg,
                 self.keys_auth._private_key,  # pylint: disable=protected-access
                 concent_variant=self.variant,
+                session=self._session,
             )
         except exceptions.ConcentError as e:
             logger.info('send_to_concent error: %s', e)
-            self._grace_sleep()
+            self._grace_period()
         except Exception:  # pylint: disable=broad-except
             logger.exception('send_to_concent(%r) failed', msg)
-            self._grace_sleep()
+            self._grace_period()
         else:
             self._grace_time = self.MIN_GRACE_TIME
             self.react_to_concent_message(res, response_to=msg)
@@ -348,14 +390,15 @@ class ConcentClientService(threading.Thread):
                 signing_key=self.keys_auth._private_key,  # noqa pylint: disable=protected-access
                 public_key=self.keys_auth.public_key,
                 concent_variant=self.variant,
+                session=self._session,
             )
         except exceptions.ConcentError as e:
             logger.warning("Can't receive message from Concent: %s", e)
-            self._grace_sleep()
+            self._grace_period()
             return
         except Exception:  # pylint: disable=broad-except
             logger.exception('receive_from_concent() failed')
-            self._grace_sleep()
+            self._grace_period()
             return
         self.react_to_concent_message(res)
 
@@ -389,17 +432,23 @@ class ConcentClientService(threading.Thread):
         else:
             self.process_synchronous_response(msg, response_to)
 
-    def _grace_sleep(self):
+    def _grace_period(self):
+        """ Stop sending and receiving messages for a grace time.
+            Requests already in flight are not interrupted. """
         self._grace_time = min(self._grace_time * self.GRACE_FACTOR,
                                self.MAX_GRACE_TIME)
 
         logger.debug('Concent grace time: %r', self._grace_time)
-        time.sleep(self._grace_time)
+        self._grace_until = time.time() + self._grace_time
+
+    def _in_grace_period(self) -> bool:
+        return time.time() < self._grace_until
 
     def _enqueue(self, key, msg):
         logger.debug("_enqueue(%r, %r)", key, msg)
         self._delayed.pop(key, None)
-        self._queue.put(msg)
+        self._queue.put((get_message_deadline(msg), next(self._sequence), msg))
+        self._wakeup.set()
 
     def income_listener(self, event, **kwargs):
         logger.debug("income listener event: %s", event)
@@ -1,7 +1,11 @@
 import base64
+import itertools
 import logging
+import os
+import threading
 import typing
 import queue
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 
@@ -11,14 +15,17 @@ from golem_messages.message.concents import (
 )
 
 from golem.core import keysauth
+from golem.core import variables
 from golem.core.service import LoopingCallService
 
-from .helpers import ssl_kwargs
+from .helpers import create_session, ssl_kwargs
 
 logger = logging.getLogger(__name__)
 
 
 class ConcentFileRequest:
+    _sequence = itertools.count()
+
     def __init__(self,  # noqa pylint:disable=too-many-arguments
                  file_path: str,
                  file_transfer_token: FileTransferToken,
@@ -32,6 +39,13 @@ class ConcentFileRequest:
         self.error = error
         self.file_category = file_category or \
             FileTransferToken.FileInfo.Category.results
+        self.deadline = file_transfer_token.token_expiration_deadline or \
+            float('inf')
+        self.sequence_number = next(self._sequence)
+
+    def __lt__(self, other: 'ConcentFileRequest') -> bool:
+        return (self.deadline, self.sequence_number) < \
+            (other.deadline, other.sequence_number)
 
     def __repr__(self):
         return '%s request - path: %r, ftt: %r, category: %r' % (
@@ -46,19 +60,59 @@ class ConcentFiletransferError(Exception):
     pass
 
 
+class FileChunks:
+    """
+    Iterates over the rest of an open file in chunks. The length is known
+    upfront, so that the file is streamed with a Content-Length header.
+    """
+
+    def __init__(self, file: typing.BinaryIO, chunk_size: int) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+
+    def __len__(self) -> int:
+        return os.fstat(self.file.fileno()).st_size - self.file.tell()
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        while True:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
 class ConcentFiletransferService(LoopingCallService):
     """
     Golem service responsible for exchanging files with the Concent service.
+
+    Up to `max_in_flight` files are transferred at a time, over persistent
+    connections, the ones with the nearest token expiration deadline first.
+    Files are streamed in chunks. An interrupted download is resumed from
+    where it stopped, up to `max_attempts` times.
     """
 
-    def __init__(self,
+    MAX_ATTEMPTS = 3
+
+    def __init__(self,  # noqa pylint:disable=too-many-arguments
                  keys_auth: keysauth.KeysAuth,
                  variant: dict,
-                 interval_seconds: int = 1,) -> None:
+                 interval_seconds: int = 1,
+                 max_in_flight: int =
+                 variables.CONCENT_FILETRANSFERS_MAX_IN_FLIGHT,
+                 chunk_size: int = variables.CONCENT_FILETRANSFERS_CHUNK_SIZE,
+                 max_attempts: int = MAX_ATTEMPTS) -> None:
         # SEE golem.core.variables.CONCENT_CHOICES
         self.variant = variant
         self.keys_auth = keys_auth
-        self._transfers: queue.Queue = queue.Queue()
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+        self._transfers: queue.PriorityQueue = queue.PriorityQueue()
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight,
+            thread_name_prefix='concent-filetransfers',
+        )
+        self._session = create_session(max_in_flight)
         super().__init__(interval_seconds=interval_seconds)
 
     def start(self, now: bool = True):
@@ -68,6 +122,8 @@ class ConcentFiletransferService(LoopingCallService):
     def stop(self):
         self._transfers.join()
         super().stop()
+        self._executor.shutdown(wait=True)
+        self._session.close()
         logger.debug("Concent Filetransfer Service stopped")
 
     def transfer(self,  # noqa pylint:disable=too-many-arguments
@@ -89,12 +145,22 @@ class ConcentFiletransferService(LoopingCallService):
         self._transfers.put(request)
 
     def _run(self):
+        while self._in_flight.acquire(blocking=False):
+            try:
+                request = self._transfers.get_nowait()
+            except queue.Empty:
+                self._in_flight.release()
+                return
+            self._executor.submit(self._transfer, request)
+
+    def _transfer(self, request: ConcentFileRequest):
         try:
-            request = self._transfers.get_nowait()
-        except queue.Empty:
-            return
-        self.process(request)
-        self._transfers.task_done()
+            self.process(request)
+        except Exception:  # noqa pylint:disable=broad-except
+            logger.exception("Concent file transfer failed: %r", request)
+        finally:
+            self._transfers.task_done()
+            self._in_flight.release()
 
     def process(self, request: ConcentFileRequest):
         logger.debug("Processing: %r", request)
@@ -162,18 +228,66 @@ class ConcentFiletransferService(LoopingCallService):
         logger.debug("Uploading file '%s' to '%s' using %s",
                      request.file_path, uri, headers)
 
-        with open(request.file_path, mode='rb') as f:
-            response = requests.post(
-                uri, data=f, headers=headers, **ssl_kwargs(self.variant))
-        return response
+        # Concent storage doesn't accept partial uploads, so an interrupted
+        # upload is started over
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with open(request.file_path, mode='rb') as f:
+                    return self._session.post(
+                        uri,
+                        data=FileChunks(f, self.chunk_size),
+                        headers=headers,
+                        **ssl_kwargs(self.variant),
+                    )
+            except requests.exceptions.ConnectionError as e:
+                if attempt >= self.max_attempts:
+                    raise
+                logger.info("Retrying upload of '%s': %s",
+                            request.file_path, e)
+        return None
 
     def download(self, request: ConcentFileRequest):
         uri = self._get_download_uri(request.file_transfer_token,
                                      request.file_category)
         headers = self._get_auth_headers(request.file_transfer_token)
-        response = requests.get(
+        part_path = request.file_path + '.part'
+
+        for attempt in range(1, self.max_attempts + 1):
+            offset = os.path.getsize(part_path) \
+                if os.path.exists(part_path) else 0
+            try:
+                response = self._get(uri, headers, offset)
+                if offset and response.status_code == 416:
+                    # The .part is left by an earlier request for this path
+                    # or is already complete, so it can't be resumed
+                    logger.info("Restarting download of '%s'",
+                                request.file_path)
+                    response.close()
+                    os.remove(part_path)
+                    response = self._get(uri, headers, 0)
+                if not response.ok:
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    return response
+                # The whole file is sent if the range is not supported
+                mode = 'ab' if response.status_code == 206 else 'wb'
+                with open(part_path, mode=mode) as f:
+                    for chunk in response.iter_content(
+                            chunk_size=self.chunk_size):
+                        f.write(chunk)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                if attempt >= self.max_attempts:
+                    raise
+                logger.info("Resuming download of '%s': %s",
+                            request.file_path, e)
+                continue
+            os.replace(part_path, request.file_path)
+            return response
+        return None
+
+    def _get(self, uri: str, headers: dict, offset: int):
+        if offset:
+            headers = dict(headers, Range='bytes={}-'.format(offset))
+        return self._session.get(
             uri, stream=True, headers=headers, **ssl_kwargs(self.variant))
-        with open(request.file_path, mode='wb') as f:
-            for chunk in response.iter_content(chunk_size=None):
-                f.write(chunk)
-        return response
@@ -4,6 +4,7 @@ import logging
 import time
 import typing
 
+import requests
 from eth_utils import decode_hex
 from ethereum.utils import privtoaddr
 from golem_messages import constants as msg_constants
@@ -143,3 +144,25 @@ def ssl_kwargs(concent_variant: dict) -> dict:
     if 'certificate' not in concent_variant:
         return {}
     return {'verify': concent_variant['certificate'], }
+
+
+def create_session(pool_size: int) -> requests.Session:
+    """Returns a requests session keeping up to `pool_size` persistent
+    connections per host"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_message_deadline(msg: message.base.Message) -> float:
+    """Returns the subtask deadline of a message or infinity,
+    if the message doesn't relate to any subtask"""
+    try:
+        return float(msg.task_to_compute.compute_task_def['deadline'])
+    except Exception:  # pylint: disable=broad-except
+        return float('inf')
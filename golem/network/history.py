@@ -4,8 +4,9 @@ import operator
 import pickle
 import queue
 import threading
+from collections import deque
 from functools import reduce, wraps
-from typing import List
+from typing import Deque, List
 from typing import Optional
 
 from golem_messages import message
@@ -13,7 +14,7 @@ from peewee import (PeeweeException, DataError, ProgrammingError,
                     NotSupportedError, Field, IntegrityError)
 
 from golem.core.service import IService
-from golem.model import NetworkMessage, Actor
+from golem.model import db, NetworkMessage, Actor
 
 logger = logging.getLogger('golem.network.history')
 
@@ -35,6 +36,10 @@ class MessageHistoryService(IService):
     - NetworkMessages have to be saved ASAP
     - removal and sweeping is not critical and can be slightly delayed
 
+    Queued messages are serialized in the service thread and saved, as well
+    as removed, in batches of up to BATCH_SIZE entries per transaction. When
+    the save queue is full, messages are saved in-place by the caller.
+
     Background operations performed by this service do not fit the looping call
     model of golem.core.service.LoopingCallService.
     """
@@ -42,6 +47,10 @@ class MessageHistoryService(IService):
     MESSAGE_LIFETIME = datetime.timedelta(days=1)
     SWEEP_INTERVAL = datetime.timedelta(hours=12)
     QUEUE_TIMEOUT = datetime.timedelta(seconds=2).total_seconds()
+    MAX_QUEUE_SIZE = 10000
+    BATCH_SIZE = 1000
+    # SQLite limits the number of variables in a single statement to 999
+    INSERT_CHUNK_SIZE = 100
 
     # Decorators (at the end of this file) need to access an instance
     # of MessageHistoryService
@@ -56,10 +65,17 @@ class MessageHistoryService(IService):
         self._thread = None  # set in start
         self._queue_timeout = None  # set in start
         self._stop_event = threading.Event()
-        self._save_queue = queue.Queue()
+        self._save_queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        # messages which failed to be saved while the save queue was full
+        self._save_retries: Deque[dict] = deque()
         self._remove_queue = queue.Queue()
         self._sweep_ts = datetime.datetime.now()
 
+        self.saved = 0
+        self.removed = 0
+        self.overflowed = 0
+        self.max_queue_depth = 0
+
     def run(self) -> None:
         """
         Thread activity method.
@@ -95,7 +111,7 @@ class MessageHistoryService(IService):
         self.instance = None
 
         self._queue_timeout = 0
-        while not self._save_queue.empty():
+        while not self._save_queue.empty() or self._save_retries:
             self._loop()
 
     @classmethod
@@ -126,8 +142,18 @@ class MessageHistoryService(IService):
         Appends the dict message representation to the save queue.
         :param msg_dict:
         """
-        if msg_dict:
-            self._save_queue.put(msg_dict)
+        if not msg_dict:
+            return
+        try:
+            self._save_queue.put_nowait(msg_dict)
+        except queue.Full:
+            self.overflowed += 1
+            logger.warning("Message history queue full, saving '%s' in-place",
+                           msg_dict.get('msg_cls'))
+            self.add_sync(msg_dict)
+        else:
+            self.max_queue_depth = max(self.max_queue_depth,
+                                       self._save_queue.qsize())
 
     def add_sync(self, msg_dict: dict) -> None:
         """
@@ -135,8 +161,9 @@ class MessageHistoryService(IService):
         :param msg_dict: Message to save
         """
         try:
-            msg = NetworkMessage(**msg_dict)
+            msg = NetworkMessage(**_serialize(msg_dict))
             msg.save()
+            self.saved += 1
         except (DataError, ProgrammingError, NotSupportedError,
                 TypeError, IntegrityError) as exc:
             # Unrecoverable error
@@ -145,7 +172,23 @@ class MessageHistoryService(IService):
         except PeeweeException:
             # Temporary error
             logger.warning("Message '%s' save queued", msg_dict.get('msg_cls'))
-            self._save_queue.put(msg_dict)
+            try:
+                self._save_queue.put_nowait(msg_dict)
+            except queue.Full:
+                # Never block, the caller may be the only consumer of the
+                # queue
+                self._save_retries.append(msg_dict)
+
+    def get_stats(self) -> dict:
+        return {
+            'save_queue': self._save_queue.qsize(),
+            'save_retries': len(self._save_retries),
+            'remove_queue': self._remove_queue.qsize(),
+            'max_queue_depth': self.max_queue_depth,
+            'saved': self.saved,
+            'removed': self.removed,
+            'overflowed': self.overflowed,
+        }
 
     def remove(self, task: str, **properties) -> None:
         """
@@ -203,8 +246,8 @@ class MessageHistoryService(IService):
         """
         Main service loop.
         - calls _sweep every SWEEP_INTERVAL
-        - saves queued (1) messages to database (FIFO)
-        - removes queued (2) messages from database
+        - saves a batch of queued (1) messages to database (FIFO)
+        - removes a batch of queued (2) messages from database
         """
 
         # Sweep messages.
@@ -215,20 +258,90 @@ class MessageHistoryService(IService):
             self._sweep_ts = now + self.SWEEP_INTERVAL
 
         # Remove messages
+        removals = self._get_batch(self._remove_queue)
+        if removals:
+            self._remove_batch(removals)
+
+        # Save messages which failed to be saved before
+        retries = self._get_retries()
+        if retries:
+            self._save_batch(retries)
+
+        # Save messages
+        saves = self._get_batch(self._save_queue, self._queue_timeout)
+        if saves:
+            self._save_batch(saves)
+
+    def _get_batch(self, source: queue.Queue,
+                   timeout: Optional[float] = None) -> list:
+        """
+        Takes up to BATCH_SIZE entries from a queue, waiting up to timeout
+        seconds for the first one.
+        """
+        batch: list = []
         try:
-            task, parameters = self._remove_queue.get(False)
+            if timeout:
+                batch.append(source.get(True, timeout))
+            while len(batch) < self.BATCH_SIZE:
+                batch.append(source.get(False))
         except queue.Empty:
             pass
-        else:
-            self.remove_sync(task, **parameters)
+        return batch
 
-        # Save messages
+    def _get_retries(self) -> List[dict]:
+        retries: List[dict] = []
         try:
-            msg_dict = self._save_queue.get(True, self._queue_timeout)
-        except queue.Empty:
+            while len(retries) < self.BATCH_SIZE:
+                retries.append(self._save_retries.popleft())
+        except IndexError:
             pass
+        return retries
+
+    def _save_batch(self, msg_dicts: List[dict]) -> None:
+        rows = []
+        for msg_dict in msg_dicts:
+            try:
+                rows.append(_serialize(msg_dict))
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Cannot serialize message '%s'",
+                                 msg_dict.get('msg_cls'))
+
+        now = datetime.datetime.now()
+        try:
+            with db.atomic():
+                for i in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+                    NetworkMessage.insert_many([
+                        dict(row, created_date=now, modified_date=now)
+                        for row in rows[i:i + self.INSERT_CHUNK_SIZE]
+                    ]).execute()
+        except (PeeweeException, TypeError) as exc:
+            # Save one by one, so that a single invalid message does not
+            # prevent saving the others
+            logger.debug("Saving %d messages in batch failed: %r",
+                         len(rows), exc)
+            for row in rows:
+                self.add_sync(row)
         else:
-            self.add_sync(msg_dict)
+            self.saved += len(rows)
+
+    def _remove_batch(self, removals: List[tuple]) -> None:
+        try:
+            conditions = [
+                reduce(operator.and_,
+                       self.build_clauses(task=task, **properties))
+                for task, properties in removals
+            ]
+            with db.atomic():
+                NetworkMessage.delete() \
+                    .where(reduce(operator.or_, conditions)) \
+                    .execute()
+        except (PeeweeException, TypeError) as exc:
+            logger.debug("Removing messages of %d tasks in batch failed: %r",
+                         len(removals), exc)
+            for task, properties in removals:
+                self.remove_sync(task, **properties)
+        else:
+            self.removed += len(removals)
 
     def _sweep(self) -> None:
         """
@@ -247,10 +360,21 @@ class MessageHistoryService(IService):
 
 # SHORTCUTS #
 
+def _serialize(msg_dict: dict) -> dict:
+    """Pickles the message of a dict created by message_to_model with
+    serialize=False; other dicts are returned as they are.
+    """
+    msg_data = msg_dict.get('msg_data')
+    if msg_data is None or isinstance(msg_data, bytes):
+        return msg_dict
+    return dict(msg_dict, msg_data=pickle.dumps(msg_data))
+
+
 def message_to_model(msg: message.base.Message,
                      node_id,
                      local_role: Actor,
-                     remote_role: Actor) -> dict:
+                     remote_role: Actor,
+                     serialize: bool = True) -> dict:
     """Converts a message to its database model dictionary representation.
 
     MessageHistoryService operates in a separate thread, whereas peewee
@@ -263,6 +387,8 @@ def message_to_model(msg: message.base.Message,
 
     :param local_role: Local node's role in computation
     :param remote_role: Remote node's role in computation
+    :param serialize: If False, 'msg_data' holds the message itself, to be
+                      pickled by MessageHistoryService in its own thread
     :return: Dict representation of NetworkMessage
     """
     return {
@@ -271,7 +397,7 @@ def message_to_model(msg: message.base.Message,
         'node': node_id,
         'msg_date': datetime.datetime.now(),
         'msg_cls': msg.__class__.__name__,
-        'msg_data': pickle.dumps(msg),
+        'msg_data': pickle.dumps(msg) if serialize else msg,
         'local_role': local_role,
         'remote_role': remote_role,
     }
@@ -297,6 +423,7 @@ def add(msg: message.base.Message,
             node_id=node_id,
             local_role=local_role,
             remote_role=remote_role,
+            serialize=sync,
         )
     except Exception:  # pylint: disable=broad-except
         logger.exception(
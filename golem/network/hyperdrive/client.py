@@ -8,6 +8,7 @@ import collections
 
 import requests
 from requests import HTTPError
+from requests.adapters import HTTPAdapter
 from twisted.internet.defer import Deferred
 
 from golem_messages import helpers as msg_helpers
@@ -37,6 +38,8 @@ class HyperdriveClient(IClient):
 
     CLIENT_ID = 'hyperg'
     VERSION = 1.1
+    # Max. number of kept-alive connections to the Hyperdrive API
+    POOL_SIZE = 8
 
     def __init__(self, port, host, timeout=None):
         super(HyperdriveClient, self).__init__()
@@ -51,6 +54,11 @@ class HyperdriveClient(IClient):
         self._url = 'http://{}:{}/api'.format(self.host, self.port)
         self._headers = {'content-type': 'application/json'}
 
+        # reuse connections between requests
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+        self._session = requests.Session()
+        self._session.mount('http://', adapter)
+
     def __repr__(self):
         return f'<{self.__class__.__name__} {self.CLIENT_ID} at {self._url}>'
 
@@ -127,10 +135,10 @@ class HyperdriveClient(IClient):
         return response['hash']
 
     def _request(self, **data):
-        response = requests.post(url=self._url,
-                                 headers=self._headers,
-                                 data=json.dumps(data),
-                                 timeout=self.timeout)
+        response = self._session.post(url=self._url,
+                                      headers=self._headers,
+                                      data=json.dumps(data),
+                                      timeout=self.timeout)
 
         try:
             response.raise_for_status()
@@ -1,16 +1,17 @@
 import ipaddress
 import itertools
 import logging
-import socket
 import random
 import time
 from collections import deque
+from concurrent.futures import Future
 from threading import Lock
 from typing import (
     Any,
     Callable,
     Dict,
     List,
+    Tuple,
 )
 
 from golem_messages import message
@@ -29,6 +30,7 @@ from golem.network.transport import tcpserver
 from golem.network.transport.network import ProtocolFactory, SessionFactory
 from golem.ranking.manager.gossip_manager import GossipManager
 from .peerkeeper import PeerKeeper, key_distance
+from .seedresolver import SeedResolver
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +55,10 @@ RANDOM_DISCONNECT_FRACTION = 0.1
 
 # Indicates how many KnownHosts can be stored in the DB
 MAX_STORED_HOSTS = 100
+# How often buffered KnownHosts updates are written to the DB
+KNOWN_HOSTS_FLUSH_INTERVAL = 10
+# How often KnownHosts above MAX_STORED_HOSTS are removed from the DB
+KNOWN_HOSTS_PRUNE_INTERVAL = 60
 
 
 class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # noqa P2P will be rewritten s00n pylint: disable=too-many-instance-attributes, too-many-public-methods
@@ -115,8 +121,13 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         self.seeds = set()
         self.used_seeds = set()
         self.bootstrap_seeds = P2P_SEEDS
+        self.seed_resolver = SeedResolver()
+        self._connect_when_resolved = False
 
         self._peer_lock = Lock()
+        # (ip_address, port) -> KnownHosts values to save
+        self._known_hosts: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self._known_hosts_lock = Lock()
 
         try:
             self.__remove_redundant_hosts_from_db()
@@ -131,6 +142,8 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         self.last_refresh_peers = now
         self.last_forward_request = now
         self.last_random_disconnect = now
+        self.last_known_hosts_flush = now
+        self.last_known_hosts_prune = now
         self.last_seeds_sync = time.time()
 
         self.last_messages = []
@@ -170,6 +183,9 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         if not self.connect_to_known_hosts:
             return
 
+        # seeds are still being resolved, try again once they are known
+        self._connect_when_resolved = not self.seeds
+
         for _ in range(len(self.seeds)):
             ip_address, port = self._get_next_random_seed()
             logger.debug("Connecting to %s:%s ...", ip_address, port)
@@ -208,29 +224,49 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
             )
 
     def add_known_peer(self, node, ip_address, port, metadata=None):
+        """ Buffers the peer's KnownHosts entry, which is saved by
+            flush_known_hosts """
         is_seed = node.is_super_node() if node else False
 
+        with self._known_hosts_lock:
+            self._known_hosts[(ip_address, port)] = {
+                'is_seed': is_seed,
+                'last_connected': time.time(),
+                'metadata': metadata or {},
+            }
+
+        if is_seed:
+            self.seed_resolver.resolve(ip_address, port).add_done_callback(
+                self._add_seeds)
+
+    def _add_seeds(self, future: Future) -> None:
+        """ Adds resolved seed addresses on the reactor thread, where
+            self.seeds is iterated """
+        from twisted.internet import reactor
+        addresses = future.result()
+        reactor.callFromThread(lambda: self.seeds.update(addresses))
+
+    def flush_known_hosts(self):
+        """ Saves buffered KnownHosts entries in a single transaction """
+        with self._known_hosts_lock:
+            known_hosts, self._known_hosts = self._known_hosts, {}
+        if not known_hosts:
+            return
+
         try:
             with db.transaction():
-                host, _ = KnownHosts.get_or_create(
-                    ip_address=ip_address,
-                    port=port,
-                    defaults={'is_seed': is_seed}
-                )
-                host.last_connected = time.time()
-                host.metadata = metadata or {}
-                host.save()
-
-            self.__remove_redundant_hosts_from_db()
-            self._sync_seeds()
-
-        except Exception as err:
-            logger.error(
-                "Couldn't add known peer %s:%s - %s",
-                ip_address,
-                port,
-                err
-            )
+                for (ip_address, port), values in known_hosts.items():
+                    host, _ = KnownHosts.get_or_create(
+                        ip_address=ip_address,
+                        port=port,
+                        defaults={'is_seed': values['is_seed']}
+                    )
+                    host.last_connected = values['last_connected']
+                    host.metadata = values['metadata']
+                    host.save()
+        except Exception as err:  # pylint: disable=broad-except
+            logger.error("Couldn't save %d known peers - %s",
+                         len(known_hosts), err)
 
     def set_metadata_manager(self, metadata_manager):
         self.metadata_manager = metadata_manager
@@ -270,6 +306,18 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
 
         self._sync_pending()
 
+        if now - self.last_known_hosts_flush > KNOWN_HOSTS_FLUSH_INTERVAL:
+            self.last_known_hosts_flush = now
+            self.flush_known_hosts()
+
+        if now - self.last_known_hosts_prune > KNOWN_HOSTS_PRUNE_INTERVAL:
+            self.last_known_hosts_prune = now
+            try:
+                self.__remove_redundant_hosts_from_db()
+            except Exception as err:  # pylint: disable=broad-except
+                logger.error("Couldn't remove redundant known peers - %s",
+                             err)
+
         if now - self.last_seeds_sync > self.reconnect_with_seed_threshold:
             self._sync_seeds()
 
@@ -967,12 +1015,26 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
         if peers_to_find:
             self.send_find_nodes(peers_to_find)
 
-    def _sync_seeds(self, known_hosts=None):
+    def _sync_seeds(self, known_hosts=None) -> Future:
+        """ Resolves seed addresses in the background. Returns a future
+            completed when self.seeds is updated on the reactor thread. """
         self.last_seeds_sync = time.time()
         if not known_hosts:
             known_hosts = KnownHosts.select().where(KnownHosts.is_seed)
 
-        def _resolve_hostname(host, port):
+        seed_host = self.config_desc.seed_host or ''
+        seed_port = self.config_desc.seed_port
+
+        futures = []
+        for host, port in itertools.chain(
+                ((kh.ip_address, kh.port) for kh in known_hosts if kh.is_seed),
+                self.bootstrap_seeds,
+                ((seed_host, seed_port), ),
+                (
+                    cs.split(':', 1) for cs in self.config_desc.seeds.split(
+                        None,
+                    )
+                )):
             try:
                 port = int(port)
             except ValueError:
@@ -981,40 +1043,44 @@ class P2PService(tcpserver.PendingConnectionsServer, DiagnosticsProvider):  # no
                     host,
                     port,
                 )
-                return
+                continue
             if not (host and port):
                 logger.debug(
                     "Ignoring incomplete seed. host=%r port=%r",
                     host,
                     port,
                 )
-                return
-            try:
-                for addrinfo in socket.getaddrinfo(host, port):
-                    yield addrinfo[4]  # (ip, port)
-            except OSError as e:
-                logger.error(
-                    "Can't resolve %s:%s. %s",
-                    host,
-                    port,
-                    e,
-                )
+                continue
+            futures.append(self.seed_resolver.resolve(host, port))
 
-        self.seeds = set()
+        synced: Future = Future()
+        lock = Lock()
+        collected = False
 
-        ip_address = self.config_desc.seed_host or ''
-        port = self.config_desc.seed_port
+        def _set_seeds(seeds):
+            self.seeds = seeds
+            synced.set_result(seeds)
+            if seeds and self._connect_when_resolved:
+                self.connect_to_seeds()
 
-        for hostport in itertools.chain(
-                ((kh.ip_address, kh.port) for kh in known_hosts if kh.is_seed),
-                self.bootstrap_seeds,
-                ((ip_address, port), ),
-                (
-                    cs.split(':', 1) for cs in self.config_desc.seeds.split(
-                        None,
-                    )
-                )):
-            self.seeds.update(_resolve_hostname(*hostport))
+        def _update(_future):
+            nonlocal collected
+            with lock:
+                if collected or not all(f.done() for f in futures):
+                    return
+                collected = True
+            seeds = set()
+            for future in futures:
+                seeds.update(future.result())
+            # self.seeds is iterated on the reactor thread
+            from twisted.internet import reactor
+            reactor.callFromThread(_set_seeds, seeds)
+
+        if not futures:
+            _update(None)
+        for future in futures:
+            future.add_done_callback(_update)
+        return synced
 
     def _get_next_random_seed(self):
         # this loop won't execute more than twice
@@ -75,6 +75,9 @@ class PeerSession(BasicSafeSession):
         self.conn_id = None
         self.metadata = None
 
+        # Task headers known by peer: task id -> (signature, time sent)
+        self.known_task_headers: typing.Dict[str, tuple] = {}
+
         # Verification by challenge not a random value
         self.solve_challenge = False
         self.challenge = None
@@ -337,6 +340,9 @@ class PeerSession(BasicSafeSession):
     def _react_to_get_tasks(self, msg):
         my_tasks = self.p2p_service.get_own_tasks_headers()
         other_tasks = self.p2p_service.get_others_tasks_headers()
+        self._prune_known_task_headers(my_tasks, other_tasks)
+        my_tasks = self._filter_known_task_headers(my_tasks)
+        other_tasks = self._filter_known_task_headers(other_tasks)
         if not my_tasks and not other_tasks:
             return
 
@@ -358,6 +364,7 @@ class PeerSession(BasicSafeSession):
         except TypeError:
             logger.debug("Unexpected format of other task list %r", other_tasks)
 
+        self._remember_task_headers(tasks_to_send)
         self.send(message.p2p.Tasks(tasks=tasks_to_send))
 
     def _react_to_tasks(self, msg):
@@ -368,6 +375,37 @@ class PeerSession(BasicSafeSession):
                 self.disconnect(
                     message.base.Disconnect.REASON.BadProtocol
                 )
+                continue
+            # Don't send the header back to the peer
+            self._remember_task_headers([t])
+
+    def _filter_known_task_headers(self, headers):
+        """ Return headers that the peer doesn't know, that have changed
+            since they were sent or that were sent long time ago """
+        if not headers:
+            return []
+        deadline = time.time() - variables.TASK_HEADERS_RESEND_INTERVAL
+        filtered = []
+        for header in headers:
+            known = self.known_task_headers.get(header.task_id)
+            if known is None or known[0] != header.signature \
+                    or known[1] < deadline:
+                filtered.append(header)
+        return filtered
+
+    def _remember_task_headers(self, headers):
+        now = time.time()
+        for header in headers:
+            self.known_task_headers[header.task_id] = (header.signature, now)
+
+    def _prune_known_task_headers(self, *headers_lists):
+        task_ids = {
+            header.task_id
+            for headers in headers_lists if headers
+            for header in headers
+        }
+        for task_id in set(self.known_task_headers) - task_ids:
+            del self.known_task_headers[task_id]
 
     def _react_to_remove_task(self, msg):
         if not self._verify_remove_task(msg):
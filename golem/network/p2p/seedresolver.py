@@ -0,0 +1,99 @@
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, FrozenSet, Tuple
+
+logger = logging.getLogger(__name__)
+
+HostPort = Tuple[str, int]
+
+
+class SeedResolver:
+    """ Resolves seed host names to socket addresses in background threads.
+
+    Results are cached for `ttl` seconds, failed lookups for `failure_ttl`
+    seconds. Concurrent requests for the same host share a single lookup.
+    IP addresses are resolved immediately, without a DNS query.
+    """
+
+    TTL = 10 * 60
+    FAILURE_TTL = 60
+    MAX_WORKERS = 4
+
+    def __init__(self,
+                 ttl: float = TTL,
+                 failure_ttl: float = FAILURE_TTL,
+                 max_workers: int = MAX_WORKERS) -> None:
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='seed-resolver',
+        )
+        self._lock = threading.Lock()
+        self._cache: Dict[HostPort, Tuple[float, FrozenSet[tuple]]] = {}
+        self._pending: Dict[HostPort, Future] = {}
+
+    def resolve(self, host: str, port: int) -> Future:
+        """ Returns a future of a set of socket addresses of host:port """
+        key = (host, port)
+        with self._lock:
+            if key in self._pending:
+                return self._pending[key]
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                return self._completed(cached[1])
+
+            if self._is_ip_address(host):
+                return self._completed(self._store(key, self._lookup(*key)))
+
+            future = self._executor.submit(self._resolve, key)
+            self._pending[key] = future
+            return future
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _resolve(self, key: HostPort) -> FrozenSet[tuple]:
+        addresses = self._lookup(*key)
+        with self._lock:
+            self._pending.pop(key, None)
+            return self._store(key, addresses)
+
+    def _store(self, key: HostPort,
+               addresses: FrozenSet[tuple]) -> FrozenSet[tuple]:
+        ttl = self.ttl if addresses else self.failure_ttl
+        self._cache[key] = (time.monotonic() + ttl, addresses)
+        return addresses
+
+    @staticmethod
+    def _lookup(host: str, port: int) -> FrozenSet[tuple]:
+        try:
+            return frozenset(
+                addrinfo[4]  # (ip, port)
+                for addrinfo in socket.getaddrinfo(host, port)
+            )
+        except OSError as e:
+            logger.error("Can't resolve %s:%s. %s", host, port, e)
+            return frozenset()
+
+    @staticmethod
+    def _is_ip_address(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def _completed(addresses: FrozenSet[tuple]) -> Future:
+        future: Future = Future()
+        future.set_result(addresses)
+        return future
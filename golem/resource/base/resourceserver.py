@@ -1,9 +1,13 @@
 import logging
+import random
+import time
+from collections import Counter
 from enum import Enum
 from threading import Lock
+from typing import Optional
 
 import os
-from twisted.internet.defer import Deferred
+from twisted.internet.defer import Deferred, DeferredSemaphore
 
 from golem.core import golem_async
 from golem.task.result.resultpackage import ZipPackager
@@ -21,17 +25,49 @@ class TransferStatus(Enum):
 
 class PendingResource(object):
 
-    def __init__(self, resource, res_id, client_options, status):
+    def __init__(self, resource, res_id, client_options, status,  # noqa pylint:disable=too-many-arguments
+                 deadline=None):
         self.resource = resource
         self.res_id = res_id
         self.client_options = client_options
         self.status = status
+        # subtask deadline, used for ordering the downloads
+        self.deadline = deadline
+        self.retries = 0
+        # earliest time of the next download attempt
+        self.retry_at = 0.
+
+    @property
+    def peer(self) -> Optional[tuple]:
+        """ Address of the first peer to download from; None if unknown """
+        peers = getattr(self.client_options, 'peers', None)
+        if not peers or not isinstance(peers[0], dict):
+            return None
+        address = peers[0].get('TCP')
+        return tuple(address) if address else None
 
 
 class BaseResourceServer(object):
+    """ Downloads the resources of computed subtasks, the ones with the
+    nearest deadline first. The number of downloads running at the same time
+    is limited, both in total and per peer, and each resource is retried with
+    a backoff before its subtask is failed. """
+
+    MAX_DOWNLOADS = 4
+    MAX_DOWNLOADS_PER_PEER = 2
+    MAX_DOWNLOAD_RETRIES = 3
+    # base and max. delay between retries of a single resource, in seconds
+    RETRY_DELAY = 5.
+    MAX_RETRY_DELAY = 60.
+    # number of packages extracted at the same time
+    MAX_EXTRACTIONS = 2
 
     def __init__(self, resource_manager, dir_manager, client):
         self._lock = Lock()
+        self._download_lock = Lock()
+        self._downloading = 0
+        self._peer_downloads = Counter()
+        self._extract_semaphore = DeferredSemaphore(self.MAX_EXTRACTIONS)
 
         self.client = client
 
@@ -92,24 +128,36 @@ class BaseResourceServer(object):
     def remove_resources(self, res_id):
         self.resource_manager.remove_resources(res_id)
 
-    def download_resources(self, resources, res_id, client_options=None):
+    def download_resources(self, resources, res_id, client_options=None,
+                           deadline=None):
         with self._lock:
             for resource in resources:
-                self._add_pending_resource(resource, res_id, client_options)
+                self._add_pending_resource(resource, res_id, client_options,
+                                           deadline)
 
             collected = not self.pending_resources.get(res_id)
 
         if collected:
             self.client.resource_collected(res_id)
 
-    def _add_pending_resource(self, resource, res_id, client_options):
+    def _add_pending_resource(self, resource, res_id, client_options,
+                              deadline=None):
         if res_id not in self.pending_resources:
             self.pending_resources[res_id] = []
 
         self.pending_resources[res_id].append(PendingResource(
-            resource, res_id, client_options, TransferStatus.idle
+            resource, res_id, client_options, TransferStatus.idle,
+            deadline=deadline
         ))
 
+    def _get_pending_resource(self, resource, res_id) \
+            -> Optional[PendingResource]:
+        with self._lock:
+            for pending_resource in self.pending_resources.get(res_id, []):
+                if pending_resource.resource == resource:
+                    return pending_resource
+        return None
+
     def _remove_pending_resource(self, resource, res_id):
         with self._lock:
             pending_resources = self.pending_resources.get(res_id, [])
@@ -124,23 +172,79 @@ class BaseResourceServer(object):
             return res_id
 
     def _download_resources(self, async_=True):
+        # Callbacks of downloads finished synchronously start the next ones
+        # from within the loop below
+        if not self._download_lock.acquire(blocking=False):
+            return
+        try:
+            while True:
+                entry = self._next_download()
+                if not entry:
+                    break
+                self._start_download(entry, async_)
+        finally:
+            self._download_lock.release()
+
+    def _next_download(self) -> Optional[PendingResource]:
+        """ Returns the waiting resource with the nearest subtask deadline,
+            if the download limits allow starting it """
+        if self._downloading >= self.MAX_DOWNLOADS:
+            return None
+
         download_statuses = [TransferStatus.idle, TransferStatus.failed]
-        pending = dict(self.pending_resources)
+        now = time.time()
+
+        with self._lock:
+            entries = [
+                entry for entries in self.pending_resources.values()
+                for entry in entries
+                if entry.status in download_statuses
+                and entry.retry_at <= now
+                and (entry.peer is None or self._peer_downloads[entry.peer]
+                     < self.MAX_DOWNLOADS_PER_PEER)
+            ]
+        if not entries:
+            return None
+
+        return min(entries, key=lambda e: (
+            e.deadline if e.deadline is not None else float('inf'),
+            e.retry_at))
+
+    def _start_download(self, entry: PendingResource, async_: bool) -> None:
+        with self._lock:
+            entry.status = TransferStatus.transferring
+            self._downloading += 1
+            if entry.peer is not None:
+                self._peer_downloads[entry.peer] += 1
+
+        logger.debug("Downloading resource %r for %r (deadline: %r, "
+                     "attempt: %d)", entry.resource, entry.res_id,
+                     entry.deadline, entry.retries + 1)
+
+        self.resource_manager.pull_resource(
+            entry.resource, entry.res_id,
+            client_options=entry.client_options,
+            success=self._download_success,
+            error=self._download_error,
+            async_=async_
+        )
 
-        for _, entries in pending.items():
-            for entry in entries:
+    def _download_finished(self, entry: Optional[PendingResource]) -> None:
+        with self._lock:
+            if entry is None or entry.status != TransferStatus.transferring:
+                return
 
-                if entry.status not in download_statuses:
-                    continue
-                entry.status = TransferStatus.transferring
+            self._downloading = max(0, self._downloading - 1)
+            peer = entry.peer
+            if peer is not None:
+                self._peer_downloads[peer] -= 1
+                if self._peer_downloads[peer] <= 0:
+                    del self._peer_downloads[peer]
 
-                self.resource_manager.pull_resource(
-                    entry.resource, entry.res_id,
-                    client_options=entry.client_options,
-                    success=self._download_success,
-                    error=self._download_error,
-                    async_=async_
-                )
+    def _get_retry_delay(self, retries: int) -> float:
+        delay = min(self.MAX_RETRY_DELAY,
+                    self.RETRY_DELAY * 2 ** (retries - 1))
+        return random.uniform(delay / 2, delay)
 
     def _download_success(self, resource, _, res_id):
         if not resource:
@@ -148,15 +252,37 @@ class BaseResourceServer(object):
                                  resource, res_id)
             return
 
+        entry = self._get_pending_resource(resource, res_id)
+        self._download_finished(entry)
+        if entry:
+            entry.status = TransferStatus.complete
+
         if not self._remove_pending_resource(resource, res_id):
             logger.warning("Resources for id %r were re-downloaded", res_id)
-            return
+        else:
+            self._extract_resources(resource, res_id)
 
-        self._extract_resources(resource, res_id)
+        self._download_resources()
 
     def _download_error(self, error, resource, res_id):
-        self._remove_pending_resource(resource, res_id)
-        self.client.resource_failure(res_id, error)
+        entry = self._get_pending_resource(resource, res_id)
+        self._download_finished(entry)
+
+        if entry and entry.retries + 1 < self.MAX_DOWNLOAD_RETRIES:
+            entry.retries += 1
+            entry.status = TransferStatus.failed
+            entry.retry_at = time.time() + self._get_retry_delay(entry.retries)
+            logger.warning("Error downloading resource %r for %r, will retry "
+                           "(attempt %d of %d): %r", resource, res_id,
+                           entry.retries + 1, self.MAX_DOWNLOAD_RETRIES,
+                           error)
+        else:
+            if entry:
+                entry.status = TransferStatus.failed
+            self._remove_pending_resource(resource, res_id)
+            self.client.resource_failure(res_id, error)
+
+        self._download_resources()
 
     def _extract_resources(self, resource, res_id):
         resource_dir = self.resource_manager.storage.get_dir(res_id)
@@ -173,11 +299,17 @@ class BaseResourceServer(object):
             ctk.add_package_paths(res_id, package_paths)
 
         async_req = golem_async.AsyncRequest(extract_packages, resource[1])
-        golem_async.async_run(async_req).addCallbacks(
+        self._extract_semaphore.run(
+            golem_async.async_run, async_req
+        ).addCallbacks(
             lambda _: self.client.resource_collected(res_id),
-            lambda e: self._download_error(e, resource, res_id)
+            lambda e: self._extraction_error(e, res_id)
         )
 
+    def _extraction_error(self, error, res_id):
+        logger.error("Error extracting resources for %r: %r", res_id, error)
+        self.client.resource_failure(res_id, error)
+
     def start_accepting(self):
         pass
 
@@ -1,7 +1,9 @@
 import abc
 import logging
 import os
+import random
 import socket
+import time
 import uuid
 from copy import deepcopy
 from twisted.internet.defer import Deferred
@@ -41,9 +43,19 @@ class ClientConfig(object):
     """
     Initial configuration for classes implementing the IClient interface
     """
-    def __init__(self, max_retries=3, timeout=None):
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 max_retries=3,
+                 timeout=None,
+                 retry_delay=0.5,
+                 max_retry_delay=8.,
+                 retry_timeout=None):
 
         self.max_retries = max_retries
+        # Base delay of exponential backoff between retries, in seconds
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        # Default time limit for all retries of a single call, in seconds
+        self.retry_timeout = retry_timeout
         self.client = dict(
             timeout=timeout or (12000, 12000)
         )
@@ -135,13 +147,36 @@ class ClientHandler(metaclass=abc.ABCMeta):
     def __init__(self, config: Optional[ClientConfig]):
         self.config = config or ClientConfig()
 
+    def _get_retry_delay(self, retries: int) -> float:
+        """ Exponential backoff with full jitter, so that clients failing at
+            the same time do not retry in lockstep """
+        delay = min(self.config.max_retry_delay,
+                    self.config.retry_delay * 2 ** (retries - 1))
+        return random.uniform(0, delay)
+
+    def _get_deadline(self, deadline: Optional[float]) -> Optional[float]:
+        if deadline is None and self.config.retry_timeout is not None:
+            deadline = time.time() + self.config.retry_timeout
+        return deadline
+
+    @staticmethod
+    def _can_retry_before(deadline: Optional[float], delay: float) -> bool:
+        return deadline is None or time.time() + delay < deadline
+
+    @staticmethod
+    def _call_later(delay: float, method, *args):
+        from twisted.internet import reactor
+        return reactor.callLater(delay, method, *args)
+
     def _retry(self, method: MethodType,
                *args,
                raise_exc: Optional[bool] = False,
+               deadline: Optional[float] = None,
                **kwargs):
 
         retries = 0
         result = None
+        deadline = self._get_deadline(deadline)
 
         while not result:
             retries += 1
@@ -159,11 +194,15 @@ class ClientHandler(metaclass=abc.ABCMeta):
                                  'kwargs=%r, exc=%r',
                                  retries, method, args, kwargs, exc)
                     raise exc
-                if retries < self.config.max_retries:
-                    logger.warning('Error executing, will retry. '
+                delay = self._get_retry_delay(retries)
+                if retries < self.config.max_retries and \
+                        self._can_retry_before(deadline, delay):
+                    logger.warning('Error executing, will retry in %.2f s. '
                                    'count=%r, method=%r, args=%r, '
                                    'kwargs=%r, exc=%r',
-                                   retries, method, args, kwargs, exc)
+                                   delay, retries, method, args, kwargs, exc)
+                    if delay > 0:
+                        time.sleep(delay)
                     continue
                 if raise_exc:
                     logger.error('Error executing, raising all. '
@@ -175,9 +214,11 @@ class ClientHandler(metaclass=abc.ABCMeta):
                 return None
             return result
 
-    def _retry_async(self, method: MethodType, *args, **kwargs):
+    def _retry_async(self, method: MethodType, *args,
+                     deadline: Optional[float] = None, **kwargs):
         retries = 0
         result = Deferred()
+        deadline = self._get_deadline(deadline)
 
         def _run():
             nonlocal retries
@@ -195,18 +236,23 @@ class ClientHandler(metaclass=abc.ABCMeta):
             if isinstance(exc, Failure):
                 exc = exc.value
 
+            delay = self._get_retry_delay(retries)
             if exc.__class__ not in self.retry_exceptions:
                 logger.error('Error executing async, raising. '
                              'count=%r, method=%r, args=%r, '
                              'kwargs=%r, exc=%r',
                              retries, method, args, kwargs, exc)
                 result.errback(exc)
-            elif retries < self.config.max_retries:
-                logger.warning('Error executing async, will retry. '
+            elif retries < self.config.max_retries and \
+                    self._can_retry_before(deadline, delay):
+                logger.warning('Error executing async, will retry in %.2f s. '
                                'count=%r, method=%r, args=%r, '
                                'kwargs=%r, exc=%r',
-                               retries, method, args, kwargs, exc)
-                _run()
+                               delay, retries, method, args, kwargs, exc)
+                if delay > 0:
+                    self._call_later(delay, _run)
+                else:
+                    _run()
             else:
                 logger.error('Error executing async, raising all. '
                              'count=%r, method=%r, args=%r, '
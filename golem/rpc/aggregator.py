@@ -0,0 +1,123 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from twisted.internet.task import LoopingCall
+
+from golem.core.service import IService
+from golem.rpc.mapping.rpceventnames import Task
+
+
+class TaskEventAggregator(IService):
+    """ Publishes task and subtask status updates, merged in batches.
+
+    Updates received within a window are published once per window. The
+    single `evt.comp.task.status` and `evt.comp.subtask.status` events are
+    merged per task and per subtask, so that only the latest intermediate
+    state is sent; a completed state (finished, failed, timeout, aborted
+    etc.) is never merged away. Once per window a subscriber also receives
+    at most:
+
+    - one `evt.comp.tasks.status.batch` event, mapping task ids to their
+      latest op class name and value,
+    - one `evt.comp.subtasks.status.batch` event, mapping task ids to
+      subtask ids and their latest op value.
+    """
+
+    WINDOW = 0.5
+
+    def __init__(self,
+                 publish: Callable[..., None],
+                 window: float = WINDOW,
+                 clock=None) -> None:
+        self._publish = publish
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Tuple[Optional[str], Optional[int]]] = \
+            OrderedDict()
+        self._subtasks: Dict[Tuple[str, str], int] = OrderedDict()
+        # single events in order, with the index of the last intermediate
+        # event of each task and subtask, which can still be replaced
+        self._events: List[Tuple[str, Tuple[Any, ...]]] = []
+        self._replaceable: Dict[Tuple, int] = {}
+
+        # LoopingCall defaults to the reactor
+        self._loop = LoopingCall(self.flush)
+        if clock is not None:
+            self._loop.clock = clock
+
+        self.received = 0
+        self.published = 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop.running
+
+    def start(self) -> None:
+        self._loop.start(self.window, now=False)
+
+    def stop(self) -> None:
+        self._loop.stop()
+        self.flush()
+
+    def task_updated(self, task_id: str, op_class: Optional[str],
+                     op_value: Optional[int],
+                     completed: bool = False) -> None:
+        with self._lock:
+            self.received += 1
+            self._tasks.pop(task_id, None)
+            self._tasks[task_id] = (op_class, op_value)
+            self._add_event((task_id, ), completed, Task.evt_task_status,
+                            task_id, op_class, op_value)
+
+    def subtask_updated(self, task_id: str, subtask_id: str,
+                        op_value: int, completed: bool = False) -> None:
+        with self._lock:
+            self.received += 1
+            self._subtasks.pop((task_id, subtask_id), None)
+            self._subtasks[(task_id, subtask_id)] = op_value
+            self._add_event((task_id, subtask_id), completed,
+                            Task.evt_subtask_status,
+                            task_id, subtask_id, op_value)
+
+    def _add_event(self, key: Tuple, completed: bool, event: str,
+                   *args) -> None:
+        index = self._replaceable.pop(key, None)
+        if index is None:
+            index = len(self._events)
+            self._events.append((event, args))
+        else:
+            self._events[index] = (event, args)
+        if not completed:
+            self._replaceable[key] = index
+
+    def flush(self) -> None:
+        with self._lock:
+            tasks, self._tasks = self._tasks, OrderedDict()
+            subtasks, self._subtasks = self._subtasks, OrderedDict()
+            events, self._events = self._events, []
+            self._replaceable = {}
+
+        for event, args in events:
+            self._publish(event, *args)
+        if tasks:
+            self._publish(Task.evt_tasks_status_batch, {
+                task_id: {'op_class': op_class, 'op_value': op_value}
+                for task_id, (op_class, op_value) in tasks.items()
+            })
+        if subtasks:
+            batch: Dict[str, Dict[str, int]] = {}
+            for (task_id, subtask_id), op_value in subtasks.items():
+                batch.setdefault(task_id, {})[subtask_id] = op_value
+            self._publish(Task.evt_subtasks_status_batch, batch)
+
+        self.published += len(events) + len(tasks) + len(subtasks)
+
+    def get_stats(self) -> Dict[str, int]:
+        """ `received` updates were merged into `published` events and
+            batch entries """
+        return {
+            'received': self.received,
+            'published': self.published,
+        }
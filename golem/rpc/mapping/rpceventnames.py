@@ -25,6 +25,8 @@ class Reputation:
 class Task:
     evt_task_status = 'evt.comp.task.status'
     evt_subtask_status = 'evt.comp.subtask.status'
+    evt_tasks_status_batch = 'evt.comp.tasks.status.batch'
+    evt_subtasks_status_batch = 'evt.comp.subtasks.status.batch'
     evt_task_test_status = 'evt.comp.task.test.status'
 
     evt_provider_rejected = 'evt.comp.task.prov_rejected'
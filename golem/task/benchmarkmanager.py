@@ -1,21 +1,58 @@
-from copy import copy
+import hashlib
 import logging
-import os
+import math
 from threading import Thread
-from typing import Union
+from typing import Iterable, NamedTuple, Optional, Tuple, Union
 
 from apps.core.benchmark.benchmarkrunner import BenchmarkRunner
 from apps.core.task.coretaskstate import TaskDesc
+from golem import hardware as hw
 from golem.core.threads import callback_wrapper
+from golem.docker.task_thread import DockerTaskThread
 from golem.environments.environment import Environment as DefaultEnvironment
 
-from golem.model import Performance
+from golem.model import HardwarePerformance, Performance
 from golem.resource.dirmanager import DirManager
 from golem.task.taskstate import TaskStatus
 
 logger = logging.getLogger(__name__)
 
 
+class Hardware(NamedTuple):
+    """ Hardware configuration the benchmarks are run on: the CPU, the cores
+    and memory (KiB) given to computations and the Docker VM, if any """
+    cpu_model: str
+    cpu_cores: int
+    memory: int
+    vm: str
+
+    @property
+    def fingerprint(self) -> str:
+        return hashlib.sha1(repr(tuple(self)).encode()).hexdigest()
+
+
+def scaled_performance(results: Iterable[Tuple[int, float]],
+                       cpu_cores: int) -> Optional[float]:
+    """ Estimates the performance on cpu_cores from (cores, performance)
+    results measured on the same CPU. Fits performance = a * cores ** b in
+    log-log space, with b limited to [0, 1]: more cores are neither slower
+    nor superlinear. A single core count is assumed to scale linearly.
+    :return: None if there are no results
+    """
+    points = [(math.log(cores), math.log(value))
+              for cores, value in results if cores > 0 and value > 0]
+    if not points or cpu_cores < 1:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    exponent = 1.
+    if variance > 0:
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+        exponent = min(max(covariance / variance, 0.), 1.)
+    return math.exp(mean_y + exponent * (math.log(cpu_cores) - mean_x))
+
+
 class BenchmarkManager(object):
     def __init__(self, node_name, task_server, root_path, benchmarks=None):
         self.node_name = node_name
@@ -33,18 +70,72 @@ class BenchmarkManager(object):
         if self.benchmarks:
             ids = self.get_saved_benchmarks_ids()
             return not set(self.benchmarks.keys() |
-                           {DefaultEnvironment.get_id()}).issubset(ids)
+                           {DefaultEnvironment.get_id()}).issubset(ids) \
+                or self.hardware_changed()
         return False
 
+    def hardware(self) -> Hardware:
+        config_desc = self.task_server.client.config_desc
+        hypervisor = getattr(DockerTaskThread.docker_manager, 'hypervisor',
+                             None)
+        return Hardware(
+            cpu_model=hw.cpu_model(),
+            cpu_cores=config_desc.num_cores,
+            memory=config_desc.max_memory_size,
+            vm=type(hypervisor).__name__ if hypervisor else '',
+        )
+
+    def hardware_changed(self) -> bool:
+        """ Benchmarks were run on other hardware configurations only """
+        query = HardwarePerformance.select(HardwarePerformance.fingerprint)
+        fingerprints = set(result.fingerprint for result in query)
+        return bool(fingerprints) \
+            and self.hardware().fingerprint not in fingerprints
+
+    @staticmethod
+    def get_stored_performance(env_id: str,
+                               hardware: Hardware) -> Optional[float]:
+        try:
+            return HardwarePerformance.get(
+                HardwarePerformance.environment_id == env_id,
+                HardwarePerformance.fingerprint == hardware.fingerprint).value
+        except HardwarePerformance.DoesNotExist:
+            return None
+
+    @staticmethod
+    def estimate_performance(env_id: str,
+                             hardware: Hardware) -> Optional[float]:
+        """ Scales the results measured with other core counts or memory
+        on the same CPU and VM """
+        if not hardware.cpu_model:
+            return None
+        query = HardwarePerformance.select(
+            HardwarePerformance.cpu_cores,
+            HardwarePerformance.value,
+        ).where(
+            HardwarePerformance.environment_id == env_id,
+            HardwarePerformance.cpu_model == hardware.cpu_model,
+            HardwarePerformance.vm == hardware.vm,
+        )
+        return scaled_performance(
+            ((result.cpu_cores, result.value) for result in query),
+            hardware.cpu_cores)
+
     def run_benchmark(self, benchmark, task_builder, env_id, success=None,
                       error=None):
         logger.info('Running benchmark for %s', env_id)
 
         from golem_messages.datastructures.p2p import Node
 
+        hardware = self.hardware()
+
         def success_callback(performance):
             logger.info('%s performance is %.2f', env_id, performance)
-            Performance.update_or_create(env_id, performance)
+            HardwarePerformance.update_or_create(env_id, hardware, performance)
+            # the configuration may have changed while the benchmark was
+            # running, the result is kept for when it comes back
+            if hardware == self.hardware():
+                Performance.update_or_create(env_id, performance)
             if success:
                 success(performance)
 
@@ -77,7 +168,7 @@ class BenchmarkManager(object):
                     self.task_server.client.config_desc.num_cores)
 
         def run_non_default_benchmarks(_performance=None):
-            self.run_benchmarks(copy(self.benchmarks), success, error)
+            self.run_affected_benchmarks(success, error)
 
         if DefaultEnvironment.get_id() not in self.get_saved_benchmarks_ids():
             # run once in lifetime, since it's for single CPU core
@@ -85,6 +176,44 @@ class BenchmarkManager(object):
         else:
             run_non_default_benchmarks()
 
+    def run_affected_benchmarks(self, success=None, error=None):
+        """ Reuses the performance measured on the current hardware and runs
+        the remaining benchmarks. When all of them can be estimated from the
+        results on other configurations of this CPU, the estimates are used
+        right away and the benchmarks run in the background. """
+        hardware = self.hardware()
+        benchmarks = dict()
+        estimated = True
+
+        for env_id, benchmark_data in self.benchmarks.items():
+            performance = self.get_stored_performance(env_id, hardware)
+            if performance is not None:
+                logger.info('Reusing %s performance %.2f', env_id,
+                            performance)
+                Performance.update_or_create(env_id, performance)
+                continue
+
+            benchmarks[env_id] = benchmark_data
+            performance = self.estimate_performance(env_id, hardware)
+            if performance is None:
+                estimated = False
+                continue
+            logger.info('%s performance is estimated at %.2f', env_id,
+                        performance)
+            Performance.update_or_create(env_id, performance)
+
+        if not benchmarks:
+            if success:
+                success(None)
+        elif estimated:
+            logger.info('Running %d benchmarks in the background',
+                        len(benchmarks))
+            self.run_benchmarks(benchmarks)
+            if success:
+                success(None)
+        else:
+            self.run_benchmarks(benchmarks, success, error)
+
     def run_benchmarks(self, benchmarks, success=None, error=None):
         env_id, (benchmark, builder_class) = benchmarks.popitem()
 
@@ -0,0 +1,269 @@
+import bz2
+import logging
+import lzma
+import os
+import sys
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# ZipFile.write accepts `compresslevel` since Python 3.7
+LEVELS_SUPPORTED = sys.version_info >= (3, 7)
+
+
+class Compression(NamedTuple):
+    method: int
+    level: Optional[int] = None
+
+
+STORED = Compression(zipfile.ZIP_STORED)
+
+
+class _Candidate(NamedTuple):
+    compression: Compression
+    compress: Callable[[bytes], bytes]
+
+
+class _Payload(NamedTuple):
+    data: bytes
+    crc: int
+    size: int
+
+
+def _compress_file(path: str, compression: Compression,
+                   chunk_size: int = 1024 ** 2) -> _Payload:
+    """ Compresses a file into the payload of a zip entry """
+    # pylint: disable=protected-access
+    if LEVELS_SUPPORTED:
+        compressor = zipfile._get_compressor(compression.method,
+                                             compression.level)
+    else:
+        compressor = zipfile._get_compressor(compression.method)
+
+    chunks = []
+    crc = size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk))
+    chunks.append(compressor.flush())
+    return _Payload(b''.join(chunks), crc, size)
+
+
+def _candidates() -> List[_Candidate]:
+    if LEVELS_SUPPORTED:
+        candidates = [
+            _Candidate(Compression(zipfile.ZIP_DEFLATED, level),
+                       lambda data, lvl=level: zlib.compress(data, lvl))
+            for level in (1, 6, 9)
+        ]
+    else:
+        candidates = [
+            _Candidate(Compression(zipfile.ZIP_DEFLATED),
+                       lambda data: zlib.compress(data, 6)),
+        ]
+    return candidates + [
+        _Candidate(Compression(zipfile.ZIP_BZIP2),
+                   lambda data: bz2.compress(data, 9)),
+        _Candidate(Compression(zipfile.ZIP_LZMA), lzma.compress),
+    ]
+
+
+class CompressionPolicy:
+    """ Chooses the compression of each package entry.
+
+    A few samples of every file are compressed with each candidate method.
+    The method with the lowest estimated time of compressing the whole file
+    and sending it at `bandwidth` bytes per second wins; files which do not
+    compress are stored. Files are sampled in parallel.
+    """
+
+    # extensions of formats that are compressed already
+    COMPRESSED_EXTENSIONS = frozenset([
+        '.7z', '.bz2', '.gif', '.gz', '.jpeg', '.jpg', '.lz', '.lzma',
+        '.mkv', '.mov', '.mp3', '.mp4', '.png', '.rar', '.webm', '.webp',
+        '.xz', '.zip',
+    ])
+    # files smaller than that are stored
+    MIN_SIZE = 1024
+    SAMPLE_SIZE = 64 * 1024
+    SAMPLE_COUNT = 3
+    # an entry is compressed only if it shrinks to less than this ratio
+    MAX_RATIO = 0.9
+    # 10 Mbit/s, a typical residential uplink
+    DEFAULT_BANDWIDTH = 10 * 1024 ** 2 / 8
+
+    def __init__(self,
+                 bandwidth: float = DEFAULT_BANDWIDTH,
+                 max_workers: Optional[int] = None) -> None:
+        self.bandwidth = bandwidth
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._candidates = _candidates()
+
+    def choose(self, path: str) -> Compression:
+        """ Returns the compression for a single file """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return STORED
+
+        ext = os.path.splitext(path)[1].lower()
+        if size < self.MIN_SIZE or ext in self.COMPRESSED_EXTENSIONS:
+            return STORED
+
+        try:
+            sample = self._read_sample(path, size)
+        except OSError:
+            return STORED
+
+        best = STORED
+        best_time = size / self.bandwidth
+        for candidate in self._candidates:
+            started = time.perf_counter()
+            compressed_size = len(candidate.compress(sample))
+            compress_time = (time.perf_counter() - started) * size \
+                / len(sample)
+            # candidates are ordered from the fastest one
+            if compress_time >= best_time:
+                break
+
+            ratio = compressed_size / len(sample)
+            if ratio > self.MAX_RATIO:
+                # compresses poorly; stronger methods are not worth trying
+                if candidate is self._candidates[0]:
+                    break
+                continue
+
+            estimated_time = compress_time + ratio * size / self.bandwidth
+            if estimated_time < best_time:
+                best, best_time = candidate.compression, estimated_time
+
+        logger.debug("Compression of %r (%d B): %r", path, size, best)
+        return best
+
+    def choose_all(self, paths: Iterable[str]) -> Dict[str, Compression]:
+        paths = list(paths)
+        if len(paths) < 2:
+            return {path: self.choose(path) for path in paths}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(paths, executor.map(self.choose, paths)))
+
+    def _read_sample(self, path: str, size: int) -> bytes:
+        """ Reads SAMPLE_COUNT chunks spread evenly over the file """
+        if size <= self.SAMPLE_SIZE * self.SAMPLE_COUNT:
+            with open(path, 'rb') as f:
+                return f.read()
+
+        step = (size - self.SAMPLE_SIZE) // (self.SAMPLE_COUNT - 1)
+        chunks = []
+        with open(path, 'rb') as f:
+            for i in range(self.SAMPLE_COUNT):
+                f.seek(i * step)
+                chunks.append(f.read(self.SAMPLE_SIZE))
+        return b''.join(chunks)
+
+
+class CompressingZipFile(zipfile.ZipFile):
+    """ ZipFile writing each file with the compression chosen for it by
+    a CompressionPolicy. `plan` chooses compressions of many files at once
+    and starts compressing them in parallel, a few files ahead of the one
+    being written. Files are written in the planned order. """
+
+    def __init__(self, *args, policy: Optional[CompressionPolicy] = None,
+                 **kwargs) -> None:
+        # set before ZipFile.__init__, which may call close() on failure
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # files to compress, in the order they are going to be written
+        self._planned: Dict[str, Compression] = OrderedDict()
+        self._compressing: Dict[str, Future] = {}
+        super().__init__(*args, **kwargs)
+        self.policy = policy
+        self.compressions: Dict[str, Compression] = {}
+
+    def plan(self, paths: Iterable[str]) -> None:
+        if not self.policy:
+            return
+        compressions = self.policy.choose_all(paths)
+        self.compressions.update(compressions)
+        for path, compression in compressions.items():
+            if compression.method != zipfile.ZIP_STORED:
+                self._planned[path] = compression
+        if self._planned and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.policy.max_workers)
+        self._compress_ahead()
+
+    def write(self, filename, arcname=None, compress_type=None,
+              **kwargs):  # pylint: disable=arguments-differ
+        if compress_type is None and self.policy \
+                and os.path.isfile(filename):
+            future = self._compressing.pop(filename, None)
+            if future is not None:
+                self._write_payload(filename, arcname,
+                                    self.compressions[filename],
+                                    future.result())
+                self._compress_ahead()
+                return
+
+            # written out of the planned order
+            self._planned.pop(filename, None)
+            compression = self.compressions.get(filename)
+            if compression is None:
+                compression = self.policy.choose(filename)
+            compress_type = compression.method
+            if compression.level is not None:
+                kwargs['compresslevel'] = compression.level
+        super().write(filename, arcname, compress_type, **kwargs)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            for future in self._compressing.values():
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        super().close()
+
+    def _compress_ahead(self) -> None:
+        """ Keeps up to twice as many files compressed or being compressed
+        as there are workers """
+        limit = 2 * self.policy.max_workers
+        while self._planned and len(self._compressing) < limit:
+            path, compression = self._planned.popitem(last=False)
+            self._compressing[path] = self._executor.submit(
+                _compress_file, path, compression)
+
+    def _write_payload(self, filename: str, arcname: Optional[str],
+                       compression: Compression, payload: _Payload) -> None:
+        """ Writes a compressed file, as ZipFile.open(zinfo, 'w') does """
+        # pylint: disable=protected-access
+        zinfo = zipfile.ZipInfo.from_file(filename, arcname)
+        zinfo.compress_type = compression.method
+        zinfo.file_size = payload.size
+        zinfo.compress_size = len(payload.data)
+        zinfo.CRC = payload.crc
+        zinfo.flag_bits = 0x00
+        if zinfo.compress_type == zipfile.ZIP_LZMA:
+            # compressed data includes an end-of-stream marker
+            zinfo.flag_bits |= 0x02
+
+        with self._lock:
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(zinfo.FileHeader())
+            self.fp.write(payload.data)
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
+            self.start_dir = self.fp.tell()
@@ -10,6 +10,8 @@ from golem.core.fileencrypt import AESFileEncryptor
 from golem.core.fileshelper import common_dir, relative_path
 from golem.core.printable_object import PrintableObject
 from golem.core.simplehash import SimpleHash
+from golem.task.result.compression import CompressingZipFile, \
+    CompressionPolicy
 
 
 def backup_rename(file_path, max_iterations=100):
@@ -42,6 +44,7 @@ class Packager(object):
 
         disk_files = self._prepare_file_dict(disk_files)
         with self.generator(output_path) as of:
+            self.prepare_package(of, list(disk_files))
             for file_path, file_name in disk_files.items():
                 self.write_disk_file(of, file_path, file_name)
 
@@ -66,6 +69,9 @@ class Packager(object):
             for absolute_path in disk_files
         }
 
+    def prepare_package(self, package_file, src_paths: List[str]):
+        """ Called with all the files to pack before any is written """
+
     @abc.abstractmethod
     def extract(self, input_path, output_dir=None):
         pass
@@ -86,6 +92,8 @@ class Packager(object):
 class ZipPackager(Packager):
 
     ZIP_MODE = zipfile.ZIP_STORED  # no compression
+    # chooses per-entry compression; entries are stored if None
+    compression_policy: Optional[CompressionPolicy] = CompressionPolicy()
 
     def extract(self, input_path, output_dir=None):
 
@@ -100,7 +108,31 @@ class ZipPackager(Packager):
         return extracted, output_dir
 
     def generator(self, output_path):
-        return zipfile.ZipFile(output_path, mode='w', compression=self.ZIP_MODE)
+        return CompressingZipFile(output_path, mode='w',
+                                  compression=self.ZIP_MODE,
+                                  policy=self.compression_policy)
+
+    def prepare_package(self, package_file, src_paths: List[str]):
+        if not isinstance(package_file, CompressingZipFile):
+            return
+
+        files: List[str] = []
+        for path in src_paths:
+            files.extend(ZipPackager._list_files(path.rstrip('/')))
+        package_file.plan(files)
+
+    @staticmethod
+    def _list_files(path: str) -> List[str]:
+        """ Files under `path`, in the order zip_append writes them """
+        if not os.path.isdir(path):
+            return [path]
+        files: List[str] = []
+        for root, dirs, file_names in os.walk(path):
+            for d in dirs:
+                files.extend(ZipPackager._list_files(os.path.join(root, d)))
+            files.extend(os.path.join(root, f) for f in file_names)
+            break
+        return files
 
     def write_disk_file(self, package_file, src_path, zip_path):
         relative_subdirectory = os.path.dirname(zip_path)
@@ -172,6 +204,9 @@ class EncryptingPackager(Packager):
     def generator(self, output_path):
         return self._packager.generator(output_path)
 
+    def prepare_package(self, package_file, src_paths: List[str]):
+        self._packager.prepare_package(package_file, src_paths)
+
     def package_name(self, file_path):
         return self.creator_class.package_name(file_path)
 
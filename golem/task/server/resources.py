@@ -113,12 +113,24 @@ class TaskResourcesMixin:
         task_keeper = self.task_manager.comp_task_keeper
         options = task_keeper.get_resources_options(subtask_id)
         client_options = self.get_download_options(options)
-        self.pull_resources(task_id, resources, client_options)
+        self.pull_resources(task_id, resources, client_options,
+                            deadline=self._get_subtask_deadline(task_id,
+                                                                subtask_id))
         return True
 
-    def pull_resources(self, task_id, resources, client_options=None):
+    def _get_subtask_deadline(self, task_id, subtask_id) -> Optional[float]:
+        task_keeper = self.task_manager.comp_task_keeper
+        comp_task_info = task_keeper.active_tasks.get(task_id)
+        if not comp_task_info:
+            return None
+        compute_task_def = comp_task_info.subtasks.get(subtask_id)
+        return compute_task_def.get('deadline') if compute_task_def else None
+
+    def pull_resources(self, task_id, resources, client_options=None,
+                       deadline=None):
         self.client.pull_resources(
-            task_id, resources, client_options=client_options)
+            task_id, resources, client_options=client_options,
+            deadline=deadline)
 
     def get_download_options(
             self,
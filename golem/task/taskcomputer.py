@@ -82,6 +82,9 @@ class TaskComputer(object):
         self.stats = IntStatsKeeper(CompStats)
 
         self.assigned_subtask: Optional['ComputeTaskDef'] = None
+        # Progress reported by the currently computing task thread
+        self.subtask_progress = 0.0
+        self.last_progress_time: Optional[float] = None
 
         self.last_task_timeout_checking = None
         self.support_direct_computation = False
@@ -174,6 +177,15 @@ class TaskComputer(object):
                         str(work_wall_clock_time))
             self.stats.increase_stat('computed_tasks')
 
+            resource_usage = task_thread.result.get('resource_usage')
+            if resource_usage:
+                dispatcher.send(
+                    signal='golem.subtask',
+                    event='resource_usage',
+                    subtask_id=subtask_id,
+                    **resource_usage,
+                )
+
             try:
                 self.task_server.send_results(
                     subtask_id,
@@ -201,6 +213,7 @@ class TaskComputer(object):
         """ Main loop of task computer """
         if self.counting_thread is not None:
             self.counting_thread.check_timeout()
+            self._update_progress()
         elif self.compute_tasks and self.runnable:
             last_request = time.time() - self.last_task_request
             if last_request > self.task_request_frequency:
@@ -211,16 +224,37 @@ class TaskComputer(object):
             return None
 
         c: TaskThread = self.counting_thread
+        now = time.time()
         tcss = ComputingSubtaskStateSnapshot(
             subtask_id=self.assigned_subtask['subtask_id'],
             progress=c.get_progress(),
             seconds_to_timeout=c.task_timeout,
-            running_time_seconds=(time.time() - c.start_time),
+            running_time_seconds=(now - c.start_time),
+            seconds_since_progress=(now - (self.last_progress_time or now)),
             **c.extra_data,
         )
 
         return tcss
 
+    def _update_progress(self) -> None:
+        task_thread = self.counting_thread
+        subtask = self.assigned_subtask
+        if task_thread is None or subtask is None:
+            return
+
+        progress = task_thread.get_progress()
+        if progress == self.subtask_progress:
+            return
+
+        self.subtask_progress = progress
+        self.last_progress_time = time.time()
+        dispatcher.send(
+            signal='golem.taskcomputer',
+            event='subtask_progress',
+            subtask_id=subtask['subtask_id'],
+            progress=progress,
+        )
+
     def is_computing(self) -> bool:
         with self.lock:
             return self.counting_thread is not None
@@ -381,6 +415,8 @@ class TaskComputer(object):
 
         with self.lock:
             self.counting_thread = tt
+            self.subtask_progress = 0.0
+            self.last_progress_time = time.time()
 
         tt.start().addBoth(lambda _: self.task_computed(tt))
 
@@ -1,4 +1,5 @@
 import datetime
+import hashlib
 import logging
 import pathlib
 import pickle
@@ -6,7 +7,7 @@ import time
 import typing
 
 import random
-from collections import Counter
+from collections import Counter, OrderedDict
 
 from eth_utils import decode_hex
 from golem_messages import (
@@ -314,6 +315,52 @@ class CompTaskKeeper:
         return self.task_package_paths.get(task_id, None)
 
 
+class VerifiedHeadersCache:
+    """ Remembers task headers with already verified signatures, so that
+        headers received again are not verified again.
+
+        A header is looked up by its task id and signature and matches only
+        if its content is the same as of the verified one. The least
+        recently used entries are evicted above `max_size`.
+    """
+
+    MAX_SIZE = 10000
+
+    def __init__(self, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self._entries: typing.Dict[tuple, bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(header: dt_tasks.TaskHeader) -> tuple:
+        return header.task_id, header.signature
+
+    @staticmethod
+    def _digest(header: dt_tasks.TaskHeader) -> bytes:
+        return hashlib.sha256(pickle.dumps(header.to_dict())).digest()
+
+    def __contains__(self, header: dt_tasks.TaskHeader) -> bool:
+        key = self._key(header)
+        digest = self._entries.get(key)
+        if digest is None or digest != self._digest(header):
+            self.misses += 1
+            return False
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def add(self, header: dt_tasks.TaskHeader) -> None:
+        key = self._key(header)
+        self._entries[key] = self._digest(header)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class TaskHeaderKeeper:
     """Keeps information about tasks living in Golem Network. Node may
        choose one of those task to compute or will pass information
@@ -168,6 +168,8 @@ class TaskManager(TaskEventListener):
                                                    minimal)
         definition.task_id = CoreTask.create_task_id(self.keys_auth.public_key)
         definition.concent_enabled = dictionary.get('concent_enabled', False)
+        definition.duplicate_stragglers = \
+            dictionary.get('duplicate_stragglers', False)
         builder = builder_type(self.node, definition, self.dir_manager)
 
         return builder.build()
@@ -447,8 +449,11 @@ class TaskManager(TaskEventListener):
         if not self.check_next_subtask(task_id, price):
             return None
 
+        duplicate_of = None
         if not self.task_needs_computation(task_id):
-            return None
+            duplicate_of = self._select_straggler(task_id, node_id)
+            if duplicate_of is None:
+                return None
 
         if self.should_wait_for_node(task_id, node_id):
             return None
@@ -461,11 +466,19 @@ class TaskManager(TaskEventListener):
                          task_id, node_name, node_id)
             return None
 
-        extra_data = task.query_extra_data(
-            estimated_performance,
-            node_id,
-            node_name
-        )
+        if duplicate_of is not None:
+            extra_data = task.query_duplicate_extra_data(
+                duplicate_of,
+                estimated_performance,
+                node_id,
+                node_name
+            )
+        else:
+            extra_data = task.query_extra_data(
+                estimated_performance,
+                node_id,
+                node_name
+            )
         ctd = extra_data.ctd
 
         def check_compute_task_def():
@@ -507,6 +520,29 @@ class TaskManager(TaskEventListener):
         ProviderComputeTimers.start(ctd['subtask_id'])
         return ctd
 
+    def _select_straggler(self, task_id: str,
+                          node_id: Optional[str] = None) -> Optional[str]:
+        """ Returns id of a running subtask that should also be given to
+        the node, if the task duplicates straggling subtasks """
+        task = self.tasks[task_id]
+        if self.task_finished(task_id) or not isinstance(task, CoreTask) \
+                or task.straggler_policy is None:
+            return None
+
+        candidates = task.get_straggler_candidates(node_id)
+        if not candidates:
+            return None
+
+        subtask_states = self.tasks_states[task_id].subtask_states
+        return task.straggler_policy.select(
+            [
+                (subtask_id, subtask_states[subtask_id].time_started, copies)
+                for subtask_id, copies in candidates.items()
+                if subtask_id in subtask_states
+            ],
+            parts_left=task.get_parts_left(),
+        )
+
     def is_my_task(self, task_id: str) -> bool:
         """ Check if the task ID is known by this node. """
         return task_id in self.tasks
@@ -699,7 +735,10 @@ class TaskManager(TaskEventListener):
         ret = []
         for tid, task in self.tasks.items():
             status = self.tasks_states[tid].status
-            if task.needs_computation() and status in self.activeStatus:
+            if status not in self.activeStatus:
+                continue
+            if task.needs_computation() \
+                    or self._select_straggler(tid) is not None:
                 ret.append(task.header)
 
         return ret
@@ -756,6 +795,11 @@ class TaskManager(TaskEventListener):
         @TaskManager.handle_generic_key_error
         def verification_finished_():
             logger.debug("Verification finished. subtask_id=%s", subtask_id)
+            if subtask_state.subtask_status == SubtaskStatus.cancelled:
+                logger.info("Subtask %r computed by another provider",
+                            subtask_id)
+                verification_finished()
+                return
             ss = self.__set_subtask_state_finished(subtask_id)
             if not self.tasks[task_id].verify_subtask(subtask_id):
                 logger.debug("Subtask %r not accepted\n", subtask_id)
@@ -771,6 +815,7 @@ class TaskManager(TaskEventListener):
             self.notice_task_updated(task_id,
                                      subtask_id=subtask_id,
                                      op=SubtaskOp.FINISHED)
+            self._cancel_subtask_copies(task_id, subtask_id)
 
             if self.tasks_states[task_id].status in self.activeStatus:
                 if not self.tasks[task_id].finished_computation():
@@ -793,6 +838,27 @@ class TaskManager(TaskEventListener):
             subtask_id, result, verification_finished_
         )
 
+    def _cancel_subtask_copies(self, task_id: str, subtask_id: str) -> None:
+        """ Cancels the other subtasks computing the part of the accepted
+        subtask """
+        task = self.tasks[task_id]
+        if not isinstance(task, CoreTask) or task.straggler_policy is None:
+            return
+
+        subtask_states = self.tasks_states[task_id].subtask_states
+        task.straggler_policy.subtask_finished(
+            time.time() - subtask_states[subtask_id].time_started)
+
+        for copy_id in task.cancel_subtask_copies(subtask_id):
+            logger.info("Cancelling subtask computed by another provider. "
+                        "subtask_id=%r", copy_id)
+            ss = subtask_states[copy_id]
+            ss.subtask_status = SubtaskStatus.cancelled
+            ss.stderr = "[GOLEM] Computed by another provider"
+            self.notice_task_updated(task_id,
+                                     subtask_id=copy_id,
+                                     op=SubtaskOp.CANCELLED)
+
     @handle_subtask_key_error
     def __set_subtask_state_finished(self, subtask_id: str) -> SubtaskState:
         task_id = self.subtask2task_mapping[subtask_id]
@@ -1206,6 +1272,11 @@ class TaskManager(TaskEventListener):
         if not (subtask_id and isinstance(op, SubtaskOp) and op.is_completed()):
             return
 
+        # The provider has not failed, the part was computed by another one
+        if op == SubtaskOp.CANCELLED:
+            ProviderComputeTimers.remove(subtask_id)
+            return
+
         try:
             self._update_provider_statistics(task_id, subtask_id, op)
         except (KeyError, ValueError) as e:
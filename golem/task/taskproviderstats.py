@@ -26,6 +26,11 @@ class ProviderStats:
         self.provider_income_assigned_sum: int = 0
         self.provider_income_completed_sum: int = 0
         self.provider_income_paid_sum: int = 0
+        # Resources used by computed subtasks (seconds, bytes)
+        self.provider_resource_usage_cnt: int = 0
+        self.provider_cpu_time_sum: int = 0
+        self.provider_wall_time_sum: int = 0
+        self.provider_block_io_sum: int = 0
 
         for key, value in kwargs.items():
             if hasattr(self, key):
@@ -89,6 +94,18 @@ class ProviderStatsManager:
         if event == 'started':
             self.keeper.increase_stat('provider_income_assigned_sum',
                                       int(kwargs['price']))
+        elif event == 'resource_usage':
+            self._on_resource_usage(**kwargs)
+
+    def _on_resource_usage(self, **kwargs) -> None:
+        self.keeper.increase_stat('provider_resource_usage_cnt')
+        self.keeper.increase_stat('provider_cpu_time_sum',
+                                  int(round(kwargs['cpu_time'])))
+        self.keeper.increase_stat('provider_wall_time_sum',
+                                  int(round(kwargs['wall_time'])))
+        self.keeper.increase_stat(
+            'provider_block_io_sum',
+            int(kwargs['block_read']) + int(kwargs['block_write']))
 
     # --- Income ---
 
@@ -1,6 +1,6 @@
 import logging
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 from threading import Lock
 from typing import NamedTuple, Optional
 
@@ -18,9 +18,44 @@ TaskMsg = NamedTuple("TaskMsg", [("ts", float), ("op", Operation)])
 
 
 class SubtaskInfo:
+    # Number of the most recent messages kept for inspection
+    MAX_MESSAGES = 20
+
     def __init__(self):
         self.latest_status = SubtaskStatus.starting
-        self.messages = []
+        self.messages = deque(maxlen=self.MAX_MESSAGES)  # type: Deque[TaskMsg]
+        # Was the subtask assigned and not finished (in any way) since then
+        self.assigned = False
+        # Were the results announced and not finished nor rejected since then
+        self.downloading = False
+
+    def got_message(self, msg: TaskMsg, latest_status: SubtaskStatus):
+        self.latest_status = latest_status
+        self.messages.append(msg)
+
+        if msg.op == SubtaskOp.ASSIGNED:
+            self.assigned = True
+        elif msg.op in [SubtaskOp.TIMEOUT,
+                        SubtaskOp.FINISHED,
+                        SubtaskOp.FAILED,
+                        SubtaskOp.NOT_ACCEPTED,
+                        SubtaskOp.CANCELLED]:
+            self.assigned = False
+
+        if msg.op == SubtaskOp.RESULT_DOWNLOADING:
+            self.downloading = True
+        elif msg.op in [SubtaskOp.FINISHED,
+                        SubtaskOp.NOT_ACCEPTED,
+                        SubtaskOp.CANCELLED]:
+            self.downloading = False
+
+    def is_verified(self) -> bool:
+        return self.latest_status == SubtaskStatus.finished
+
+    def is_in_progress(self) -> bool:
+        return self.assigned and self.latest_status not in [
+            SubtaskStatus.finished,
+            SubtaskStatus.failure]
 
 
 class TaskInfo:
@@ -30,15 +65,30 @@ class TaskInfo:
     processes those information to get statistical information. It is probably
     only useful for :py:class:`RequestorTaskStats` objects which fill instances
     of this class with information.
+
+    The counters are updated with every message, so that reading the stats
+    does not depend on the number of subtasks. Only the most recent messages
+    are kept.
     """
 
+    # Number of the most recent task level messages kept for inspection
+    MAX_MESSAGES = 100
+
     def __init__(self):
         self.latest_status = TaskStatus.notStarted  # type: TaskStatus
         self._want_to_compute_count = 0
-        self.messages = []  # type: List[TaskMsg]
+        self.messages = deque(maxlen=self.MAX_MESSAGES)  # type: Deque[TaskMsg]
         self.subtasks = defaultdict(
             SubtaskInfo)  # type: DefaultDict[str, SubtaskInfo]
 
+        self._start_time = 0.0
+        self._finish_time = 0.0
+        self._task_failures = False
+        self._subtask_ops = Counter()  # type: Counter
+        self._verified_count = 0
+        self._downloading_count = 0
+        self._in_progress_count = 0
+
     def got_want_to_compute(self):
         """Makes note of a received work offer"""
         self._want_to_compute_count += 1
@@ -49,15 +99,33 @@ class TaskInfo:
         self.messages.append(msg)
         self.latest_status = latest_status
 
+        if msg.op in [TaskOp.CREATED, TaskOp.RESTORED]:
+            self._start_time = msg.ts
+        elif msg.op.is_completed():
+            self._finish_time = msg.ts
+
+        if msg.op in [TaskOp.NOT_ACCEPTED, TaskOp.TIMEOUT]:
+            self._task_failures = True
+
     def got_subtask_message(self, subtask_id: str, msg: TaskMsg,
                             latest_status: SubtaskStatus):
         """Stores information from subtask level message"""
-        self.subtasks[subtask_id].latest_status = latest_status
-        self.subtasks[subtask_id].messages.append(msg)
+        st = self.subtasks[subtask_id]
+
+        self._verified_count -= st.is_verified()
+        self._downloading_count -= st.downloading
+        self._in_progress_count -= st.is_in_progress()
+
+        st.got_message(msg, latest_status)
+        self._subtask_ops[msg.op] += 1
+
+        self._verified_count += st.is_verified()
+        self._downloading_count += st.downloading
+        self._in_progress_count += st.is_in_progress()
 
     def subtask_count(self) -> int:
         """Number of subtasks of this task"""
-        return len(self.subtasks.keys())
+        return len(self.subtasks)
 
     def collected_results_count(self) -> int:
         """Returns number of successfully received results
@@ -75,19 +143,10 @@ class TaskInfo:
         This is equal to the number of subtasks with the latest state
         ``SubtaskStatus.finished``.
         """
-        cnt = 0
-        for st in self.subtasks.values():
-            if st.latest_status == SubtaskStatus.finished:
-                cnt += 1
-        return cnt
+        return self._verified_count
 
     def _subtasks_count_specific_ops(self, op: Operation):
-        cnt = 0
-        for st in self.subtasks.values():
-            for msg in st.messages:
-                if msg.op == op:
-                    cnt += 1
-        return cnt
+        return self._subtask_ops[op]
 
     def not_accepted_results_count(self) -> int:
         """Number of times a subtask failed verification"""
@@ -116,18 +175,7 @@ class TaskInfo:
         also include subtasks that are actively sending results at the moment
         of a call.
         """
-        cnt = 0
-        for st in self.subtasks.values():
-            download_in_progress = False
-            for msg in st.messages:
-                if msg.op == SubtaskOp.RESULT_DOWNLOADING:
-                    download_in_progress = True
-                elif msg.op in [SubtaskOp.FINISHED,
-                                SubtaskOp.NOT_ACCEPTED]:
-                    download_in_progress = False
-            if download_in_progress:
-                cnt += 1
-        return cnt
+        return self._downloading_count
 
     def total_time(self) -> float:
         """Returns total time in seconds spent on the task
@@ -139,21 +187,13 @@ class TaskInfo:
         latter. Note that the time spent paused is also included in
         the total time.
         """
-        start_time = 0.0
-        finish_time = 0.0
-
-        if not self.is_completed():
+        if self.is_completed():
+            finish_time = self._finish_time
+        else:
             finish_time = time.time()
 
-        for msg in reversed(self.messages):
-            if (msg.op in [TaskOp.CREATED, TaskOp.RESTORED]
-                    and not start_time):
-                start_time = msg.ts
-            elif msg.op.is_completed() and not finish_time:
-                finish_time = msg.ts
-
-        assert finish_time >= start_time
-        return finish_time - start_time
+        assert finish_time >= self._start_time
+        return finish_time - self._start_time
 
     def had_failures_or_timeouts(self) -> bool:
         """Were there any failures or timeouts during computation
@@ -161,17 +201,10 @@ class TaskInfo:
         Both failure to calculate (SUBTASK_FAILED) and failure to verify
         (SUBTASK_NOT_ACCEPTED) are considered failures in this method.
         """
-        for msg in self.messages:
-            if msg.op in [TaskOp.NOT_ACCEPTED,
-                          TaskOp.TIMEOUT]:
-                return True
-        for st in self.subtasks.values():
-            for msg in st.messages:
-                if msg.op in [SubtaskOp.FAILED,
-                              SubtaskOp.NOT_ACCEPTED,
-                              SubtaskOp.TIMEOUT]:
-                    return True
-        return False
+        return self._task_failures or any(
+            self._subtask_ops[op] for op in [SubtaskOp.FAILED,
+                                             SubtaskOp.NOT_ACCEPTED,
+                                             SubtaskOp.TIMEOUT])
 
     def is_completed(self) -> bool:
         """Has the task already been completed
@@ -202,24 +235,7 @@ class TaskInfo:
         """
         if self.is_completed():
             return 0
-
-        cnt = 0
-        for st in self.subtasks.values():
-            if st.latest_status in [SubtaskStatus.finished,
-                                    SubtaskStatus.failure]:
-                continue
-            in_progress = False
-            for msg in st.messages:
-                if msg.op == SubtaskOp.ASSIGNED:
-                    in_progress = True
-                elif msg.op in [SubtaskOp.TIMEOUT,
-                                SubtaskOp.FINISHED,
-                                SubtaskOp.FAILED,
-                                SubtaskOp.NOT_ACCEPTED]:
-                    in_progress = False
-            if in_progress:
-                cnt += 1
-        return cnt
+        return self._in_progress_count
 
 
 TaskStats = NamedTuple("TaskStats", [("finished", bool),
@@ -23,7 +23,9 @@ from twisted.internet.defer import inlineCallbacks
 
 from apps.appsmanager import AppsManager
 from apps.core.task.coretask import CoreTask
+from apps.core.verification_policy import ProviderRecord
 from golem.clientconfigdescriptor import ClientConfigDescriptor
+from golem.core.scheduler import JobScheduler, ReactorLagMonitor
 from golem.core.variables import MAX_CONNECT_SOCKET_ADDRESSES
 from golem.core.common import node_info_str, short_node_id
 from golem.environments.environment import SupportStatus, UnsupportReason
@@ -36,7 +38,9 @@ from golem.network.transport.tcpserver import (
     PendingConnectionsServer,
 )
 from golem.ranking.helper.trust import Trust
+from golem.ranking.manager.trust_manager import computed_trust_local
 from golem.ranking.manager.database_manager import (
+    get_local_rank,
     get_requestor_efficiency,
     get_requestor_assigned_sum,
     get_requestor_paid_sum,
@@ -59,7 +63,7 @@ from .server import queue_ as srv_queue
 from .server import resources
 from .server import verification as srv_verification
 from .taskcomputer import TaskComputer
-from .taskkeeper import TaskHeaderKeeper
+from .taskkeeper import TaskHeaderKeeper, VerifiedHeadersCache
 from .taskmanager import TaskManager
 from .tasksession import TaskSession
 
@@ -86,6 +90,24 @@ class TaskServer(
         srv_queue.TaskMessagesQueueMixin,
         srv_verification.VerificationMixin,
 ):
+    # Time after which the due sync jobs that did not run yet are deferred
+    # to the next tick of the sync loop
+    SYNC_TICK_BUDGET = 0.5
+    # name, interval, priority (lower runs first), time budget
+    SYNC_JOBS = (
+        ('sessions', 1., 0, 0.1),
+        # also woken up when a result or a failure is ready to be sent
+        ('waiting_results', 5., 0, 0.2),
+        ('task_computer', 1., 0, 0.05),
+        ('concent_messages', 1., 1, 0.1),
+        ('pending_connections', 1., 1, 0.1),
+        ('forwarded_session_requests', 1., 2, 0.05),
+        ('task_connections', 1., 2, 0.05),
+        ('connect_to_nodes', 2., 2, 0.1),
+        ('old_tasks', 5., 3, 0.2),
+        ('sweep_sessions', 5., 3, 0.05),
+    )
+
     def __init__(self,
                  node,
                  config_desc: ClientConfigDescriptor,
@@ -106,6 +128,7 @@ class TaskServer(
             node=self.node,
             min_price=config_desc.min_price,
             task_archiver=task_archiver)
+        self.verified_headers = VerifiedHeadersCache()
         self.task_manager = TaskManager(
             self.node,
             self.keys_auth,
@@ -132,6 +155,9 @@ class TaskServer(
         self.task_sessions_incoming: weakref.WeakSet = weakref.WeakSet()
 
         OfferPool.change_interval(self.config_desc.offer_pooling_interval)
+        CoreTask.VERIFICATION_QUEUE.set_max_concurrency(config_desc.num_cores)
+        CoreTask.VERIFICATION_QUEUE.policy.set_record_source(
+            self.get_provider_record)
 
         self.max_trust = 1.0
         self.min_trust = 0.0
@@ -152,6 +178,11 @@ class TaskServer(
         self.resource_handshakes = {}
         self.requested_tasks: Set[str] = set()
 
+        self.sync_jobs = JobScheduler(tick_budget=self.SYNC_TICK_BUDGET)
+        for name, interval, priority, budget in self.SYNC_JOBS:
+            self.sync_jobs.add(name, interval, priority, budget)
+        self.reactor_lag = ReactorLagMonitor()
+
         network = TCPNetwork(
             ProtocolFactory(SafeProtocol, self, SessionFactory(TaskSession)),
             use_ipv6)
@@ -180,31 +211,26 @@ class TaskServer(
     def sync_network(self, timeout=None):
         if timeout is None:
             timeout = self.config_desc.task_session_timeout
-        jobs = (
-            functools.partial(
+        jobs = {
+            'sessions': functools.partial(
                 super().sync_network,
                 timeout=timeout,
             ),
-            self._sync_pending,
-            self._send_waiting_results,
-            self.task_computer.run,
-            self.task_connections_helper.sync,
-            self._sync_forwarded_session_requests,
-            self.__remove_old_tasks,
-            functools.partial(
+            'pending_connections': self._sync_pending,
+            'waiting_results': self._send_waiting_results,
+            'task_computer': self.task_computer.run,
+            'task_connections': self.task_connections_helper.sync,
+            'forwarded_session_requests':
+                self._sync_forwarded_session_requests,
+            'old_tasks': self.__remove_old_tasks,
+            'concent_messages': functools.partial(
                 concent.process_messages_received_from_concent,
                 concent_service=self.client.concent_service,
             ),
-            self.sweep_sessions,
-            self.connect_to_nodes,
-        )
-
-        for job in jobs:
-            try:
-                #logger.debug("TServer sync running: job=%r", job)
-                job()
-            except Exception:  # pylint: disable=broad-except
-                logger.exception("TaskServer.sync_network job %r failed", job)
+            'sweep_sessions': self.sweep_sessions,
+            'connect_to_nodes': self.connect_to_nodes,
+        }
+        self.sync_jobs.run(jobs)
 
         if next(tmp_cycler) == 0:
             logger.debug('TASK SERVER TASKS DUMP: %r', self.task_manager.tasks)
@@ -220,6 +246,25 @@ class TaskServer(
         super().resume()
         CoreTask.VERIFICATION_QUEUE.resume()
 
+    @rpc_utils.expose('comp.tasks.verification.stats')
+    @staticmethod
+    def get_verification_stats() -> Dict[str, Any]:
+        return CoreTask.VERIFICATION_QUEUE.get_stats()
+
+    @rpc_utils.expose('comp.tasks.sync.stats')
+    def get_sync_stats(self) -> Dict[str, Any]:
+        """ Durations of the sync jobs and the lag of the reactor """
+        return {
+            'jobs': self.sync_jobs.get_stats(),
+            'reactor_lag': self.reactor_lag.get_stats(),
+        }
+
+    @rpc_utils.expose('comp.tasks.progress')
+    def get_computing_progress(self) -> Optional[Dict[str, Any]]:
+        """ Progress of the subtask computed by this node, if any """
+        progress = self.task_computer.get_progress()
+        return progress.__dict__ if progress else None
+
     def get_environment_by_id(self, env_id):
         return self.task_keeper.environments_manager.get_environment_by_id(
             env_id)
@@ -365,10 +410,12 @@ class TaskServer(
             result=result['data'],
             last_sending_trial=last_sending_trial,
             delay_time=delay_time,
-            owner=header.task_owner)
+            owner=header.task_owner,
+            resource_usage=result.get('resource_usage'))
 
         self.create_and_set_result_package(wtr)
         self.results_to_send[subtask_id] = wtr
+        self.sync_jobs.wake('waiting_results')
 
         Trust.REQUESTED.increase(header.task_owner.key)
 
@@ -399,6 +446,7 @@ class TaskServer(
                 subtask_id=subtask_id,
                 err_msg=err_msg,
                 owner=header.task_owner)
+            self.sync_jobs.wake('waiting_results')
 
     def new_connection(self, session):
         if not self.active:
@@ -430,13 +478,15 @@ class TaskServer(
         return self.task_keeper.get_all_tasks()
 
     def add_task_header(self, task_header: dt_tasks.TaskHeader) -> bool:
-        if not self.verify_header_sig(task_header):
-            logger.info(
-                'Invalid signature task_header:%r, signature: %r',
-                task_header,
-                task_header.signature,
-            )
-            return False
+        if task_header not in self.verified_headers:
+            if not self.verify_header_sig(task_header):
+                logger.info(
+                    'Invalid signature task_header:%r, signature: %r',
+                    task_header,
+                    task_header.signature,
+                )
+                return False
+            self.verified_headers.add(task_header)
         if task_header.deadline < time.time():
             logger.info(
                 "Task's deadline already in the past. task_header: %r",
@@ -499,11 +549,13 @@ class TaskServer(
         wtr = self.results_to_send.get(subtask_id, None)
         if wtr:
             wtr.already_sending = False
+            self.sync_jobs.wake('waiting_results')
 
     def change_config(self, config_desc, run_benchmarks=False):
         PendingConnectionsServer.change_config(self, config_desc)
         self.config_desc = config_desc
         self.task_keeper.change_config(config_desc)
+        CoreTask.VERIFICATION_QUEUE.set_max_concurrency(config_desc.num_cores)
         return self.task_computer.change_config(
             config_desc, run_benchmarks=run_benchmarks)
 
@@ -642,6 +694,18 @@ class TaskServer(
     def get_computing_trust(self, node_id):
         return self.client.get_computing_trust(node_id)
 
+    @staticmethod
+    def get_provider_record(node_id: str) -> ProviderRecord:
+        """ Local history of the provider, for the verification policy """
+        local_rank = get_local_rank(node_id)
+        if local_rank is None:
+            return ProviderRecord()
+        return ProviderRecord(
+            trust=computed_trust_local(local_rank),
+            verified=local_rank.positive_computed,
+            rejected=local_rank.wrong_computed,
+        )
+
     def get_socket_addresses(self, node_info, prv_port=None, pub_port=None):
         """ Change node info into tcp addresses. Adds a suggested address.
         :param Node node_info: node information
@@ -893,7 +957,7 @@ class WaitingTaskResult(object):
     def __init__(self, task_id, subtask_id, result,
                  last_sending_trial, delay_time, owner, result_path=None,
                  result_hash=None, result_secret=None, package_sha1=None,
-                 result_size=None, package_path=None):
+                 result_size=None, package_path=None, resource_usage=None):
 
         self.task_id = task_id
         self.subtask_id = subtask_id
@@ -908,6 +972,8 @@ class WaitingTaskResult(object):
         self.package_sha1 = package_sha1
         self.package_path = package_path
         self.result_size = result_size
+        # SEE golem.docker.stats.ResourceUsage.to_dict
+        self.resource_usage = resource_usage
 
         self.already_sending = False
 # pylint: enable=too-many-arguments, too-many-locals
@@ -119,6 +119,8 @@ class SubtaskStatus(Enum):
     finished = "Finished"
     failure = "Failure"
     restarted = "Restart"
+    # Computed by another provider
+    cancelled = "Cancelled"
 
     def is_computed(self) -> bool:
         return self in [self.starting, self.downloading]
@@ -197,6 +199,7 @@ class SubtaskOp(Operation):
     FAILED = auto()
     TIMEOUT = auto()
     RESTARTED = auto()
+    CANCELLED = auto()
 
     def is_completed(self) -> bool:
         return self not in (
@@ -0,0 +1,133 @@
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Dict, List, Optional, Tuple
+
+import golem_messages
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeConcent:
+    """ Local HTTP stand-in for the Concent service and its storage cluster.
+
+        Answers `/api/v1/send/` and `/api/v1/receive/` requests after
+        `latency` seconds with `response_content`, stores files uploaded
+        to `/upload/` and serves them from `/download/<path>`, honouring
+        `Range` headers. Keeps track of the requests received and of the
+        maximum number of requests handled concurrently. """
+
+    def __init__(self,
+                 pubkey: bytes,
+                 latency: float = 0.,
+                 response_content: bytes = b'') -> None:
+        self.pubkey = pubkey
+        self.latency = latency
+        self.response_content = response_content
+        self.version = golem_messages.__version__
+
+        self.requests: List[Tuple[str, str, dict]] = []
+        self.files: Dict[str, bytes] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Drop the connection of the next download after that many bytes
+        self.break_download_after: Optional[int] = None
+
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return 'http://127.0.0.1:{}'.format(self._server.server_port)
+
+    @property
+    def variant(self) -> dict:
+        return {'url': self.url, 'pubkey': self.pubkey}
+
+    @property
+    def storage_cluster_address(self) -> str:
+        return self.url + '/'
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *_):  # pylint: disable=arguments-differ
+                pass
+
+            def do_POST(self):  # noqa pylint: disable=invalid-name
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                fake.requests.append(('POST', self.path, dict(self.headers)))
+                if self.path == '/upload/':
+                    fake.files[self.headers['Concent-Upload-Path']] = body
+                    self._respond(200, b'')
+                    return
+                with fake._lock:
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight,
+                                             fake.in_flight)
+                time.sleep(fake.latency)
+                with fake._lock:
+                    fake.in_flight -= 1
+                self._respond(200, fake.response_content)
+
+            def do_GET(self):  # noqa pylint: disable=invalid-name
+                fake.requests.append(('GET', self.path, dict(self.headers)))
+                data = fake.files.get(self.path[len('/download/'):])
+                if data is None:
+                    self._respond(404, b'')
+                    return
+
+                offset = 0
+                match = re.match(r'bytes=(\d+)-$',
+                                 self.headers.get('Range') or '')
+                if match:
+                    offset = int(match.group(1))
+                if offset and offset >= len(data):
+                    self.send_response(416)
+                    self.send_header('Content-Range',
+                                     'bytes */{}'.format(len(data)))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(206 if offset else 200)
+                self.send_header('Content-Length', str(len(data) - offset))
+                if offset:
+                    self.send_header('Content-Range', 'bytes {}-{}/{}'.format(
+                        offset, len(data) - 1, len(data)))
+                self.end_headers()
+
+                limit, fake.break_download_after = \
+                    fake.break_download_after, None
+                if limit is None:
+                    self.wfile.write(data[offset:])
+                    return
+                self.wfile.write(data[offset:offset + limit])
+                self.wfile.flush()
+                self.close_connection = True
+
+            def _respond(self, code: int, content: bytes):
+                self.send_response(code)
+                self.send_header('Concent-Golem-Messages-Version',
+                                 fake.version)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
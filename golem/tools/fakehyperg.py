@@ -0,0 +1,92 @@
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeHyperdriveServer:
+    """ Minimal stand-in for the Hyperdrive HTTP API, listening on a local
+        port. Answers every command immediately, without touching any files,
+        and counts the requests and TCP connections it served. Used in tests
+        and for benchmarking the clients. """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0) -> None:
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @staticmethod
+    def respond(params: dict) -> dict:
+        command = params.get('command')
+        if command == 'id':
+            return dict(id='fake-hyperg', version='0.0.0')
+        if command == 'addresses':
+            return dict(addresses=dict(TCP=dict(address='127.0.0.1',
+                                                port=3282)))
+        if command == 'download':
+            return dict(files=[])
+        return dict(hash=params.get('hash') or str(uuid.uuid4()))
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body are written separately
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                length = int(self.headers.get('Content-Length', 0))
+                params = json.loads(self.rfile.read(length).decode('utf-8'))
+                with server._lock:
+                    server.requests += 1
+
+                body = json.dumps(server.respond(params)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_):
+                pass
+
+        return Handler
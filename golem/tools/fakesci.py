@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Optional
+
+
+class FakeSCI:
+    """ In-process stand-in for golem_sci's SmartContractsInterface. Answers
+        the read-only chain queries after `latency` seconds, like a remote
+        geth node would, and counts the calls. """
+
+    GAS_PRICE = 10 ** 9
+    GAS_PER_PAYMENT = 20000
+    GAS_BATCH_PAYMENT_BASE = 30000
+    REQUIRED_CONFS = 6
+
+    def __init__(self,
+                 latency: float = 0.,
+                 eth_address: str = '0x' + 40 * '1',
+                 eth_balance: int = 0,
+                 gnt_balance: int = 0,
+                 gntb_balance: int = 0,
+                 block_number: int = 0) -> None:
+        self.latency = latency
+        self.eth_address = eth_address
+        self.eth_balance = eth_balance
+        self.gnt_balance = gnt_balance
+        self.gntb_balance = gntb_balance
+        self.block_number = block_number
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _query(self, value):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return value
+
+    def get_eth_address(self) -> str:
+        return self.eth_address
+
+    def get_eth_balance(self, _address: str) -> int:
+        return self._query(self.eth_balance)
+
+    def get_gnt_balance(self, _address: str) -> int:
+        return self._query(self.gnt_balance)
+
+    def get_gntb_balance(self, _address: str) -> int:
+        return self._query(self.gntb_balance)
+
+    def get_block_number(self) -> int:
+        return self._query(self.block_number)
+
+    def get_gate_address(self) -> Optional[str]:
+        return self._query(None)
+
+    def get_current_gas_price(self) -> int:
+        return self._query(self.GAS_PRICE)
+
+    def get_transaction_receipt(self, _tx_hash: str):
+        return self._query(None)
+
+    def stop(self) -> None:
+        pass
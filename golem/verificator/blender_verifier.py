@@ -1,11 +1,13 @@
 from datetime import datetime
-from typing import Type
+from typing import Optional, Type
 
 import logging
 import numpy
 import os
 import json
 
+from golem.verificator.blender_worker import BlenderWorkerRegistry, \
+    WorkerUnavailable
 from golem.verificator.verifier import SubtaskVerificationState
 
 from .rendering_verifier import FrameRenderingVerifier
@@ -18,15 +20,19 @@ logger = logging.getLogger(__name__)
 # pylint: disable=R0902
 class BlenderVerifier(FrameRenderingVerifier):
     DOCKER_NAME = "golemfactory/blender_verifier"
-    DOCKER_TAG = '1.1'
+    DOCKER_TAG = '1.2'
 
     def __init__(self, verification_data,
-                 docker_task_cls: Type) -> None:
+                 docker_task_cls: Type,
+                 worker_registry: Optional[BlenderWorkerRegistry] = None) \
+            -> None:
         super().__init__(verification_data)
         self.finished = Deferred()
         self.docker_task_cls = docker_task_cls
+        self.worker_registry = worker_registry
         self.timeout = 0
         self.docker_task = None
+        self.worker_job_id: Optional[str] = None
 
     def _get_part_size(self, subtask_info):
         if subtask_info['use_frames'] and len(subtask_info['all_frames']) \
@@ -54,6 +60,8 @@ class BlenderVerifier(FrameRenderingVerifier):
     def stop(self):
         if self.docker_task:
             self.docker_task.end_comp()
+        if self.worker_job_id and self.worker_registry:
+            self.worker_registry.cancel(self.worker_job_id)
 
     def start_rendering(self, timeout=0):
         self.timeout = timeout
@@ -100,6 +108,56 @@ class BlenderVerifier(FrameRenderingVerifier):
             entrypoint="python3 /golem/entrypoints/verifier_entrypoint.py",
         )
 
+        task_id = subtask_info['ctd'].get('task_id')
+        if self.worker_registry is not None and task_id:
+            try:
+                self.worker_job_id, d = self.worker_registry.verify(
+                    task_id,
+                    spool_dir=os.path.join(subtask_info['tmp_dir'],
+                                           'verification_worker'),
+                    resources_dir=subtask_info['path_root'],
+                    docker_images=[(self.DOCKER_NAME, self.DOCKER_TAG)],
+                    params=extra_data,
+                    results=self.verification_data['results'],
+                    timeout=self.timeout)
+            except (WorkerUnavailable, OSError) as e:
+                logger.debug("Verification worker unavailable: %r", e)
+            else:
+                d.addCallbacks(self._verdict_received,
+                               self._worker_failed,
+                               errbackArgs=(dir_mapping, extra_data))
+                return
+
+        self._start_docker_task(dir_mapping, extra_data)
+
+    def _worker_failed(self, failure, dir_mapping, extra_data):
+        self.worker_job_id = None
+        if failure.check(WorkerUnavailable):
+            logger.info("Verification worker unavailable, verifying in a "
+                        "separate container: %s", failure.value)
+            self._start_docker_task(dir_mapping, extra_data)
+            return
+        logger.warning("Verification process exception %s", failure.value)
+        self.finished.errback(failure)
+
+    def _verdict_received(self, verdict):
+        self.worker_job_id = None
+        subtask_info = self.verification_data['subtask_info']
+        if verdict.get('error'):
+            logger.warning("Subtask %s verification error: %s",
+                           subtask_info['subtask_id'], verdict['error'])
+        logger.info(
+            "Subtask %s verification verdict: %s",
+            subtask_info['subtask_id'],
+            verdict,
+        )
+        if verdict['verdict']:
+            self.finished.callback(True)
+        else:
+            self.finished.errback(
+                Exception('Verification result negative', verdict))
+
+    def _start_docker_task(self, dir_mapping, extra_data):
         self.docker_task = self.docker_task_cls(
             docker_images=[(self.DOCKER_NAME, self.DOCKER_TAG)],
             extra_data=extra_data,
@@ -114,17 +172,7 @@ class BlenderVerifier(FrameRenderingVerifier):
             with open(os.path.join(dir_mapping.output, 'verdict.json'), 'r') \
                     as f:
                 verdict = json.load(f)
-
-            logger.info(
-                "Subtask %s verification verdict: %s",
-                subtask_info['subtask_id'],
-                verdict,
-            )
-            if verdict['verdict']:
-                self.finished.callback(True)
-            else:
-                self.finished.errback(
-                    Exception('Verification result negative', verdict))
+            self._verdict_received(verdict)
 
         d = self.docker_task.start()
         d.addErrback(error)
@@ -0,0 +1,333 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, \
+    Type
+
+from pydispatch import dispatcher
+from twisted.internet.defer import Deferred
+from twisted.internet.task import LoopingCall
+
+from golem.task.taskstate import TaskOp
+
+logger = logging.getLogger(__name__)
+
+# Spool directory layout, shared with the verifier_tools.worker script run
+# in the container, where the spool is mounted as the work dir
+JOBS_DIR = 'jobs'
+RUNNING_DIR = 'running'
+RESULTS_DIR = 'results'
+STOP_FILE = 'stop'
+CONTAINER_WORK_DIR = '/golem/work'
+
+
+class WorkerUnavailable(Exception):
+    """ The job could not be run by a verification worker. The caller should
+        verify the result in a separate container. """
+
+
+class BlenderVerificationWorker:
+    """ A verification container running `ENTRYPOINT`, which takes jobs from
+    the spool until it has been idle for `idle_timeout` seconds """
+
+    ENTRYPOINT = 'python3 /golem/entrypoints/verifier_worker_entrypoint.py'
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 task_id: str,
+                 docker_task_cls: Type,
+                 docker_images: List,
+                 spool_dir: str,
+                 resources_dir: str,
+                 idle_timeout: float,
+                 on_exit: Callable[['BlenderVerificationWorker', bool], None]
+                 ) -> None:
+        self.task_id = task_id
+        self.docker_task_cls = docker_task_cls
+        self.docker_images = docker_images
+        self.spool_dir = spool_dir
+        self.resources_dir = resources_dir
+        self.idle_timeout = idle_timeout
+        self.on_exit = on_exit
+        self.docker_task = None
+        self.running = False
+
+    def start(self) -> None:
+        dir_mapping = self.docker_task_cls.specify_dir_mapping(
+            resources=self.resources_dir,
+            temporary=os.path.dirname(self.spool_dir),
+            work=self.spool_dir,
+            output=os.path.join(self.spool_dir, 'output'),
+            logs=os.path.join(self.spool_dir, 'logs'),
+        )
+        self.docker_task = self.docker_task_cls(
+            docker_images=self.docker_images,
+            extra_data=dict(
+                entrypoint=self.ENTRYPOINT,
+                idle_timeout=self.idle_timeout,
+            ),
+            dir_mapping=dir_mapping,
+            timeout=0,
+            # the spool must be mounted, not copied
+            use_container_pool=False,
+        )
+        self.running = True
+        deferred = self.docker_task.start()
+        deferred.addCallbacks(lambda _: self._exited(failed=False),
+                              lambda _: self._exited(failed=True))
+
+    def stop(self) -> None:
+        if self.docker_task and self.running:
+            self.docker_task.end_comp()
+
+    def _exited(self, failed: bool) -> None:
+        self.running = False
+        self.on_exit(self, failed)
+
+
+class _Job:  # pylint: disable=too-few-public-methods
+
+    def __init__(self, task_id: str, deferred: Deferred,
+                 deadline: Optional[float]) -> None:
+        self.task_id = task_id
+        self.deferred = deferred
+        self.deadline = deadline
+
+
+class BlenderWorkerRegistry:
+    """ Verification workers of the tasks being verified. Blender
+    verification of a subtask is queued as a job in the spool directory of
+    its task. The first job starts a worker container for the task, which
+    keeps the scene loaded, the verifier modules imported and the classifier
+    in memory for the next jobs. More workers are started, up to
+    `MAX_WORKERS`, while jobs keep waiting. Workers exit on their own after
+    `IDLE_TIMEOUT` seconds without jobs and are stopped when the task ends.
+
+    Jobs are exchanged through files and not a socket, because the spool is
+    mounted in the container also when Docker runs in a VM. The results are
+    polled every `POLL_INTERVAL` seconds.
+
+    When a worker cannot be started or fails, the waiting jobs of its task
+    fail with WorkerUnavailable and no more workers are started for the task.
+    """
+
+    MAX_WORKERS = 2
+    IDLE_TIMEOUT = 300
+    POLL_INTERVAL = 0.5
+    TASK_END_OPS = (TaskOp.FINISHED, TaskOp.TIMEOUT, TaskOp.ABORTED)
+
+    def __init__(self, docker_task_cls: Type, clock=None) -> None:
+        self.docker_task_cls = docker_task_cls
+        self._workers: Dict[str, List[BlenderVerificationWorker]] = dict()
+        self._spool_dirs: Dict[str, str] = dict()
+        self._broken: Set[str] = set()
+        self._jobs: Dict[str, _Job] = dict()
+        self._lock = threading.Lock()
+        self._poller = LoopingCall(self._poll)
+        if clock is not None:
+            self._poller.clock = clock
+
+        dispatcher.connect(self._task_status_updated,
+                           signal='golem.taskmanager')
+
+    def verify(self,  # pylint: disable=too-many-arguments
+               task_id: str,
+               spool_dir: str,
+               resources_dir: str,
+               docker_images: List,
+               params: Dict,
+               results: Iterable[str],
+               timeout: float = 0) -> Tuple[str, Deferred]:
+        """ Queues verification of the subtask `results` with the verifier
+        `params`. Returns the job id and a deferred firing with the result
+        dict {"verdict": bool, "error": Optional[str]} read from the spool.
+        """
+        if task_id in self._broken:
+            raise WorkerUnavailable(task_id)
+
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(spool_dir, job_id)
+        for name in (JOBS_DIR, RUNNING_DIR, RESULTS_DIR, job_id):
+            os.makedirs(os.path.join(spool_dir, name), exist_ok=True)
+        for path in results:
+            _link_or_copy(path, os.path.join(job_dir, os.path.basename(path)))
+
+        params = dict(params, subtask_paths=[
+            '{}/{}/{}'.format(CONTAINER_WORK_DIR, job_id,
+                              os.path.basename(path)) for path in results
+        ])
+        job_path = os.path.join(spool_dir, JOBS_DIR, job_id + '.json')
+        with open(job_path + '.tmp', 'w') as f:
+            json.dump(params, f)
+        os.replace(job_path + '.tmp', job_path)
+
+        deferred = Deferred()
+        deadline = time.time() + timeout if timeout else None
+        with self._lock:
+            self._jobs[job_id] = _Job(task_id, deferred, deadline)
+            self._spool_dirs[task_id] = spool_dir
+        logger.debug("Verification job queued. task_id=%s, job_id=%s",
+                     task_id, job_id)
+
+        self._scale(task_id, resources_dir, docker_images)
+        if not self._poller.running:
+            self._poller.start(self.POLL_INTERVAL, now=False)
+        return job_id, deferred
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return
+            spool_dir = self._spool_dirs.get(job.task_id)
+        if spool_dir:
+            _remove_job_files(spool_dir, job_id)
+
+    def stop_task(self, task_id: str) -> None:
+        """ Stops the workers of the task. Jobs still waiting fail with
+            WorkerUnavailable. """
+        with self._lock:
+            workers = self._workers.pop(task_id, [])
+            spool_dir = self._spool_dirs.pop(task_id, None)
+            self._broken.discard(task_id)
+        if spool_dir and workers:
+            open(os.path.join(spool_dir, STOP_FILE), 'w').close()
+        for worker in workers:
+            worker.stop()
+        self._fail_jobs(task_id, spool_dir, "Task {} ended".format(task_id))
+        if spool_dir:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+    def get_workers(self, task_id: str) -> List[BlenderVerificationWorker]:
+        return list(self._workers.get(task_id, []))
+
+    def _scale(self, task_id: str, resources_dir: str,
+               docker_images: List) -> None:
+        with self._lock:
+            workers = self._workers.setdefault(task_id, [])
+            workers[:] = [w for w in workers if w.running]
+            waiting = sum(1 for job in self._jobs.values()
+                          if job.task_id == task_id)
+            if len(workers) >= min(waiting, self.MAX_WORKERS):
+                return
+            worker = BlenderVerificationWorker(
+                task_id, self.docker_task_cls, docker_images,
+                self._spool_dirs[task_id], resources_dir,
+                self.IDLE_TIMEOUT, self._worker_exited)
+            workers.append(worker)
+
+        logger.info("Starting verification worker. task_id=%s, workers=%d",
+                    task_id, len(workers))
+        try:
+            worker.start()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.warning("Cannot start verification worker: %r", exc)
+            self._worker_failed(task_id, worker)
+
+    def _worker_exited(self, worker: BlenderVerificationWorker,
+                       failed: bool) -> None:
+        task_id = worker.task_id
+        if failed:
+            logger.warning("Verification worker failed. task_id=%s", task_id)
+            self._worker_failed(task_id, worker)
+            return
+        logger.debug("Verification worker exited. task_id=%s", task_id)
+        with self._lock:
+            workers = self._workers.get(task_id, [])
+            if worker not in workers:
+                return  # stopped with the task
+            workers.remove(worker)
+        # a job may have been queued just before the worker became idle
+        self._scale(task_id, worker.resources_dir, worker.docker_images)
+
+    def _worker_failed(self, task_id: str,
+                       worker: BlenderVerificationWorker) -> None:
+        with self._lock:
+            workers = self._workers.get(task_id, [])
+            if worker not in workers:
+                return  # stopped with the task
+            workers.remove(worker)
+            self._broken.add(task_id)
+            spool_dir = self._spool_dirs.get(task_id)
+            others = list(workers)
+        for other in others:
+            other.stop()
+        self._fail_jobs(task_id, spool_dir,
+                        "Verification worker of task {} failed"
+                        .format(task_id))
+
+    def _fail_jobs(self, task_id: str, spool_dir: Optional[str],
+                   reason: str) -> None:
+        with self._lock:
+            job_ids = [job_id for job_id, job in self._jobs.items()
+                       if job.task_id == task_id]
+            jobs = [self._jobs.pop(job_id) for job_id in job_ids]
+        for job_id, job in zip(job_ids, jobs):
+            if spool_dir:
+                _remove_job_files(spool_dir, job_id)
+            job.deferred.errback(WorkerUnavailable(reason))
+
+    def _poll(self) -> None:
+        now = time.time()
+        finished = []
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                spool_dir = self._spool_dirs.get(job.task_id)
+                if spool_dir is None:
+                    continue
+                result_path = os.path.join(spool_dir, RESULTS_DIR,
+                                           job_id + '.json')
+                if os.path.exists(result_path):
+                    finished.append((job_id, job, spool_dir, result_path))
+                    del self._jobs[job_id]
+                elif job.deadline and now > job.deadline:
+                    finished.append((job_id, job, spool_dir, None))
+                    del self._jobs[job_id]
+            idle = not self._jobs
+
+        for job_id, job, spool_dir, result_path in finished:
+            if result_path is None:
+                _remove_job_files(spool_dir, job_id)
+                job.deferred.errback(TimeoutError(
+                    "Verification job {} timed out".format(job_id)))
+                continue
+            try:
+                with open(result_path, 'r') as f:
+                    result = json.load(f)
+            except (OSError, ValueError) as exc:
+                job.deferred.errback(exc)
+            else:
+                job.deferred.callback(result)
+            finally:
+                _remove_job_files(spool_dir, job_id)
+
+        if idle and self._poller.running:
+            self._poller.stop()
+
+    def _task_status_updated(self, event='default', task_id=None, op=None,
+                             **_kwargs) -> None:
+        if event != 'task_status_updated' or op is None:
+            return
+        if op in self.TASK_END_OPS and task_id in self._workers:
+            self.stop_task(task_id)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _remove_job_files(spool_dir: str, job_id: str) -> None:
+    for name in (JOBS_DIR, RUNNING_DIR, RESULTS_DIR):
+        try:
+            os.remove(os.path.join(spool_dir, name, job_id + '.json'))
+        except FileNotFoundError:
+            pass
+    shutil.rmtree(os.path.join(spool_dir, job_id), ignore_errors=True)
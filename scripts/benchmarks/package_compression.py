@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Compares the end-to-end time of packing, sending and extracting task
+resources with and without per-entry compression, at several simulated
+bandwidths."""
+import os
+import random
+import shutil
+import struct
+import tempfile
+import time
+
+import click
+
+from golem.task.result.compression import CompressionPolicy
+from golem.task.result.resultpackage import ZipPackager
+
+MBIT = 1024 ** 2 / 8
+
+
+def generate_files(directory, scale):
+    """ Creates a sample of typical task files: a text scene, a binary
+    scene with repetitive structure, an EXR-like float image, a log and an
+    already compressed texture """
+    rnd = random.Random(0)
+    paths = []
+
+    def add(name, data):
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+
+    add('scene.obj', ''.join(
+        'v {:.4f} {:.4f} {:.4f}\n'.format(rnd.random(), rnd.random(), 1.)
+        for _ in range(100000 * scale)).encode())
+    add('scene.blend', b''.join(
+        struct.pack('<4sI', b'DATA', i) + bytes(56)
+        for i in range(100000 * scale)))
+    add('result.exr', b''.join(
+        struct.pack('<f', round(rnd.random(), 2)) for _ in range(
+            250000 * scale)))
+    add('stdout.log',
+        b'Fra:1 Mem:12.00M | Rendered 1/64 Tiles\n' * 20000 * scale)
+    add('texture.png', os.urandom(1024 ** 2 * scale))
+    return paths
+
+
+def measure(files, work_dir, policy):
+    ZipPackager.compression_policy = policy
+    package = os.path.join(work_dir, 'package.zip')
+    out_dir = os.path.join(work_dir, 'out')
+
+    started = time.perf_counter()
+    ZipPackager().create(package, files)
+    pack_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ZipPackager().extract(package, out_dir)
+    extract_time = time.perf_counter() - started
+
+    size = os.path.getsize(package)
+    os.remove(package)
+    shutil.rmtree(out_dir)
+    return size, pack_time + extract_time
+
+
+@click.command()
+@click.option("--scale", default=1, help="Size multiplier of sample files")
+@click.option("--source", type=click.Path(exists=True, file_okay=False),
+              help="Pack this directory instead of generated sample files")
+@click.option("--bandwidth", "-b", multiple=True, type=float,
+              default=[1., 10., 100., 1000.], help="Bandwidth in Mbit/s")
+def run_benchmark(scale, source, bandwidth):
+    work_dir = tempfile.mkdtemp()
+    try:
+        if source:
+            files = [source]
+        else:
+            files_dir = os.path.join(work_dir, 'files')
+            os.makedirs(files_dir)
+            files = generate_files(files_dir, scale)
+
+        stored_size, stored_time = measure(files, work_dir, None)
+        print("STORED: {:.1f} MB, pack + extract {:.2f} s".format(
+            stored_size / 1024 ** 2, stored_time))
+
+        for mbits in bandwidth:
+            policy = CompressionPolicy(bandwidth=mbits * MBIT)
+            size, cpu_time = measure(files, work_dir, policy)
+            stored_total = stored_time + stored_size / (mbits * MBIT)
+            total = cpu_time + size / (mbits * MBIT)
+            print("{:7.1f} Mbit/s: {:.1f} MB, total {:.2f} s "
+                  "(stored: {:.2f} s, {:+.1%})".format(
+                      mbits, size / 1024 ** 2, total, stored_total,
+                      total / stored_total - 1))
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Simulates the makespan of a single-frame Blender task rendered by providers
+of different performance, with fixed and with adaptive partitioning."""
+import heapq
+import random
+import statistics
+
+import click
+
+from apps.rendering.task.partitioning import AdaptivePartitioner
+
+
+def simulate(perfs, total_parts, part_work, adaptive, subtask_timeout,
+             deadline):
+    """ Returns time needed to compute all the parts. Each provider asks for
+    a new subtask as soon as it finishes the previous one. """
+    partitioner = AdaptivePartitioner(total_parts, subtask_timeout, deadline)
+    # (time ready, provider index)
+    ready = [(0., i) for i in range(len(perfs))]
+    heapq.heapify(ready)
+    running = {}
+    next_part = 1
+    subtask_num = 0
+    makespan = 0.
+
+    while next_part <= total_parts or running:
+        now, provider = heapq.heappop(ready)
+        subtask_id = running.pop(provider, None)
+        if subtask_id is not None:
+            partitioner.subtask_finished(subtask_id, now=now)
+            makespan = max(makespan, now)
+        if next_part > total_parts:
+            continue
+
+        perf = perfs[provider]
+        parts_left = total_parts - next_part + 1
+        parts = partitioner.get_parts_count(perf, parts_left, now=now) \
+            if adaptive else 1
+        subtask_num += 1
+        subtask_id = str(subtask_num)
+        partitioner.subtask_given(subtask_id, perf, parts, now=now)
+        running[provider] = subtask_id
+        next_part += parts
+        heapq.heappush(ready, (now + parts * part_work / perf, provider))
+
+    return makespan
+
+
+@click.command()
+@click.option("--providers", default=10, help="Number of providers")
+@click.option("--subtasks", default=10,
+              help="Number of equal subtasks in the fixed mode")
+@click.option("--parts", default=100,
+              help="Number of parts in the adaptive mode")
+@click.option("--spread", default=4.,
+              help="Ratio between the fastest and the slowest provider")
+@click.option("--work", default=36000.,
+              help="Time of rendering the whole frame with performance 1")
+@click.option("--runs", default=20)
+@click.option("--seed", default=0)
+def run_benchmark(providers, subtasks, parts, spread, work, runs, seed):
+    rnd = random.Random(seed)
+    fixed, adaptive = [], []
+    for _ in range(runs):
+        perfs = [rnd.uniform(1., spread) for _ in range(providers)]
+        deadline = subtask_timeout = work
+        fixed.append(simulate(perfs, subtasks, work / subtasks, False,
+                              subtask_timeout, deadline))
+        adaptive.append(simulate(perfs, parts, work / parts, True,
+                                 subtask_timeout, deadline))
+
+    print("FIXED MAKESPAN: {:.1f}".format(statistics.mean(fixed)))
+    print("ADAPTIVE MAKESPAN: {:.1f}".format(statistics.mean(adaptive)))
+    print("REDUCTION: {:.1%}".format(
+        1 - statistics.mean(adaptive) / statistics.mean(fixed)))
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Simulates the makespan of a task whose subtasks are occasionally computed
+much slower than expected (an overloaded or vanished provider), with and
+without duplicating the straggling subtasks."""
+import collections
+import heapq
+import random
+import statistics
+
+import click
+
+from apps.core.task.stragglers import StragglerPolicy
+
+
+def simulate(perfs, total_parts, part_work, straggle, slowdown,
+             subtask_timeout, duplicate, rnd):
+    """ Returns time needed to compute all the parts and the number of
+    duplicated subtasks. A subtask that does not finish before the timeout
+    is given out again. Providers of cancelled copies keep computing until
+    their own subtask ends, as they are not notified. """
+    policy = StragglerPolicy(total_parts) if duplicate else None
+    pending = collections.deque(range(total_parts))
+    done = set()
+    running = {}  # subtask id -> (part, time started)
+    copies = collections.Counter()
+    # (time finished, subtask id, provider, part, succeeded)
+    events = []
+    idle = list(range(len(perfs)))
+    subtask_num = 0
+    now = 0.
+
+    def select_straggler():
+        oldest = {}
+        for subtask_id, (part, started) in running.items():
+            if part not in done and (part not in oldest
+                                     or started < oldest[part][1]):
+                oldest[part] = (subtask_id, started)
+        subtask_id = policy.select(
+            [(sid, started, copies[part])
+             for part, (sid, started) in oldest.items()],
+            parts_left=total_parts - len(done), now=now)
+        return None if subtask_id is None else running[subtask_id][0]
+
+    while len(done) < total_parts:
+        for provider in list(idle):
+            if pending:
+                part = pending.popleft()
+            elif policy is not None:
+                part = select_straggler()
+                if part is None:
+                    break
+                policy.subtask_duplicated()
+            else:
+                break
+
+            duration = part_work / perfs[provider]
+            if rnd.random() < straggle:
+                duration *= slowdown
+            subtask_num += 1
+            idle.remove(provider)
+            running[subtask_num] = (part, now)
+            copies[part] += 1
+            heapq.heappush(events, (now + min(duration, subtask_timeout),
+                                    subtask_num, provider, part,
+                                    duration <= subtask_timeout))
+
+        now, subtask_id, provider, part, succeeded = heapq.heappop(events)
+        _, started = running.pop(subtask_id)
+        copies[part] -= 1
+        idle.append(provider)
+        if part in done:
+            continue
+        if succeeded:
+            done.add(part)
+            if policy is not None:
+                policy.subtask_finished(now - started)
+        elif not copies[part]:
+            pending.append(part)
+
+    return now, policy.duplicates if policy is not None else 0
+
+
+@click.command()
+@click.option("--providers", default=10, help="Number of providers")
+@click.option("--subtasks", default=50, help="Number of subtasks")
+@click.option("--spread", default=2.,
+              help="Ratio between the fastest and the slowest provider")
+@click.option("--straggle", default=0.05,
+              help="Probability that a subtask is computed slowly")
+@click.option("--slowdown", default=10.,
+              help="How many times slower a straggling subtask is computed")
+@click.option("--work", default=600.,
+              help="Time of computing a subtask with performance 1")
+@click.option("--runs", default=100)
+@click.option("--seed", default=0)
+def run_benchmark(providers, subtasks, spread, straggle, slowdown, work,
+                  runs, seed):
+    rnd = random.Random(seed)
+    plain, duplicated, extra = [], [], []
+    for _ in range(runs):
+        perfs = [rnd.uniform(1., spread) for _ in range(providers)]
+        subtask_timeout = 4 * work
+        state = rnd.getstate()
+        plain.append(simulate(perfs, subtasks, work, straggle, slowdown,
+                              subtask_timeout, False, rnd)[0])
+        rnd.setstate(state)
+        makespan, duplicates = simulate(perfs, subtasks, work, straggle,
+                                        slowdown, subtask_timeout, True, rnd)
+        duplicated.append(makespan)
+        extra.append(duplicates)
+
+    print("MAKESPAN: {:.1f}".format(statistics.mean(plain)))
+    print("MAKESPAN WITH DUPLICATES: {:.1f}".format(
+        statistics.mean(duplicated)))
+    print("REDUCTION: {:.1%}".format(
+        1 - statistics.mean(duplicated) / statistics.mean(plain)))
+    print("EXTRA SUBTASKS: {:.1%}".format(
+        statistics.mean(extra) / subtasks))
+
+
+if __name__ == "__main__":
+    run_benchmark()
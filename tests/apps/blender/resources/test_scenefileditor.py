@@ -1,3 +1,4 @@
+import json
 from importlib import reload
 
 import unittest.mock as mock
@@ -100,6 +101,109 @@ True
         bpy_m.ops.render.render.assert_not_called()
         bpy_m.ops.file.report_missing_files.assert_called_once_with()
 
+    def test_multicrop_file_generation_full(self):
+        """Mocks blender by providing bpy and tests whether generated script
+         renders every crop and frame in a single run."""
+        parameters = {
+            'resolution': (10, 20),
+            'use_compositing': False,
+            'samples': 5,
+            'output_format': 'exr',
+            'frames': [1, 2],
+        }
+        crops = [
+            {'borders_x': [0.0, 0.5], 'borders_y': [0.1, 0.2],
+             'results': ['crop0_0001.exr', 'crop0_0002.exr']},
+            {'borders_x': [0.5, 1.0], 'borders_y': [0.3, 0.4],
+             'results': ['crop1_0001.exr', 'crop1_0002.exr']},
+        ]
+        result = scenefileeditor._generate_blender_multicrop_file(
+            template_path=scenefileeditor.BLENDER_MULTICROP_TEMPLATE_PATH,
+            parameters=parameters,
+            crops=crops,
+            output_dir='/golem/output',
+            num_threads=3,
+            marker='CROP ',
+        )
+
+        scene_m = mock.MagicMock()
+        scene_m.render = mock.MagicMock()
+        scene_m.render.engine = 'CYCLES'
+        bpy_m = mock.MagicMock()
+        bpy_m.context.scene = scene_m
+        filepaths = []
+        bpy_m.ops.render.render.side_effect = \
+            lambda **_: filepaths.append(scene_m.render.filepath)
+
+        result = result.replace('import bpy', '')
+        globs = dict(globals())
+        globs['bpy'] = bpy_m
+
+        with mock.patch('builtins.print') as print_m:
+            exec(result, globs)
+
+        self.assertEqual(scene_m.render.image_settings.file_format, 'OPEN_EXR')
+        self.assertEqual(scene_m.render.threads, 3)
+        self.assertEqual(scene_m.render.resolution_x, 10)
+        self.assertEqual(scene_m.render.border_max_y, 0.4)
+        self.assertEqual(filepaths, [
+            '/golem/output/crop0_0001.exr',
+            '/golem/output/crop0_0002.exr',
+            '/golem/output/crop1_0001.exr',
+            '/golem/output/crop1_0002.exr',
+        ])
+        print_m.assert_any_call('CROP 0', flush=True)
+        print_m.assert_any_call('CROP 1', flush=True)
+        bpy_m.ops.file.report_missing_files.assert_called_once_with()
+
+    def test_server_file_generation_full(self):
+        """Mocks blender by providing bpy and stdin and tests whether
+         generated script renders the crops of every job read from stdin."""
+        result = scenefileeditor._generate_blender_server_file(
+            template_path=scenefileeditor.BLENDER_SERVER_TEMPLATE_PATH,
+            num_threads=3,
+            crop_marker='CROP ',
+            done_marker='DONE',
+        )
+        jobs = [
+            {'resolution': [10, 20], 'use_compositing': False, 'samples': 5,
+             'output_format': 'exr', 'frames': [1], 'output_dir': '/a',
+             'crops': [{'borders_x': [0.0, 0.5], 'borders_y': [0.1, 0.2],
+                        'results': ['crop0_0001.exr']}]},
+            {'resolution': [30, 40], 'use_compositing': False, 'samples': 5,
+             'output_format': 'png', 'frames': [2], 'output_dir': '/b',
+             'crops': [{'borders_x': [0.5, 1.0], 'borders_y': [0.3, 0.4],
+                        'results': ['crop0_0002.png']}]},
+        ]
+
+        scene_m = mock.MagicMock()
+        scene_m.render = mock.MagicMock()
+        scene_m.render.engine = 'CYCLES'
+        bpy_m = mock.MagicMock()
+        bpy_m.context.scene = scene_m
+        filepaths = []
+        bpy_m.ops.render.render.side_effect = \
+            lambda **_: filepaths.append(scene_m.render.filepath)
+
+        result = result.replace('import bpy', '')
+        globs = dict(globals())
+        globs['bpy'] = bpy_m
+
+        with mock.patch('builtins.print') as print_m, \
+                mock.patch('sys.stdin', [json.dumps(job) + '\n'
+                                         for job in jobs]):
+            exec(result, globs)
+
+        self.assertEqual(scene_m.render.threads, 3)
+        self.assertEqual(scene_m.render.image_settings.file_format, 'PNG')
+        self.assertEqual(scene_m.render.resolution_x, 30)
+        self.assertEqual(filepaths, ['/a/crop0_0001.exr', '/b/crop0_0002.png'])
+        self.assertEqual(print_m.call_args_list, [
+            mock.call('CROP 0', flush=True),
+            mock.call('DONE', flush=True),
+        ] * 2)
+        bpy_m.ops.file.report_missing_files.assert_called_once_with()
+
     def tearDown(self):
         super(TestSceneFileEditor, self).tearDown()
         reload(scenefileeditor)
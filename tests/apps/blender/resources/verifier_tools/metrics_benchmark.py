@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from tests.apps.blender.resources.verifier_tools.test_metrics import (
+    METRICS,
+    render_crop,
+)
+
+CROP_SIZES = [256, 1024, 4096]
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("size", CROP_SIZES)
+@pytest.mark.parametrize("metric", METRICS, ids=lambda m: m.__name__)
+@pytest.mark.benchmark(min_rounds=5, warmup=False)
+def test_metric_speed(benchmark, metric, size: int):
+    """ Crop pairs per second of every metric kernel, the crop size in
+    megapixels is reported in extra_info """
+    image1 = render_crop(size, 0)
+    image2 = render_crop(size, 1)
+    benchmark.extra_info['megapixels'] = size * size / 1e6
+    benchmark(metric.compute_metrics, image1, image2)
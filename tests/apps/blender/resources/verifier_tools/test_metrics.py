@@ -0,0 +1,126 @@
+import cv2
+import numpy
+import pytest
+from PIL import Image, ImageFilter
+
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools import (
+    edges,
+    histograms_correlation,
+    mass_center_distance,
+    psnr,
+    skimage,
+    ssim,
+    variance,
+    wavelet,
+)
+from apps.blender.resources.images.entrypoints.scripts.verifier_tools.\
+    rgbimage import RGBImage
+
+METRICS = [
+    ssim.MetricSSIM,
+    psnr.MetricPSNR,
+    variance.ImageVariance,
+    edges.MetricEdgeFactor,
+    wavelet.MetricWavelet,
+    histograms_correlation.MetricHistogramsCorrelation,
+    mass_center_distance.MetricMassCenterDistance,
+]
+
+# Feature values of the 256x256 crops computed by the kernels before they
+# were vectorized
+PREVIOUS_VALUES = {
+    'comp_edge_factor': 19.242360432942707,
+    'edge_difference': 1062.6834615071614,
+    'histograms_correlation': 0.044089960452116744,
+    'image_variance': 13651.162598928366,
+    'max_x_mass_center_distance': 8.58104685436123e-05,
+    'max_y_mass_center_distance': 3.7422233215900214e-05,
+    'psnr': 31.411489099857395,
+    'ref_edge_factor': 19.238250732421875,
+    'reference_variance': 13650.743224355305,
+    'ssim': 0.5802186866489073,
+    'variance_difference': 0.4193745730608498,
+    'wavelet_db4_base': 1804.4609618510956,
+    'wavelet_db4_high': 139.5481209400205,
+    'wavelet_db4_low': 275.3191786926448,
+    'wavelet_db4_mid': 138.71981861472517,
+    'wavelet_haar_base': 136.21398925779442,
+    'wavelet_haar_freq_x1': 0.032857259114583336,
+    'wavelet_haar_freq_x2': 0.08793131510416727,
+    'wavelet_haar_freq_x3': 0.30533854166666785,
+    'wavelet_haar_high': 140.96299186585443,
+    'wavelet_haar_low': 177.17212727866814,
+    'wavelet_haar_mid': 139.3230881463914,
+    'wavelet_sym2_base': 4394.292973362111,
+    'wavelet_sym2_high': 139.9038362775049,
+    'wavelet_sym2_low': 561.0298374533985,
+    'wavelet_sym2_mid': 159.96846728474668,
+}
+
+# The variances are summed exactly now, the error of the previous float sums
+# shows in the difference of two close variances
+TOLERANCES = {
+    'variance_difference': 1e-7,
+}
+
+
+def render_crop(size: int, seed: int) -> RGBImage:
+    """ Gradients with noise, two seeds give two renders of the same scene
+    with different noise """
+    rng = numpy.random.RandomState(seed)
+    y, x = numpy.mgrid[0:size, 0:size]
+    base = numpy.stack([x * 255 // size,
+                        y * 255 // size,
+                        (x + y) * 127 // size], axis=-1)
+    noise = rng.randint(-8, 9, base.shape)
+    return RGBImage(numpy.clip(base + noise, 0, 255).astype(numpy.uint8))
+
+
+def compute_features(image1: RGBImage, image2: RGBImage) -> dict:
+    features = dict()
+    for metric in METRICS:
+        features.update(metric.compute_metrics(image1, image2))
+    return features
+
+
+def test_matches_previous_values():
+    features = compute_features(render_crop(256, 0), render_crop(256, 1))
+
+    assert features.keys() == PREVIOUS_VALUES.keys()
+    for label, value in PREVIOUS_VALUES.items():
+        tolerance = TOLERANCES.get(label, 1e-9)
+        assert features[label] == pytest.approx(value, rel=tolerance), label
+
+
+def test_kernels_match_reference():
+    image1 = render_crop(256, 0)
+    image2 = render_crop(256, 1)
+    pixels1 = numpy.asarray(image1)
+    pixels2 = numpy.asarray(image2)
+
+    assert numpy.array_equal(
+        edges.find_edges(pixels1),
+        numpy.array(image1.to_pil().filter(ImageFilter.FIND_EDGES)))
+
+    assert ssim.compare_ssim_rgb(pixels1, pixels2) == pytest.approx(
+        skimage.compare_ssim(pixels1, pixels2, multichannel=True), rel=1e-9)
+
+    def dense_histogram(pixels):
+        histogram = cv2.calcHist([pixels], range(3), None, [256] * 3,
+                                 [0, 256] * 3)
+        cv2.normalize(histogram, histogram, 0, 256, cv2.NORM_MINMAX)
+        return histogram
+
+    # OpenCV sums the 256^3 bins in a different order
+    metric = histograms_correlation.MetricHistogramsCorrelation
+    assert metric.compare_histograms(pixels1, pixels2) == pytest.approx(
+        cv2.compareHist(dense_histogram(pixels1), dense_histogram(pixels2),
+                        cv2.HISTCMP_CORREL), rel=1e-7)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 9])
+def test_find_edges_small(size: int):
+    pixels = numpy.asarray(render_crop(size, 0))
+    assert numpy.array_equal(
+        edges.find_edges(pixels),
+        numpy.array(Image.fromarray(pixels).filter(ImageFilter.FIND_EDGES)))
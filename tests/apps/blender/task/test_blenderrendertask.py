@@ -5,6 +5,7 @@ import os
 from os import path
 from random import randrange, shuffle
 
+import pickle
 import tempfile
 import unittest
 import unittest.mock as mock
@@ -577,6 +578,86 @@ class TestBlenderTask(TempDirFixture, LogTestCase):
         assert preview is None
 
 
+class TestBlenderTaskAdaptivePartitioning(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        task_definition = RenderingTaskDefinition()
+        task_definition.options = BlenderRendererOptions()
+        task_definition.options.use_frames = False
+        task_definition.options.frames = [1]
+        task_definition.options.adaptive_partitioning = True
+        task_definition.output_file = self.temp_file_name('output')
+        task_definition.output_format = "PNG"
+        task_definition.resolution = [2, 300]
+        task_definition.main_scene_file = path.join(self.path, "example.blend")
+        task_definition.task_id = str(uuid.uuid4())
+        self.bt = BlenderRenderTask(
+            owner=dt_p2p_factory.Node(),
+            task_definition=task_definition,
+            total_tasks=10,
+            root_path=self.tempdir)
+        self.bt.initialize(DirManager(self.tempdir))
+
+    def test_merged_parts(self):
+        slow = self.bt.query_extra_data(100, "ABC", "abc").ctd
+        fast = self.bt.query_extra_data(300, "DEF", "def").ctd
+
+        assert slow['extra_data']['start_task'] == 1
+        assert slow['extra_data']['end_task'] == 1
+        assert fast['extra_data']['start_task'] == 2
+        assert fast['extra_data']['end_task'] == 4
+        assert self.bt.last_task == 4
+        assert self.bt.needs_computation()
+
+        borders_y = fast['extra_data']['crops'][0]['borders_y']
+        self.assertAlmostEqual(borders_y[0], 0.6)
+        self.assertAlmostEqual(borders_y[1], 0.9)
+
+    def test_resent_merged_parts(self):
+        self.bt.query_extra_data(100, "ABC", "abc")
+        fast = self.bt.query_extra_data(300, "DEF", "def").ctd
+        self.bt.last_task = self.bt.total_tasks
+        self.bt.computation_failed(fast['subtask_id'])
+
+        resent = self.bt.query_extra_data(100, "GHI", "ghi").ctd
+        assert resent['extra_data']['start_task'] == 2
+        assert resent['extra_data']['end_task'] == 4
+
+    def test_counts_received_parts(self):
+        self.bt.query_extra_data(100, "ABC", "abc")
+        fast = self.bt.query_extra_data(300, "DEF", "def").ctd
+        subtask_id = fast['subtask_id']
+
+        with mock.patch.object(self.bt, '_update_preview'), \
+                mock.patch.object(self.bt, '_update_task_preview'):
+            self.bt.accept_results(subtask_id, ['result.png'])
+        assert self.bt.num_tasks_received == 3
+        assert self.bt.collected_file_names[2] == 'result.png'
+
+        with mock.patch.object(self.bt, '_remove_from_preview'):
+            self.bt.restart_subtask(subtask_id)
+        assert self.bt.num_tasks_received == 0
+
+    def test_restore_old_pickle(self):
+        state = self.bt.__getstate__()
+        # not pickled before adaptive partitioning was added
+        del state['partitioner']
+        del state['parts_ranges']
+        del self.bt.preview_updater.__dict__['chunk_ends']
+        self.bt.preview_updater.chunks = {1: 'chunk1.png'}
+
+        restored = object.__new__(BlenderRenderTask)
+        restored.__setstate__(pickle.loads(pickle.dumps(state)))
+
+        assert restored.partitioner is None
+        ctd = restored.query_extra_data(300, "DEF", "def").ctd
+        assert ctd['extra_data']['start_task'] == 1
+        assert ctd['extra_data']['end_task'] == 1
+        restored.computation_failed(ctd['subtask_id'])
+        assert restored.preview_updater.chunk_ends == {1: 1}
+
+
 class TestPreviewUpdater(TempDirFixture, LogTestCase):
 
     def test_update_preview(self):
@@ -615,6 +696,20 @@ class TestPreviewUpdater(TempDirFixture, LogTestCase):
                                        res_y * scale_factor)
             self.assertTrue(pu.perfectly_placed_subtasks == chunks)
 
+    def test_update_preview_merged_chunk(self):
+        preview_file = self.temp_file_name('sample_img.png')
+        expected_offsets = {1: 0, 2: 10, 3: 20, 4: 30}
+        pu = PreviewUpdater(preview_file, 20, 30, expected_offsets)
+
+        for number, last_number, height in [(2, 3, 20), (1, 1, 10)]:
+            img = numpy.zeros((height, 20, 3), numpy.uint8)
+            file1 = self.temp_file_name('chunk{}.png'.format(number))
+            cv2.imwrite(file1, img)
+            pu.update_preview(file1, number, last_number)
+
+        assert pu.perfectly_placed_subtasks == 3
+        assert pu.perfect_match_area_y == 30
+
     def test_error_in_preview_update(self):
         pu = PreviewUpdater(None, PREVIEW_X, PREVIEW_Y, {})
         with self.assertLogs(logger, level="WARNING"):
@@ -1,4 +1,4 @@
-from unittest import mock
+from unittest import mock, TestCase
 import functools
 from twisted.internet.defer import Deferred
 
@@ -7,7 +7,9 @@ from golem.core.common import timeout_to_deadline
 from golem.core.deferred import sync_wait
 from golem.docker.task_thread import DockerTaskThread
 from golem.tools.testwithreactor import TestWithReactor
+from apps.core.verification_policy import VerificationMode
 from apps.core.verification_queue import VerificationQueue
+from apps.core.verification_task import VerificationTask
 
 
 class TestVerificationQueue(TestWithReactor):
@@ -52,3 +54,122 @@ class TestVerificationQueue(TestWithReactor):
 
         sync_wait(d, 60)
         _verification_timed_out.assert_called_once()
+
+
+class TestVerificationQueueScheduling(TestCase):
+
+    def setUp(self):
+        self.queue = VerificationQueue(concurrency=4)
+        self.queue.pause()
+
+    def _submit(self, subtask_id, deadline, subtask_deadline=None):
+        self.queue.submit(mock.Mock(), subtask_id, deadline, cb=mock.Mock(),
+                          subtask_deadline=subtask_deadline)
+
+    @mock.patch('apps.core.verification_queue.VerificationQueue._run')
+    def test_earliest_deadline_first(self, run):
+        self._submit('late', 300)
+        self._submit('early', 100)
+        self._submit('middle', 200)
+        assert self.queue.get_stats()['queue_depth'] == 3
+
+        with mock.patch('psutil.cpu_percent', return_value=0.):
+            self.queue.resume()
+
+        started = [c[0][0].subtask_id for c in run.call_args_list]
+        assert started == ['early', 'middle', 'late']
+        assert self.queue.get_stats()['queue_depth'] == 0
+
+    @mock.patch('apps.core.verification_queue.VerificationQueue._run')
+    def test_ordered_by_subtask_deadline(self, run):
+        self._submit('late', 1000, subtask_deadline=300)
+        self._submit('early', 1000, subtask_deadline=100)
+
+        with mock.patch('psutil.cpu_percent', return_value=0.):
+            self.queue.resume()
+
+        started = [c[0][0] for c in run.call_args_list]
+        assert [entry.subtask_id for entry in started] == ['early', 'late']
+        # the results are still verified until the task deadline
+        assert all(entry.deadline == 1000 for entry in started)
+
+    @mock.patch('psutil.cpu_count', return_value=8)
+    def test_concurrency_limited_by_load(self, _cpu_count):
+        with mock.patch('psutil.cpu_percent', return_value=0.):
+            assert self.queue.concurrency == 4
+        with mock.patch('psutil.cpu_percent', return_value=75.):
+            assert self.queue.concurrency == 2
+        with mock.patch('psutil.cpu_percent', return_value=100.):
+            assert self.queue.concurrency == 1
+
+    def test_set_max_concurrency(self):
+        self.queue.set_max_concurrency(0)
+        assert self.queue.get_stats()['max_concurrency'] == 1
+        self.queue.set_max_concurrency(16)
+        assert self.queue.get_stats()['max_concurrency'] == 16
+
+    @mock.patch('apps.core.verification_queue.VerificationQueue._run')
+    def test_paused_queue_does_not_run(self, run):
+        self._submit('deadbeef', 100)
+        run.assert_not_called()
+        assert self.queue.get_stats()['paused']
+
+    @mock.patch('apps.core.verification_queue.VerificationQueue._run')
+    def test_spot_checks_deferred(self, run):
+        with mock.patch.object(self.queue.policy, 'choose',
+                               return_value=VerificationMode.SPOT):
+            self._submit('spot', 10000, subtask_deadline=100)
+        regular_deadline = 100 + VerificationQueue.SPOT_CHECK_DELAY - 1
+        self._submit('regular', 10000, subtask_deadline=regular_deadline)
+
+        with mock.patch('psutil.cpu_percent', return_value=0.):
+            self.queue.resume()
+
+        started = [c[0][0].subtask_id for c in run.call_args_list]
+        assert started == ['regular', 'spot']
+
+    @mock.patch('apps.core.verification_queue.VerificationQueue._run')
+    def test_spot_check_behind_backlog(self, run):
+        with mock.patch.object(self.queue.policy, 'choose',
+                               return_value=VerificationMode.SPOT):
+            self._submit('spot', 400, subtask_deadline=100)
+        for subtask_deadline in [500, 350, 450, 380]:
+            self._submit('regular-{}'.format(subtask_deadline), 1000,
+                         subtask_deadline=subtask_deadline)
+
+        with mock.patch('psutil.cpu_percent', return_value=0.):
+            self.queue.resume()
+
+        # the spot check is not delayed past its deadline
+        started = [c[0][0].subtask_id for c in run.call_args_list]
+        assert started == ['regular-350', 'regular-380', 'spot',
+                           'regular-450', 'regular-500']
+
+    def test_escalated_provider(self):
+        entry = VerificationTask('deadbeef', timeout_to_deadline(100),
+                                 {'subtask_info': {'node_id': 'ABC'}},
+                                 VerificationMode.LIGHT)
+        self.queue.policy.escalated.add('ABC')
+        with mock.patch.object(entry, 'start', return_value=None):
+            self.queue._run(entry, mock.Mock())
+        assert entry.mode == VerificationMode.FULL
+
+
+class TestVerificationTask(TestCase):
+
+    def _start(self, mode):
+        verifier = mock.Mock()
+        verifier.simple_verification.return_value = True
+        entry = VerificationTask('deadbeef', timeout_to_deadline(100), {},
+                                 mode)
+        entry.start(mock.Mock(return_value=verifier))
+        return verifier
+
+    def test_full(self):
+        verifier = self._start(VerificationMode.FULL)
+        verifier.start_verification.assert_called_once_with({})
+
+    def test_light(self):
+        verifier = self._start(VerificationMode.LIGHT)
+        verifier.start_verification.assert_not_called()
+        verifier.verification_completed.assert_called_once_with()
@@ -465,6 +465,110 @@ class TestCoreTask(LogTestCase, TestDirFixture):
         assert ctd['performance'] == perf_index
         assert ctd['docker_images'] == c.docker_images
 
+    def _get_duplicating_task(self):
+        task_def = TestCoreTask._get_core_task_definition()
+        task_def.duplicate_stragglers = True
+        task = self.CoreTaskDeabstracted(
+            task_definition=task_def,
+            owner=dt_p2p_factory.Node(),
+            resource_size=1024,
+            total_tasks=2,
+        )
+        task.initialize(DirManager(self.path))
+        task.last_task = 2
+        task.counting_nodes = {node_id: Mock()
+                               for node_id in ('ABC', 'DEF', 'GHI')}
+        for subtask_id, node_id, start_task in (('first', 'ABC', 1),
+                                                ('second', 'DEF', 2)):
+            task.subtasks_given[subtask_id] = {
+                'subtask_id': subtask_id,
+                'status': SubtaskStatus.starting,
+                'start_task': start_task,
+                'node_id': node_id,
+                'ctd': {'extra_data': {'start_task': start_task}},
+            }
+        return task
+
+    def test_no_straggler_policy(self):
+        task = self._get_core_task()
+        assert task.straggler_policy is None
+        assert task.get_straggler_candidates() == {}
+
+    def test_get_straggler_candidates(self):
+        task = self._get_duplicating_task()
+        assert task.get_straggler_candidates('GHI') == {'first': 1,
+                                                        'second': 1}
+        assert task.get_straggler_candidates('ABC') == {'second': 1}
+
+        task.subtasks_given['second']['status'] = SubtaskStatus.verifying
+        assert task.get_straggler_candidates('GHI') == {'first': 1}
+
+        task.num_failed_subtasks = 1
+        assert task.get_straggler_candidates('GHI') == {}
+
+    def test_query_duplicate_extra_data(self):
+        task = self._get_duplicating_task()
+        extra_data = task.query_duplicate_extra_data(
+            'first', perf_index=10, node_id='GHI')
+
+        duplicate_id = extra_data.ctd['subtask_id']
+        assert duplicate_id not in ('first', 'second')
+        assert extra_data.ctd['extra_data'] == {'start_task': 1}
+        duplicate = task.subtasks_given[duplicate_id]
+        assert duplicate['node_id'] == 'GHI'
+        assert duplicate['start_task'] == 1
+        assert duplicate['status'] == SubtaskStatus.starting
+        assert task.get_subtask_copies(duplicate_id) == \
+            ['first', duplicate_id]
+        assert task.straggler_policy.duplicates == 1
+        assert task.get_straggler_candidates('JKL') == {'first': 2,
+                                                        'second': 1}
+
+    def test_cancel_subtask_copies(self):
+        task = self._get_duplicating_task()
+        duplicate_id = task.query_duplicate_extra_data(
+            'first', perf_index=10, node_id='GHI').ctd['subtask_id']
+
+        task.subtasks_given[duplicate_id]['status'] = \
+            SubtaskStatus.downloading
+        task.accept_results(duplicate_id, [])
+        assert task.cancel_subtask_copies(duplicate_id) == ['first']
+        assert task.subtasks_given['first']['status'] == \
+            SubtaskStatus.cancelled
+        task.counting_nodes['ABC'].cancel.assert_called_once_with()
+
+        # Late results of the cancelled copy are ignored
+        with patch.object(task, 'accept_results') as accept:
+            task.verification_finished('first', Mock(), {})
+            accept.assert_not_called()
+
+    def test_failed_subtask_with_active_copy(self):
+        task = self._get_duplicating_task()
+        task.query_duplicate_extra_data('first', perf_index=10, node_id='GHI')
+
+        task.computation_failed('first')
+        assert task.subtasks_given['first']['status'] == \
+            SubtaskStatus.cancelled
+        assert task.num_failed_subtasks == 0
+        assert not task.needs_computation()
+
+    def test_restore_old_pickle(self):
+        task = self._get_duplicating_task()
+        state = task.__getstate__()
+        # not pickled before straggler duplication was added
+        del state['straggler_policy']
+        del state['duplicate_of']
+
+        restored = object.__new__(type(task))
+        restored.__setstate__(state)
+
+        assert restored.straggler_policy is None
+        assert restored.get_straggler_candidates('GHI') == {}
+        assert restored.get_subtask_copies('first') == ['first']
+        restored.computation_failed('first')
+        assert restored.num_failed_subtasks == 1
+        assert restored.cancel_subtask_copies('second') == []
+
 
 class TestLogKeyError(LogTestCase):
 
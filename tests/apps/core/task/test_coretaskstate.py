@@ -117,3 +117,16 @@ class TestPicklesFrom_0_18_0(TestCase):
         self.assertEqual(self.task_definition.name, 'some_name')
         self.assertEqual(self.task_definition.timeout, '00:01:00')
         self.assertEqual(self.task_definition.subtasks_count, 1)
+
+
+class TestPicklesFromVersion2(TestCase):
+
+    def test_missing_duplicate_stragglers(self):
+        task_definition = TaskDefinition()
+        del task_definition.duplicate_stragglers
+        with mock.patch(
+            'apps.core.task.coretaskstate.TaskDefinition.__getstate__',
+            side_effect=lambda: (2, task_definition.__dict__),
+        ):
+            task_definition = pickle.loads(pickle.dumps(task_definition))
+        self.assertFalse(task_definition.duplicate_stragglers)
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from apps.core.task.stragglers import StragglerPolicy
+
+
+class TestStragglerPolicy(TestCase):
+
+    def setUp(self):
+        self.policy = StragglerPolicy(total_parts=20, tail_share=0.1,
+                                      slowdown=2., max_copies=2, budget=0.1)
+
+    def test_init(self):
+        assert self.policy.tail_parts == 2
+        assert self.policy.max_duplicates == 2
+        assert self.policy.duplicates_left == 2
+        assert self.policy.median_duration is None
+
+    def test_minimal_budget(self):
+        policy = StragglerPolicy(total_parts=3)
+        assert policy.tail_parts == 1
+        assert policy.max_duplicates == 1
+
+    def test_tail(self):
+        assert not self.policy.is_straggler(running_time=1., parts_left=3)
+        assert self.policy.is_straggler(running_time=1., parts_left=2)
+
+    def test_slowdown(self):
+        for duration in (10., 12., 100.):
+            self.policy.subtask_finished(duration)
+        assert self.policy.median_duration == 12.
+        assert not self.policy.is_straggler(running_time=24., parts_left=10)
+        assert self.policy.is_straggler(running_time=25., parts_left=10)
+
+    def test_select_oldest(self):
+        running = [('a', 30., 1), ('b', 10., 1), ('c', 20., 1)]
+        assert self.policy.select(running, parts_left=2, now=40.) == 'b'
+
+    def test_select_max_copies(self):
+        running = [('a', 30., 1), ('b', 10., 2)]
+        assert self.policy.select(running, parts_left=2, now=40.) == 'a'
+        assert self.policy.select(running[1:], parts_left=2, now=40.) is None
+
+    def test_select_no_stragglers(self):
+        running = [('a', 30., 1)]
+        assert self.policy.select(running, parts_left=10, now=40.) is None
+        assert self.policy.select([], parts_left=1, now=40.) is None
+
+    def test_budget(self):
+        running = [('a', 30., 1)]
+        self.policy.subtask_duplicated()
+        assert self.policy.select(running, parts_left=1, now=40.) == 'a'
+        self.policy.subtask_duplicated()
+        assert self.policy.duplicates_left == 0
+        assert self.policy.select(running, parts_left=1, now=40.) is None
@@ -0,0 +1,96 @@
+import random
+from unittest import TestCase, mock
+
+from apps.core.verification_policy import ProviderRecord, \
+    VerificationMode, VerificationPolicy
+from golem.verificator.verifier import SubtaskVerificationState
+
+TRUSTED = ProviderRecord(trust=1., verified=1000, rejected=0)
+
+
+class TestProviderRecord(TestCase):
+
+    def test_rejection_rate(self):
+        assert ProviderRecord().rejection_rate == 0.
+        assert ProviderRecord(verified=3, rejected=1).rejection_rate == .25
+
+
+class TestVerificationPolicy(TestCase):
+
+    def setUp(self):
+        self.records = {'trusted': TRUSTED}
+        self.policy = VerificationPolicy(self.records.get,
+                                         rnd=random.Random(0))
+
+    def test_no_record_source(self):
+        policy = VerificationPolicy()
+        assert policy.choose('trusted') == VerificationMode.FULL
+
+    def test_unknown_provider(self):
+        assert self.policy.choose('unknown') == VerificationMode.FULL
+        assert self.policy.choose(None) == VerificationMode.FULL
+
+    def test_record_source_error(self):
+        self.policy.set_record_source(mock.Mock(side_effect=ValueError))
+        assert self.policy.choose('trusted') == VerificationMode.FULL
+
+    def test_untrusted(self):
+        self.records['low_trust'] = TRUSTED._replace(trust=.4)
+        self.records['new'] = TRUSTED._replace(verified=10)
+        self.records['rejected'] = TRUSTED._replace(rejected=50)
+        for node_id in ('low_trust', 'new', 'rejected'):
+            assert self.policy.choose(node_id) == VerificationMode.FULL
+
+    def test_high_value(self):
+        assert self.policy.choose(
+            'trusted', value=VerificationPolicy.FULL_VALUE + 1) \
+            == VerificationMode.FULL
+
+    def test_spot_rate(self):
+        self.assertAlmostEqual(self.policy.get_spot_rate(TRUSTED),
+                               VerificationPolicy.MIN_SPOT_RATE)
+        self.assertAlmostEqual(
+            self.policy.get_spot_rate(TRUSTED._replace(trust=.5)),
+            VerificationPolicy.MAX_SPOT_RATE)
+
+    def test_trusted_sampled(self):
+        modes = [self.policy.choose('trusted') for _ in range(1000)]
+        spot = modes.count(VerificationMode.SPOT)
+        assert VerificationMode.FULL not in modes
+        assert 20 < spot < 80
+
+    def test_escalation(self):
+        self.policy.verification_finished(
+            'trusted', VerificationMode.SPOT,
+            SubtaskVerificationState.WRONG_ANSWER, 10.)
+        assert self.policy.is_escalated('trusted')
+        assert self.policy.choose('trusted') == VerificationMode.FULL
+        assert self.policy.get_stats()['failed_spot_checks'] == 1
+        assert self.policy.get_stats()['escalated_providers'] == 1
+
+    def test_no_escalation(self):
+        for verdict in (SubtaskVerificationState.VERIFIED,
+                        SubtaskVerificationState.TIMEOUT):
+            self.policy.verification_finished(
+                'trusted', VerificationMode.SPOT, verdict, 10.)
+        assert not self.policy.is_escalated('trusted')
+
+    def test_stats(self):
+        verified = SubtaskVerificationState.VERIFIED
+        self.policy.verification_finished(
+            'a', VerificationMode.FULL, verified, 10.)
+        self.policy.verification_finished(
+            'b', VerificationMode.SPOT, verified, 20.)
+        for _ in range(3):
+            self.policy.verification_finished(
+                'b', VerificationMode.LIGHT, verified, .1)
+
+        assert self.policy.get_stats() == {
+            'full': 1,
+            'spot': 1,
+            'light': 3,
+            'failed_spot_checks': 0,
+            'escalated_providers': 0,
+            'full_verification_time': 30.,
+            'estimated_time_saved': 45.,
+        }
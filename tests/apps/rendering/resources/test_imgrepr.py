@@ -104,6 +104,18 @@ class TestExrImgRepr(TempDirFixture, PEP8MixIn):
         assert e.get_pixel((0, 0)) == val1
         assert e.get_pixel((4, 4)) == val2
 
+    def test_copy(self):
+        e = get_exr_img_repr()
+        e.set_pixel((0, 0), [102, 77, 51])
+
+        c = e.copy()
+        assert c.get_size() == (10, 10)
+        assert c.get_pixel((0, 0)) == [102, 77, 51]
+        assert c.get_pixel((5, 5)) == e.get_pixel((5, 5))
+
+        c.set_pixel((5, 5), [0, 0, 0])
+        assert e.get_pixel((5, 5)) == [178, 187, 180]
+
 
 class TestImgFunctions(TempDirFixture, LogTestCase):
     def test_load_img(self):
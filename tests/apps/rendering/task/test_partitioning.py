@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from apps.rendering.task.partitioning import AdaptivePartitioner
+
+
+class TestAdaptivePartitioner(TestCase):
+
+    def setUp(self):
+        self.partitioner = AdaptivePartitioner(
+            total_parts=100, subtask_timeout=1000, deadline=10000)
+
+    def test_unknown_performance(self):
+        assert self.partitioner.get_parts_count(0, 100, now=0) == 1
+        assert self.partitioner.get_parts_count(500, 1, now=0) == 1
+
+    def test_first_provider_gets_single_part(self):
+        assert self.partitioner.get_parts_count(500, 100, now=0) == 1
+
+    def test_faster_provider_gets_more_parts(self):
+        self.partitioner.subtask_given('a', 100, 1, now=0)
+        self.partitioner.subtask_given('b', 100, 1, now=0)
+        assert self.partitioner.get_parts_count(100, 98, now=0) == 1
+        assert self.partitioner.get_parts_count(400, 98, now=0) == 4
+
+    def test_limited_by_remaining_parts(self):
+        self.partitioner.subtask_given('a', 100, 1, now=0)
+        assert self.partitioner.get_parts_count(1000, 6, now=0) == 3
+
+    def test_limited_by_time(self):
+        self.partitioner.subtask_given('a', 100, 2, now=0)
+        self.partitioner.subtask_finished('a', now=200)
+        assert self.partitioner.part_time == 100
+        # 1000s subtask timeout, half of it as a margin, 4x faster provider
+        assert self.partitioner.get_parts_count(400, 90, now=200) == 4
+        # close to the deadline
+        assert self.partitioner.get_parts_count(400, 90, now=9900) == 2
+        assert self.partitioner.get_parts_count(400, 90, now=9990) == 1
+
+    def test_failed_subtask_not_measured(self):
+        self.partitioner.subtask_given('a', 100, 1, now=0)
+        self.partitioner.subtask_failed('a')
+        self.partitioner.subtask_finished('a', now=100)
+        assert self.partitioner.part_time is None
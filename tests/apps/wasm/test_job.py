@@ -1,8 +1,9 @@
 import os
+import subprocess
 from contextlib import ExitStack
 from json import dumps
 from unittest import TestCase
-from mock import mock_open, patch
+from mock import Mock, mock_open, patch
 
 from apps.wasm.resources.images.scripts import job
 
@@ -27,7 +28,7 @@ class WasmJobTestCase(TestCase):
                 patch('builtins.open', mock_open(read_data=dumps(params))),
             )
             stack.enter_context(patch.dict('os.environ', env))
-            call_mock = stack.enter_context(patch('subprocess.call'))
+            call_mock = stack.enter_context(patch('subprocess.Popen'))
             job.run_job()
 
         expected_call = [
@@ -41,3 +42,22 @@ class WasmJobTestCase(TestCase):
             '--', 'arg1', 'arg2'
         ]
         call_mock.assert_called_once_with(expected_call, cwd='/resources')
+
+    def test_progress(self):
+        params = {
+            'output_file_paths': ['file1.out', 'file2.out'],
+            'PROGRESS_FILE': '/work/progress',
+        }
+        process = Mock()
+        process.wait.side_effect = [
+            subprocess.TimeoutExpired('wasm-sandbox', 1), 0]
+
+        def exists(path):
+            return path == os.path.join('/output', 'file1.out')
+
+        with patch.dict('os.environ', {'OUTPUT_DIR': '/output'}), \
+                patch('os.path.exists', side_effect=exists), \
+                patch.object(job, 'report_progress') as report_progress:
+            assert job.wait_reporting_progress(process, params) == 0
+
+        report_progress.assert_called_once_with(params, 0.5)
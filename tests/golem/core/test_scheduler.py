@@ -0,0 +1,127 @@
+import subprocess
+import sys
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from twisted.internet.task import Clock
+
+from golem.core.scheduler import Histogram, JobScheduler, ReactorLagMonitor
+
+
+class TestHistogram(TestCase):
+
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1.))
+        for value in (0.05, 0.1, 0.5, 2.):
+            histogram.observe(value)
+
+        stats = histogram.to_dict()
+        assert stats['count'] == 4
+        assert stats['max'] == 2.
+        assert stats['avg'] == (0.05 + 0.1 + 0.5 + 2.) / 4
+        assert stats['buckets'] == {'0.1': 2, '1.0': 1, 'inf': 1}
+
+    def test_empty(self):
+        assert Histogram().to_dict()['avg'] == 0.
+
+
+class TestJobScheduler(TestCase):
+
+    def setUp(self):
+        self.scheduler = JobScheduler(tick_budget=0.5)
+        self.scheduler.add('fast', interval=1., priority=0)
+        self.scheduler.add('slow', interval=10., priority=1)
+        self.jobs = {'fast': Mock(), 'slow': Mock()}
+
+    @patch('golem.core.scheduler.time.monotonic')
+    def test_intervals(self, monotonic):
+        monotonic.return_value = 100.
+        assert self.scheduler.run(self.jobs) == ['fast', 'slow']
+
+        monotonic.return_value = 101.
+        assert self.scheduler.run(self.jobs) == ['fast']
+
+        monotonic.return_value = 110.
+        assert self.scheduler.run(self.jobs) == ['fast', 'slow']
+
+    @patch('golem.core.scheduler.time.monotonic')
+    def test_wake(self, monotonic):
+        monotonic.return_value = 100.
+        self.scheduler.run(self.jobs)
+
+        monotonic.return_value = 101.
+        self.scheduler.wake('slow')
+        assert self.scheduler.run(self.jobs) == ['fast', 'slow']
+
+    def test_failure(self):
+        self.jobs['fast'].side_effect = RuntimeError
+        assert self.scheduler.run(self.jobs) == ['fast', 'slow']
+        self.jobs['slow'].assert_called_once_with()
+        assert self.scheduler.get_stats()['fast']['failures'] == 1
+
+    def test_unknown_jobs_skipped(self):
+        assert self.scheduler.run({'slow': Mock()}) == ['slow']
+
+    @patch('golem.core.scheduler.time.monotonic')
+    def test_tick_budget(self, monotonic):
+        clock = [100.]
+        monotonic.side_effect = lambda: clock[0]
+
+        def overrun():
+            clock[0] += 1.
+
+        self.jobs['fast'].side_effect = overrun
+        assert self.scheduler.run(self.jobs) == ['fast']
+        stats = self.scheduler.get_stats()
+        assert stats['fast']['overruns'] == 1
+        assert stats['slow']['deferrals'] == 1
+
+        # the deferred job runs first on the next tick
+        assert self.scheduler.run(self.jobs) == ['slow', 'fast']
+        assert self.scheduler.get_stats()['slow']['deferrals'] == 0
+
+    def test_stats(self):
+        self.scheduler.run(self.jobs)
+        stats = self.scheduler.get_stats()
+        assert stats['fast']['duration']['count'] == 1
+        assert stats['fast']['last_run'] is not None
+        assert stats['slow']['interval'] == 10.
+
+
+class TestReactorLagMonitor(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.monitor = ReactorLagMonitor(interval=1., clock=self.clock)
+
+    def test_lag(self):
+        self.monitor.start()
+        self.clock.advance(1.)
+        assert self.monitor.last_lag == 0.
+
+        self.clock.advance(2.5)
+        assert self.monitor.last_lag == 1.5
+        stats = self.monitor.get_stats()
+        assert stats['count'] == 2
+        assert stats['max'] == 1.5
+
+    def test_start_stop(self):
+        assert not self.monitor.running
+        self.monitor.start()
+        assert self.monitor.running
+        with self.assertRaises(RuntimeError):
+            self.monitor.start()
+
+        self.monitor.stop()
+        assert not self.monitor.running
+        assert not self.clock.getDelayedCalls()
+        with self.assertRaises(RuntimeError):
+            self.monitor.stop()
+
+    def test_reactor_not_imported(self):
+        # golemapp installs a platform specific reactor after the imports
+        subprocess.check_call([
+            sys.executable, '-c',
+            'import sys, golem.core.scheduler; '
+            'assert "twisted.internet.reactor" not in sys.modules',
+        ])
@@ -65,7 +65,8 @@ class TestDockerJob(DockerTestCase):
 
         parameters = {'OUTPUT_DIR': '/golem/output',
                       'RESOURCES_DIR': '/golem/resources',
-                      'WORK_DIR': '/golem/work'}
+                      'WORK_DIR': '/golem/work',
+                      'PROGRESS_FILE': '/golem/work/progress'}
         self.assertEqual(job.parameters, parameters)
         self.assertEqual(job.host_config, {})
         self.assertEqual(job.resources_dir, self.resources_dir)
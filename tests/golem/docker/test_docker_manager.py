@@ -1,11 +1,14 @@
 # pylint: disable=too-many-lines
 import functools
+import os
 import sys
 from collections import namedtuple
 from subprocess import CalledProcessError
 from unittest import TestCase, mock
 
-from golem.docker.config import DEFAULTS
+from docker.errors import DockerException
+
+from golem.docker.config import APPS_DIR, DEFAULTS
 from tests.golem.docker.test_hypervisor import command, MockHypervisor, \
     MockDockerManager, raise_exception, raise_process_exception
 
@@ -286,59 +289,72 @@ class TestDockerManager(TestCase):  # pylint: disable=too-many-public-methods
         assert not dmm.build_images.called
         assert dmm._env_checked
 
-    def test_pull_images(self):
-        pulls = [0]
+    @staticmethod
+    def _expected_images():
+        from apps.core import nvgpu
+        if nvgpu.is_supported():
+            return 7
+        return 5
 
-        def command(key, *args, **kwargs):
-            if key == 'images':
-                return ''
-            elif key == 'pull':
-                pulls[0] += 1
-                return True
+    @mock.patch('golem.docker.manager.local_client')
+    @mock.patch('golem.docker.manager.ImageInventory.instance')
+    def test_pull_images(self, inventory, local_client):
+        inventory().has_name.return_value = False
+        local_client().pull.return_value = [{'status': 'Downloaded'}]
 
-        with mock.patch.object(MockDockerManager, 'command',
-                               side_effect=command):
-            dmm = MockDockerManager()
-            dmm.pull_images()
+        dmm = MockDockerManager()
+        dmm.pull_images()
 
-        from apps.core import nvgpu
-        if nvgpu.is_supported():
-            expected = 7
-        else:
-            expected = 5
+        assert local_client().pull.call_count == self._expected_images()
+        local_client().pull.assert_any_call(
+            'golemfactory/base', tag='1.4', stream=True, decode=True)
+        assert inventory().reload.call_count == 2
 
-        assert pulls[0] == expected
+    @mock.patch('golem.docker.manager.local_client')
+    @mock.patch('golem.docker.manager.ImageInventory.instance')
+    def test_pull_images_available(self, inventory, local_client):
+        inventory().has_name.return_value = True
 
-    @mock.patch('os.chdir')
-    def test_build_images(self, os_chdir):
+        dmm = MockDockerManager()
+        dmm.pull_images()
 
-        builds = [0]
-        tags = [0]
+        assert not local_client().pull.called
 
-        def command(key, *args, **kwargs):
-            if key == 'images':
-                return ''
-            elif key == 'build':
-                builds[0] += 1
-                return True
-            elif key == 'tag':
-                tags[0] += 1
-                return True
+    @mock.patch('golem.docker.manager.local_client')
+    @mock.patch('golem.docker.manager.ImageInventory.instance')
+    def test_pull_images_error(self, inventory, local_client):
+        inventory().has_name.return_value = False
+        local_client().pull.return_value = [{'error': 'manifest unknown'}]
 
-        with mock.patch.object(MockDockerManager, 'command',
-                               side_effect=command):
-            dmm = MockDockerManager()
-            dmm.build_images()
+        dmm = MockDockerManager()
+        with self.assertRaisesRegex(DockerException, 'manifest unknown'):
+            dmm.pull_images()
+        assert local_client().pull.call_count == 1
+        # Images pulled before the error are visible
+        assert inventory().reload.call_count == 2
 
-        from apps.core import nvgpu
-        if nvgpu.is_supported():
-            expected = 7
-        else:
-            expected = 5
+    @mock.patch('golem.docker.manager.local_client')
+    @mock.patch('golem.docker.manager.ImageInventory.instance')
+    def test_build_images(self, inventory, local_client):
+        inventory().has_name.return_value = False
+        local_client().build.return_value = [{'stream': 'Step 1/2\n'}]
 
-        assert builds[0] == expected
-        assert tags[0] == expected
-        assert len(os_chdir.mock_calls) == 2 * expected
+        dmm = MockDockerManager()
+        dmm.build_images()
+
+        expected = self._expected_images()
+        assert local_client().build.call_count == expected
+        assert local_client().tag.call_count == expected
+
+        local_client().build.assert_any_call(
+            path=os.path.join(APPS_DIR, 'blender/resources/images/'),
+            dockerfile='blender.Dockerfile',
+            tag='golemfactory/blender',
+            rm=True,
+            decode=True,
+        )
+        local_client().tag.assert_any_call(
+            'golemfactory/blender', 'golemfactory/blender', tag='1.10')
 
     def test_recover_vm_connectivity(self):
         callback = mock.Mock()
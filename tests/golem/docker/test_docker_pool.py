@@ -0,0 +1,218 @@
+import os
+from unittest import mock
+
+import docker.errors
+
+from golem.docker.image import DockerImage
+from golem.docker.job import DockerJob
+from golem.docker.pool import DockerContainerPool, PooledDockerJob
+from golem.testutils import TempDirFixture
+
+IMAGE = 'golemfactory/base:latest'
+
+
+class PoolTestBase(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('golem.docker.pool.local_client')
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        ids = iter(range(1000))
+        self.client.create_container.side_effect = \
+            lambda **_: {'Id': 'container-{}'.format(next(ids))}
+
+        patcher = mock.patch.object(DockerContainerPool, 'warm_up')
+        self.warm_up = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.pool = DockerContainerPool({'mem_limit': '1024m'}, 2)
+        self.pool._root_dir = self.new_path / 'pool'
+        os.makedirs(self.pool._root_dir)
+
+    def _removed(self):
+        return [c[0][0] for c in self.client.remove_container.call_args_list]
+
+
+class TestDockerContainerPool(PoolTestBase):
+
+    def test_reuse(self):
+        container = self.pool.acquire(IMAGE)
+        assert os.path.isdir(container.work_dir)
+        self.pool.release(container)
+
+        assert self.pool.acquire(IMAGE) is container
+        assert self.client.create_container.call_count == 1
+        assert self.client.start.call_count == 1
+        assert self.pool.stats['created'] == 1
+        assert self.pool.stats['reused'] == 1
+
+        kwargs = self.client.create_host_config.call_args[1]
+        assert kwargs['mem_limit'] == '1024m'
+        assert kwargs['binds'][container.work_dir]['bind'] == \
+            DockerJob.WORK_DIR
+
+    def test_clean_dirs_after_release(self):
+        container = self.pool.acquire(IMAGE)
+        leftover = os.path.join(container.output_dir, 'result.png')
+        open(leftover, 'w').close()
+        self.pool.release(container)
+        assert not os.path.exists(leftover)
+
+    def test_recycle_after_failure(self):
+        container = self.pool.acquire(IMAGE)
+        self.pool.release(container, failed=True)
+
+        assert self._removed() == [container.container_id]
+        assert not os.path.exists(container.slot_dir)
+        assert self.pool.acquire(IMAGE) is not container
+        self.warm_up.assert_called_once_with(IMAGE)
+
+    def test_recycle_after_max_jobs(self):
+        container = self.pool.acquire(IMAGE)
+        for _ in range(self.pool.MAX_JOBS_PER_CONTAINER - 1):
+            self.pool.release(container)
+            assert self.pool.acquire(IMAGE) is container
+        self.pool.release(container)
+
+        assert self._removed() == [container.container_id]
+        assert self.pool.size == 0
+
+    def test_reconfigure(self):
+        idle = self.pool.acquire(IMAGE)
+        busy = self.pool.acquire(IMAGE)
+        self.pool.release(idle)
+
+        self.pool.reconfigure({'mem_limit': '1024m'}, 2)
+        assert not self.client.remove_container.called
+
+        self.pool.reconfigure({'mem_limit': '2048m'}, 2)
+        assert self._removed() == [idle.container_id]
+
+        # created with the previous limits
+        self.pool.release(busy)
+        assert self._removed() == [idle.container_id, busy.container_id]
+
+    def test_bounded(self):
+        first = self.pool.acquire(IMAGE)
+        second = self.pool.acquire('other')
+        self.pool.release(first)
+        self.pool.release(second)
+        assert self.pool.size == 2
+
+        third = self.pool.acquire('third')
+        assert self._removed() == [first.container_id]
+        assert self.pool.size == 2
+        self.pool.release(third)
+
+    def test_discard(self):
+        container = self.pool.acquire(IMAGE)
+        self.pool.discard(container)
+        assert self._removed() == [container.container_id]
+        assert self.pool.size == 0
+
+
+class TestPooledDockerJob(PoolTestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.resources_dir = self.new_path / 'resources'
+        self.work_dir = self.new_path / 'work'
+        self.output_dir = self.new_path / 'output'
+        for path in (self.resources_dir, self.work_dir, self.output_dir):
+            os.makedirs(path)
+        (self.resources_dir / 'scene.blend').write_text('scene')
+
+        self.client.exec_create.return_value = {'Id': 'exec'}
+
+    def _create_job(self):
+        return PooledDockerJob(
+            self.pool,
+            image=DockerImage('golemfactory/base'),
+            entrypoint='python3 /golem/scripts/job.py',
+            parameters={'frames': [1]},
+            resources_dir=str(self.resources_dir),
+            work_dir=str(self.work_dir),
+            output_dir=str(self.output_dir),
+            environment={'LOCAL_USER_ID': '1000'},
+        )
+
+    def test_run(self):
+        job = self._create_job()
+        with job:
+            container = job.warm_container
+            assert job.get_status() == DockerJob.STATE_CREATED
+            assert os.path.isfile(
+                os.path.join(container.resources_dir, 'scene.blend'))
+            assert os.path.isfile(
+                os.path.join(container.work_dir, DockerJob.PARAMS_FILE))
+
+            job.start()
+            args, kwargs = self.client.exec_create.call_args
+            assert args[0] == container.container_id
+            assert args[1][-1].startswith('python3 /golem/scripts/job.py')
+            assert kwargs['workdir'] == DockerJob.WORK_DIR
+            assert kwargs['environment']['LOCAL_USER_ID'] == '1000'
+
+            with open(os.path.join(container.output_dir, 'out.png'), 'w'):
+                pass
+            with open(os.path.join(container.logs_dir, 'stdout.log'),
+                      'w') as f:
+                f.write('rendered')
+
+            self.client.exec_inspect.return_value = \
+                {'Running': False, 'ExitCode': 0}
+            assert job.wait() == 0
+
+            stdout = str(self.new_path / 'stdout.log')
+            stderr = str(self.new_path / 'stderr.log')
+            job.dump_logs(stdout, stderr)
+            with open(stdout) as f:
+                assert f.read() == 'rendered'
+            assert os.path.getsize(stderr) == 0
+
+        assert (self.output_dir / 'out.png').exists()
+        assert job.get_status() == DockerJob.STATE_REMOVED
+        assert not self.client.remove_container.called
+        assert self.pool.acquire(IMAGE) is container
+
+    def test_failed(self):
+        job = self._create_job()
+        with job:
+            container = job.warm_container
+            job.start()
+            self.client.exec_inspect.return_value = \
+                {'Running': False, 'ExitCode': 1}
+            assert job.wait() == 1
+        assert self._removed() == [container.container_id]
+
+    def test_kill(self):
+        job = self._create_job()
+        with job:
+            container = job.warm_container
+            job.kill()
+            assert not self.client.remove_container.called
+
+            job.start()
+            job.kill()
+            assert job.get_status() == DockerJob.STATE_KILLED
+            assert self._removed() == [container.container_id]
+
+            self.client.exec_inspect.side_effect = \
+                docker.errors.NotFound('removed')
+            assert job.wait() == -1
+        assert self._removed() == [container.container_id]
+        assert self.pool.size == 0
+
+    def test_progress(self):
+        job = self._create_job()
+        with job:
+            assert job.get_progress() is None
+            progress_file = os.path.join(job.warm_container.work_dir,
+                                         DockerJob.PROGRESS_FILE)
+            with open(progress_file, 'w') as f:
+                f.write('0.42')
+            assert job.get_progress() == 0.42
+            with open(progress_file, 'w') as f:
+                f.write('1.5')
+            assert job.get_progress() == 1.0
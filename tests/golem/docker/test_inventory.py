@@ -0,0 +1,170 @@
+from unittest import TestCase, mock
+
+import requests
+
+from golem.docker.image import DockerImage
+from golem.docker.inventory import ImageInventory
+
+BASE_ID = 'sha256:' + 'a' * 64
+BLENDER_ID = 'sha256:' + 'b' * 64
+
+
+def _images():
+    return [
+        {'Id': BASE_ID, 'RepoTags': ['golemfactory/base:1.4',
+                                     'golemfactory/base:latest']},
+        {'Id': BLENDER_ID, 'RepoTags': ['golemfactory/blender:1.9']},
+        {'Id': 'sha256:' + 'c' * 64, 'RepoTags': ['<none>:<none>']},
+        {'Id': 'sha256:' + 'd' * 64, 'RepoTags': None},
+    ]
+
+
+class TestImageInventory(TestCase):
+
+    def setUp(self):
+        self.client = mock.Mock()
+        self.client.images.return_value = _images()
+        self.inventory = ImageInventory(lambda: self.client,
+                                        events_window=1,
+                                        refresh_interval=60)
+
+    def test_lookup_loads_once(self):
+        assert self.inventory.has_name('golemfactory/base:1.4')
+        assert self.inventory.has_name('golemfactory/blender:1.9')
+        assert not self.inventory.has_name('golemfactory/blender:1.8')
+        assert self.inventory.get_id('golemfactory/base:latest') == BASE_ID
+        assert self.client.images.call_count == 1
+
+    def test_docker_hub_names(self):
+        self.client.images.return_value = [
+            {'Id': BASE_ID, 'RepoTags': ['ubuntu:18.04']}]
+        assert self.inventory.has_name('library/ubuntu:18.04')
+        assert self.inventory.has_name('docker.io/library/ubuntu:18.04')
+
+    def test_get_names(self):
+        assert self.inventory.get_names(BLENDER_ID) == \
+            {'golemfactory/blender:1.9'}
+        assert self.inventory.get_names('b' * 64) == \
+            {'golemfactory/blender:1.9'}
+        assert self.inventory.get_names('b' * 12) == \
+            {'golemfactory/blender:1.9'}
+        assert self.inventory.get_names('deadface') == set()
+
+    def test_reload(self):
+        assert not self.inventory.has_name('golemfactory/dummy:1.1')
+        self.client.images.return_value = _images() + [
+            {'Id': 'sha256:' + 'e' * 64,
+             'RepoTags': ['golemfactory/dummy:1.1']}]
+        assert self.inventory.reload()
+        assert self.inventory.has_name('golemfactory/dummy:1.1')
+
+    def test_reload_error_keeps_images(self):
+        self.inventory.reload()
+        self.client.images.side_effect = requests.exceptions.ConnectionError
+        assert not self.inventory.reload()
+        assert self.inventory.has_name('golemfactory/base:1.4')
+
+    def test_not_reachable(self):
+        self.client.images.side_effect = requests.exceptions.ConnectionError
+        assert not self.inventory.has_name('golemfactory/base:1.4')
+        assert not self.inventory.has_name('golemfactory/base:1.4')
+        # Retried until the daemon responds
+        assert self.client.images.call_count == 2
+
+    def test_invalidate(self):
+        self.inventory.reload()
+        self.inventory.invalidate()
+        self.inventory.has_name('golemfactory/base:1.4')
+        assert self.client.images.call_count == 2
+
+    def test_events(self):
+        self.inventory.reload()
+        self.client.events.return_value = iter([
+            {'Type': 'image', 'Action': 'delete', 'id': BLENDER_ID}])
+        self.client.images.return_value = _images()[:1]
+
+        assert self.inventory._read_events(0, 1)
+        self.client.events.assert_called_once_with(
+            since=0, until=1, decode=True, filters={'type': 'image'})
+
+    def test_watch(self):
+        self.inventory.reload()
+        self.client.images.return_value = _images()[:1]
+
+        def events(**_):
+            self.inventory._stop_event.set()
+            return iter([{'Type': 'image', 'Action': 'delete'}])
+
+        self.client.events.side_effect = events
+        self.inventory._watch()
+
+        assert not self.inventory.has_name('golemfactory/blender:1.9')
+        assert self.client.images.call_count == 2
+
+    def test_watch_no_events(self):
+        self.inventory.reload()
+
+        def events(**_):
+            self.inventory._stop_event.set()
+            return iter([])
+
+        self.client.events.side_effect = events
+        self.inventory._watch()
+        assert self.client.images.call_count == 1
+
+    @mock.patch('golem.docker.inventory.time.monotonic')
+    def test_watch_refresh(self, monotonic):
+        monotonic.return_value = 100.
+        self.inventory.reload()
+        monotonic.return_value = 161.
+
+        def events(**_):
+            self.inventory._stop_event.set()
+            return iter([])
+
+        self.client.events.side_effect = events
+        self.inventory._watch()
+        assert self.client.images.call_count == 2
+
+    def test_watch_error(self):
+        self.inventory.reload()
+
+        def events(**_):
+            self.inventory._stop_event.set()
+            raise requests.exceptions.ConnectionError
+
+        self.client.events.side_effect = events
+        self.inventory._watch()
+
+        self.inventory.has_name('golemfactory/base:1.4')
+        assert self.client.images.call_count == 2
+
+    def test_start_stop(self):
+        self.client.events.return_value = iter([])
+        self.inventory.start()
+        assert self.inventory._thread.is_alive()
+        self.inventory.stop()
+        assert not self.inventory._thread.is_alive()
+
+
+@mock.patch('golem.docker.image.ImageInventory.instance')
+class TestDockerImageIsAvailable(TestCase):
+
+    def setUp(self):
+        self.inventory = ImageInventory(mock.Mock())
+        self.inventory._update(_images())
+
+    def test_by_name(self, instance):
+        instance.return_value = self.inventory
+        assert DockerImage('golemfactory/base', tag='1.4').is_available()
+        assert DockerImage('golemfactory/base').is_available()
+        assert not DockerImage('golemfactory/base', tag='1.3').is_available()
+
+    def test_by_id(self, instance):
+        instance.return_value = self.inventory
+        assert DockerImage('golemfactory/blender', image_id=BLENDER_ID,
+                           tag='1.9').is_available()
+        assert not DockerImage('golemfactory/blender', image_id=BASE_ID,
+                               tag='1.9').is_available()
+        assert not DockerImage('golemfactory/blender', image_id='deadface',
+                               tag='1.9').is_available()
@@ -0,0 +1,205 @@
+from pathlib import Path
+from unittest import TestCase, mock
+
+from golem.docker.stats import (
+    ContainerStatsCollector,
+    ResourceUsage,
+    parse_api_stats,
+    read_cgroup_v1,
+    read_cgroup_v2,
+)
+from golem.testutils import TempDirFixture
+
+CONTAINER_ID = 'abcdef0123456789'
+
+
+def _write(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestResourceUsage(TestCase):
+
+    def test_cpu_utilization(self):
+        usage = ResourceUsage(cpu_time=30., wall_time=60.)
+        assert usage.cpu_utilization == .5
+        assert usage.to_dict()['cpu_utilization'] == .5
+
+    def test_no_wall_time(self):
+        assert ResourceUsage(cpu_time=1.).cpu_utilization == 0.
+
+
+class TestReadCgroup(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.root = Path(self.tempdir)
+
+    def test_v1(self):
+        group = Path('docker') / CONTAINER_ID
+        _write(self.root / 'memory' / group / 'memory.usage_in_bytes',
+               '524288\n')
+        _write(self.root / 'memory' / group / 'memory.max_usage_in_bytes',
+               '1048576\n')
+        _write(self.root / 'cpuacct' / group / 'cpuacct.usage',
+               '2500000000\n')
+        _write(self.root / 'blkio' / group / 'blkio.throttle.io_service_bytes',
+               '8:0 Read 4096\n8:0 Write 512\n8:16 Read 1024\nTotal 5632\n')
+
+        assert read_cgroup_v1(CONTAINER_ID, self.root) == {
+            'memory': 524288,
+            'memory_peak': 1048576,
+            'cpu_ns': 2500000000,
+            'block_read': 5120,
+            'block_write': 512,
+        }
+        assert read_cgroup_v2(CONTAINER_ID, self.root) is None
+
+    def test_v2_systemd(self):
+        group = self.root / 'system.slice' / \
+            'docker-{}.scope'.format(CONTAINER_ID)
+        _write(group / 'memory.peak', '2048\n')
+        _write(group / 'memory.current', '1024\n')
+        _write(group / 'cpu.stat',
+               'usage_usec 1500000\nuser_usec 1000000\nsystem_usec 500000\n')
+        _write(group / 'io.stat',
+               '8:0 rbytes=100 wbytes=10 rios=1 wios=1 dbytes=0 dios=0\n')
+
+        assert read_cgroup_v1(CONTAINER_ID, self.root) is None
+        assert read_cgroup_v2(CONTAINER_ID, self.root) == {
+            'memory': 1024,
+            'memory_peak': 2048,
+            'cpu_ns': 1500000000,
+            'block_read': 100,
+            'block_write': 10,
+        }
+
+    def test_v2_no_peak(self):
+        group = self.root / 'docker' / CONTAINER_ID
+        _write(group / 'memory.current', '1024\n')
+        _write(group / 'cpu.stat', 'usage_usec 10\n')
+
+        stats = read_cgroup_v2(CONTAINER_ID, self.root)
+        assert stats['memory'] == 1024
+        assert 'memory_peak' not in stats
+        assert stats['block_read'] == 0
+
+    def test_missing(self):
+        assert read_cgroup_v1(CONTAINER_ID, self.root) is None
+        assert read_cgroup_v2(CONTAINER_ID, self.root) is None
+
+
+class TestParseApiStats(TestCase):
+
+    def test_parse(self):
+        stats = {
+            'memory_stats': {'usage': 100, 'max_usage': 300},
+            'cpu_stats': {'cpu_usage': {'total_usage': 10 ** 9}},
+            'blkio_stats': {'io_service_bytes_recursive': [
+                {'major': 8, 'minor': 0, 'op': 'Read', 'value': 40},
+                {'major': 8, 'minor': 0, 'op': 'Write', 'value': 2},
+                {'major': 8, 'minor': 0, 'op': 'Total', 'value': 42},
+            ]},
+        }
+        assert parse_api_stats(stats) == {
+            'memory': 100,
+            'memory_peak': 300,
+            'cpu_ns': 10 ** 9,
+            'block_read': 40,
+            'block_write': 2,
+        }
+
+    def test_not_running(self):
+        assert parse_api_stats({
+            'memory_stats': {},
+            'cpu_stats': {'cpu_usage': {}},
+            'blkio_stats': {'io_service_bytes_recursive': None},
+        }) is None
+
+
+class TestContainerStatsCollector(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.collector = ContainerStatsCollector(
+            CONTAINER_ID, interval=0.01, cgroup_root=Path(self.tempdir))
+
+    @mock.patch('golem.docker.stats.local_client')
+    def test_sample_api(self, local_client):
+        local_client().stats.side_effect = [
+            {
+                'memory_stats': {'usage': usage},
+                'cpu_stats': {'cpu_usage': {'total_usage': cpu}},
+            }
+            for usage, cpu in ((200, 10 ** 9), (100, 3 * 10 ** 9))
+        ]
+        self.collector.sample()
+        self.collector.sample()
+
+        usage = self.collector.usage
+        assert self.collector.samples == 2
+        assert usage.peak_memory == 200
+        assert usage.cpu_time == 3.
+        local_client().stats.assert_called_with(CONTAINER_ID, stream=False)
+
+    @mock.patch('golem.docker.stats.local_client')
+    def test_sample_error(self, local_client):
+        local_client().stats.side_effect = OSError
+        self.collector.sample()
+        assert self.collector.samples == 0
+        assert self.collector.usage.peak_memory == 0
+
+    @mock.patch('golem.docker.stats.time')
+    @mock.patch('golem.docker.stats.ContainerStatsCollector._read',
+                return_value={'memory': 1, 'cpu_ns': 1, 'block_read': 0,
+                              'block_write': 0})
+    def test_wall_time(self, _read, time_mock):
+        time_mock.monotonic.return_value = 10.
+        with self.collector:
+            time_mock.monotonic.return_value = 15.5
+        assert not self.collector.is_alive()
+        assert self.collector.samples >= 1
+        assert self.collector.usage.wall_time == 5.5
+
+    @staticmethod
+    def _stats(memory, memory_peak, cpu_ns, block_read):
+        return {'memory': memory, 'memory_peak': memory_peak,
+                'cpu_ns': cpu_ns, 'block_read': block_read,
+                'block_write': 0}
+
+    def test_warm_container(self):
+        # a previous job used 4 s of CPU and raised the peak to 1000
+        with mock.patch.object(self.collector, '_read', side_effect=[
+                self._stats(100, 1000, 4 * 10 ** 9, 50),
+                self._stats(300, 1000, 5 * 10 ** 9, 60),
+                self._stats(200, 1000, 6 * 10 ** 9, 80)]):
+            self.collector.take_baseline()
+            self.collector.sample()
+            self.collector.sample()
+
+        usage = self.collector.usage
+        assert usage.cpu_time == 2.
+        assert usage.block_read == 30
+        assert usage.peak_memory == 300
+
+    def test_peak_raised(self):
+        with mock.patch.object(self.collector, '_read', side_effect=[
+                self._stats(100, 1000, 0, 0),
+                self._stats(300, 1500, 0, 0)]):
+            self.collector.take_baseline()
+            self.collector.sample()
+
+        assert self.collector.usage.peak_memory == 1500
+
+    def test_sample_on_stop(self):
+        self.collector.interval = 60
+        with mock.patch.object(self.collector, '_read', side_effect=[
+                None,
+                self._stats(100, 100, 10 ** 9, 0),
+                self._stats(100, 100, 3 * 10 ** 9, 0)]):
+            self.collector.take_baseline()
+            with self.collector:
+                pass
+
+        assert self.collector.samples == 2
+        assert self.collector.usage.cpu_time == 3.
@@ -16,6 +16,7 @@ from golem import testutils
 from golem.ethereum import exceptions
 from golem.ethereum.transactionsystem import TransactionSystem
 from golem.ethereum.exceptions import NotEnoughFunds
+from golem.tools.fakesci import FakeSCI
 
 fake = faker.Faker()
 PASSWORD = 'derp'
@@ -461,6 +462,47 @@ class WithdrawTest(TransactionSystemBase):
         assert self.ets.get_available_gnt() == 0
 
 
+class ChainStateTest(TransactionSystemBase):
+    LATENCY = 0.2
+
+    def setUp(self):
+        super().setUp()
+        self.fake_sci = FakeSCI(
+            latency=self.LATENCY,
+            eth_balance=denoms.ether,
+            gnt_balance=2 * denoms.ether,
+            gntb_balance=3 * denoms.ether,
+            block_number=1234,
+        )
+        self.ets._sci = self.fake_sci
+
+    def test_concurrent_refresh(self):
+        started = time.monotonic()
+        self.ets._refresh_balances()
+        # four queries, not run one after another
+        assert time.monotonic() - started < 2 * self.LATENCY
+        assert self.ets._eth_balance == denoms.ether
+        assert self.ets._gnt_balance == 2 * denoms.ether
+        assert self.ets._gntb_balance == 3 * denoms.ether
+        assert self.ets.get_block_number() == 1234
+
+    def test_balance_from_cache(self):
+        self.ets._refresh_balances()
+        calls = self.fake_sci.calls
+
+        balance = self.ets.get_balance()
+        assert balance['block_number'] == 1234
+        assert balance['block_update_time'] is not None
+        assert self.fake_sci.calls == calls
+
+    def test_block_number_failure(self):
+        with patch.object(self.fake_sci, 'get_block_number',
+                          side_effect=Exception('timeout')):
+            self.ets._refresh_balances()
+        assert self.ets._gntb_balance == 3 * denoms.ether
+        assert self.ets._block_number == 1223
+
+
 class ConcentDepositTest(TransactionSystemBase):
     def setUp(self):
         super().setUp()
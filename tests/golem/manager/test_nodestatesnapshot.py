@@ -19,6 +19,7 @@ class TestComputingSubtaskStateSnapshot(TestCase):
             'frames': [1],
             'start_task': start_task,
             'total_tasks': 1,
+            'seconds_since_progress': 0.0,
             'some_unused_field': 1234,
         }
 
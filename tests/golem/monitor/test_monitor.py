@@ -267,7 +267,7 @@ class TestSenderThread(TestCase):
             proto_ver=None
         )
         sender.stop_request.isSet = mock.Mock(side_effect=[False, True])
-        with mock.patch('requests.post',
+        with mock.patch('requests.Session.post',
                         side_effect=requests.exceptions.RequestException(
                             "request failed")), \
                 self.assertLogs() as logs:
@@ -0,0 +1,158 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest import TestCase, mock
+
+from golem.monitor.model.loginlogoutmodel import LoginModel
+from golem.monitor.model.nodemetadatamodel import NodeInfoModel
+from golem.monitor.model.statssnapshotmodel import ComputationTime, \
+    P2PSnapshotModel
+from golem.monitor.monitor import MessageBuffer, SenderThread
+from golem.monitor.test_helper import meta_data
+
+
+class MonitorStandIn(ThreadingMixIn, HTTPServer):
+    """ Local stand-in for the monitor server, recording the payloads """
+
+    daemon_threads = True
+
+    def __init__(self, batch_status=200):
+        self.payloads = []
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                length = int(self.headers['Content-Length'])
+                payload = json.loads(self.rfile.read(length))
+                if 'batch' in payload and batch_status != 200:
+                    self.send_response(batch_status)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                server.payloads.append(payload)
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *_):
+                pass
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}/'.format(self.server_address[1])
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *_):
+        self.shutdown()
+        self.server_close()
+
+
+def _p2p_snapshot(peers):
+    return P2PSnapshotModel('cliid', 'sessid', peers)
+
+
+class TestMessageBuffer(TestCase):
+
+    def test_coalesce_snapshots(self):
+        buffer = MessageBuffer(10)
+        login = LoginModel(meta_data())
+        buffer.put(_p2p_snapshot(['old']))
+        buffer.put(login)
+        buffer.put(_p2p_snapshot(['new']))
+
+        messages = buffer.take(10)
+        assert len(messages) == 2
+        assert messages[0].p2p_snapshot == ['new']
+        assert messages[1] is login
+        assert buffer.coalesced == 1
+
+    def test_drop_oldest(self):
+        buffer = MessageBuffer(2)
+        for value in range(3):
+            buffer.put(ComputationTime(meta_data(), True, value))
+
+        assert [m.value for m in buffer.take(10)] == [1, 2]
+        assert buffer.dropped == 1
+
+
+class TestSenderThread(TestCase):
+
+    def _sender(self, url, **kwargs):
+        return SenderThread(NodeInfoModel('cliid', 'sessid'), url, 1, 60, 1,
+                            **kwargs)
+
+    def test_batches(self):
+        with MonitorStandIn() as server:
+            sender = self._sender(server.url, max_batch_size=2)
+            for value in range(3):
+                sender.send(ComputationTime(meta_data(), True, value))
+            sender.send(_p2p_snapshot(['old']))
+            sender.send(_p2p_snapshot(['new']))
+            assert sender.flush() == 4
+
+        assert len(server.payloads) == 2
+        assert [len(p['batch']) for p in server.payloads] == [2, 2]
+        assert server.payloads[1]['batch'][1]['p2p_snapshot'] == ['new']
+        # the connection is reused
+        assert server.connections == 1
+
+        stats = sender.get_stats()
+        assert stats['sent'] == 4
+        assert stats['batches'] == 2
+        assert stats['coalesced'] == 1
+        assert stats['avg_latency'] is not None
+
+    def test_batches_rejected(self):
+        for status in (400, 500):
+            with MonitorStandIn(batch_status=status) as server:
+                sender = self._sender(server.url, max_batch_size=2)
+                for value in range(3):
+                    sender.send(ComputationTime(meta_data(), True, value))
+                assert sender.flush() == 3
+
+            # the rejected batch is sent again as single messages, and so
+            # are the following ones
+            assert [p['data']['value'] for p in server.payloads] == [0, 1, 2]
+            assert not sender.sender.batches_accepted
+            stats = sender.get_stats()
+            assert stats['sent'] == 3
+            assert stats['failed'] == 0
+
+    def test_single_messages(self):
+        with MonitorStandIn() as server:
+            sender = self._sender(server.url)
+            sender.send(LoginModel(meta_data()))
+            sender.flush()
+
+        assert server.payloads[0]['data']['type'] == 'Login'
+
+    def test_flush_on_stop(self):
+        with MonitorStandIn() as server:
+            sender = self._sender(server.url, flush_interval=60)
+            sender.start()
+            sender.send(LoginModel(meta_data()))
+            sender.join()
+
+        assert len(server.payloads) == 1
+
+    def test_failed(self):
+        sender = self._sender('http://127.0.0.1:1/', max_queue_size=1)
+        with mock.patch('golem.monitor.transport.httptransport.log'):
+            sender.send(LoginModel(meta_data()))
+            sender.send(LoginModel(meta_data()))
+            sender.flush()
+
+        stats = sender.get_stats()
+        assert stats['failed'] == 1
+        assert stats['dropped'] == 1
+        assert stats['queued'] == 0
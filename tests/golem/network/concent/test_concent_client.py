@@ -2,6 +2,7 @@
 import datetime
 import gc
 import logging
+import threading
 import time
 from unittest import mock, TestCase
 import urllib
@@ -23,6 +24,7 @@ from golem.core import variables
 from golem.network import history
 from golem.network.concent import client
 from golem.network.concent import exceptions
+from golem.tools.fakeconcent import FakeConcent
 
 logger = logging.getLogger(__name__)
 
@@ -291,15 +293,17 @@ class TestConcentClientService(testutils.TempDirFixture):
 
         send_mock.side_effect = exceptions.ConcentRequestError
         mock_path = ("golem.network.concent.client.ConcentClientService"
-                     "._grace_sleep")
-        with mock.patch(mock_path) as sleep_mock:
+                     "._grace_period")
+        with mock.patch(mock_path) as grace_mock:
             self.concent_service._loop()
-            sleep_mock.assert_called_once_with()
+            self.concent_service._executor.shutdown(wait=True)
+            grace_mock.assert_called_once_with()
 
         send_mock.assert_called_once_with(
             self.msg,
             self.concent_service.keys_auth._private_key,
             concent_variant=self.concent_service.variant,
+            session=self.concent_service._session,
         )
 
         assert not self.concent_service._delayed
@@ -318,13 +322,70 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
         self.concent_service._loop()
+        self.concent_service._executor.shutdown(wait=True)
         send_mock.assert_called_once_with(
             self.msg,
             self.concent_service.keys_auth._private_key,
             concent_variant=self.concent_service.variant,
+            session=self.concent_service._session,
         )
         react_mock.assert_called_once_with(data, response_to=self.msg)
 
+    def test_loop_max_in_flight(self, send_mock, *_):
+        release = threading.Event()
+        send_mock.side_effect = lambda *_, **__: release.wait(5)
+        for i in range(6):
+            self.concent_service.submit(
+                'key{}'.format(i),
+                self.msg,
+                delay=datetime.timedelta(),
+            )
+
+        self.concent_service._loop()
+        self.concent_service._loop()
+        self.assertEqual(self.concent_service._queue.qsize(),
+                         6 - variables.CONCENT_MAX_IN_FLIGHT)
+
+        release.set()
+        while not self.concent_service._queue.empty():
+            self.concent_service._loop()
+            time.sleep(.01)
+        self.concent_service._executor.shutdown(wait=True)
+        self.assertEqual(send_mock.call_count, 6)
+
+    def test_loop_grace_period(self, send_mock, *_):
+        send_mock.side_effect = exceptions.ConcentRequestError
+        self.concent_service.submit('key1', self.msg, datetime.timedelta())
+        self.concent_service.submit('key2', self.msg, datetime.timedelta())
+        self.concent_service._in_flight = threading.BoundedSemaphore(1)
+
+        self.concent_service._loop()
+        while send_mock.call_count < 1 or \
+                not self.concent_service._in_grace_period():
+            time.sleep(.01)
+        self.concent_service._loop()
+
+        send_mock.assert_called_once()
+        self.assertEqual(self.concent_service._queue.qsize(), 1)
+
+    def test_deadline_order(self, *_):
+        messages = []
+        for deadline in (30, 10, None, 20):
+            msg = mock.Mock()
+            if deadline is None:
+                del msg.task_to_compute
+            else:
+                msg.task_to_compute.compute_task_def = {'deadline': deadline}
+            messages.append(msg)
+            self.concent_service._enqueue(deadline, msg)
+
+        ordered = [self.concent_service._queue.get_nowait()[2]
+                   for _ in messages]
+        self.assertEqual(
+            ordered,
+            [messages[1], messages[3], messages[0], messages[2]],
+        )
+
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
         '.react_to_concent_message'
@@ -336,6 +397,7 @@ class TestConcentClientService(testutils.TempDirFixture):
             signing_key=self.concent_service.keys_auth._private_key,
             public_key=self.concent_service.keys_auth.public_key,
             concent_variant=self.concent_service.variant,
+            session=self.concent_service._session,
         )
         react_mock.assert_has_calls(
             (
@@ -345,7 +407,7 @@ class TestConcentClientService(testutils.TempDirFixture):
 
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
-        '._grace_sleep'
+        '._grace_period'
     )
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
@@ -363,13 +425,14 @@ class TestConcentClientService(testutils.TempDirFixture):
             signing_key=mock.ANY,
             public_key=mock.ANY,
             concent_variant=self.concent_service.variant,
+            session=mock.ANY,
         )
         sleep_mock.assert_called_once_with()
         react_mock.assert_not_called()
 
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
-        '._grace_sleep'
+        '._grace_period'
     )
     @mock.patch(
         'golem.network.concent.client.ConcentClientService'
@@ -387,6 +450,7 @@ class TestConcentClientService(testutils.TempDirFixture):
             signing_key=mock.ANY,
             public_key=mock.ANY,
             concent_variant=mock.ANY,
+            session=mock.ANY,
         )
         sleep_mock.assert_called_once_with()
         react_mock.assert_not_called()
@@ -429,6 +493,57 @@ class TestConcentClientService(testutils.TempDirFixture):
         )
 
 
+@mock.patch('golem.terms.ConcentTermsOfUse.are_accepted', return_value=True)
+@mock.patch('golem.network.concent.client.ConcentClientService.receive')
+class TestConcentClientServiceStandIn(testutils.TempDirFixture):
+    LATENCY = .3
+
+    def setUp(self):
+        super().setUp()
+        self.concent = FakeConcent(
+            pubkey=golem_messages.cryptography.ECCx(None).raw_pubkey,
+            latency=self.LATENCY,
+        )
+        self.concent.start()
+        self.concent_service = client.ConcentClientService(
+            keys_auth=keysauth.KeysAuth(
+                datadir=self.path,
+                private_key_name='priv_key',
+                password='password',
+            ),
+            variant=self.concent.variant,
+            max_in_flight=4,
+        )
+
+    def tearDown(self):
+        self.concent_service.stop()
+        self.concent.stop()
+        super().tearDown()
+
+    def _sent(self):
+        return [r for r in self.concent.requests if r[1] == '/api/v1/send/']
+
+    def test_concurrent_requests(self, *_):
+        for i in range(8):
+            self.concent_service.submit(
+                'key{}'.format(i),
+                msg_factories.concents.ForceReportComputedTaskFactory(),
+                delay=datetime.timedelta(),
+            )
+
+        started = time.time()
+        self.concent_service.start()
+        while len(self._sent()) < 8 and time.time() - started < 10:
+            time.sleep(.05)
+        elapsed = time.time() - started
+        self.concent_service.stop()
+        self.concent_service.join(timeout=3)
+
+        self.assertEqual(len(self._sent()), 8)
+        self.assertEqual(self.concent.max_in_flight, 4)
+        self.assertLess(elapsed, 4 * self.LATENCY)
+
+
 class ConcentCallLaterTestCase(testutils.TempDirFixture):
     def setUp(self):
         super().setUp()
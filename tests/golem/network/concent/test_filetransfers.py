@@ -1,9 +1,13 @@
 import base64
+import os
 import queue
+import threading
+import time
 import unittest
 
 import mock
 
+from golem_messages.cryptography import ECCx
 from golem_messages.factories.concents import (
     FileTransferTokenFactory, FileInfoFactory)
 from golem_messages.message.concents import FileTransferToken
@@ -12,6 +16,7 @@ from golem import testutils
 from golem.core import keysauth
 from golem.core import variables
 from golem.network.concent import filetransfers
+from golem.tools.fakeconcent import FakeConcent
 from tests.factories.concent import ConcentFileRequestFactory
 
 
@@ -75,8 +80,12 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
 
     @mock.patch('golem.network.concent.filetransfers.LoopingCallService.stop')
     def test_stop(self, lcs_mock):
-        self.cfs.stop()
+        with mock.patch.object(self.cfs, '_executor') as executor, \
+                mock.patch.object(self.cfs, '_session') as session:
+            self.cfs.stop()
         lcs_mock.assert_called_once()
+        executor.shutdown.assert_called_once_with(wait=True)
+        session.close.assert_called_once_with()
 
     @mock.patch('golem.network.concent.filetransfers.logger.warning')
     def test_transfer_unstarted(self, log_mock):
@@ -93,6 +102,34 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         self.assertEqual(request.file_transfer_token, ftt)
         self.assertEqual(request.file_category, category)
 
+    def test_transfer_deadline_order(self):
+        for deadline in (30, 10, 20):
+            self.cfs.transfer(
+                '/less/important.txt',
+                FileTransferTokenFactory(token_expiration_deadline=deadline),
+            )
+        deadlines = [self.cfs._transfers.get().deadline for _ in range(3)]
+        self.assertEqual(deadlines, [10, 20, 30])
+
+    @mock.patch('golem.network.concent.filetransfers.'
+                'ConcentFiletransferService.process')
+    def test_run_max_in_flight(self, process_mock):
+        release = threading.Event()
+        process_mock.side_effect = lambda _: release.wait(5)
+        for _ in range(5):
+            self.cfs.transfer('/yeta/nother.file', FileTransferTokenFactory())
+        self.cfs._run()
+        self.cfs._run()
+
+        self.assertEqual(self.cfs._transfers.qsize(),
+                         5 - variables.CONCENT_FILETRANSFERS_MAX_IN_FLIGHT)
+        release.set()
+        while not self.cfs._transfers.empty():
+            self.cfs._run()
+            time.sleep(.01)
+        self.cfs._transfers.join()
+        self.assertEqual(process_mock.call_count, 5)
+
     def test_transfer_category_default(self):
         ftt = FileTransferTokenFactory()
         self.cfs.transfer('/less/important.txt', ftt)
@@ -113,6 +150,7 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         ftt = FileTransferTokenFactory()
         self.cfs.transfer(path, ftt)
         self.cfs._run()
+        self.cfs._transfers.join()
         process_mock.assert_called_once()
         request = process_mock.call_args[0][0]
         self.assertIsInstance(request, filetransfers.ConcentFileRequest)
@@ -185,7 +223,7 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         file.write_text('meh')
         return str(file)
 
-    @mock.patch('golem.network.concent.filetransfers.requests.post')
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.post')
     def test_upload(self, requests_mock):
         path = self._init_uploaded_file('something.good')
 
@@ -210,7 +248,7 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         self.assertIsNotNone(kwargs.get('headers').pop('Concent-Auth'))
         self.assertEqual(kwargs.get('headers'), headers)
 
-    @mock.patch('golem.network.concent.filetransfers.requests.post')
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.post')
     def test_upload_multiple_files(self, requests_mock):
         path = self._init_uploaded_file('obsta.cles')
         category = FileTransferToken.FileInfo.Category.resources
@@ -238,7 +276,7 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
         concent_upload_path = kwargs.get('headers').get('Concent-Upload-Path')
         self.assertEqual(concent_upload_path, ftt.files[1].get('path'))  # noqa pylint:disable=unsubscriptable-object
 
-    @mock.patch('golem.network.concent.filetransfers.requests.get')
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.get')
     def test_download(self, requests_mock):
         path = self.path + '/gotwell.soon'
 
@@ -264,7 +302,7 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
             self._mock_get_auth_headers(ftt)
         )
 
-    @mock.patch('golem.network.concent.filetransfers.requests.get')
+    @mock.patch('golem.network.concent.filetransfers.requests.Session.get')
     def test_download_multiple_files(self, requests_mock):
         path = self.path + '/spanish.sahara'
         category = FileTransferToken.FileInfo.Category.resources
@@ -290,3 +328,119 @@ class ConcentFiletransferServiceTest(testutils.TempDirFixture):
 
         requests_mock.assert_called_once()
         self.assertEqual(requests_mock.call_args[0], (download_address, ))
+
+
+class ConcentFiletransferStandInTest(testutils.TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.concent = FakeConcent(pubkey=ECCx(None).raw_pubkey)
+        self.concent.start()
+        self.cfs = filetransfers.ConcentFiletransferService(
+            keys_auth=keysauth.KeysAuth(
+                datadir=self.path,
+                private_key_name='priv_key',
+                password='password',
+            ),
+            variant=self.concent.variant,
+            chunk_size=16,
+        )
+        self.data = bytes(range(256)) * 4
+
+    def tearDown(self):
+        self.concent.stop()
+        super().tearDown()
+
+    def _request(self, file_path, **kwargs):
+        ftt = FileTransferTokenFactory(
+            storage_cluster_address=self.concent.storage_cluster_address,
+            **kwargs,
+        )
+        return ConcentFileRequestFactory(
+            file_path=file_path,
+            file_transfer_token=ftt,
+        )
+
+    def test_upload(self):
+        path = self.new_path / 'upload.dat'
+        path.write_bytes(self.data)
+        request = self._request(str(path), upload=True)
+
+        response = self.cfs.process(request)
+
+        self.assertEqual(response.status_code, 200)
+        upload_path = request.file_transfer_token.get_file_info(
+            request.file_category).get('path')
+        self.assertEqual(self.concent.files[upload_path], self.data)
+
+    def test_download(self):
+        path = self.new_path / 'download.dat'
+        request = self._request(str(path), download=True)
+        download_path = request.file_transfer_token.get_file_info(
+            request.file_category).get('path')
+        self.concent.files[download_path] = self.data
+
+        response = self.cfs.process(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(path.read_bytes(), self.data)
+
+    def test_download_resume(self):
+        path = self.new_path / 'download.dat'
+        request = self._request(str(path), download=True)
+        download_path = request.file_transfer_token.get_file_info(
+            request.file_category).get('path')
+        self.concent.files[download_path] = self.data
+        self.concent.break_download_after = 100
+
+        response = self.cfs.process(request)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(path.read_bytes(), self.data)
+        self.assertFalse(os.path.exists(str(path) + '.part'))
+        get_requests = [r for r in self.concent.requests if r[0] == 'GET']
+        self.assertEqual(len(get_requests), 2)
+        offset = int(get_requests[1][2]['Range'][len('bytes='):-1])
+        self.assertTrue(0 < offset <= 100)
+
+    def test_download_missing(self):
+        error = mock.Mock()
+        request = self._request(
+            str(self.new_path / 'missing.dat'), download=True)
+        request.error = error
+
+        self.cfs.process(request)
+
+        error.assert_called_once()
+        self.assertIsInstance(error.call_args[0][0],
+                              filetransfers.ConcentFiletransferError)
+
+    def test_download_missing_part_removed(self):
+        path = self.new_path / 'missing.dat'
+        part_path = self.new_path / 'missing.dat.part'
+        part_path.write_bytes(self.data[:100])
+        request = self._request(str(path), download=True)
+        request.error = mock.Mock()
+
+        self.cfs.process(request)
+
+        request.error.assert_called_once()
+        self.assertFalse(part_path.exists())
+
+    def test_download_stale_part(self):
+        path = self.new_path / 'download.dat'
+        part_path = self.new_path / 'download.dat.part'
+        part_path.write_bytes(bytes(len(self.data)))
+        request = self._request(str(path), download=True)
+        download_path = request.file_transfer_token.get_file_info(
+            request.file_category).get('path')
+        self.concent.files[download_path] = self.data
+
+        response = self.cfs.process(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(path.read_bytes(), self.data)
+        self.assertFalse(part_path.exists())
+        get_requests = [r for r in self.concent.requests if r[0] == 'GET']
+        self.assertEqual(len(get_requests), 2)
+        self.assertNotIn('Range', get_requests[1][2])
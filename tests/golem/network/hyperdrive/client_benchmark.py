@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+import requests
+
+from golem.network.hyperdrive.client import HyperdriveClient
+from golem.tools.fakehyperg import FakeHyperdriveServer
+
+REQUESTS = 100
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+@pytest.fixture(scope='module')
+def server():
+    with FakeHyperdriveServer() as fake_server:
+        yield fake_server
+
+
+def pooled_requests(client: HyperdriveClient):
+    for _ in range(REQUESTS):
+        client.id()
+
+
+def unpooled_requests(client: HyperdriveClient):
+    # a new connection for every request, as before the session was added
+    for _ in range(REQUESTS):
+        requests.post(url=client._url,  # pylint: disable=protected-access
+                      headers={'content-type': 'application/json'},
+                      data=json.dumps(dict(command='id'))).json()
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("run", [pooled_requests, unpooled_requests])
+@pytest.mark.benchmark(min_rounds=10, warmup=True)
+def test_request_throughput(benchmark, server, run):
+    client = HyperdriveClient(server.port, server.host)
+    benchmark(run, client)
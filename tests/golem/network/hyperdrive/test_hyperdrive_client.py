@@ -8,6 +8,7 @@ from twisted.python import failure
 
 from golem.network.hyperdrive.client import HyperdriveAsyncClient, \
     HyperdriveClient, HyperdriveClientOptions
+from golem.tools.fakehyperg import FakeHyperdriveServer
 
 from tests.factories.hyperdrive import hyperdrive_client_kwargs
 
@@ -24,7 +25,7 @@ response = {
 response_str = json.dumps(response)
 
 
-@mock.patch('golem.network.hyperdrive.client.requests.post',
+@mock.patch('golem.network.hyperdrive.client.requests.Session.post',
             return_value=mock.Mock(text=response_str,
                                    content=response_str.encode()))
 class TestHyperdriveClient(TestCase):
@@ -75,7 +76,7 @@ class TestHyperdriveClient(TestCase):
         assert client.cancel(content_hash) == response_hash
 
     @mock.patch('json.loads')
-    @mock.patch('requests.post')
+    @mock.patch('requests.Session.post')
     def test_request(self, post, json_loads, _):
         client = self.get_client()
         resp = mock.Mock()
@@ -115,6 +116,19 @@ class TestHyperdriveClient(TestCase):
         assert not json_loads.called
 
 
+class TestHyperdriveClientConnection(TestCase):
+
+    def test_connection_reused(self):
+        with FakeHyperdriveServer() as server:
+            client = HyperdriveClient(server.port, server.host)
+            for _ in range(10):
+                assert client.id()['id'] == 'fake-hyperg'
+            assert client.cancel('hash') == 'hash'
+
+        assert server.requests == 11
+        assert server.connections == 1
+
+
 class TestHyperdriveClientAsync(TestCase):
 
     @staticmethod
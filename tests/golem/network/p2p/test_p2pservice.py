@@ -1,6 +1,7 @@
 # pylint: disable=protected-access
 from os import urandom
 import random
+import threading
 import time
 import unittest.mock as mock
 from unittest.mock import MagicMock, patch
@@ -42,7 +43,7 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service.seeds = set()
 
     def test_P2P_SEEDS(self):
-        self.service._sync_seeds()
+        self.service._sync_seeds().result(timeout=10)
         self.assertGreater(len(self.service.bootstrap_seeds), 0)
         self.assertGreaterEqual(
             len(self.service.seeds),
@@ -53,21 +54,21 @@ class TestSyncSeeds(TestDatabaseWithReactor):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = '127.0.0.1'
         self.service.config_desc.seed_port = 'l33t'
-        self.service._sync_seeds()
+        self.service._sync_seeds().result(timeout=10)
         self.assertEqual(self.service.seeds, set())
 
     def test_no_host(self):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = ''
         self.service.config_desc.seed_port = '31337'
-        self.service._sync_seeds()
+        self.service._sync_seeds().result(timeout=10)
         self.assertEqual(self.service.seeds, set())
 
     def test_gaierror(self):
         self.service.bootstrap_seeds = frozenset()
         self.service.config_desc.seed_host = 'nosuchaddress'
         self.service.config_desc.seed_port = '31337'
-        self.service._sync_seeds()
+        self.service._sync_seeds().result(timeout=10)
         self.assertEqual(self.service.seeds, set())
 
 
@@ -234,6 +235,9 @@ class TestP2PService(TestDatabaseWithReactor):
 
         # insert one
         self.service.add_known_peer(node, node.pub_addr, node.pub_port)
+        # buffered until flushed
+        assert len(KnownHosts.select()) == len_start
+        self.service.flush_known_hosts()
         select_1 = KnownHosts.select()
         len_1 = len(select_1)
         last_conn_1 = select_1[0].last_connected
@@ -244,11 +248,16 @@ class TestP2PService(TestDatabaseWithReactor):
 
         # insert duplicate
         self.service.add_known_peer(node, node.pub_addr, node.pub_port)
+        self.service.flush_known_hosts()
         select_2 = KnownHosts.select()
         len_2 = len(select_2)
         assert len_2 == len_1
         assert select_2[0].last_connected > last_conn_1
 
+        # seeds are updated on the reactor thread
+        updated = threading.Event()
+        self._get_reactor().callFromThread(updated.set)
+        assert updated.wait(timeout=10)
         assert len(self.service.seeds) > nominal_seeds
 
         # try to add more than max, we already have at least 1
@@ -267,10 +276,30 @@ class TestP2PService(TestDatabaseWithReactor):
                 pub_port=10000,
                 prv_port=10000)
             self.service.add_known_peer(n, pub, n.prv_port)
+        self.service.flush_known_hosts()
 
+        # redundant hosts are removed on a timer
+        assert len(KnownHosts.select()) > MAX_STORED_HOSTS
+        self.service.last_known_hosts_prune = 0
+        self.service.sync_network()
         assert len(KnownHosts.select()) == MAX_STORED_HOSTS
+
+        self.service._sync_seeds().result(timeout=10)
         assert len(self.service.seeds) == nominal_seeds
 
+    def test_flush_known_hosts_on_timer(self):
+        KnownHosts.delete().execute()
+        node = dt_p2p_factory.Node()
+        for i in range(10):
+            self.service.add_known_peer(node, '1.2.3.4', 10000 + i % 5)
+
+        self.service.sync_network()
+        assert not KnownHosts.select().count()
+
+        self.service.last_known_hosts_flush = 0
+        self.service.sync_network()
+        assert KnownHosts.select().count() == 5
+
     def test_sync_free_peers(self):
         node = dt_p2p_factory.Node(
             key=encode_hex(urandom(64))[2:],
@@ -4,6 +4,7 @@ import copy
 import ipaddress
 import random
 import sys
+import time
 import uuid
 from unittest import TestCase
 from unittest.mock import patch, Mock, MagicMock, ANY
@@ -19,12 +20,18 @@ from golem import testutils
 from golem.core.keysauth import KeysAuth
 from golem.core.variables import PROTOCOL_CONST
 from golem.core.variables import TASK_HEADERS_LIMIT
+from golem.core.variables import TASK_HEADERS_RESEND_INTERVAL
 from golem.network.p2p.p2pservice import P2PService
 from golem.network.p2p.peersession import (logger, PeerSession, PeerSessionInfo)
 from golem.tools.assertlogs import LogTestCase
 from tests.factories import taskserver as task_server_factory
 
 
+def _headers(start, stop, signature=b'sig'):
+    return [Mock(task_id='task{}'.format(i), signature=signature)
+            for i in range(start, stop)]
+
+
 def fill_slots(msg):
     for slot in msg.__slots__:
         if hasattr(msg, slot):
@@ -392,8 +399,8 @@ class TestPeerSession(testutils.DatabaseFixture, LogTestCase,
         peer_session._react_to_get_tasks(Mock())
         assert not peer_session.send.called
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, 100))
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            _headers(0, 100)
         peer_session.p2p_service.get_others_tasks_headers.return_value = list()
         peer_session._react_to_get_tasks(Mock())
 
@@ -401,10 +408,10 @@ class TestPeerSession(testutils.DatabaseFixture, LogTestCase,
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
         assert len(sent_tasks) == len(set(sent_tasks))
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, TASK_HEADERS_LIMIT - 1))
-        peer_session.p2p_service.get_others_tasks_headers.return_value = list(
-            range(0, TASK_HEADERS_LIMIT - 1))
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            _headers(0, TASK_HEADERS_LIMIT - 1)
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            _headers(0, TASK_HEADERS_LIMIT - 1)
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
@@ -418,15 +425,15 @@ class TestPeerSession(testutils.DatabaseFixture, LogTestCase,
         peer_session.send = MagicMock()
 
         peer_session.p2p_service.get_own_tasks_headers.return_value = None
-        peer_session.p2p_service.get_others_tasks_headers.return_value = list(
-            range(0, 10))
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            _headers(0, 10)
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
         assert len(sent_tasks) == len(set(sent_tasks))
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, 10))
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            _headers(0, 10)
         peer_session.p2p_service.get_others_tasks_headers.return_value = None
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
@@ -440,21 +447,85 @@ class TestPeerSession(testutils.DatabaseFixture, LogTestCase,
         peer_session.p2p_service.get_others_tasks_headers = Mock()
         peer_session.send = MagicMock()
 
-        peer_session.p2p_service.get_own_tasks_headers.return_value = list(
-            range(0, 50))
-        peer_session.p2p_service.get_others_tasks_headers.return_value = list(
-            range(51, 100))
+        own_headers = _headers(0, 50)
+        others_headers = _headers(51, 100)
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            own_headers
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            others_headers
         peer_session._react_to_get_tasks(Mock())
         sent_tasks = peer_session.send.call_args_list[0][0][0].tasks
 
-        my_tasks = list(filter(lambda x: x in (0, 50), sent_tasks))
-        other_tasks = list(filter(lambda x: x in (50, 100), sent_tasks))
+        my_tasks = [x for x in sent_tasks if x in own_headers]
+        other_tasks = [x for x in sent_tasks if x in others_headers]
 
         assert len(my_tasks) <= int(TASK_HEADERS_LIMIT / 2)
         assert len(other_tasks) <= int(TASK_HEADERS_LIMIT / 2)
         assert len(sent_tasks) <= TASK_HEADERS_LIMIT
         assert len(sent_tasks) == len(set(sent_tasks))
 
+    def test_react_to_get_tasks_known_headers(self):
+        conn = MagicMock()
+        peer_session = PeerSession(conn)
+        peer_session.send = MagicMock()
+        headers = _headers(0, 5)
+        peer_session.p2p_service.get_own_tasks_headers.return_value = headers
+        peer_session.p2p_service.get_others_tasks_headers.return_value = []
+
+        peer_session._react_to_get_tasks(Mock())
+        assert set(peer_session.send.call_args[0][0].tasks) == set(headers)
+
+        # Nothing new
+        peer_session.send.reset_mock()
+        peer_session._react_to_get_tasks(Mock())
+        peer_session.send.assert_not_called()
+
+        # Changed and new headers only
+        changed = _headers(0, 1, signature=b'new sig')
+        added = _headers(5, 6)
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            changed + headers[1:] + added
+        peer_session._react_to_get_tasks(Mock())
+        assert set(peer_session.send.call_args[0][0].tasks) == \
+            set(changed + added)
+
+        # All headers sent again after an interval
+        peer_session.send.reset_mock()
+        with patch('golem.network.p2p.peersession.time.time',
+                   return_value=time.time() + TASK_HEADERS_RESEND_INTERVAL
+                   + 1):
+            peer_session._react_to_get_tasks(Mock())
+        assert len(peer_session.send.call_args[0][0].tasks) == 6
+
+    def test_known_headers_pruned(self):
+        conn = MagicMock()
+        peer_session = PeerSession(conn)
+        peer_session.send = MagicMock()
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            _headers(0, 5)
+        peer_session.p2p_service.get_others_tasks_headers.return_value = []
+        peer_session._react_to_get_tasks(Mock())
+        assert len(peer_session.known_task_headers) == 5
+
+        peer_session.p2p_service.get_own_tasks_headers.return_value = \
+            _headers(0, 2)
+        peer_session._react_to_get_tasks(Mock())
+        assert set(peer_session.known_task_headers) == {'task0', 'task1'}
+
+    def test_react_to_tasks_not_sent_back(self):
+        conn = MagicMock()
+        peer_session = PeerSession(conn)
+        peer_session.send = MagicMock()
+        headers = _headers(0, 3)
+        peer_session.p2p_service.add_task_header.return_value = True
+        peer_session._react_to_tasks(Mock(tasks=headers))
+
+        peer_session.p2p_service.get_own_tasks_headers.return_value = []
+        peer_session.p2p_service.get_others_tasks_headers.return_value = \
+            headers
+        peer_session._react_to_get_tasks(Mock())
+        peer_session.send.assert_not_called()
+
     @patch('golem.network.p2p.peersession.PeerSession._send_peers')
     def test_react_to_get_peers(self, send_mock):
         msg = message.p2p.GetPeers()
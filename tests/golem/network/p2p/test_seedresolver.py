@@ -0,0 +1,81 @@
+import socket
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from golem.network.p2p.seedresolver import SeedResolver
+
+
+def _addrinfo(ip, port):
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (ip, port))]
+
+
+@patch('golem.network.p2p.seedresolver.socket.getaddrinfo')
+class TestSeedResolver(TestCase):
+
+    def setUp(self):
+        self.resolver = SeedResolver(ttl=60, failure_ttl=10)
+
+    def tearDown(self):
+        self.resolver.shutdown()
+
+    def test_resolve(self, getaddrinfo):
+        getaddrinfo.return_value = _addrinfo('10.0.0.1', 40102)
+        future = self.resolver.resolve('seed.example.com', 40102)
+        assert future.result(timeout=5) == {('10.0.0.1', 40102)}
+        getaddrinfo.assert_called_once_with('seed.example.com', 40102)
+
+    def test_cached(self, getaddrinfo):
+        getaddrinfo.return_value = _addrinfo('10.0.0.1', 40102)
+        self.resolver.resolve('seed.example.com', 40102).result(timeout=5)
+
+        future = self.resolver.resolve('seed.example.com', 40102)
+        assert future.done()
+        assert future.result() == {('10.0.0.1', 40102)}
+        assert getaddrinfo.call_count == 1
+
+    @patch('golem.network.p2p.seedresolver.time.monotonic')
+    def test_expired(self, monotonic, getaddrinfo):
+        monotonic.return_value = 100.
+        getaddrinfo.return_value = _addrinfo('10.0.0.1', 40102)
+        self.resolver.resolve('seed.example.com', 40102).result(timeout=5)
+
+        monotonic.return_value = 161.
+        self.resolver.resolve('seed.example.com', 40102).result(timeout=5)
+        assert getaddrinfo.call_count == 2
+
+    @patch('golem.network.p2p.seedresolver.time.monotonic')
+    def test_failure_cached_shorter(self, monotonic, getaddrinfo):
+        monotonic.return_value = 100.
+        getaddrinfo.side_effect = socket.gaierror('no such host')
+        future = self.resolver.resolve('nosuchaddress', 40102)
+        assert future.result(timeout=5) == set()
+
+        monotonic.return_value = 105.
+        assert self.resolver.resolve('nosuchaddress', 40102).done()
+        monotonic.return_value = 111.
+        self.resolver.resolve('nosuchaddress', 40102).result(timeout=5)
+        assert getaddrinfo.call_count == 2
+
+    def test_ip_address(self, getaddrinfo):
+        getaddrinfo.return_value = _addrinfo('1.2.3.4', 40102)
+        future = self.resolver.resolve('1.2.3.4', 40102)
+        assert future.done()
+        assert future.result() == {('1.2.3.4', 40102)}
+
+    def test_shared_lookup(self, getaddrinfo):
+        release = threading.Event()
+
+        def slow_lookup(*_):
+            release.wait(5)
+            return _addrinfo('10.0.0.1', 40102)
+
+        getaddrinfo.side_effect = slow_lookup
+        first = self.resolver.resolve('seed.example.com', 40102)
+        second = self.resolver.resolve('seed.example.com', 40102)
+        assert first is second
+        assert not first.done()
+
+        release.set()
+        assert second.result(timeout=5) == {('10.0.0.1', 40102)}
+        assert getaddrinfo.call_count == 1
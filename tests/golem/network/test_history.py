@@ -69,13 +69,13 @@ class TestMessageHistoryService(DatabaseFixture):
         save.side_effect = DataError
 
         self.service.add_sync(msg_dict)
-        assert not self.service._save_queue.put.called
+        assert not self.service._save_queue.put_nowait.called
         assert message_count() == 0
 
         save.side_effect = PeeweeException
 
         self.service.add_sync(msg_dict)
-        assert self.service._save_queue.put.called
+        assert self.service._save_queue.put_nowait.called
         assert message_count() == 0
 
     def test_add_sync_success(self):
@@ -210,36 +210,37 @@ class TestMessageHistoryService(DatabaseFixture):
         self.service._loop()
         assert not self.service._sweep.called
 
-    def test_loop_add_sync(self):
+    def test_loop_save_batch(self):
         self.service._sweep = mock.Mock()
         self.service._queue_timeout = 0.1
-        self.service.add_sync = mock.Mock()
+        self.service._save_batch = mock.Mock()
 
         # No message
         self.service._loop()
-        assert not self.service.add_sync.called
+        assert not self.service._save_batch.called
 
-        # Add message
-        msg = self._build_dict()
-        self.service._save_queue.put(msg)
+        # Add messages
+        msgs = [self._build_dict(), self._build_dict()]
+        for msg in msgs:
+            self.service._save_queue.put(msg)
 
-        # With message
+        # With messages
         self.service._loop()
-        assert self.service.add_sync.called
+        self.service._save_batch.assert_called_once_with(msgs)
 
-        # No message again, since it was popped from the queue
-        self.service.add_sync.reset_mock()
+        # No message again, since they were popped from the queue
+        self.service._save_batch.reset_mock()
         self.service._loop()
-        assert not self.service.add_sync.called
+        assert not self.service._save_batch.called
 
-    def test_loop_remove_sync(self):
+    def test_loop_remove_batch(self):
         self.service._sweep = mock.Mock()
         self.service._queue_timeout = 0.1
-        self.service.remove_sync = mock.Mock()
+        self.service._remove_batch = mock.Mock()
 
         # No tuple
         self.service._loop()
-        assert not self.service.remove_sync.called
+        assert not self.service._remove_batch.called
 
         # Add tuple
         task = str(uuid.uuid4())
@@ -248,12 +249,94 @@ class TestMessageHistoryService(DatabaseFixture):
 
         # With tuple
         self.service._loop()
-        assert self.service.remove_sync.called
+        self.service._remove_batch.assert_called_once_with([(task, props)])
 
         # Not tuple again, since it was popped from the queue
-        self.service.remove_sync.reset_mock()
+        self.service._remove_batch.reset_mock()
         self.service._loop()
-        assert not self.service.remove_sync.called
+        assert not self.service._remove_batch.called
+
+    @mock.patch('golem.network.history.MessageHistoryService.BATCH_SIZE', 150)
+    def test_save_batch(self):
+        self.service._queue_timeout = 0.1
+        self.service._sweep_ts = datetime.datetime.max
+        for _ in range(200):
+            self.service.add(self._build_dict())
+
+        self.service._loop()
+        assert message_count() == 150
+        self.service._loop()
+        assert message_count() == 200
+        assert self.service.get_stats()['saved'] == 200
+
+    def test_save_batch_invalid_message(self):
+        msgs = [self._build_dict(), self._build_dict(), self._build_dict()]
+        msgs[1]['msg_cls'] = None
+
+        self.service._save_batch(msgs)
+        assert message_count() == 2
+
+    def test_save_batch_serializes(self):
+        msg = msg_factories.tasks.TaskToComputeFactory()
+        msg_dict = history.message_to_model(
+            msg=msg,
+            node_id='node',
+            local_role=Actor.Provider,
+            remote_role=Actor.Requestor,
+            serialize=False,
+        )
+        assert msg_dict['msg_data'] is msg
+
+        self.service._save_batch([msg_dict])
+        saved = NetworkMessage.get(NetworkMessage.task == msg.task_id)
+        assert saved.as_message().subtask_id == msg.subtask_id
+
+    def test_remove_batch(self):
+        msgs = [
+            self._build_dict("task1", None),
+            self._build_dict("task1", None),
+            self._build_dict("task2", None),
+            self._build_dict("task3", None),
+        ]
+        self.service._save_batch(msgs)
+        assert message_count() == 4
+
+        self.service._remove_batch([
+            ("task1", dict(subtask=msgs[0]['subtask'])),
+            ("task2", dict()),
+        ])
+        assert message_count() == 2
+        assert self.service.get_stats()['removed'] == 2
+
+    @mock.patch('golem.network.history.MessageHistoryService.MAX_QUEUE_SIZE',
+                1)
+    def test_queue_full(self):
+        service = history.MessageHistoryService()
+        service.add(self._build_dict())
+        assert message_count() == 0
+
+        service.add(self._build_dict())
+        assert message_count() == 1
+        assert service.get_stats()['overflowed'] == 1
+        assert service.get_stats()['save_queue'] == 1
+
+    @mock.patch('golem.network.history.MessageHistoryService.MAX_QUEUE_SIZE',
+                1)
+    def test_add_sync_fail_queue_full(self):
+        service = history.MessageHistoryService()
+        service._queue_timeout = 0.1
+        service._sweep_ts = datetime.datetime.max
+        service.add(self._build_dict())
+
+        with mock.patch('golem.model.NetworkMessage.save',
+                        side_effect=PeeweeException):
+            # does not block on the full queue
+            service.add_sync(self._build_dict())
+        assert service.get_stats()['save_retries'] == 1
+
+        service._loop()
+        assert message_count() == 2
+        assert service.get_stats()['save_retries'] == 0
 
 
 @mock.patch("golem.network.history.MessageHistoryService.add")
@@ -315,6 +398,7 @@ class TestAdd(unittest.TestCase):
             node_id=node_id,
             local_role=local_role,
             remote_role=remote_role,
+            serialize=False,
         )
         add_mock.assert_called_once_with(model)
 
@@ -1,4 +1,4 @@
-from unittest import mock
+from unittest import mock, TestCase
 
 import os
 import shutil
@@ -229,6 +229,81 @@ class TestResourceServer(testwithreactor.TestDirFixtureWithReactor):
     def testDownloadError(self):
         rs, file_names = self.testAddFilesToGet()
         resources = list(rs.pending_resources[self.task_id])
+        for _ in range(rs.MAX_DOWNLOAD_RETRIES - 1):
+            for entry in resources:
+                rs._download_error(Exception(), entry.resource, self.task_id)
+        assert len(rs.pending_resources[self.task_id]) == len(resources)
+        assert not self.client.failed
+
         for entry in resources:
             rs._download_error(Exception(), entry.resource, self.task_id)
         assert not rs.pending_resources
+        assert self.client.failed
+
+
+def _peer_options(address):
+    return mock.Mock(peers=[{'TCP': (address, 3282)}])
+
+
+class TestDownloadScheduler(TestCase):
+
+    def setUp(self):
+        self.resource_manager = mock.Mock()
+        self.client = MockClient()
+        self.server = BaseResourceServer(self.resource_manager, mock.Mock(),
+                                         self.client)
+        patcher = mock.patch('golem.core.golem_async.async_run')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _pulled(self):
+        return [c[0][0] for c in
+                self.resource_manager.pull_resource.call_args_list]
+
+    def test_deadline_order(self):
+        self.server.MAX_DOWNLOADS = 1
+        for deadline in (30, 10, None, 20):
+            self.server.download_resources([('res', deadline)], 'task',
+                                           deadline=deadline)
+
+        self.server._download_resources()
+        assert self._pulled() == [('res', 10)]
+        for expected in (20, 30, None):
+            self.server._download_success(self._pulled()[-1], [], 'task')
+            assert self._pulled()[-1] == ('res', expected)
+
+    def test_global_limit(self):
+        resources = [('res', i) for i in range(10)]
+        self.server.download_resources(resources, 'task')
+        self.server._download_resources()
+        assert len(self._pulled()) == self.server.MAX_DOWNLOADS
+
+    def test_peer_limit(self):
+        self.server.download_resources(
+            [('res', i) for i in range(5)], 'task1',
+            client_options=_peer_options('1.2.3.4'))
+        self.server.download_resources(
+            [('res', i) for i in range(5)], 'task2',
+            client_options=_peer_options('5.6.7.8'))
+        self.server._download_resources()
+
+        tasks = [c[0][1] for c in
+                 self.resource_manager.pull_resource.call_args_list]
+        assert tasks.count('task1') == self.server.MAX_DOWNLOADS_PER_PEER
+        assert tasks.count('task2') == self.server.MAX_DOWNLOADS_PER_PEER
+
+    def test_retry_with_backoff(self):
+        self.server.download_resources([('res', 1)], 'task')
+        self.server._download_resources()
+        self.server._download_error(Exception(), ('res', 1), 'task')
+
+        # waits for the backoff delay
+        entry = self.server.pending_resources['task'][0]
+        assert entry.retry_at > time.time()
+        self.server._download_resources()
+        assert len(self._pulled()) == 1
+
+        entry.retry_at = 0
+        self.server._download_resources()
+        assert len(self._pulled()) == 2
+        assert not self.client.failed
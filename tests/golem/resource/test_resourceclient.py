@@ -1,10 +1,11 @@
 # pylint: disable=protected-access
 import time
-from unittest import TestCase
+from unittest import TestCase, mock
 from unittest.mock import Mock
 
 import requests
 from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock
 from twisted.python.failure import Failure
 
 from golem.core import golem_async
@@ -28,7 +29,7 @@ class TestClientHandler(TestCase):
             self.counter += 1
 
     def setUp(self):
-        config = ClientConfig(max_retries=3)
+        config = ClientConfig(max_retries=3, retry_delay=0)
         self.handler = ClientHandler(config)
         self.state = self.State()
 
@@ -75,6 +76,30 @@ class TestClientHandler(TestCase):
         # Exception was raised on first retry
         assert self.state.counter == 1
 
+    @mock.patch('random.uniform', side_effect=lambda _, b: b)
+    @mock.patch('time.sleep')
+    def test_retry_backoff(self, sleep, _):
+        self.handler.config = ClientConfig(max_retries=5, retry_delay=1.,
+                                           max_retry_delay=3.)
+
+        def func():
+            raise requests.exceptions.Timeout()
+
+        self.handler._retry(func)
+        assert [c[0][0] for c in sleep.call_args_list] == [1., 2., 3., 3.]
+
+    @mock.patch('time.sleep')
+    def test_retry_deadline(self, sleep):
+        self.handler.config = ClientConfig(max_retries=5, retry_delay=1.)
+
+        def func():
+            self.state.increment()
+            raise requests.exceptions.Timeout()
+
+        self.handler._retry(func, deadline=time.time() - 1)
+        assert self.state.counter == 1
+        assert not sleep.called
+
     def test_retry_async(self):
 
         def func():
@@ -150,6 +175,46 @@ class TestClientHandler(TestCase):
 
         self._run_and_verify_state(func, success, error)
 
+    @mock.patch('random.uniform', side_effect=lambda _, b: b)
+    def test_retry_async_backoff(self, _):
+        self.handler.config = ClientConfig(max_retries=3, retry_delay=1.)
+        clock = Clock()
+        self.handler._call_later = clock.callLater
+
+        def func():
+            self.state.increment()
+            deferred = Deferred()
+            deferred.errback(requests.exceptions.Timeout())
+            return deferred
+
+        errors = []
+        self.handler._retry_async(func).addErrback(errors.append)
+        assert self.state.counter == 1
+        clock.advance(0.9)
+        assert self.state.counter == 1
+        clock.advance(0.1)
+        assert self.state.counter == 2
+        clock.advance(2.)
+        assert self.state.counter == 3
+        assert len(errors) == 1
+
+    def test_retry_async_deadline(self):
+        self.handler.config = ClientConfig(max_retries=3, retry_delay=1.,
+                                           retry_timeout=-1)
+        self.handler._call_later = mock.Mock()
+
+        def func():
+            self.state.increment()
+            deferred = Deferred()
+            deferred.errback(requests.exceptions.Timeout())
+            return deferred
+
+        errors = []
+        self.handler._retry_async(func).addErrback(errors.append)
+        assert self.state.counter == 1
+        assert len(errors) == 1
+        assert not self.handler._call_later.called
+
     def _run_and_verify_state(self, func, success, error):
         self.handler._retry_async(func) \
             .addCallbacks(success, error)
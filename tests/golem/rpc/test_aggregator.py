@@ -0,0 +1,104 @@
+import subprocess
+import sys
+import unittest
+from unittest.mock import Mock, call
+
+from twisted.internet.task import Clock
+
+from golem.rpc.aggregator import TaskEventAggregator
+from golem.rpc.mapping.rpceventnames import Task
+
+
+class TestTaskEventAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.publish = Mock()
+        self.aggregator = TaskEventAggregator(
+            self.publish,
+            window=0.5,
+            clock=self.clock,
+        )
+
+    def test_merge_updates(self):
+        self.aggregator.task_updated('t1', 'TaskOp', 1)
+        self.aggregator.task_updated('t1', 'TaskOp', 2)
+        self.aggregator.subtask_updated('t1', 's1', 1)
+        self.aggregator.subtask_updated('t1', 's1', 3)
+        self.publish.assert_not_called()
+        self.aggregator.flush()
+
+        assert self.publish.call_args_list == [
+            call(Task.evt_task_status, 't1', 'TaskOp', 2),
+            call(Task.evt_subtask_status, 't1', 's1', 3),
+            call(Task.evt_tasks_status_batch,
+                 {'t1': {'op_class': 'TaskOp', 'op_value': 2}}),
+            call(Task.evt_subtasks_status_batch, {'t1': {'s1': 3}}),
+        ]
+        assert self.aggregator.get_stats() == {
+            'received': 4,
+            'published': 4,
+        }
+
+    def test_completed_not_merged(self):
+        self.aggregator.task_updated('t1', 'TaskOp', 1)
+        self.aggregator.task_updated('t1', 'TaskOp', 2, completed=True)
+        self.aggregator.task_updated('t1', 'TaskOp', 3)
+        self.aggregator.task_updated('t1', 'TaskOp', 4)
+        self.aggregator.subtask_updated('t1', 's1', 1)
+        self.aggregator.subtask_updated('t1', 's1', 4, completed=True)
+        self.aggregator.subtask_updated('t1', 's1', 5, completed=True)
+        self.aggregator.flush()
+
+        assert self.publish.call_args_list[:4] == [
+            call(Task.evt_task_status, 't1', 'TaskOp', 2),
+            call(Task.evt_task_status, 't1', 'TaskOp', 4),
+            call(Task.evt_subtask_status, 't1', 's1', 4),
+            call(Task.evt_subtask_status, 't1', 's1', 5),
+        ]
+
+    def test_bounded(self):
+        for i in range(100):
+            self.aggregator.subtask_updated('t1', 's{}'.format(i % 10), i)
+            self.aggregator.task_updated('t2', 'TaskOp', i)
+        self.aggregator.flush()
+
+        events = [c[0][0] for c in self.publish.call_args_list]
+        assert events.count(Task.evt_tasks_status_batch) == 1
+        assert events.count(Task.evt_subtasks_status_batch) == 1
+        assert events.count(Task.evt_task_status) == 1
+        assert events.count(Task.evt_subtask_status) == 10
+
+        batch = self.publish.call_args_list[-1][0][1]
+        assert batch['t1'] == {'s{}'.format(i): 90 + i for i in range(10)}
+
+    def test_flush_empty(self):
+        self.aggregator.flush()
+        self.publish.assert_not_called()
+
+    def test_window(self):
+        self.aggregator.start()
+        self.aggregator.task_updated('t1', 'TaskOp', 1)
+        self.publish.assert_not_called()
+
+        self.clock.advance(0.5)
+        assert self.publish.call_count == 2
+
+        self.clock.advance(0.5)
+        assert self.publish.call_count == 2
+
+    def test_stop_flushes(self):
+        self.aggregator.start()
+        assert self.aggregator.running
+        self.aggregator.subtask_updated('t1', 's1', 1)
+        self.aggregator.stop()
+        assert not self.aggregator.running
+        assert self.publish.call_count == 2
+
+    def test_reactor_not_imported(self):
+        # golemapp installs a platform specific reactor after the imports
+        subprocess.check_call([
+            sys.executable, '-c',
+            'import sys, golem.rpc.aggregator; '
+            'assert "twisted.internet.reactor" not in sys.modules',
+        ])
@@ -0,0 +1,41 @@
+import os
+import pytest
+
+from golem.task.taskrequestorstats import RequestorTaskStats
+from golem.task.taskstate import SubtaskOp, SubtaskState, SubtaskStatus, \
+    TaskOp, TaskState, TaskStatus
+
+
+def skip_benchmarks():
+    if os.environ.get('benchmarks', False):
+        return False
+    return True
+
+
+def create_stats(subtasks: int):
+    stats = RequestorTaskStats()
+    state = TaskState()
+    state.status = TaskStatus.computing
+    stats.on_message('task', state, op=TaskOp.CREATED)
+
+    for i in range(subtasks):
+        subtask_id = 'subtask-{}'.format(i)
+        state.subtask_states[subtask_id] = SubtaskState()
+        state.subtask_states[subtask_id].subtask_status = \
+            SubtaskStatus.starting
+        stats.on_message('task', state, subtask_id, SubtaskOp.ASSIGNED)
+    return stats, state
+
+
+def subtask_event(stats, state):
+    stats.on_message('task', state, 'subtask-0', SubtaskOp.RESULT_DOWNLOADING)
+
+
+@pytest.mark.skipif(skip_benchmarks(), reason="skip benchmarks by default")
+@pytest.mark.parametrize("subtasks", [10, 100, 1000, 10000])
+@pytest.mark.benchmark(min_rounds=100, warmup=True)
+def test_subtask_event_speed(benchmark, subtasks: int):
+    """ The time of processing an event should not depend on the number
+    of subtasks """
+    stats, state = create_stats(subtasks)
+    benchmark(subtask_event, stats, state)
@@ -0,0 +1,137 @@
+import os
+import zipfile
+from unittest import mock
+
+from golem.task.result import compression
+from golem.task.result.compression import CompressingZipFile, \
+    Compression, CompressionPolicy, STORED
+from golem.task.result.resultpackage import ZipPackager
+from golem.testutils import TempDirFixture
+
+
+class TestCompressionPolicy(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.policy = CompressionPolicy()
+
+        self.text_file = os.path.join(self.path, 'scene.obj')
+        with open(self.text_file, 'w') as f:
+            for i in range(20000):
+                f.write('v {0}.0 {0}.5 1.0\n'.format(i % 100))
+
+        self.random_file = os.path.join(self.path, 'noise.bin')
+        with open(self.random_file, 'wb') as f:
+            f.write(os.urandom(512 * 1024))
+
+    def test_compressible(self):
+        assert self.policy.choose(self.text_file) != STORED
+
+    def test_incompressible(self):
+        assert self.policy.choose(self.random_file) == STORED
+
+    def test_compressed_extension(self):
+        png_file = os.path.join(self.path, 'result.png')
+        os.rename(self.text_file, png_file)
+        assert self.policy.choose(png_file) == STORED
+
+    def test_small_file(self):
+        small_file = os.path.join(self.path, 'small.txt')
+        with open(small_file, 'w') as f:
+            f.write('a' * (CompressionPolicy.MIN_SIZE - 1))
+        assert self.policy.choose(small_file) == STORED
+
+    def test_fast_link(self):
+        # compressing is slower than sending the file as it is
+        policy = CompressionPolicy(bandwidth=float('inf'))
+        assert policy.choose(self.text_file) == STORED
+
+    def test_choose_all(self):
+        result = self.policy.choose_all([self.text_file, self.random_file])
+        assert result[self.text_file] != STORED
+        assert result[self.random_file] == STORED
+
+
+class TestCompressingZipPackager(TestCompressionPolicy):
+
+    def test_package(self):
+        sub_dir = os.path.join(self.path, 'dir')
+        os.makedirs(sub_dir)
+        nested_file = os.path.join(sub_dir, 'log.txt')
+        with open(nested_file, 'w') as f:
+            f.write('rendering tile\n' * 10000)
+
+        out_path = os.path.join(self.tempdir, 'package.zip')
+        ZipPackager().create(out_path, [self.text_file, self.random_file,
+                                        sub_dir])
+
+        with zipfile.ZipFile(out_path) as zf:
+            methods = {os.path.basename(info.filename): info.compress_type
+                       for info in zf.infolist()}
+        assert methods['scene.obj'] != zipfile.ZIP_STORED
+        assert methods['log.txt'] != zipfile.ZIP_STORED
+        assert methods['noise.bin'] == zipfile.ZIP_STORED
+
+        out_dir = os.path.join(self.tempdir, 'extracted')
+        ZipPackager().extract(out_path, out_dir)
+        for path in (self.text_file, self.random_file):
+            with open(path, 'rb') as src, \
+                    open(os.path.join(out_dir, os.path.basename(path)),
+                         'rb') as dst:
+                assert src.read() == dst.read()
+        assert os.path.exists(os.path.join(out_dir, 'dir', 'log.txt'))
+
+
+class TestCompressingZipFile(TempDirFixture):
+
+    METHODS = (zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA)
+
+    def setUp(self):
+        super().setUp()
+        self.files = []
+        for i, method in enumerate(self.METHODS):
+            path = os.path.join(self.path, 'file{}.txt'.format(i))
+            with open(path, 'w') as f:
+                f.write('line {}\n'.format(i) * 20000)
+            self.files.append(path)
+
+        self.policy = CompressionPolicy(max_workers=2)
+        self.policy.choose_all = lambda paths: {
+            path: Compression(method)
+            for path, method in zip(paths, self.METHODS)
+        }
+        self.out_path = os.path.join(self.tempdir, 'package.zip')
+
+    def _check_package(self):
+        with zipfile.ZipFile(self.out_path) as zf:
+            assert zf.testzip() is None
+            assert [info.compress_type for info in zf.infolist()] == \
+                list(self.METHODS)
+            for path in self.files:
+                with open(path, 'rb') as f:
+                    assert zf.read(os.path.basename(path)) == f.read()
+
+    def test_compressed_in_parallel(self):
+        with mock.patch.object(compression, '_compress_file',
+                               wraps=compression._compress_file) as compress, \
+                CompressingZipFile(self.out_path, mode='w',
+                                   policy=self.policy) as zf:
+            zf.plan(self.files)
+            for path in self.files:
+                zf.write(path, os.path.basename(path))
+
+        assert compress.call_count == len(self.files)
+        self._check_package()
+
+    def test_out_of_order(self):
+        # the last file is not compressed ahead with a single worker
+        self.policy.max_workers = 1
+        with CompressingZipFile(self.out_path, mode='w',
+                                policy=self.policy) as zf:
+            zf.plan(self.files)
+            for path in reversed(self.files):
+                zf.write(path, os.path.basename(path))
+
+        with zipfile.ZipFile(self.out_path) as zf:
+            assert zf.testzip() is None
+            assert len(zf.infolist()) == len(self.files)
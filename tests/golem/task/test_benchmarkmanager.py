@@ -1,10 +1,14 @@
 import types
+from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import pytest
+
 from apps.appsmanager import AppsManager
 from golem.environments.environment import Environment as DefaultEnvironment
-from golem.model import Performance
-from golem.task.benchmarkmanager import BenchmarkManager
+from golem.model import HardwarePerformance, Performance
+from golem.task.benchmarkmanager import BenchmarkManager, Hardware, \
+    scaled_performance
 from golem.testutils import DatabaseFixture, PEP8MixIn
 
 
@@ -25,6 +29,30 @@ class MockThread:
         return self._target
 
 
+class TestScaledPerformance(TestCase):
+
+    def test_no_results(self):
+        assert scaled_performance([], 4) is None
+        assert scaled_performance([(2, 0.)], 4) is None
+
+    def test_single_core_count_scales_linearly(self):
+        assert scaled_performance([(2, 100.)], 4) == pytest.approx(200.)
+        assert scaled_performance([(2, 100.), (2, 300.)], 1) == \
+            pytest.approx(3 ** .5 * 50.)
+
+    def test_fitted_exponent(self):
+        results = [(1, 100.), (4, 200.)]
+        assert scaled_performance(results, 2) == pytest.approx(2 ** .5 * 100.)
+        assert scaled_performance(results, 16) == pytest.approx(400.)
+
+    def test_exponent_limits(self):
+        assert scaled_performance([(1, 100.), (2, 500.)], 4) == \
+            pytest.approx(50000 ** .5 * 4 / 2 ** .5)
+        assert scaled_performance([(1, 100.), (2, 50.)], 4) == \
+            pytest.approx(50 ** .5 * 10.)
+
+
+@patch('golem.hardware.cpu_model', Mock(return_value='CPU'))
 class TestBenchmarkManager(DatabaseFixture, PEP8MixIn):
     PEP8_FILES = ['golem/task/benchmarkmanager.py']
 
@@ -33,9 +61,17 @@ class TestBenchmarkManager(DatabaseFixture, PEP8MixIn):
         am = AppsManager()
         am.load_all_apps()
         am._benchmark_enabled = Mock(return_value=True)
-        self.b = BenchmarkManager("NODE1", Mock(), self.path,
+        task_server = Mock()
+        task_server.client.config_desc.num_cores = 2
+        task_server.client.config_desc.max_memory_size = 2 * 1024 ** 2
+        self.b = BenchmarkManager("NODE1", task_server, self.path,
                                   am.get_benchmarks())
 
+    def _save_results(self, hardware, value):
+        for env_id in self.b.benchmarks:
+            HardwarePerformance.update_or_create(env_id, hardware, value)
+        Performance.update_or_create(DefaultEnvironment.get_id(), 3)
+
     def test_benchmarks_not_needed_wo_apps(self):
         assert not BenchmarkManager(None, None, None).benchmarks_needed()
 
@@ -54,6 +90,23 @@ class TestBenchmarkManager(DatabaseFixture, PEP8MixIn):
         # then
         assert not self.b.benchmarks_needed()
 
+    def test_benchmarks_needed_when_hardware_changed(self):
+        # restore the original (benchmarks are disabled in conftest.py)
+        self.b.benchmarks_needed = types.MethodType(benchmarks_needed, self.b)
+        for env_id in self.b.benchmarks:
+            Performance.update_or_create(env_id, 100)
+        self._save_results(self.b.hardware()._replace(cpu_cores=1), 100)
+        assert self.b.benchmarks_needed()
+
+        self._save_results(self.b.hardware(), 100)
+        assert not self.b.benchmarks_needed()
+
+    def test_hardware(self):
+        assert self.b.hardware() == Hardware(
+            cpu_model='CPU', cpu_cores=2, memory=2 * 1024 ** 2, vm='')
+        assert self.b.hardware().fingerprint != \
+            self.b.hardware()._replace(memory=1024 ** 2).fingerprint
+
     @patch("golem.task.benchmarkmanager.Thread", MockThread)
     @patch("golem.environments.environment.make_perf_test")
     @patch("golem.task.benchmarkmanager.BenchmarkRunner")
@@ -104,3 +157,64 @@ class TestBenchmarkManager(DatabaseFixture, PEP8MixIn):
         for idx, env_id in enumerate(reversed(list(self.b.benchmarks))):
             assert (1 + idx) * 100 == \
                    Performance.get(Performance.environment_id == env_id).value
+
+    @patch("golem.task.benchmarkmanager.BenchmarkRunner")
+    def test_run_all_benchmarks_reuses_stored_results(self, br_mock):
+        # given
+        self._save_results(self.b.hardware()._replace(cpu_cores=1), 100)
+        self._save_results(self.b.hardware(), 250)
+        success = Mock()
+
+        # when
+        self.b.run_all_benchmarks(success)
+
+        # then
+        br_mock.assert_not_called()
+        success.assert_called_once_with(None)
+        for env_id in self.b.benchmarks:
+            assert Performance.get(
+                Performance.environment_id == env_id).value == 250
+
+    @patch("golem.task.benchmarkmanager.BenchmarkRunner")
+    def test_run_all_benchmarks_estimates_unseen_hardware(self, br_mock):
+        # given
+        self._save_results(self.b.hardware()._replace(cpu_cores=1), 100)
+        success = Mock()
+
+        # when
+        self.b.run_all_benchmarks(success)
+
+        # then the estimates are used while the benchmarks run
+        success.assert_called_once_with(None)
+        for env_id in self.b.benchmarks:
+            assert Performance.get(
+                Performance.environment_id == env_id).value == \
+                pytest.approx(200)
+        assert br_mock.call_count == 1
+
+        # when the first benchmark finishes
+        br_mock.call_args[1]['success_callback'](180)
+
+        # then the next one starts
+        env_id = list(self.b.benchmarks)[-1]
+        assert Performance.get(
+            Performance.environment_id == env_id).value == 180
+        assert HardwarePerformance.get(
+            HardwarePerformance.environment_id == env_id,
+            HardwarePerformance.fingerprint == self.b.hardware().fingerprint,
+        ).value == 180
+        assert br_mock.call_count == min(2, len(self.b.benchmarks))
+        success.assert_called_once_with(None)
+
+    @patch("golem.task.benchmarkmanager.BenchmarkRunner")
+    def test_run_all_benchmarks_other_cpu(self, br_mock):
+        # given
+        self._save_results(self.b.hardware()._replace(cpu_model='Other'), 100)
+        success = Mock()
+
+        # when
+        self.b.run_all_benchmarks(success)
+
+        # then
+        success.assert_not_called()
+        assert br_mock.call_count == 1
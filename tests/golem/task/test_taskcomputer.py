@@ -330,6 +330,43 @@ class TestTaskComputer(DatabaseFixture, LogTestCase):
         tc.assigned_subtask['task_id'] = "task_id"
         assert tc.get_environment() == "env"
 
+    @mock.patch('golem.task.taskcomputer.dispatcher.send')
+    def test_subtask_progress(self, send):
+        tc = TaskComputer(self.task_server, use_docker_manager=False)
+        assert tc.get_progress() is None
+
+        tc.assigned_subtask = ComputeTaskDef()
+        tc.assigned_subtask['task_id'] = "task_id"
+        tc.assigned_subtask['subtask_id'] = "subtask_id"
+        tc.counting_thread = mock.Mock(
+            start_time=time.time(),
+            task_timeout=100,
+            extra_data={
+                'outfilebasename': "Test Task_1",
+                'output_format': "PNG",
+                'scene_file': "/golem/resources/cube.blend",
+                'frames': [1],
+                'start_task': 1,
+                'total_tasks': 1,
+            })
+        tc.counting_thread.get_progress.return_value = 0.25
+
+        tc.run()
+        send.assert_called_once_with(signal='golem.taskcomputer',
+                                     event='subtask_progress',
+                                     subtask_id="subtask_id",
+                                     progress=0.25)
+
+        progress = tc.get_progress()
+        assert progress.subtask_id == "subtask_id"
+        assert progress.progress == 0.25
+        assert progress.seconds_to_timeout == 100
+        assert progress.seconds_since_progress >= 0
+        # the getter does not report progress on its own
+        tc.counting_thread.get_progress.return_value = 0.5
+        tc.get_progress()
+        assert send.call_count == 1
+
 
 @ci_skip
 class TestTaskThread(DatabaseFixture):
@@ -3,6 +3,7 @@ from datetime import timedelta
 from pathlib import Path
 import random
 import time
+import unittest
 import unittest.mock as mock
 
 from eth_utils import encode_hex
@@ -22,6 +23,7 @@ from golem.environments.environmentsmanager import EnvironmentsManager
 from golem.network.hyperdrive.client import HyperdriveClient
 from golem.task import taskkeeper
 from golem.task.taskkeeper import TaskHeaderKeeper, CompTaskKeeper, logger
+from golem.task.taskkeeper import VerifiedHeadersCache
 from golem.testutils import PEP8MixIn
 from golem.testutils import TempDirFixture
 from golem.tools.assertlogs import LogTestCase
@@ -422,6 +424,49 @@ def get_task_header(key_id_seed="kkk"):
     return dt_tasks.TaskHeader(**th_dict_repr)
 
 
+class TestVerifiedHeadersCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = VerifiedHeadersCache(max_size=2)
+
+    @staticmethod
+    def _header(key_id_seed="kkk"):
+        header = get_task_header(key_id_seed)
+        header.signature = b'signature'
+        return header
+
+    def test_verified(self):
+        header = self._header()
+        assert header not in self.cache
+        self.cache.add(header)
+        assert header in self.cache
+        assert self.cache.hits == 1
+        assert self.cache.misses == 1
+
+    def test_content_changed(self):
+        header = self._header()
+        self.cache.add(header)
+        header.max_price += 1
+        assert header not in self.cache
+
+    def test_signature_changed(self):
+        header = self._header()
+        self.cache.add(header)
+        header.signature = b'other signature'
+        assert header not in self.cache
+
+    def test_max_size(self):
+        headers = [self._header(seed) for seed in ('a', 'b', 'c')]
+        self.cache.add(headers[0])
+        self.cache.add(headers[1])
+        assert headers[0] in self.cache  # most recently used now
+        self.cache.add(headers[2])
+
+        assert len(self.cache) == 2
+        assert headers[0] in self.cache
+        assert headers[1] not in self.cache
+        assert headers[2] in self.cache
+
+
 @mock.patch('golem.task.taskkeeper.ProviderStatsManager', mock.Mock())
 class TestCompTaskKeeper(LogTestCase, PEP8MixIn, TempDirFixture):
     PEP8_FILES = [
@@ -21,6 +21,7 @@ from twisted.internet.defer import fail
 from apps.appsmanager import AppsManager
 from apps.core.task.coretask import CoreTask
 from apps.core.task.coretaskstate import TaskDefinition
+from apps.core.task.stragglers import StragglerPolicy
 from apps.blender.task.blenderrendertask import BlenderRenderTask
 from golem import model
 from golem import testutils
@@ -1538,3 +1539,94 @@ class TestNeedsComputation(unittest.TestCase):
 
     def test_needs_computation(self, *_):
         self.assertTrue(self.tm.task_needs_computation(self.task_id))
+
+
+@patch('golem.core.statskeeper.StatsKeeper._get_or_create')
+class TestDuplicateStragglers(unittest.TestCase):
+    def setUp(self):
+        with patch('golem.core.statskeeper.StatsKeeper._get_or_create'):
+            self.tm = TaskManager(
+                node=dt_p2p_factory.Node(),
+                keys_auth=MagicMock(spec=KeysAuth),
+                root_path='/tmp',
+                config_desc=ClientConfigDescriptor(),
+                task_persistence=False
+            )
+        self.task_id = str(uuid.uuid4())
+        self.tm.tasks_states[self.task_id] = TaskState()
+        self.tm.tasks_states[self.task_id].status = TaskStatus.computing
+        self.task = MagicMock(spec=CoreTask)
+        self.task.header = Mock(task_id=self.task_id)
+        self.task.straggler_policy = StragglerPolicy(total_parts=10)
+        self.tm.tasks[self.task_id] = self.task
+
+        subtask_states = self.tm.tasks_states[self.task_id].subtask_states
+        for subtask_id, time_started in (('old', 10.), ('new', 20.)):
+            subtask_states[subtask_id] = SubtaskState()
+            subtask_states[subtask_id].time_started = time_started
+
+    def test_no_policy(self, *_):
+        self.task.straggler_policy = None
+        assert self.tm._select_straggler(self.task_id, 'ABC') is None
+        self.task.get_straggler_candidates.assert_not_called()
+
+    def test_select_straggler(self, *_):
+        self.task.get_straggler_candidates.return_value = {'old': 1,
+                                                           'new': 1}
+        self.task.get_parts_left.return_value = 1
+        assert self.tm._select_straggler(self.task_id, 'ABC') == 'old'
+        self.task.get_straggler_candidates.assert_called_once_with('ABC')
+
+    def test_select_straggler_not_in_tail(self, *_):
+        self.task.get_straggler_candidates.return_value = {'old': 1}
+        self.task.get_parts_left.return_value = 5
+        assert self.tm._select_straggler(self.task_id, 'ABC') is None
+
+    def test_get_tasks_headers(self, *_):
+        self.task.needs_computation.return_value = False
+        self.task.get_straggler_candidates.return_value = {}
+        assert self.tm.get_tasks_headers() == []
+
+        self.task.get_straggler_candidates.return_value = {'old': 1}
+        self.task.get_parts_left.return_value = 1
+        assert self.tm.get_tasks_headers() == [self.task.header]
+
+    def test_get_next_subtask_duplicate(self, *_):
+        self.task.needs_computation.return_value = False
+        self.task.get_straggler_candidates.return_value = {'new': 1}
+        self.task.get_parts_left.return_value = 1
+        self.task.header.max_price = 10
+        self.task.should_accept_client.return_value = \
+            AcceptClientVerdict.ACCEPTED
+        ctd = ComputeTaskDef()
+        ctd['task_id'] = self.task_id
+        ctd['subtask_id'] = 'copy'
+        ctd['deadline'] = timeout_to_deadline(120)
+        self.task.query_duplicate_extra_data.return_value = \
+            Task.ExtraData(ctd=ctd)
+
+        with patch.object(self.tm, 'check_next_subtask', return_value=True), \
+                patch.object(self.tm, 'should_wait_for_node',
+                             return_value=False):
+            subtask = self.tm.get_next_subtask(
+                "DEF", "DEF", self.task_id, 1000, 10, 5, 10, "10.10.10.10")
+
+        assert subtask['subtask_id'] == 'copy'
+        self.task.query_duplicate_extra_data.assert_called_once_with(
+            'new', 1000, "DEF", "DEF")
+        self.task.query_extra_data.assert_not_called()
+        assert self.tm.subtask2task_mapping['copy'] == self.task_id
+
+    @patch('golem.task.taskmanager.TaskManager.notice_task_updated')
+    def test_cancel_subtask_copies(self, notice_task_updated, *_):
+        self.task.cancel_subtask_copies.return_value = ['old']
+        with freeze_time(datetime.datetime.utcfromtimestamp(50.)):
+            self.tm._cancel_subtask_copies(self.task_id, 'new')
+
+        assert self.task.straggler_policy.median_duration == 30.
+        self.task.cancel_subtask_copies.assert_called_once_with('new')
+        subtask_state = \
+            self.tm.tasks_states[self.task_id].subtask_states['old']
+        assert subtask_state.subtask_status == SubtaskStatus.cancelled
+        notice_task_updated.assert_called_once_with(
+            self.task_id, subtask_id='old', op=SubtaskOp.CANCELLED)
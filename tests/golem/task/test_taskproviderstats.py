@@ -21,10 +21,14 @@ class TestProviderStats(TestCase):
             provider_income_assigned_sum=7,
             provider_income_completed_sum=8,
             provider_income_paid_sum=9,
+            provider_resource_usage_cnt=10,
+            provider_cpu_time_sum=11,
+            provider_wall_time_sum=12,
+            provider_block_io_sum=13,
         )
 
         # The number of properties didn't change
-        assert len(vars(stats)) == 9
+        assert len(vars(stats)) == 13
 
         # The names of properties didn't change
         assert stats.provider_wtct_cnt == 1
@@ -36,6 +40,10 @@ class TestProviderStats(TestCase):
         assert stats.provider_income_assigned_sum == 7
         assert stats.provider_income_completed_sum == 8
         assert stats.provider_income_paid_sum == 9
+        assert stats.provider_resource_usage_cnt == 10
+        assert stats.provider_cpu_time_sum == 11
+        assert stats.provider_wall_time_sum == 12
+        assert stats.provider_block_io_sum == 13
 
 
 @patch('golem.task.taskproviderstats.ProviderTTCDelayTimers')
@@ -129,6 +137,25 @@ class TestProviderStatsManager(TestCase):
         manager.keeper.increase_stat.assert_called_once_with(
             'provider_income_assigned_sum', 10)
 
+    def test_on_resource_usage(self, _):
+        manager = self.manager
+        manager._on_subtask_started(
+            event='resource_usage',
+            subtask_id='subtask',
+            peak_memory=2 ** 20,
+            cpu_time=29.6,
+            block_read=100,
+            block_write=20,
+            wall_time=60.2,
+            cpu_utilization=29.6 / 60.2,
+        )
+        manager.keeper.increase_stat.assert_has_calls([
+            call('provider_resource_usage_cnt'),
+            call('provider_cpu_time_sum', 30),
+            call('provider_wall_time_sum', 60),
+            call('provider_block_io_sum', 120),
+        ])
+
     def test_on_income_invalid_arguments(self, _):
         manager = self.manager
 
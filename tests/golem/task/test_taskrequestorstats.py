@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 from pydispatch import dispatcher
 
 from golem import testutils
-from golem.task.taskrequestorstats import TaskInfo, TaskMsg, \
+from golem.task.taskrequestorstats import TaskInfo, TaskMsg, SubtaskInfo, \
     RequestorTaskStats, logger, CurrentStats, TaskStats, EMPTY_TASK_STATS, \
     FinishedTasksStats, FinishedTasksSummary, RequestorTaskStatsManager, \
     EMPTY_CURRENT_STATS, EMPTY_FINISHED_STATS, AggregateTaskStats, \
@@ -260,6 +260,22 @@ class TestTaskInfo(TestCase, testutils.PEP8MixIn):
         self.assertTrue(ti.had_failures_or_timeouts(),
                         "One subtask should have failed")
 
+    def test_messages_trimmed(self):
+        ti = self._create_task_with_single_subtask()
+        for i in range(SubtaskInfo.MAX_MESSAGES):
+            ti.got_subtask_message(
+                "st1", TaskMsg(ts=3.0 + i, op=SubtaskOp.TIMEOUT),
+                SubtaskStatus.failure)
+            ti.got_subtask_message(
+                "st1", TaskMsg(ts=3.0 + i, op=SubtaskOp.ASSIGNED),
+                SubtaskStatus.starting)
+
+        self.assertEqual(len(ti.subtasks["st1"].messages),
+                         SubtaskInfo.MAX_MESSAGES)
+        # counters still include the trimmed messages
+        self.assertEqual(ti.timeout_count(), SubtaskInfo.MAX_MESSAGES)
+        self.assertEqual(ti.in_progress_subtasks_count(), 1)
+
 
 class TestRequestorTaskStats(LogTestCase):
     def compare_task_stats(self, ts1, ts2):
@@ -345,6 +345,33 @@ class TestTaskServer(TaskServerTestBase):  # noqa pylint: disable=too-many-publi
             .assert_called_once()
         # pylint: enable=no-member
 
+    def test_sync_job_intervals(self, *_):
+        ts = self.ts
+        with patch.object(ts, 'sweep_sessions') as sweep_sessions, \
+                patch.object(ts, '_sync_pending') as sync_pending:
+            ts.sync_network()
+            ts.sync_network()
+        sweep_sessions.assert_called_once_with()
+        sync_pending.assert_called_once_with()
+
+    def test_sync_waiting_results_woken(self, *_):
+        ts = self.ts
+        with patch.object(ts, '_send_waiting_results') as send:
+            ts.sync_network()
+            ts.sync_network()
+            send.assert_called_once_with()
+
+            ts.results_to_send['xyz'] = Mock(already_sending=True)
+            ts.retry_sending_task_result('xyz')
+            ts.sync_network()
+            assert send.call_count == 2
+
+    def test_get_sync_stats(self, *_):
+        self.ts.sync_network()
+        stats = self.ts.get_sync_stats()
+        assert stats['jobs']['waiting_results']['duration']['count'] == 1
+        assert 'max' in stats['reactor_lag']
+
     def test_retry_sending_task_result(self, *_):
         ts = self.ts
         ts.network = Mock()
@@ -886,6 +913,26 @@ class TaskServerTaskHeaderTest(TaskServerTestBase):
 
         self.assertFalse(ts.add_task_header(task_header))
 
+    def test_add_task_header_verified_once(self):
+        keys_auth_2 = KeysAuth(
+            os.path.join(self.path, "2"),
+            'priv_key',
+            'password',
+        )
+        task_header = get_example_task_header(keys_auth_2.public_key)
+        task_header.sign(private_key=keys_auth_2._private_key)  # noqa pylint:disable=no-value-for-parameter
+
+        with patch.object(self.ts, 'verify_header_sig',
+                          wraps=self.ts.verify_header_sig) as verify:
+            self.assertTrue(self.ts.add_task_header(task_header))
+            self.assertTrue(self.ts.add_task_header(task_header))
+            assert verify.call_count == 1
+
+            # Same signature, different content
+            task_header.max_price += 1
+            self.assertFalse(self.ts.add_task_header(task_header))
+            assert verify.call_count == 2
+
 
 class TaskServerBase(TestDatabaseWithReactor, testutils.TestWithClient):
     def setUp(self):
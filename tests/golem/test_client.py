@@ -38,10 +38,10 @@ from golem.manager.nodestatesnapshot import ComputingSubtaskStateSnapshot
 from golem.network.p2p.peersession import PeerSessionInfo
 from golem.report import StatusPublisher
 from golem.resource.dirmanager import DirManager
-from golem.rpc.mapping.rpceventnames import UI, Environment, Golem
+from golem.rpc.mapping.rpceventnames import UI, Environment, Golem, Task
 from golem.task.acl import Acl
 from golem.task.taskserver import TaskServer
-from golem.task.taskstate import TaskTestStatus
+from golem.task.taskstate import SubtaskOp, TaskOp, TaskTestStatus
 from golem.tools import testwithreactor
 from golem.tools.assertlogs import LogTestCase
 
@@ -184,6 +184,29 @@ class TestClient(TestClientBase):
         self.assertIsInstance(payment_address, str)
         self.assertTrue(len(payment_address) > 0)
 
+    def test_taskmanager_listener(self, *_):
+        c = self.client
+        c.rpc_publisher = Mock()
+        for op in (SubtaskOp.ASSIGNED, SubtaskOp.FINISHED):
+            c.taskmanager_listener(sender=None, signal='golem.taskmanager',
+                                   event='task_status_updated',
+                                   task_id='t1', subtask_id='s1', op=op)
+        c.taskmanager_listener(sender=None, signal='golem.taskmanager',
+                               event='task_status_updated',
+                               task_id='t1', op=TaskOp.FINISHED)
+        publish = c.rpc_publisher.publish
+        publish.assert_not_called()
+
+        c.task_events.flush()
+        publish.assert_any_call(
+            Task.evt_subtask_status, 't1', 's1', SubtaskOp.FINISHED.value)
+        publish.assert_any_call(
+            Task.evt_task_status, 't1', 'TaskOp', TaskOp.FINISHED.value)
+        publish.assert_any_call(
+            Task.evt_subtasks_status_batch,
+            {'t1': {'s1': SubtaskOp.FINISHED.value}})
+        assert publish.call_count == 4
+
     def test_remove_resources(self, *_):
         def unique_dir():
             d = os.path.join(self.path, str(uuid.uuid4()))
@@ -1056,6 +1079,7 @@ class TestClientRPCMethods(TestClientBase, LogTestCase):
             'frames': [1],
             'start_task': start_task,
             'total_tasks': 1,
+            'seconds_since_progress': 0.0,
         }
         task_computer.get_progress.return_value = \
             ComputingSubtaskStateSnapshot(**state_snapshot_dict)
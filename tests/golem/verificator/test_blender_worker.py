@@ -0,0 +1,183 @@
+import json
+import os
+from unittest import mock
+
+from pydispatch import dispatcher
+from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock
+
+from golem.docker.task_thread import DockerTaskThread
+from golem.task.taskstate import TaskOp
+from golem.task.taskthread import JobException
+from golem.testutils import TempDirFixture
+from golem.verificator.blender_worker import BlenderWorkerRegistry, \
+    WorkerUnavailable
+
+IMAGES = [('golemfactory/blender_verifier', '1.1')]
+
+
+class FakeDockerTask:
+    specify_dir_mapping = staticmethod(DockerTaskThread.specify_dir_mapping)
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.deferred = Deferred()
+
+    def start(self):
+        return self.deferred
+
+    def end_comp(self):
+        self.deferred.errback(JobException("Killed"))
+
+
+class TestBlenderWorkerRegistry(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.clock = Clock()
+        self.docker_task_cls = mock.Mock(
+            side_effect=FakeDockerTask,
+            specify_dir_mapping=FakeDockerTask.specify_dir_mapping)
+        self.registry = BlenderWorkerRegistry(self.docker_task_cls,
+                                              clock=self.clock)
+        self.spool_dir = os.path.join(self.tempdir, 'spool')
+        self.result = self.temp_file_name('result.png')
+        with open(self.result, 'w') as f:
+            f.write('png')
+
+    def tearDown(self):
+        dispatcher.disconnect(self.registry._task_status_updated,
+                              signal='golem.taskmanager')
+        super().tearDown()
+
+    def _verify(self, task_id='task', timeout=0):
+        return self.registry.verify(
+            task_id, self.spool_dir, self.tempdir, IMAGES,
+            params={'scene_path': '/golem/resources/scene.blend'},
+            results=[self.result], timeout=timeout)
+
+    def _finish(self, job_id, verdict=True):
+        with open(os.path.join(self.spool_dir, 'results', job_id + '.json'),
+                  'w') as f:
+            json.dump({'verdict': verdict, 'error': None}, f)
+
+    def test_verify(self):
+        job_id, _ = self._verify()
+
+        with open(os.path.join(self.spool_dir, 'jobs',
+                               job_id + '.json')) as f:
+            params = json.load(f)
+        assert params == {
+            'scene_path': '/golem/resources/scene.blend',
+            'subtask_paths': ['/golem/work/{}/result.png'.format(job_id)],
+        }
+        assert os.path.isfile(os.path.join(self.spool_dir, job_id,
+                                           'result.png'))
+
+        workers = self.registry.get_workers('task')
+        assert len(workers) == 1
+        kwargs = workers[0].docker_task.kwargs
+        assert kwargs['docker_images'] == IMAGES
+        assert kwargs['use_container_pool'] is False
+        assert kwargs['dir_mapping'].work.as_posix() == self.spool_dir
+        assert kwargs['extra_data']['idle_timeout'] == \
+            BlenderWorkerRegistry.IDLE_TIMEOUT
+
+    def test_result(self):
+        job_id, deferred = self._verify()
+        results = []
+        deferred.addCallback(results.append)
+
+        self.clock.advance(BlenderWorkerRegistry.POLL_INTERVAL)
+        assert not results
+
+        self._finish(job_id)
+        self.clock.advance(BlenderWorkerRegistry.POLL_INTERVAL)
+        assert results == [{'verdict': True, 'error': None}]
+        assert not os.path.exists(os.path.join(self.spool_dir, job_id))
+        assert not os.listdir(os.path.join(self.spool_dir, 'results'))
+
+    def test_workers_reused_and_bounded(self):
+        job_id, _ = self._verify()
+        self._finish(job_id)
+        self.clock.advance(BlenderWorkerRegistry.POLL_INTERVAL)
+        self._verify()
+        assert len(self.registry.get_workers('task')) == 1
+
+        for _ in range(3):
+            self._verify()
+        assert len(self.registry.get_workers('task')) == \
+            BlenderWorkerRegistry.MAX_WORKERS
+        assert self.docker_task_cls.call_count == \
+            BlenderWorkerRegistry.MAX_WORKERS
+
+    def test_worker_failed(self):
+        _, deferred = self._verify()
+        failures = []
+        deferred.addErrback(failures.append)
+
+        worker = self.registry.get_workers('task')[0]
+        worker.docker_task.deferred.errback(JobException("No image"))
+
+        assert failures[0].check(WorkerUnavailable)
+        assert not self.registry.get_workers('task')
+        with self.assertRaises(WorkerUnavailable):
+            self._verify()
+
+    def test_idle_worker_exited(self):
+        self._verify()
+        worker = self.registry.get_workers('task')[0]
+        # the job was queued just before the worker became idle
+        worker.docker_task.deferred.callback(None)
+
+        workers = self.registry.get_workers('task')
+        assert len(workers) == 1
+        assert workers[0] is not worker
+
+    def test_task_finished(self):
+        _, deferred = self._verify()
+        failures = []
+        deferred.addErrback(failures.append)
+        worker = self.registry.get_workers('task')[0]
+
+        dispatcher.send(signal='golem.taskmanager',
+                        event='task_status_updated',
+                        task_id='task', op=TaskOp.FINISHED)
+
+        assert not worker.running
+        assert failures[0].check(WorkerUnavailable)
+        assert not os.path.exists(self.spool_dir)
+        assert not self.registry.get_workers('task')
+
+    def test_other_task_op(self):
+        self._verify()
+        dispatcher.send(signal='golem.taskmanager',
+                        event='task_status_updated',
+                        task_id='task', op=TaskOp.STARTED)
+        assert self.registry.get_workers('task')[0].running
+
+    def test_timeout(self):
+        with mock.patch('golem.verificator.blender_worker.time.time',
+                        return_value=0.):
+            job_id, deferred = self._verify(timeout=10)
+        failures = []
+        deferred.addErrback(failures.append)
+
+        with mock.patch('golem.verificator.blender_worker.time.time',
+                        return_value=11.):
+            self.clock.advance(BlenderWorkerRegistry.POLL_INTERVAL)
+        assert failures[0].check(TimeoutError)
+        assert not os.path.exists(os.path.join(self.spool_dir, 'jobs',
+                                               job_id + '.json'))
+
+    def test_cancel(self):
+        job_id, deferred = self._verify()
+        results = []
+        deferred.addBoth(results.append)
+
+        self.registry.cancel(job_id)
+        self._finish(job_id)
+        self.clock.advance(BlenderWorkerRegistry.POLL_INTERVAL)
+        assert not results
+        assert not os.path.exists(os.path.join(self.spool_dir, 'jobs',
+                                               job_id + '.json'))
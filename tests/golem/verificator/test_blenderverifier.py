@@ -3,14 +3,23 @@ import time
 import pytest
 from unittest import mock
 
+from pydispatch import dispatcher
+from twisted.internet.defer import Deferred
+from twisted.internet.task import Clock
+
 from golem.core.common import get_golem_path, is_linux
 from golem.core.deferred import sync_wait
 from golem.docker.image import DockerImage
 from golem.docker.manager import DockerManager
 from golem.docker.task_thread import DockerTaskThread
 from golem.task.localcomputer import ComputerAdapter
+from golem.task.taskthread import JobException
 from golem.testutils import TempDirFixture
 from golem.verificator.blender_verifier import BlenderVerifier
+from golem.verificator.blender_worker import BlenderWorkerRegistry, \
+    WorkerUnavailable
+from golem.verificator.verifier import SubtaskVerificationState
+from tests.golem.verificator.test_blender_worker import FakeDockerTask
 
 
 @pytest.mark.slow
@@ -69,7 +78,7 @@ class TestBlenderVerifier(TempDirFixture):
         self.subtask_info['ctd'] = dict()
         self.subtask_info['ctd']['deadline'] = time.time() + 3600
         self.subtask_info['ctd']['docker_images'] = [DockerImage(
-            'golemfactory/blender', tag='1.9').to_dict()]
+            'golemfactory/blender', tag='1.10').to_dict()]
         self.subtask_info['ctd']['extra_data'] = dict()
         self.subtask_info['ctd']['extra_data']['scene_file'] = \
             self.subtask_info['scene_file']
@@ -148,3 +157,145 @@ class TestBlenderVerifier(TempDirFixture):
             ['GolemTask_10001.png'],
             'Subtask computation failed with exit code 1',
         )
+
+
+class TestBlenderVerifierWithWorker(TempDirFixture):
+
+    def setUp(self):
+        super().setUp()
+        self.registry = mock.Mock()
+        self.docker_task_cls = mock.Mock(
+            specify_dir_mapping=DockerTaskThread.specify_dir_mapping)
+        result = os.path.join(self.tempdir, 'work', 'result.png')
+        self.verification_data = dict(
+            subtask_info=dict(
+                subtask_id='subtask',
+                ctd=dict(task_id='task'),
+                tmp_dir=self.tempdir,
+                path_root='/resources',
+                crop_window=[0.0, 1.0, 0.0, 1.0],
+                scene_file='/golem/resources/scene.blend',
+                resolution=[150, 150],
+                samples=35,
+                frames=[1],
+                output_format='PNG',
+            ),
+            results=[result],
+            resources=[],
+        )
+        self.verifier = BlenderVerifier(self.verification_data,
+                                        self.docker_task_cls,
+                                        worker_registry=self.registry)
+
+    def _start(self, job_deferred):
+        self.registry.verify.return_value = ('job', job_deferred)
+        d = self.verifier.start_verification(self.verification_data)
+        results = []
+        d.addBoth(results.append)
+        return results
+
+    def test_verified_by_worker(self):
+        job_deferred = Deferred()
+        results = self._start(job_deferred)
+
+        self.registry.verify.assert_called_once()
+        args, kwargs = self.registry.verify.call_args
+        assert args == ('task',)
+        assert kwargs['spool_dir'] == \
+            os.path.join(self.tempdir, 'verification_worker')
+        assert kwargs['results'] == self.verification_data['results']
+        assert self.verifier.worker_job_id == 'job'
+
+        job_deferred.callback({'verdict': True, 'error': None})
+        assert results[0][:2] == \
+            ('subtask', SubtaskVerificationState.VERIFIED)
+        self.docker_task_cls.assert_not_called()
+
+    def test_rejected_by_worker(self):
+        job_deferred = Deferred()
+        results = self._start(job_deferred)
+        job_deferred.callback({'verdict': False, 'error': None})
+        assert isinstance(results[0].value, Exception)
+
+    def test_worker_unavailable(self):
+        job_deferred = Deferred()
+        self._start(job_deferred)
+        job_deferred.errback(WorkerUnavailable())
+        self.docker_task_cls.assert_called_once()
+        assert self.verifier.worker_job_id is None
+
+    def test_stop(self):
+        self._start(Deferred())
+        self.verifier.stop()
+        self.registry.cancel.assert_called_once_with('job')
+
+
+class TestBlenderVerifierWorkerFallback(TempDirFixture):
+    """ The worker container fails, e.g. when the verifier image was built
+    without the worker entrypoint """
+
+    def setUp(self):
+        super().setUp()
+        self.docker_task_cls = mock.Mock(
+            side_effect=FakeDockerTask,
+            specify_dir_mapping=FakeDockerTask.specify_dir_mapping)
+        self.registry = BlenderWorkerRegistry(self.docker_task_cls,
+                                              clock=Clock())
+        self.result = self.temp_file_name('result.png')
+        with open(self.result, 'w') as f:
+            f.write('png')
+
+    def tearDown(self):
+        dispatcher.disconnect(self.registry._task_status_updated,
+                              signal='golem.taskmanager')
+        super().tearDown()
+
+    def _start(self, subtask_id):
+        verification_data = dict(
+            subtask_info=dict(
+                subtask_id=subtask_id,
+                ctd=dict(task_id='task'),
+                tmp_dir=self.tempdir,
+                path_root=self.tempdir,
+                crop_window=[0.0, 1.0, 0.0, 1.0],
+                scene_file='/golem/resources/scene.blend',
+                resolution=[150, 150],
+                samples=35,
+                frames=[1],
+                output_format='PNG',
+            ),
+            results=[self.result],
+            resources=[],
+        )
+        verifier = BlenderVerifier(verification_data, self.docker_task_cls,
+                                   worker_registry=self.registry)
+        verifier.start_verification(verification_data)
+
+    def test_verifier_image_listed(self):
+        images = [(entry[0], entry[2])
+                  for entry in DockerManager._collect_images()]
+        assert (BlenderVerifier.DOCKER_NAME, BlenderVerifier.DOCKER_TAG) \
+            in images
+
+    def test_worker_failed(self):
+        image = (BlenderVerifier.DOCKER_NAME, BlenderVerifier.DOCKER_TAG)
+        self._start('subtask1')
+        worker_task = self.registry.get_workers('task')[0].docker_task
+        assert worker_task.kwargs['docker_images'] == [image]
+
+        worker_task.deferred.errback(JobException(
+            "can't open file 'verifier_worker_entrypoint.py'"))
+
+        # verified in a separate container
+        assert self.docker_task_cls.call_count == 2
+        kwargs = self.docker_task_cls.call_args[1]
+        assert kwargs['docker_images'] == [image]
+        assert kwargs['extra_data']['entrypoint'] == \
+            'python3 /golem/entrypoints/verifier_entrypoint.py'
+
+        # no more workers are started for the task
+        self._start('subtask2')
+        assert self.docker_task_cls.call_count == 3
+        assert self.docker_task_cls.call_args[1]['extra_data'][
+            'entrypoint'] == 'python3 /golem/entrypoints/verifier_entrypoint.py'
+        assert not self.registry.get_workers('task')